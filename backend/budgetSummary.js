@@ -0,0 +1,227 @@
+// backend/budgetSummary.js
+// Budget totals of an event, kept on the event document instead of recomputed on every read.
+//
+// Event.budget_summary holds { total_expenses, total_paid, item_count, by_category: { <category>: {amount, count} } }
+// (category keys are encoded, see categoryKey). Every expense write ($inc) applies the difference it makes,
+// so GET /api/events/:eventId/budget reads the totals with the event itself. Events without a summary
+// (created before it existed, or seeded in bulk) get one built by a $group aggregation on their first read.
+//
+// An expense write goes through withBudgetChange: it bumps Event.budget_version and adds itself to
+// budget_pending before the item is written, and applies its difference (and leaves budget_pending) after.
+// A rebuild only stores its result when no write was in progress when it read the event and none started
+// before it stored - so an aggregation can never already contain an item whose $inc is still to come, and a
+// write never $inc's a summary that does not exist yet. (No transaction: the hermetic test MongoDB is a
+// standalone server.) A write that never finished (its process died) is dropped from budget_pending after
+// PENDING_STALE_MS, together with the summary it may have left behind: the next read builds it again.
+
+const crypto = require('crypto');
+const { mongoose } = require('./db');
+const Event = require('./models/Event');
+const BudgetItem = require('./models/BudgetItem');
+
+const MAX_REBUILD_ATTEMPTS = 5;
+const MAX_APPLY_ATTEMPTS = 5;
+// Far longer than any expense write takes: an entry this old belongs to a process that is gone
+const PENDING_STALE_MS = 5 * 60 * 1000;
+// The budget bookkeeping leaves Event.updated_at alone: the events list ETag (conditional.js) is built from it,
+// and the list does not return these fields - an expense must not make every dashboard refetch the events
+const NO_TIMESTAMPS = { timestamps: false };
+
+const paidOf = (item) => (item.is_paid ? item.amount : 0);
+
+/* ================================
+   Incremental updates
+   ================================ */
+
+// Categories are free text: "." would make a nested path, a leading "$" or "" an invalid one
+// ("%" alone stands for the empty category - an encoded "%" is always "%25")
+const categoryKey = (category) =>
+  String(category ?? '').replace(/[%.$]/g, (c) => `%${c.charCodeAt(0).toString(16).toUpperCase()}`) || '%';
+const categoryName = (key) =>
+  (key === '%' ? '' : key.replace(/%(25|2E|24)/g, (_, hex) => String.fromCharCode(parseInt(hex, 16))));
+
+// The $inc that adding (sign 1) or removing (sign -1) one item makes to the summary
+function itemDelta(item, sign) {
+  if (!item) return {};
+  return {
+    'budget_summary.total_expenses': sign * (item.amount || 0),
+    'budget_summary.total_paid': sign * (paidOf(item) || 0),
+    'budget_summary.item_count': sign,
+    [`budget_summary.by_category.${categoryKey(item.category)}.amount`]: sign * (item.amount || 0),
+    [`budget_summary.by_category.${categoryKey(item.category)}.count`]: sign
+  };
+}
+
+function mergeDeltas(...deltas) {
+  const merged = {};
+  deltas.forEach((delta) => Object.entries(delta).forEach(([path, value]) => {
+    merged[path] = (merged[path] || 0) + value;
+  }));
+  Object.keys(merged).forEach((path) => merged[path] === 0 && delete merged[path]);
+  return merged;
+}
+
+/**
+ * Completes the expense write `writeId` started by withBudgetChange: `before` is the item as it was
+ * (null when created), `after` as it is now (null when deleted).
+ */
+async function applyBudgetChange(eventId, writeId, before, after) {
+  const delta = mergeDeltas(itemDelta(before, -1), itemDelta(after, 1));
+  const pending = { _id: eventId, 'budget_pending.id': writeId };
+  const leave = { $pull: { budget_pending: { id: writeId } } };
+  for (let attempt = 0; attempt < MAX_APPLY_ATTEMPTS; attempt++) {
+    const withSummary = await Event.updateOne(
+      { ...pending, budget_summary: { $exists: true } },
+      { $inc: { ...delta, budget_version: 1 }, ...leave },
+      NO_TIMESTAMPS
+    );
+    if (withSummary.matchedCount > 0) return;
+    // No summary yet: the next read builds it from the items (which already include this write)
+    const withoutSummary = await Event.updateOne(
+      { ...pending, budget_summary: { $exists: false } },
+      { $inc: { budget_version: 1 }, ...leave },
+      NO_TIMESTAMPS
+    );
+    if (withoutSummary.matchedCount > 0) return;
+    // Deleted, or dropped as stale (a rebuild may have missed this write)
+    if (!(await Event.exists(pending))) break;
+  }
+  // The summary cannot take the difference safely: drop it, the next read builds it from the items
+  await Event.updateOne(
+    { _id: eventId },
+    { $unset: { budget_summary: 1 }, $inc: { budget_version: 1 }, ...leave },
+    NO_TIMESTAMPS
+  );
+}
+
+/**
+ * Runs an expense write of the event and keeps its budget summary in step with it.
+ * @param {Function} write - async () => ({ before, after }): the item as it was (null when created)
+ *                           and as it is now (null when deleted); nothing changed = both null
+ */
+async function withBudgetChange(eventId, write) {
+  // Before the item changes: from here on no rebuild may store an aggregation of this event
+  const writeId = crypto.randomUUID();
+  await Event.updateOne(
+    { _id: eventId },
+    { $inc: { budget_version: 1 }, $push: { budget_pending: { id: writeId, at: new Date() } } },
+    NO_TIMESTAMPS
+  );
+  let change = { before: null, after: null };
+  try {
+    change = (await write()) || change;
+    return change;
+  } finally {
+    await applyBudgetChange(eventId, writeId, change.before, change.after);
+  }
+}
+
+/**
+ * Drops the writes of `event` (lean) that are in budget_pending for longer than PENDING_STALE_MS, and
+ * with them the summary: their $inc never came, their item may or may not have been written.
+ * @returns {Promise<boolean>} true when the event had stale writes (read it again)
+ */
+async function clearStaleWrites(event) {
+  const staleBefore = Date.now() - PENDING_STALE_MS;
+  const stale = (event.budget_pending || []).filter((w) => new Date(w.at).getTime() < staleBefore);
+  if (stale.length === 0) return false;
+  await Event.updateOne(
+    { _id: event._id, budget_version: event.budget_version },
+    {
+      $pull: { budget_pending: { id: { $in: stale.map((w) => w.id) } } },
+      $unset: { budget_summary: 1 },
+      $inc: { budget_version: 1 }
+    },
+    NO_TIMESTAMPS
+  );
+  return true;
+}
+
+/* ================================
+   Rebuild
+   ================================ */
+
+async function aggregateSummary(eventId) {
+  const rows = await BudgetItem.aggregate([
+    { $match: { event_id: new mongoose.Types.ObjectId(String(eventId)) } },
+    {
+      $group: {
+        _id: '$category',
+        amount: { $sum: '$amount' },
+        paid: { $sum: { $cond: ['$is_paid', '$amount', 0] } },
+        count: { $sum: 1 }
+      }
+    }
+  ]);
+  const summary = { total_expenses: 0, total_paid: 0, item_count: 0, by_category: {} };
+  rows.forEach((row) => {
+    summary.total_expenses += row.amount;
+    summary.total_paid += row.paid;
+    summary.item_count += row.count;
+    summary.by_category[categoryKey(row._id)] = { amount: row.amount, count: row.count };
+  });
+  return summary;
+}
+
+/**
+ * Returns the event (lean) with its budget_summary, building and storing the summary if it is missing.
+ * @returns {Promise<object|null>} null when the event does not exist
+ */
+async function getEventWithBudget(eventId) {
+  for (let attempt = 0; ; attempt++) {
+    const event = await Event.findById(eventId).lean();
+    if (!event) return null;
+    if (await clearStaleWrites(event)) continue;
+    if (event.budget_summary) return event;
+
+    const summary = await aggregateSummary(eventId);
+    // A write in progress may or may not be in the aggregation yet: answer with it, but do not store it
+    if (event.budget_pending && event.budget_pending.length > 0) return { ...event, budget_summary: summary };
+    const version = event.budget_version === undefined ? { $exists: false } : event.budget_version;
+    const stored = await Event.updateOne(
+      { _id: eventId, budget_summary: { $exists: false }, budget_version: version, 'budget_pending.0': { $exists: false } },
+      { $set: { budget_summary: summary } },
+      NO_TIMESTAMPS
+    );
+    // Under constant writes give up storing and answer with the fresh aggregation
+    if (stored.matchedCount > 0 || attempt + 1 >= MAX_REBUILD_ATTEMPTS) {
+      return { ...event, budget_summary: summary };
+    }
+  }
+}
+
+// Drops the stored summaries (items were changed in bulk); they are rebuilt on the next read
+function resetBudgetSummaries(eventIds) {
+  return Event.updateMany(
+    { _id: { $in: eventIds } },
+    { $unset: { budget_summary: 1 }, $inc: { budget_version: 1 } },
+    NO_TIMESTAMPS
+  );
+}
+
+/**
+ * The summary as the budget screen shows it: totals, remaining budget and the per-category chart.
+ */
+function formatBudgetSummary(event) {
+  const summary = event.budget_summary;
+  const budgetLimit = event.total_budget || 0;
+  return {
+    budgetLimit,
+    summary: {
+      totalExpenses: summary.total_expenses,
+      totalPaid: summary.total_paid,
+      remaining: budgetLimit - summary.total_expenses
+    },
+    chartData: Object.entries(summary.by_category || {})
+      .filter(([, category]) => category.count > 0)
+      .map(([key, category]) => ({ name: categoryName(key), value: category.amount }))
+  };
+}
+
+module.exports = {
+  withBudgetChange,
+  getEventWithBudget,
+  resetBudgetSummaries,
+  formatBudgetSummary,
+  aggregateSummary
+};
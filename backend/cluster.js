@@ -0,0 +1,93 @@
+// backend/cluster.js
+// Cluster mode: `node cluster.js` runs CLUSTER_WORKERS copies of index.js (default: one per CPU) behind PORT.
+//
+// The primary accepts the connections and hands each one to a worker (sticky sessions): a Socket.io
+// request carrying a session id goes to the worker that created the session (session ids start with
+// the worker index, see coordination.js), everything else is spread round-robin. It also holds the
+// seating edit locks and relays the pub/sub bus between the workers (CoordinationHub).
+// A worker that exits is replaced, and the edit locks held by its sockets are released.
+
+require('dotenv').config();
+const cluster = require('cluster');
+const net = require('net');
+const os = require('os');
+
+if (!cluster.isPrimary) {
+  require('./index');
+} else {
+  const { CoordinationHub, STICKY_SID } = require('./coordination');
+
+  const PORT = process.env.PORT || 4000;
+  const WORKERS = Number(process.env.CLUSTER_WORKERS) || os.availableParallelism();
+
+  const workers = [];
+  const ready = new Set();
+  let next = 0;
+  let listening = false;
+  let stopping = false;
+
+  const hub = new CoordinationHub(() => Object.values(cluster.workers));
+
+  function pickWorker(head) {
+    // The request line is enough: "GET /socket.io/?EIO=4&transport=polling&sid=w2_... HTTP/1.1"
+    const requestLine = head.toString('latin1', 0, Math.min(head.length, 2048)).split('\r\n', 1)[0];
+    const sticky = STICKY_SID.exec(requestLine);
+    if (sticky && ready.has(Number(sticky[1]))) return workers[Number(sticky[1])];
+
+    const indexes = [...ready];
+    if (indexes.length === 0) return null;
+    return workers[indexes[next++ % indexes.length]];
+  }
+
+  const balancer = net.createServer({ pauseOnConnect: true }, (connection) => {
+    connection.on('error', () => connection.destroy());
+    connection.once('data', (head) => {
+      connection.pause();
+      const worker = pickWorker(head);
+      if (!worker) return connection.destroy();
+      worker.send({ type: 'sticky:connection', head: head.toString('base64') }, connection, (err) => {
+        if (err) connection.destroy();
+      });
+    });
+    connection.resume();
+  });
+
+  function fork(index) {
+    const worker = cluster.fork({ CLUSTER_WORKER_INDEX: String(index) });
+    workers[index] = worker;
+    worker.on('message', (msg) => {
+      if (msg && msg.type === 'worker:ready') {
+        ready.add(index);
+        if (!listening) {
+          listening = true;
+          balancer.listen(PORT, '0.0.0.0', () => {
+            console.log(`Cluster (${WORKERS} workers) listening on http://0.0.0.0:${PORT}`);
+          });
+        }
+        return;
+      }
+      hub.handle(worker, msg).catch((err) => console.error('❌ Coordination message failed:', err.message));
+    });
+    worker.on('exit', (code, signal) => {
+      ready.delete(index);
+      hub.workerExited(worker);
+      if (stopping) return;
+      console.error(`❌ Worker ${index} exited (${signal || code}), restarting`);
+      setTimeout(() => fork(index), 1000);
+    });
+  }
+
+  function stop() {
+    if (stopping) return;
+    stopping = true;
+    balancer.close();
+    Object.values(cluster.workers).forEach((worker) => worker.kill('SIGTERM'));
+    cluster.disconnect(() => process.exit(0));
+    setTimeout(() => process.exit(0), 10000).unref();
+  }
+
+  process.on('SIGTERM', stop);
+  process.on('SIGINT', stop);
+
+  for (let i = 0; i < WORKERS; i++) fork(i);
+}
@@ -0,0 +1,133 @@
+// backend/conditional.js
+// Conditional GET and response compression for the dashboard data routes.
+//
+// After every `data_changed` the frontend refetches events, tasks, guests, budget, vendors and tables,
+// although usually only one of them changed. Each of these lists gets an ETag built from the list's
+// version - how many documents match and the newest updated_at among them (two indexed queries, no
+// documents read) - checked *before* the list itself is queried. The browser revalidates with
+// If-None-Match on its own (Cache-Control: no-cache) and an unchanged list costs a 304 without a body.
+// Any write bumps updated_at (Mongoose timestamps), a delete lowers the count. The version is read
+// before the list, so a write in between costs one more full answer, never a stale 304.
+//
+// JSON and text answers are compressed with brotli or gzip (node's zlib), as negotiated by Accept-Encoding.
+// RESPONSE_COMPRESSION=off turns compression off (e.g. behind a proxy that already compresses).
+
+const crypto = require('crypto');
+const zlib = require('zlib');
+
+// Bump when the shape of a list response changes, so browsers do not keep answers of the old format
+const FORMAT_VERSION = 1;
+
+const COMPRESSION_ENABLED = process.env.RESPONSE_COMPRESSION !== 'off';
+const COMPRESSION_MIN_BYTES = Number(process.env.RESPONSE_COMPRESSION_MIN_BYTES) || 1024;
+const COMPRESSIBLE_TYPE = /json|text|javascript|svg|xml/i;
+
+/* ================================
+   Conditional GET
+   ================================ */
+
+/**
+ * Version of the documents matching `filter`: "<count>:<newest updated_at in ms>".
+ * @param {string} field - the model's updatedAt path ('updated_at' or 'updatedAt')
+ */
+async function listVersion(Model, filter, field = 'updated_at') {
+  const [count, newest] = await Promise.all([
+    Model.countDocuments(filter),
+    Model.findOne(filter).sort({ [field]: -1 }).select({ [field]: 1, _id: 0 }).lean()
+  ]);
+  return `${count}:${newest && newest[field] ? new Date(newest[field]).getTime() : 0}`;
+}
+
+/**
+ * Sets the ETag (built from the URL and the given versions) and answers 304 if the client already has it.
+ * @returns {boolean} true when the 304 was sent and the route is done
+ */
+function notModified(req, res, ...versions) {
+  const hash = crypto.createHash('sha1')
+    .update(JSON.stringify([FORMAT_VERSION, req.originalUrl, ...versions]))
+    .digest('base64url');
+  res.set('ETag', `W/"${hash}"`);
+  res.set('Cache-Control', 'private, no-cache');
+  if (!req.fresh) return false;
+  res.status(304).end();
+  return true;
+}
+
+/* ================================
+   Compression
+   ================================ */
+
+const CODINGS = {
+  br: (body, done) => zlib.brotliCompress(body, {
+    params: {
+      // Quality 11 (the default) is meant for static files; 4 compresses JSON nearly as well, much faster
+      [zlib.constants.BROTLI_PARAM_QUALITY]: 4,
+      [zlib.constants.BROTLI_PARAM_SIZE_HINT]: body.length
+    }
+  }, done),
+  gzip: (body, done) => zlib.gzip(body, done)
+};
+
+// The preferred coding the client accepts ("br, gzip;q=0.8" -> "br"), or null
+function negotiateEncoding(header) {
+  const accepted = String(header || '').split(',').map((part) => {
+    const [name, ...params] = part.trim().toLowerCase().split(';');
+    const q = params.map((p) => p.trim()).find((p) => p.startsWith('q='));
+    return { name, q: q ? Number(q.slice(2)) : 1 };
+  }).filter((coding) => coding.q > 0);
+  const qualityOf = (name) => Math.max(0, ...accepted.filter((c) => c.name === name || c.name === '*').map((c) => c.q));
+  const best = Object.keys(CODINGS)
+    .map((name) => ({ name, q: qualityOf(name) }))
+    .filter((coding) => coding.q > 0)
+    .sort((a, b) => b.q - a.q)[0];
+  return best ? best.name : null;
+}
+
+function isCompressible(req, res, body, minBytes) {
+  return req.method !== 'HEAD'
+    && !res.headersSent // streamed answers (exports, static files) are written before end()
+    && res.statusCode >= 200 && res.statusCode < 300 && res.statusCode !== 204
+    && !res.getHeader('Content-Encoding')
+    && COMPRESSIBLE_TYPE.test(String(res.getHeader('Content-Type') || ''))
+    && !/no-transform/.test(String(res.getHeader('Cache-Control') || ''))
+    && body.length >= minBytes;
+}
+
+/**
+ * Express middleware compressing answers sent in one piece (res.json / res.send).
+ */
+function compressResponses({ enabled = COMPRESSION_ENABLED, minBytes = COMPRESSION_MIN_BYTES } = {}) {
+  return (req, res, next) => {
+    if (!enabled) return next();
+    const end = res.end;
+    res.end = function (chunk, encoding, callback) {
+      if (typeof encoding === 'function') {
+        callback = encoding;
+        encoding = undefined;
+      }
+      const body = typeof chunk === 'string' ? Buffer.from(chunk, encoding || 'utf8') : chunk;
+      if (!Buffer.isBuffer(body) || !isCompressible(req, res, body, minBytes)) {
+        return end.call(this, chunk, encoding, callback);
+      }
+      res.vary('Accept-Encoding');
+      const coding = negotiateEncoding(req.headers['accept-encoding']);
+      if (!coding) return end.call(this, body, callback);
+
+      CODINGS[coding](body, (err, compressed) => {
+        if (err) return end.call(this, body, callback);
+        this.setHeader('Content-Encoding', coding);
+        this.setHeader('Content-Length', compressed.length);
+        end.call(this, compressed, callback);
+      });
+      return this;
+    };
+    next();
+  };
+}
+
+module.exports = {
+  listVersion,
+  notModified,
+  compressResponses,
+  negotiateEncoding
+};
@@ -0,0 +1,335 @@
+// backend/coordination.js
+// State shared by the backend processes: the seating edit locks and a pub/sub bus (Socket.io broadcasts,
+// identity cache invalidation, message job lookups).
+//
+// A single process (`node index.js`) keeps both in memory. In cluster mode (`node cluster.js`) every worker
+// talks to the primary over the cluster IPC channel: the primary holds the locks (CoordinationHub) and
+// relays bus messages to the other workers. The worker side only relies on the LockStore and Bus methods
+// below, so a store shared by several machines (e.g. Redis) can be plugged in by implementing them and
+// returning it from createCoordination().
+//
+//   LockStore: acquire(key, holder) -> {acquired, holder, expired?}, release(key, socketId), releaseSocket(socketId), remove(keys)
+//   Bus:       publish(channel, message), subscribe(channel, handler), ask(channel, payload), answer(channel, handler)
+
+const crypto = require('crypto');
+const { Adapter } = require('socket.io-adapter');
+
+const ASK_TIMEOUT_MS = 2000;
+// A request of an existing Socket.io session: "/socket.io/?EIO=4&transport=polling&sid=w2_..." (see attach)
+const STICKY_SID = /[?&]sid=w(\d+)_/;
+const LOCK_TIMEOUT_MS = 2000;
+const LOCK_OPS = ['acquire', 'release', 'releaseSocket', 'remove'];
+
+/* ================================
+   Edit locks
+   ================================ */
+
+// One holder ({ socketId, userId, email }) per key (event id); the same user may take over their own lock
+class MemoryLockStore {
+  constructor() {
+    this.locks = new Map();
+  }
+
+  async acquire(key, holder) {
+    const current = this.locks.get(String(key));
+    if (current && current.userId !== holder.userId) return { acquired: false, holder: current };
+    this.locks.set(String(key), holder);
+    return { acquired: true, holder };
+  }
+
+  // Only the socket that took the lock can release it
+  async release(key, socketId) {
+    const current = this.locks.get(String(key));
+    if (!current || current.socketId !== socketId) return false;
+    this.locks.delete(String(key));
+    return true;
+  }
+
+  async releaseSocket(socketId) {
+    return this.releaseMatching((holder) => holder.socketId === socketId);
+  }
+
+  // The events were deleted
+  async remove(keys) {
+    keys.forEach((key) => this.locks.delete(String(key)));
+  }
+
+  releaseMatching(predicate) {
+    const released = [];
+    for (const [key, holder] of this.locks) {
+      if (predicate(holder)) {
+        this.locks.delete(key);
+        released.push(key);
+      }
+    }
+    return released;
+  }
+}
+
+/* ================================
+   Bus
+   ================================ */
+
+// A single process: there is nobody else to tell
+class LocalBus {
+  publish() {}
+  subscribe() {}
+  async ask() { return null; }
+  answer() {}
+}
+
+/* ================================
+   Cluster worker side (IPC to cluster.js)
+   ================================ */
+
+class IpcClient {
+  constructor(proc = process) {
+    this.proc = proc;
+    this.seq = 0;
+    this.pending = new Map();
+    this.subscribers = new Map();
+    this.answerers = new Map();
+    proc.on('message', (msg) => this.onMessage(msg));
+  }
+
+  request(msg, timeoutMs) {
+    const id = ++this.seq;
+    return new Promise((resolve, reject) => {
+      const timer = timeoutMs && setTimeout(() => {
+        this.pending.delete(id);
+        resolve(null);
+      }, timeoutMs);
+      this.pending.set(id, { resolve, reject, timer });
+      this.proc.send({ ...msg, id });
+    });
+  }
+
+  async onMessage(msg) {
+    if (!msg || typeof msg.type !== 'string' || !msg.type.startsWith('coord:')) return;
+    if (msg.type === 'coord:reply') {
+      const call = this.pending.get(msg.id);
+      if (!call) return;
+      this.pending.delete(msg.id);
+      clearTimeout(call.timer);
+      if (msg.error) call.reject(new Error(msg.error));
+      else call.resolve(msg.result);
+    } else if (msg.type === 'coord:message') {
+      (this.subscribers.get(msg.channel) || []).forEach((handler) => handler(msg.message));
+    } else if (msg.type === 'coord:ask') {
+      const answerer = this.answerers.get(msg.channel);
+      let result = null;
+      try {
+        result = answerer ? (await answerer(msg.payload)) ?? null : null;
+      } catch (err) {
+        console.error(`❌ Bus answer on ${msg.channel} failed:`, err.message);
+      }
+      this.proc.send({ type: 'coord:answer', id: msg.id, result });
+    }
+  }
+}
+
+// What a lock call answers when the primary does not reply in time (busy, restarting, message lost):
+// a failed acquire (expired: it may still be applied late), a release that may not have happened
+const LOCK_EXPIRED = {
+  acquire: () => ({ acquired: false, holder: null, expired: true }),
+  release: () => false,
+  releaseSocket: () => [],
+  remove: () => undefined
+};
+
+class IpcLockStore {
+  constructor(client) {
+    this.client = client;
+    LOCK_OPS.forEach((op) => {
+      this[op] = async (...args) => {
+        const result = await this.client.request({ type: 'coord:lock', op, args }, LOCK_TIMEOUT_MS);
+        return result === null ? LOCK_EXPIRED[op]() : result;
+      };
+    });
+  }
+}
+
+class IpcBus {
+  constructor(client) {
+    this.client = client;
+  }
+
+  // Delivered to every other worker (not to this one)
+  publish(channel, message) {
+    this.client.proc.send({ type: 'coord:publish', channel, message });
+  }
+
+  subscribe(channel, handler) {
+    const handlers = this.client.subscribers.get(channel) || [];
+    this.client.subscribers.set(channel, [...handlers, handler]);
+  }
+
+  // The first non-null answer of the other workers, or null
+  ask(channel, payload) {
+    return this.client.request({ type: 'coord:ask', channel, payload }, ASK_TIMEOUT_MS);
+  }
+
+  answer(channel, handler) {
+    this.client.answerers.set(channel, handler);
+  }
+}
+
+/**
+ * Socket.io adapter that also publishes every broadcast on the bus and replays the other workers'
+ * broadcasts locally, so `io.to(room).emit(...)` reaches the room's sockets on every worker.
+ * Messages go through IPC as JSON - what Socket.io would send to the browser anyway.
+ */
+function busAdapter(bus) {
+  return class BusAdapter extends Adapter {
+    constructor(nsp) {
+      super(nsp);
+      this.channel = `io:${nsp.name}`;
+      bus.subscribe(this.channel, ({ packet, rooms, except, flags }) => {
+        super.broadcast(packet, { rooms: new Set(rooms), except: new Set(except), flags });
+      });
+    }
+
+    broadcast(packet, opts) {
+      if (!opts.flags || !opts.flags.local) {
+        bus.publish(this.channel, {
+          packet,
+          rooms: [...opts.rooms],
+          except: [...(opts.except || [])],
+          flags: opts.flags
+        });
+      }
+      super.broadcast(packet, opts);
+    }
+  };
+}
+
+/* ================================
+   Setup
+   ================================ */
+
+/**
+ * The coordination of this process: in-memory for `node index.js`, over IPC for a cluster.js worker.
+ * @returns {{ clustered: boolean, workerIndex: number|null, locks, bus, runsScheduler: boolean,
+ *            attach: (io) => void, acceptConnections: (server) => void }}
+ */
+function createCoordination() {
+  const index = process.env.CLUSTER_WORKER_INDEX;
+  if (index === undefined || typeof process.send !== 'function') {
+    return {
+      clustered: false,
+      workerIndex: null,
+      locks: new MemoryLockStore(),
+      bus: new LocalBus(),
+      runsScheduler: true,
+      attach() {},
+      acceptConnections() {}
+    };
+  }
+
+  const workerIndex = Number(index);
+  const client = new IpcClient();
+  const bus = new IpcBus(client);
+  // The primary is gone (killed): nobody routes connections here anymore
+  process.on('disconnect', () => process.exit(0));
+
+  return {
+    clustered: true,
+    workerIndex,
+    locks: new IpcLockStore(client),
+    bus,
+    // Nightly reminders run once for the cluster, not once per worker
+    runsScheduler: workerIndex === 0,
+
+    attach(io) {
+      io.adapter(busAdapter(bus));
+      // Session ids start with the worker index: cluster.js routes the session's next requests here
+      io.engine.generateId = () => `w${workerIndex}_${crypto.randomBytes(15).toString('base64url')}`;
+    },
+
+    // Connections accepted by the primary arrive with the bytes it read to pick this worker
+    acceptConnections(server) {
+      // cluster.js routes a connection by its first request only. A session's polls must reach the worker
+      // holding the session, so their connection is closed after the answer and the next poll is routed
+      // again (a poll that came over a kept-alive connection of another worker fails once the same way and
+      // the client reconnects). Plain API requests can go to any worker and keep their connection alive.
+      server.prependListener('request', (req, res) => {
+        if (req.url.startsWith('/socket.io/') && STICKY_SID.test(req.url)) res.setHeader('Connection', 'close');
+      });
+      process.on('message', (msg, connection) => {
+        if (!msg || msg.type !== 'sticky:connection' || !connection) return;
+        server.emit('connection', connection);
+        connection.unshift(Buffer.from(msg.head, 'base64'));
+        connection.resume();
+      });
+      process.send({ type: 'worker:ready', index: workerIndex });
+    }
+  };
+}
+
+/* ================================
+   Cluster primary side
+   ================================ */
+
+/**
+ * Serves the workers' lock calls and relays their bus messages (run by cluster.js).
+ * @param {() => import('cluster').Worker[]} listWorkers - the connected workers
+ */
+class CoordinationHub {
+  constructor(listWorkers) {
+    this.listWorkers = listWorkers;
+    this.locks = new MemoryLockStore();
+    this.asks = new Map();
+    this.seq = 0;
+  }
+
+  others(worker) {
+    return this.listWorkers().filter((w) => w.id !== worker.id && w.isConnected());
+  }
+
+  async handle(worker, msg) {
+    if (!msg || typeof msg.type !== 'string') return;
+    if (msg.type === 'coord:lock') {
+      if (!LOCK_OPS.includes(msg.op)) return worker.send({ type: 'coord:reply', id: msg.id, error: `Unknown op ${msg.op}` });
+      const args = [...msg.args];
+      // Remember the worker holding the lock, to release it if the worker dies
+      if (msg.op === 'acquire') args[1] = { ...args[1], worker: worker.id };
+      const result = await this.locks[msg.op](...args);
+      if (worker.isConnected()) worker.send({ type: 'coord:reply', id: msg.id, result });
+    } else if (msg.type === 'coord:publish') {
+      this.others(worker).forEach((w) => w.send({ type: 'coord:message', channel: msg.channel, message: msg.message }));
+    } else if (msg.type === 'coord:ask') {
+      const others = this.others(worker);
+      if (others.length === 0) return worker.send({ type: 'coord:reply', id: msg.id, result: null });
+      const id = ++this.seq;
+      this.asks.set(id, { worker, replyId: msg.id, waiting: new Set(others.map((w) => w.id)) });
+      others.forEach((w) => w.send({ type: 'coord:ask', id, channel: msg.channel, payload: msg.payload }));
+    } else if (msg.type === 'coord:answer') {
+      this.answered(msg.id, worker.id, msg.result);
+    }
+  }
+
+  answered(id, workerId, result) {
+    const ask = this.asks.get(id);
+    if (!ask) return;
+    ask.waiting.delete(workerId);
+    if (result === null && ask.waiting.size > 0) return;
+    this.asks.delete(id);
+    if (ask.worker.isConnected()) ask.worker.send({ type: 'coord:reply', id: ask.replyId, result });
+  }
+
+  // A dead worker's sockets are gone: free their locks and stop waiting for its answers
+  workerExited(worker) {
+    const released = this.locks.releaseMatching((holder) => holder.worker === worker.id);
+    if (released.length > 0) console.log(`🔓 Released ${released.length} edit locks of worker ${worker.id}`);
+    [...this.asks.keys()].forEach((id) => this.answered(id, worker.id, null));
+  }
+}
+
+module.exports = {
+  createCoordination,
+  CoordinationHub,
+  MemoryLockStore,
+  LocalBus,
+  busAdapter,
+  STICKY_SID
+};
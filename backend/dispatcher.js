@@ -0,0 +1,209 @@
+// backend/dispatcher.js
+// Background SMS dispatch for the RSVP invitations.
+//
+// POST /api/messages/send only creates a job; the messages are sent here by a bounded pool of workers,
+// paced by a token bucket (the provider's rate limit) and retried with backoff on transient errors.
+// Jobs live in memory and are polled with GET /api/messages/jobs/:jobId.
+
+const crypto = require('crypto');
+
+const DISPATCH_CONCURRENCY = Number(process.env.SMS_CONCURRENCY) || 10;
+const DISPATCH_RATE_PER_SEC = Number(process.env.SMS_RATE_PER_SEC) || 10;
+const MAX_RETRIES = Number(process.env.SMS_MAX_RETRIES ?? 3);
+const RETRY_BASE_MS = Number(process.env.SMS_RETRY_BASE_MS) || 500;
+const JOB_TTL_MS = 60 * 60 * 1000; // finished jobs are kept for an hour
+const MAX_REPORTED_FAILURES = 100;
+
+/* ================================
+   Providers
+   ================================ */
+
+// 429 / 5xx / network errors are worth another try; anything else (bad number, auth) is final
+function isTransient(err) {
+  const status = err.status ?? err.statusCode;
+  if (status) return status === 429 || status >= 500;
+  return ['ECONNRESET', 'ECONNREFUSED', 'ETIMEDOUT', 'EAI_AGAIN', 'UND_ERR_SOCKET'].includes(err.code ?? err.cause?.code);
+}
+
+function twilioProvider() {
+  const twilio = require('twilio');
+  const client = twilio(process.env.TWILIO_ACCOUNT_SID, process.env.TWILIO_AUTH_TOKEN);
+  return {
+    name: 'twilio',
+    send: ({ to, body }) => client.messages.create({ from: process.env.TWILIO_SMS_FROM, to, body })
+  };
+}
+
+// Any HTTP endpoint accepting { from, to, body } - used for the local fake provider in tests
+function httpProvider(url) {
+  return {
+    name: 'http',
+    send: async ({ to, body }) => {
+      const response = await fetch(url, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ from: process.env.TWILIO_SMS_FROM || 'wedding-planner', to, body })
+      });
+      if (!response.ok) {
+        const err = new Error(`SMS provider answered ${response.status}`);
+        err.status = response.status;
+        throw err;
+      }
+    }
+  };
+}
+
+function consoleProvider() {
+  return {
+    name: 'dev',
+    send: async ({ to, body }) => console.log('📩 [DEV SEND] to:', to, 'text:', body)
+  };
+}
+
+function createProvider() {
+  if (process.env.SMS_PROVIDER_URL) return httpProvider(process.env.SMS_PROVIDER_URL);
+
+  const hasTwilio =
+    process.env.TWILIO_ACCOUNT_SID &&
+    process.env.TWILIO_AUTH_TOKEN &&
+    process.env.TWILIO_SMS_FROM;
+  if (hasTwilio) {
+    try {
+      return twilioProvider();
+    } catch (e) {
+      console.error('⚠️ Twilio client could not be created, messages will only be logged:', e.message);
+    }
+  }
+  return consoleProvider();
+}
+
+/* ================================
+   Rate limiting
+   ================================ */
+
+class TokenBucket {
+  constructor(ratePerSec, burst = ratePerSec) {
+    this.ratePerSec = ratePerSec;
+    this.capacity = Math.max(1, burst);
+    this.tokens = this.capacity;
+    this.updatedAt = Date.now();
+  }
+
+  // Resolves when a send is allowed
+  async take() {
+    for (;;) {
+      const now = Date.now();
+      this.tokens = Math.min(this.capacity, this.tokens + ((now - this.updatedAt) / 1000) * this.ratePerSec);
+      this.updatedAt = now;
+      if (this.tokens >= 1) {
+        this.tokens -= 1;
+        return;
+      }
+      await new Promise((resolve) => setTimeout(resolve, ((1 - this.tokens) / this.ratePerSec) * 1000));
+    }
+  }
+}
+
+/* ================================
+   Dispatcher
+   ================================ */
+
+class Dispatcher {
+  constructor({
+    provider = null, // created with the first message, so the SMS client (twilio) is not loaded at boot
+    concurrency = DISPATCH_CONCURRENCY,
+    ratePerSec = DISPATCH_RATE_PER_SEC,
+    maxRetries = MAX_RETRIES,
+    retryBaseMs = RETRY_BASE_MS
+  } = {}) {
+    this.provider = provider;
+    this.concurrency = concurrency;
+    this.bucket = new TokenBucket(ratePerSec);
+    this.maxRetries = maxRetries;
+    this.retryBaseMs = retryBaseMs;
+    this.jobs = new Map();
+    this.queue = [];
+    this.active = 0;
+  }
+
+  /**
+   * Queues one message per recipient and returns the job right away.
+   * @param {{to: string, body: string}[]} messages
+   * @param {object} meta - extra fields returned with the job (link, mode, eventTitle...)
+   */
+  createJob(messages, { skipped = 0, ...meta } = {}) {
+    this.pruneJobs();
+    const job = {
+      id: crypto.randomUUID(),
+      status: messages.length > 0 ? 'running' : 'done',
+      total: messages.length + skipped,
+      sent: 0,
+      skipped,
+      failed: 0,
+      retries: 0,
+      failures: [],
+      createdAt: new Date(),
+      finishedAt: messages.length > 0 ? null : new Date(),
+      ...meta
+    };
+    this.jobs.set(job.id, job);
+    messages.forEach((message) => this.queue.push({ job, message, attempt: 0 }));
+    this.pump();
+    return job;
+  }
+
+  getJob(id) {
+    return this.jobs.get(id) || null;
+  }
+
+  pruneJobs() {
+    const cutoff = Date.now() - JOB_TTL_MS;
+    for (const [id, job] of this.jobs) {
+      if (job.finishedAt && job.finishedAt.getTime() < cutoff) this.jobs.delete(id);
+    }
+  }
+
+  pump() {
+    while (this.active < this.concurrency && this.queue.length > 0) {
+      const task = this.queue.shift();
+      this.active++;
+      this.deliver(task).finally(() => {
+        this.active--;
+        this.pump();
+      });
+    }
+  }
+
+  async deliver(task) {
+    const { job, message } = task;
+    await this.bucket.take();
+    try {
+      if (!this.provider) this.provider = createProvider();
+      await this.provider.send(message);
+      job.sent++;
+    } catch (err) {
+      if (isTransient(err) && task.attempt < this.maxRetries) {
+        // Retry later with exponential backoff + jitter, without holding a worker slot
+        task.attempt++;
+        job.retries++;
+        const delay = this.retryBaseMs * 2 ** (task.attempt - 1) * (0.5 + Math.random());
+        setTimeout(() => {
+          this.queue.push(task);
+          this.pump();
+        }, delay);
+        return;
+      }
+      job.failed++;
+      if (job.failures.length < MAX_REPORTED_FAILURES) {
+        job.failures.push({ phone: message.to, error: err.message });
+      }
+    }
+
+    if (job.sent + job.failed + job.skipped === job.total) {
+      job.status = 'done';
+      job.finishedAt = new Date();
+    }
+  }
+}
+
+module.exports = { Dispatcher, TokenBucket, createProvider, isTransient };
@@ -0,0 +1,298 @@
+// backend/guestTransfer.js
+// Guest import (Excel/CSV -> Guest) and export (Guest -> Excel/CSV).
+//
+// Import reads the file row by row (CSV is streamed, Excel is converted in chunks),
+// writes in batches with one bulkWrite per batch, upserts by phone and reports per-row errors.
+// Export walks a cursor instead of loading the whole guest list.
+
+const fs = require('fs');
+const path = require('path');
+const { once } = require('events');
+const csv = require('csv-parser');
+const XLSX = require('xlsx');
+const { normalizePhone, guestPhoneFilter } = require('./phone');
+
+const IMPORT_BATCH_SIZE = Number(process.env.IMPORT_BATCH_SIZE) || 500;
+const SHEET_CHUNK_ROWS = 1000;
+const MAX_REPORTED_ERRORS = 100;
+
+// מילון המרה לסטטוסים
+const IMPORT_STATUS_MAP = {
+  'מגיע': 'attending', 'כן': 'attending', 'yes': 'attending',
+  'לא': 'declined', 'לא מגיע': 'declined', 'no': 'declined',
+  // "maybe" is not a stored status - such guests stay pending
+  'אולי': 'pending', 'maybe': 'pending', '?': 'pending'
+};
+
+// מילונים להמרה לעברית (ייצוא)
+const EXPORT_SIDE_MAP = { 'groom': 'צד חתן', 'bride': 'צד כלה', 'family': 'משפחה', 'friend': 'חברים' };
+const EXPORT_STATUS_MAP = { 'attending': 'מגיע', 'declined': 'לא מגיע', 'pending': 'טרם ענה', 'maybe': 'אולי' };
+const EXPORT_MEAL_MAP = { 'standard': 'רגיל', 'special': 'מיוחדת', 'veggie': 'צמחוני', 'vegan': 'טבעוני', 'kids': 'מנת ילדים' };
+
+const EXPORT_HEADERS = ['שם מלא', 'טלפון', 'אימייל', 'צד', 'כמות מוזמנים', 'סטטוס הגעה', 'סוג מנה', 'הערות'];
+
+// התאמת רוחב עמודות (כדי שיראה יפה)
+const EXPORT_COLUMN_WIDTHS = [
+  { wch: 20 }, // שם מלא
+  { wch: 15 }, // טלפון
+  { wch: 20 }, // אימייל
+  { wch: 10 }, // צד
+  { wch: 12 }, // כמות
+  { wch: 12 }, // סטטוס
+  { wch: 10 }, // מנה
+  { wch: 30 }  // הערות
+];
+
+/* ================================
+   IMPORT
+   ================================ */
+
+function isCsvFile(file) {
+  return path.extname(file.originalname || '').toLowerCase() === '.csv' || file.mimetype === 'text/csv';
+}
+
+// CSV: streamed from disk, one row at a time
+async function* readCsvRows(filePath) {
+  const parser = fs.createReadStream(filePath).pipe(csv({
+    mapHeaders: ({ header }) => header.replace(/^﻿/, '').trim()
+  }));
+  let rowNumber = 1; // row 1 is the header line
+  for await (const row of parser) {
+    rowNumber++;
+    yield { row, rowNumber };
+  }
+}
+
+// Excel: the workbook is parsed once, rows are converted to objects chunk by chunk
+async function* readSheetRows(filePath) {
+  const workbook = XLSX.readFile(filePath);
+  const sheet = workbook.Sheets[workbook.SheetNames[0]]; // לוקחים את הגיליון הראשון
+  if (!sheet || !sheet['!ref']) return;
+
+  const range = XLSX.utils.decode_range(sheet['!ref']);
+  const [headerRow = []] = XLSX.utils.sheet_to_json(sheet, {
+    header: 1,
+    range: { s: range.s, e: { r: range.s.r, c: range.e.c } }
+  });
+  const headers = headerRow.map((h) => String(h ?? '').trim());
+
+  for (let start = range.s.r + 1; start <= range.e.r; start += SHEET_CHUNK_ROWS) {
+    const end = Math.min(start + SHEET_CHUNK_ROWS - 1, range.e.r);
+    const rows = XLSX.utils.sheet_to_json(sheet, {
+      header: headers,
+      range: { s: { r: start, c: range.s.c }, e: { r: end, c: range.e.c } }
+    });
+    for (const row of rows) {
+      yield { row, rowNumber: row.__rowNum__ + 1 };
+    }
+    // Give other requests a turn between chunks
+    await new Promise((resolve) => setImmediate(resolve));
+  }
+}
+
+function readImportRows(file) {
+  return isCsvFile(file) ? readCsvRows(file.path) : readSheetRows(file.path);
+}
+
+function isBlankRow(row) {
+  return Object.values(row).every((v) => v === undefined || v === null || String(v).trim() === '');
+}
+
+// Converts one file row to guest fields, or returns { error } for invalid rows
+function parseImportRow(row) {
+  // ניקוי מפתחות (Trim) למקרה שיש רווחים בכותרות
+  const cleanRow = {};
+  Object.keys(row).forEach((key) => {
+    cleanRow[key.trim()] = row[key];
+  });
+
+  // חיפוש גמיש של שם
+  const name = cleanRow['שם'] || cleanRow['שם מלא'] || cleanRow['Name'] || cleanRow['Full Name'];
+  if (!name || !String(name).trim()) return { error: 'חסר שם' };
+
+  const phone = String(cleanRow['טלפון'] || cleanRow['נייד'] || cleanRow['Phone'] || '').trim();
+
+  // טיפול בסטטוס - אם הערך הוא בוליאני (TRUE/FALSE מאקסל), נמיר אותו
+  const statusRaw = cleanRow['סטטוס'] || cleanRow['אישור הגעה'] || cleanRow['Status'];
+  let rsvpStatus;
+  if (typeof statusRaw === 'string' && statusRaw.trim()) {
+    rsvpStatus = IMPORT_STATUS_MAP[statusRaw.trim().toLowerCase()] || 'pending';
+  } else if (statusRaw === true) {
+    rsvpStatus = 'attending';
+  }
+
+  const amountRaw = cleanRow['כמות'] || cleanRow['מספר אורחים'] || cleanRow['Amount'];
+  const amountInvited = amountRaw === undefined || amountRaw === '' ? 1 : Number(amountRaw);
+  if (!Number.isFinite(amountInvited) || amountInvited < 1) {
+    return { error: `כמות לא תקינה: ${amountRaw}` };
+  }
+
+  return {
+    guest: {
+      full_name: String(name).trim(),
+      phone, // ממיר למחרוזת למקרה שאקסל שלח מספר
+      amount_invited: amountInvited,
+      rsvp_status: rsvpStatus
+    }
+  };
+}
+
+function addRowError(report, rowNumber, message) {
+  report.failed++;
+  if (report.errors.length < MAX_REPORTED_ERRORS) {
+    report.errors.push({ row: rowNumber, message });
+  }
+}
+
+// Builds the bulkWrite operation for one guest:
+// rows with a phone upsert by phone (any stored format), rows without a phone are plain inserts.
+// bulkWrite skips the model's middleware, so phone_normalized is set here.
+function toWriteOp(eventId, guest) {
+  const { rsvp_status, ...row } = guest;
+  const fields = { ...row, phone_normalized: normalizePhone(guest.phone) };
+  const defaults = { event_id: eventId, side: 'friend', meal_option: 'standard' };
+
+  if (!guest.phone) {
+    return { insertOne: { document: { ...defaults, ...fields, rsvp_status: rsvp_status || 'pending' } } };
+  }
+
+  const set = { ...fields };
+  // A file without a status column must not reset answers that already arrived
+  if (rsvp_status) set.rsvp_status = rsvp_status;
+
+  return {
+    updateOne: {
+      filter: { event_id: eventId, ...guestPhoneFilter(guest.phone) },
+      update: { $set: set, $setOnInsert: defaults },
+      upsert: true
+    }
+  };
+}
+
+async function flushBatch(Guest, eventId, entries, report) {
+  // Within one batch the last row for a phone wins (upserts on the same phone must not race)
+  const byPhone = new Map();
+  const unique = [];
+  for (const entry of entries) {
+    const key = normalizePhone(entry.guest.phone);
+    if (!key) {
+      unique.push(entry);
+    } else {
+      if (byPhone.has(key)) report.duplicates++;
+      byPhone.set(key, entry);
+    }
+  }
+  unique.push(...byPhone.values());
+
+  const ops = unique.map(({ guest }) => toWriteOp(eventId, guest));
+  let result;
+  try {
+    result = await Guest.bulkWrite(ops, { ordered: false });
+  } catch (err) {
+    if (!err.writeErrors && !err.result) throw err;
+    result = err.result;
+    (err.writeErrors || []).forEach((writeError) => {
+      addRowError(report, unique[writeError.index].rowNumber, writeError.errmsg || 'שגיאת שמירה');
+    });
+  }
+
+  // Mongoose skips ops that fail casting/validation when ordered is false and lists them here
+  (result?.mongoose?.results || []).forEach((opResult, index) => {
+    if (opResult instanceof Error) addRowError(report, unique[index].rowNumber, opResult.message);
+  });
+
+  report.inserted += (result?.insertedCount || 0) + (result?.upsertedCount || 0);
+  report.updated += result?.matchedCount || 0;
+}
+
+/**
+ * Imports all rows of an uploaded file into the event's guest list.
+ * @returns {{ totalRows, inserted, updated, duplicates, failed, errors: {row, message}[] }}
+ */
+async function importGuests(Guest, eventId, file) {
+  const report = { totalRows: 0, inserted: 0, updated: 0, duplicates: 0, failed: 0, errors: [] };
+  let batch = [];
+
+  for await (const { row, rowNumber } of readImportRows(file)) {
+    if (isBlankRow(row)) continue;
+    report.totalRows++;
+
+    const parsed = parseImportRow(row);
+    if (parsed.error) {
+      addRowError(report, rowNumber, parsed.error);
+      continue;
+    }
+
+    batch.push({ rowNumber, guest: parsed.guest });
+    if (batch.length >= IMPORT_BATCH_SIZE) {
+      await flushBatch(Guest, eventId, batch, report);
+      batch = [];
+    }
+  }
+  if (batch.length > 0) await flushBatch(Guest, eventId, batch, report);
+
+  return report;
+}
+
+/* ================================
+   EXPORT
+   ================================ */
+
+function toExportRow(g) {
+  return [
+    g.full_name,
+    g.phone || '',
+    g.email || '',
+    EXPORT_SIDE_MAP[g.side] || 'חברים',
+    g.amount_invited || 1,
+    EXPORT_STATUS_MAP[g.rsvp_status] || 'טרם ענה',
+    EXPORT_MEAL_MAP[g.meal_option] || 'רגיל',
+    g.dietary_notes || ''
+  ];
+}
+
+function csvCell(value) {
+  const s = String(value ?? '');
+  return /[",\r\n]/.test(s) ? `"${s.replace(/"/g, '""')}"` : s;
+}
+
+// CSV export: written row by row straight from the cursor, respecting back-pressure
+async function streamGuestsCsv(res, cursor) {
+  res.setHeader('Content-Disposition', 'attachment; filename="Guests_List.csv"');
+  res.setHeader('Content-Type', 'text/csv; charset=utf-8');
+
+  // BOM so Excel opens the Hebrew text as UTF-8
+  res.write('﻿' + EXPORT_HEADERS.map(csvCell).join(',') + '\r\n');
+  for await (const guest of cursor) {
+    const line = toExportRow(guest).map(csvCell).join(',') + '\r\n';
+    if (!res.write(line)) await once(res, 'drain');
+  }
+  res.end();
+}
+
+// Excel export: rows are appended to the sheet in chunks from the cursor (no intermediate array of all guests)
+async function buildGuestsWorkbook(cursor) {
+  const workSheet = XLSX.utils.aoa_to_sheet([EXPORT_HEADERS]);
+  let chunk = [];
+  for await (const guest of cursor) {
+    chunk.push(toExportRow(guest));
+    if (chunk.length >= SHEET_CHUNK_ROWS) {
+      XLSX.utils.sheet_add_aoa(workSheet, chunk, { origin: -1 });
+      chunk = [];
+    }
+  }
+  if (chunk.length > 0) XLSX.utils.sheet_add_aoa(workSheet, chunk, { origin: -1 });
+  workSheet['!cols'] = EXPORT_COLUMN_WIDTHS;
+
+  const workBook = XLSX.utils.book_new();
+  XLSX.utils.book_append_sheet(workBook, workSheet, "רשימת מוזמנים");
+  return XLSX.write(workBook, { type: "buffer", bookType: "xlsx" });
+}
+
+module.exports = {
+  importGuests,
+  parseImportRow,
+  streamGuestsCsv,
+  buildGuestsWorkbook,
+  IMPORT_BATCH_SIZE
+};
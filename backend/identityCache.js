@@ -0,0 +1,88 @@
+// backend/identityCache.js
+// In-process cache of the identity fields the list routes need for every request
+// (email, is_partner, linked_wedding_id), so a dashboard refresh does not re-read the user each time.
+//
+// Entries expire after IDENTITY_CACHE_TTL_MS and the least recently used one is evicted when
+// IDENTITY_CACHE_MAX is reached. Routes that change a user call invalidate(userId).
+// IDENTITY_CACHE_TTL_MS=0 turns the cache off (every call goes to the loader).
+
+const IDENTITY_CACHE_TTL_MS = Number(process.env.IDENTITY_CACHE_TTL_MS ?? 60 * 1000);
+const IDENTITY_CACHE_MAX = Number(process.env.IDENTITY_CACHE_MAX) || 10000;
+
+class IdentityCache {
+  /**
+   * @param {(userId: string) => Promise<object|null>} loader - reads the identity from the database
+   */
+  constructor(loader, { ttlMs = IDENTITY_CACHE_TTL_MS, maxEntries = IDENTITY_CACHE_MAX } = {}) {
+    this.loader = loader;
+    this.ttlMs = ttlMs;
+    this.maxEntries = maxEntries;
+    this.entries = new Map(); // Map keeps insertion order: the first key is the least recently used
+    this.pending = new Map(); // concurrent misses for the same user share one query
+    this.counters = { hits: 0, misses: 0, evictions: 0, invalidations: 0 };
+  }
+
+  async get(userId) {
+    const key = String(userId);
+    const entry = this.entries.get(key);
+    if (entry && entry.expiresAt > Date.now()) {
+      this.counters.hits++;
+      // Move to the end (most recently used)
+      this.entries.delete(key);
+      this.entries.set(key, entry);
+      return entry.value;
+    }
+    if (entry) this.entries.delete(key);
+
+    this.counters.misses++;
+    if (this.pending.has(key)) return this.pending.get(key);
+
+    const load = (async () => {
+      try {
+        const value = await this.loader(key);
+        // Unknown users are not cached - they may register a moment later
+        if (value && this.ttlMs > 0 && this.pending.get(key) === load) this.set(key, value);
+        return value;
+      } finally {
+        if (this.pending.get(key) === load) this.pending.delete(key);
+      }
+    })();
+    this.pending.set(key, load);
+    return load;
+  }
+
+  set(key, value) {
+    this.entries.delete(key);
+    this.entries.set(key, { value, expiresAt: Date.now() + this.ttlMs });
+    while (this.entries.size > this.maxEntries) {
+      this.entries.delete(this.entries.keys().next().value);
+      this.counters.evictions++;
+    }
+  }
+
+  invalidate(userId) {
+    const key = String(userId);
+    // A load started before the change must not put the old value back
+    this.pending.delete(key);
+    if (this.entries.delete(key)) this.counters.invalidations++;
+  }
+
+  clear() {
+    this.counters.invalidations += this.entries.size;
+    this.entries.clear();
+    this.pending.clear();
+  }
+
+  stats() {
+    const lookups = this.counters.hits + this.counters.misses;
+    return {
+      ...this.counters,
+      size: this.entries.size,
+      hitRate: lookups > 0 ? Number((this.counters.hits / lookups).toFixed(3)) : null,
+      ttlMs: this.ttlMs,
+      maxEntries: this.maxEntries
+    };
+  }
+}
+
+module.exports = { IdentityCache };
@@ -4,7 +4,6 @@ require('dotenv').config();
 const express = require('express');
 const cors = require('cors');
 const crypto = require('crypto');
-const nodemailer = require('nodemailer');
 const mongoose = require('mongoose');
 const bcrypt = require('bcryptjs');
 const Vendor = require('./models/Vendor');
@@ -15,13 +14,23 @@ const Task = require('./models/Task');
 const Guest = require('./models/Guest');
 const Notification = require('./models/Notification');
 const BudgetItem = require('./models/BudgetItem'); 
-const XLSX = require('xlsx'); 
 const Table = require('./models/Table');
+const { normalizePhone, guestPhoneFilter } = require('./phone');
+const { Dispatcher } = require('./dispatcher');
+const { parsePageQuery, findPage, sendPage } = require('./pagination');
+const { IdentityCache } = require('./identityCache');
+const { applySeating, autoSeat, SeatingError, SEATING_ERRORS } = require('./seating');
+const { withBudgetChange, getEventWithBudget, formatBudgetSummary } = require('./budgetSummary');
+const { listVersion, notModified, compressResponses } = require('./conditional');
+const { createCoordination } = require('./coordination');
+const { markStage, lazy, loadEagerly, startupReport } = require('./startup');
 
 // (NEW) - for serving frontend build on Render
 const path = require('path'); // (NEW)
 const fs = require('fs');     // (NEW)
 
+markStage('modules');
+
 // Helper to generate a random wedding code (e.g., "WED-X7K9")
 // Uses a mix of letters and numbers, excluding confusing characters like I, 1, 0, O.
 const generateWeddingCode = () => {
@@ -62,6 +71,11 @@ const io = new Server(server, {
 // ייצוא אובייקט ה-io (למקרה שנצטרך אותו בקבצים אחרים)
 module.exports.io = io;
 
+// נעילות ושידורים משותפים לכל התהליכים (במצב cluster.js) - ראו coordination.js
+const coordination = createCoordination();
+const { locks, bus } = coordination;
+coordination.attach(io);
+
 // CORS & Middleware
 // CORS ל-Express
 app.use(cors({
@@ -69,6 +83,8 @@ app.use(cors({
   credentials: true
 }));
 app.use(express.json());
+// דחיסת תשובות JSON (brotli/gzip לפי Accept-Encoding) - ראו conditional.js
+app.use(compressResponses());
 app.set('trust proxy', 1);
 
 // Helper function to sanitize user object
@@ -88,34 +104,31 @@ function toPublic(doc) {
   return o;
 }
 
+// Fields a client may select with ?fields= and sort by with ?sort= on the paged list routes
+const GUEST_LIST_OPTIONS = {
+  sortFields: ['created_at', 'updated_at', 'full_name'],
+  defaultSort: '-created_at',
+  fields: ['event_id', 'full_name', 'email', 'phone', 'side', 'amount_invited', 'meal_option', 'dietary_notes',
+    'rsvp_status', 'table_id', 'is_unknown', 'created_at', 'updated_at']
+};
+const TASK_LIST_OPTIONS = {
+  sortFields: ['due_date', 'created_at', 'title'],
+  defaultSort: 'due_date',
+  fields: ['user_id', 'title', 'due_date', 'is_done', 'status', 'assignee_name', 'assignee_email', 'category',
+    'collaborators_emails', 'created_at', 'updated_at']
+};
+const NOTIFICATION_LIST_OPTIONS = {
+  sortFields: ['created_at'],
+  defaultSort: '-created_at',
+  fields: ['user_id', 'message', 'type', 'is_read', 'created_at']
+};
+
+const escapeRegex = (text) => String(text).replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+
 /* ================================
    RSVP HELPERS (NEW)
    ================================ */
 
-function normalizePhone(raw) {
-  if (!raw) return '';
-  let p = String(raw).trim();
-  p = p.replace(/[^\d+]/g, ''); // keep digits and +
-  // Israel: 05X... -> +9725X...
-  if (p.startsWith('0')) p = '+972' + p.slice(1);
-  if (p.startsWith('972')) p = '+' + p;
-  return p;
-}
-
-function phoneVariants(raw) {
-  const v = new Set();
-  const a = String(raw || '').trim();
-  if (!a) return [];
-  v.add(a);
-  v.add(a.replace(/[^\d+]/g, ''));
-  const n = normalizePhone(a);
-  if (n) v.add(n);
-
-  // also try raw without + for robustness
-  if (n.startsWith('+')) v.add(n.slice(1));
-  return Array.from(v).filter(Boolean);
-}
-
 function mapMealInputToDb(meal) {
   const m = String(meal || '').trim().toLowerCase();
   if (m === 'מיוחדת' || m === 'special') return 'special';
@@ -144,6 +157,7 @@ function getPublicBaseUrl() {
 }
 
 function buildMailTransport() {
+  const nodemailer = require('nodemailer');
   // נסה להשתמש ב-Gmail אם יש פרטי התחברות
   if (process.env.GMAIL_USER && process.env.GMAIL_PASS) {
     return nodemailer.createTransport({
@@ -184,11 +198,27 @@ function buildMailTransport() {
   };
 }
 
-const mailer = buildMailTransport();
+// נבנה בשליחת המייל הראשונה (nodemailer לא נטען בעליית השרת) - ראו startup.js
+const mailer = lazy('mail', buildMailTransport);
+
+// שולח ה-SMS (תור עם מגבלת קצב ו-retries) - Twilio, ספק HTTP (SMS_PROVIDER_URL) או הדפסה לקונסול
+const dispatcher = new Dispatcher();
 
-// 🔒 משתנה לשמירת הנעילות בזיכרון (לא ב-Database)
-// מבנה: { eventId: { socketId, userId, userEmail } }
-const activeLocks = {};
+// זהות המשתמש (שותף/זוג) עבור נתיבי הרשימות - נשמרת בזיכרון עם TTL, ומתבטלת כשהמשתמש משתנה
+const identities = new IdentityCache((userId) =>
+  User.findById(userId, { email: 1, is_partner: 1, linked_wedding_id: 1 }).lean()
+);
+
+// Every process keeps its own cache: a changed user is dropped everywhere (null = everyone)
+function forgetIdentity(userId) {
+  if (userId) identities.invalidate(userId);
+  else identities.clear();
+  bus.publish('identity:invalidate', userId ? String(userId) : null);
+}
+bus.subscribe('identity:invalidate', (userId) => (userId ? identities.invalidate(userId) : identities.clear()));
+
+// 🔒 נעילות עריכה של סידורי ההושבה (לא ב-Database) - locks מ-coordination.js
+// מבנה: eventId -> { socketId, userId, email }
 
 // Socket.io - טיפול בחיבורים
 io.on('connection', (socket) => {
@@ -213,48 +243,43 @@ io.on('connection', (socket) => {
   // --- מנגנון נעילה (Locking Mechanism) ---
 
   // 1. בקשת נעילה כשנכנסים לדף העריכה
-  socket.on('request_edit_lock', ({ eventId, userId, email }) => {
-    const currentLock = activeLocks[eventId];
-
-    // אם יש נעילה, ומי שנעל הוא לא המשתמש הנוכחי
-    if (currentLock && currentLock.userId !== userId) {
-      // דחיית בקשה: האירוע נעול
-      socket.emit('lock_status', { 
-        isLocked: true, 
-        lockedBy: currentLock.email 
-      });
-    } else {
-      // אישור בקשה: נועלים את האירוע
-      activeLocks[eventId] = { socketId: socket.id, userId, email };
-      socket.emit('lock_status', { isLocked: false });
+  socket.on('request_edit_lock', async ({ eventId, userId, email }) => {
+    try {
+      // אם יש נעילה, ומי שנעל הוא לא המשתמש הנוכחי - הבקשה נדחית
+      const result = await locks.acquire(eventId, { socketId: socket.id, userId, email });
+      if (result.acquired) {
+        socket.emit('lock_status', { isLocked: false });
+      } else if (result.expired) {
+        console.error(`❌ Edit lock request for ${eventId} timed out`);
+      } else {
+        socket.emit('lock_status', {
+          isLocked: true,
+          lockedBy: result.holder.email
+        });
+      }
+    } catch (err) {
+      console.error('❌ Edit lock request failed:', err.message);
     }
   });
 
-  // 2. שחרור נעילה יזום (כשיוצאים מהדף)
+  // 2. שחרור נעילה יזום (כשיוצאים מהדף) - רק ה-Socket שנעל יכול לשחרר
   socket.on('release_edit_lock', (eventId) => {
-    const currentLock = activeLocks[eventId];
-    // משחררים רק אם ה-Socket הזה הוא זה שנעל
-    if (currentLock && currentLock.socketId === socket.id) {
-      delete activeLocks[eventId];
-    }
+    locks.release(eventId, socket.id).catch((err) => console.error('❌ Edit lock release failed:', err.message));
   });
 
   // 3. שחרור אוטומטי בעת ניתוק (סגירת טאב / נפילת אינטרנט)
-  socket.on('disconnect', () => {
+  socket.on('disconnect', async () => {
     console.log(`❌ User disconnected: ${socket.id}`);
-    
-    // מעבר על כל הנעילות ומחיקת אלו ששייכות ל-Socket שהתנתק
-    Object.keys(activeLocks).forEach((eventId) => {
-      if (activeLocks[eventId].socketId === socket.id) {
-        console.log(`🔓 Auto-unlocking event ${eventId} due to disconnect`);
-        delete activeLocks[eventId];
-      }
-    });
+    try {
+      const released = await locks.releaseSocket(socket.id);
+      released.forEach((eventId) => console.log(`🔓 Auto-unlocking event ${eventId} due to disconnect`));
+    } catch (err) {
+      console.error('❌ Edit lock release failed:', err.message);
+    }
   });
 });
 
-// --- הפעלת ה-Scheduler עם ה-IO (עבור התראות) ---
-require('./scheduler')(io); 
+// --- ה-Scheduler (התראות) מופעל אחרי החיבור ל-Mongo - ראו Server Start ---
 
 
 // ================= ROUTES =================
@@ -265,6 +290,15 @@ const healthHandler = (req, res) => {
     db: mongoose.connection?.name || null,
     state: mongoose.connection?.readyState ?? null,
     uptime: process.uptime(),
+    memory: {
+      rss: process.memoryUsage.rss(),
+      heapUsed: process.memoryUsage().heapUsed,
+    },
+    identityCache: identities.stats(),
+    // שלבי העלייה (ms מתחילת התהליך) ומודולים שנטענים בשימוש הראשון - ראו startup.js
+    startup: startupReport(),
+    worker: coordination.workerIndex,
+    pid: process.pid,
   });
 };
 app.get('/', (req, res) => res.send('Wedding Planner API is running! 🚀'));
@@ -350,6 +384,7 @@ app.post('/api/users/register', async (req, res) => {
     }
 
     const user = await User.create(userPayload);
+    forgetIdentity(user._id);
     res.status(201).json(toPublic(user));
   } catch (err) {
     if (err && err.code === 11000) {
@@ -416,7 +451,7 @@ app.post('/api/users/forgot', async (req, res) => {
         `,
       };
       
-      const result = await mailer.sendMail(mailOptions);
+      const result = await mailer().sendMail(mailOptions);
       console.log('✅ Email sent successfully to:', user.email);
       if (result && result.messageId) {
         console.log('📧 Message ID:', result.messageId);
@@ -493,6 +528,7 @@ app.put('/api/users/:id/settings', async (req, res) => {
       { new: true }
     );
     if (!user) return res.status(404).json({ message: 'User not found' });
+    forgetIdentity(id);
     
     // 🔥 Observer Trigger: עדכון כל החלונות של המשתמש
     io.to(id).emit('user_updated', toPublic(user));
@@ -573,7 +609,7 @@ app.get('/api/events', async (req, res) => {
     return res.status(400).json({ message: 'userId query param is required' });
   }
   try {
-    const requestUser = await User.findById(userId);
+    const requestUser = await identities.get(userId);
     
     // Determine which ID to search by:
     // If partner -> use the linked couple's ID
@@ -590,7 +626,11 @@ app.get('/api/events', async (req, res) => {
         $lte: new Date(end)
       };
     }
-    const events = await Event.find(filter).sort({ event_date: 1 });
+    // 304 when none of the events changed since the client's copy (conditional.js)
+    if (notModified(req, res, String(searchId), await listVersion(Event, filter))) return;
+
+    // בלי שדות התקציב: הם לא מעדכנים את updated_at (budgetSummary.js) ולכן לא נכללים ב-ETag
+    const events = await Event.find(filter).select('-budget_summary -budget_version -budget_pending').sort({ event_date: 1 });
     res.json(events.map(toPublic));
   } catch (err) {
     res.status(500).json({ message: 'Error fetching events', error: err.message });
@@ -639,7 +679,7 @@ app.delete('/api/events/:id', async (req, res) => {
     if (!deleted) return res.status(404).json({ message: 'Event not found' });
     
     // מחיקת נעילה אם קיימת
-    if (activeLocks[id]) delete activeLocks[id];
+    await locks.remove([id]);
 
     // שידור לסנכרון חלונות
     io.to(String(deleted.user_id)).emit('data_changed');
@@ -691,8 +731,11 @@ app.get('/api/tasks', async (req, res) => {
   if (!userId) return res.status(400).json({ message: 'userId required' });
 
   try {
+    // Opt-in paging/projection: ?limit=&cursor=&sort=&fields= (see pagination.js)
+    const page = parsePageQuery(req.query, TASK_LIST_OPTIONS);
+
     // Identify the requesting user
-    const requestUser = await User.findById(userId);
+    const requestUser = await identities.get(userId);
     if (!requestUser) return res.status(404).json({ message: 'User not found' });
 
     let filter = {};
@@ -721,9 +764,16 @@ app.get('/api/tasks', async (req, res) => {
       filter.status = { $ne: 'done' };
     }
 
-    const tasks = await Task.find(filter).sort({ due_date: 1, created_at: -1 });
-    res.json(tasks.map(toPublic));
+    // overdueOnly depends on the current time, so it is always answered in full
+    if (overdueOnly !== 'true'
+      && notModified(req, res, String(filter.user_id), filter.assignee_email || null, await listVersion(Task, filter))) {
+      return;
+    }
+
+    const result = await findPage(Task, filter, page, { due_date: 1, created_at: -1 });
+    sendPage(res, page, result, toPublic);
   } catch (err) {
+    if (err.status === 400) return res.status(400).json({ message: err.message });
     res.status(500).json({ message: 'Error fetching tasks', error: err.message });
   }
 });
@@ -758,10 +808,23 @@ app.put('/api/tasks/:id', async (req, res) => {
 
 app.get('/api/events/:eventId/guests', async (req, res) => {
   const { eventId } = req.params;
+  const { rsvpStatus, side, tableId, search } = req.query;
   try {
-    const guests = await Guest.find({ event_id: eventId }).sort({ created_at: -1 });
-    res.json(guests.map(toPublic));
+    // Opt-in paging/projection: ?limit=&cursor=&sort=&fields= (see pagination.js)
+    const page = parsePageQuery(req.query, GUEST_LIST_OPTIONS);
+
+    const filter = { event_id: eventId };
+    if (rsvpStatus) filter.rsvp_status = rsvpStatus;
+    if (side) filter.side = side;
+    if (tableId) filter.table_id = tableId === 'none' ? null : tableId;
+    if (search) filter.full_name = { $regex: escapeRegex(search), $options: 'i' };
+
+    if (notModified(req, res, await listVersion(Guest, filter))) return;
+
+    const result = await findPage(Guest, filter, page);
+    sendPage(res, page, result, toPublic);
   } catch (err) {
+    if (err.status === 400) return res.status(400).json({ message: err.message });
     res.status(500).json({ message: 'Error fetching guests', error: err.message });
   }
 });
@@ -800,7 +863,10 @@ app.put('/api/guests/:id', async (req, res) => {
     const updateData = {};
     if (fullName !== undefined) updateData.full_name = fullName;
     if (email !== undefined) updateData.email = email;
-    if (phone !== undefined) updateData.phone = phone;
+    if (phone !== undefined) {
+      updateData.phone = phone;
+      updateData.phone_normalized = normalizePhone(phone);
+    }
     if (side !== undefined) updateData.side = side;
     if (amountInvited !== undefined) updateData.amount_invited = amountInvited;
     if (mealOption !== undefined) updateData.meal_option = mealOption;
@@ -852,8 +918,7 @@ app.post('/api/rsvp/lookup', async (req, res) => {
     const { eventId, phone } = req.body || {};
     if (!eventId || !phone) return res.status(400).json({ message: 'eventId and phone are required' });
 
-    const variants = phoneVariants(phone);
-    const guest = await Guest.findOne({ event_id: eventId, phone: { $in: variants } });
+    const guest = await Guest.findOne({ event_id: eventId, ...guestPhoneFilter(phone) });
     if (!guest) return res.json({ found: false });
 
     return res.json({
@@ -872,7 +937,6 @@ app.post('/api/rsvp/submit', async (req, res) => {
     const { eventId, phone, fullName, status, count, side, mealOption } = req.body || {};
     if (!eventId || !phone) return res.status(400).json({ message: 'eventId and phone are required' });
 
-    const variants = phoneVariants(phone);
     const normalized = normalizePhone(phone);
 
     const finalStatus = mapStatusInputToDb(status);
@@ -882,7 +946,7 @@ app.post('/api/rsvp/submit', async (req, res) => {
     const amountInvited = Number(count || 1);
     const safeAmount = Number.isFinite(amountInvited) && amountInvited > 0 ? amountInvited : 1;
 
-    let guest = await Guest.findOne({ event_id: eventId, phone: { $in: variants } });
+    let guest = await Guest.findOne({ event_id: eventId, ...guestPhoneFilter(phone) });
 
     if (guest) {
       guest.rsvp_status = finalStatus;
@@ -943,37 +1007,13 @@ app.post('/api/messages/send', async (req, res) => {
       filter.rsvp_status = 'pending';
     }
 
-    const guests = await Guest.find(filter).lean();
+    const guests = await Guest.find(filter, { phone: 1 }).lean();
     const base = getPublicBaseUrl();
     const link = `${base}/rsvp/e/${eventId}`;
 
-    const hasTwilio =
-      process.env.TWILIO_ACCOUNT_SID &&
-      process.env.TWILIO_AUTH_TOKEN &&
-      process.env.TWILIO_SMS_FROM;
-
-    let twilioClient = null;
-    if (hasTwilio) {
-      try {
-        const twilio = require('twilio');
-        twilioClient = twilio(process.env.TWILIO_ACCOUNT_SID, process.env.TWILIO_AUTH_TOKEN);
-      } catch (e) {
-        twilioClient = null;
-      }
-    }
-
-    const results = { sent: 0, skipped: 0, failed: 0, failures: [] };
-
-    for (const g of guests) {
-      const p = normalizePhone(g.phone);
-      if (!p) {
-        results.skipped++;
-        continue;
-      }
-
-      // ✅ השם כאן הוא בדיוק מה שהקלדת (eventName) או מה-DB (event.title)
-      // בלי "חתונת" בכוח — אם אתה רוצה "חתונת X" תכתוב eventName="חתונת X"
-      const text =
+    // ✅ השם כאן הוא בדיוק מה שהקלדת (eventName) או מה-DB (event.title)
+    // בלי "חתונת" בכוח — אם אתה רוצה "חתונת X" תכתוב eventName="חתונת X"
+    const text =
 `הנכם מוזמנים ל${finalEventName} 💍
 
 נשמח לאישור הגעה דרך הקישור:
@@ -981,48 +1021,58 @@ ${link}
 
 תודה רבה ❤️`;
 
-      if (!twilioClient) {
-        console.log('📩 [DEV SEND] to:', p, 'text:', text);
-        results.sent++;
+    const messages = [];
+    let skipped = 0;
+    for (const g of guests) {
+      const p = normalizePhone(g.phone);
+      if (!p) {
+        skipped++;
         continue;
       }
-
-      try {
-        await twilioClient.messages.create({
-          from: process.env.TWILIO_SMS_FROM,
-          to: p,
-          body: text
-        });
-        results.sent++;
-      } catch (err) {
-        results.failed++;
-        results.failures.push({ phone: p, error: err.message });
-      }
+      messages.push({ to: p, body: text });
     }
 
-    return res.json({
-      ok: true,
+    // השליחה עצמה רצה ברקע - הלקוח מקבל מזהה משימה ובודק התקדמות
+    const job = dispatcher.createJob(messages, {
+      skipped,
+      eventId,
       link,
       mode: mode || 'all',
-      eventTitle: finalEventName,
-      ...results
+      eventTitle: finalEventName
     });
+
+    return res.status(202).json({ ok: true, jobId: job.id, ...job });
   } catch (err) {
     return res.status(500).json({ message: 'Error sending messages', error: err.message });
   }
 });
 
+// מצב משימת שליחה (sent / failed / skipped מתעדכנים תוך כדי)
+// במצב cluster המשימה רצה ב-worker שיצר אותה - אם היא לא כאן, שואלים את השאר
+app.get('/api/messages/jobs/:jobId', async (req, res) => {
+  const job = dispatcher.getJob(req.params.jobId) || await bus.ask('messages:job', req.params.jobId);
+  if (!job) return res.status(404).json({ message: 'Job not found' });
+  res.json({ ok: true, jobId: job.id, ...job });
+});
+bus.answer('messages:job', (jobId) => dispatcher.getJob(jobId));
+
 
 // --- Notification Routes ---
 
 app.get('/api/notifications', async (req, res) => {
-  const { userId } = req.query;
+  const { userId, includeRead } = req.query;
   if (!userId) return res.status(400).json({ message: 'userId required' });
   try {
-    const notifications = await Notification.find({ user_id: userId, is_read: false })
-      .sort({ created_at: -1 });
-    res.json(notifications.map(toPublic));
+    // Opt-in paging/projection: ?limit=&cursor=&fields= (see pagination.js)
+    const page = parsePageQuery(req.query, NOTIFICATION_LIST_OPTIONS);
+
+    const filter = { user_id: userId };
+    if (includeRead !== 'true') filter.is_read = false;
+
+    const result = await findPage(Notification, filter, page);
+    sendPage(res, page, result, toPublic);
   } catch (err) {
+    if (err.status === 400) return res.status(400).json({ message: err.message });
     res.status(500).json({ message: 'Error fetching notifications' });
   }
 });
@@ -1039,36 +1089,35 @@ app.put('/api/notifications/:id/read', async (req, res) => {
 // --- Budget Routes (Updated) ---
 
 // 1. שליפת נתונים + התקציב שהוגדר
+// הסיכומים (סה"כ, שולם, גרף לפי קטגוריה) נשמרים על האירוע ומתעדכנים בכל שינוי הוצאה - ראו budgetSummary.js
+// ?items=false מחזיר רק את הסיכומים (בלי רשימת ההוצאות)
 app.get('/api/events/:eventId/budget', async (req, res) => {
   const { eventId } = req.params;
   try {
-    const event = await Event.findById(eventId); // שליפת האירוע כדי לקבל את התקציב
+    // The answer depends on the event (limit), on its expenses and on the stored summary. An expense write saves
+    // the item before it updates the summary (without touching updated_at): budget_version/budget_pending
+    // tell the two steps apart, so an answer read in between never stays valid once the write is done
+    const [eventVersion, itemsVersion, budgetState] = await Promise.all([
+      listVersion(Event, { _id: eventId }),
+      listVersion(BudgetItem, { event_id: eventId }),
+      Event.findById(eventId, { budget_version: 1, budget_pending: 1, _id: 0 }).lean()
+    ]);
+    const summaryVersion = budgetState
+      ? `${budgetState.budget_version || 0}:${(budgetState.budget_pending || []).length}`
+      : null;
+    if (notModified(req, res, eventVersion, itemsVersion, summaryVersion)) return;
+
+    const [event, items] = await Promise.all([
+      getEventWithBudget(eventId),
+      req.query.items === 'false' ? null : BudgetItem.find({ event_id: eventId }).sort({ created_at: -1 }).lean()
+    ]);
     if (!event) return res.status(404).json({ message: 'Event not found' });
 
-    const items = await BudgetItem.find({ event_id: eventId }).sort({ created_at: -1 });
-    
-    // חישובים
-    const totalExpenses = items.reduce((acc, item) => acc + item.amount, 0);
-    const totalPaid = items.reduce((acc, item) => acc + (item.is_paid ? item.amount : (item.paid_amount || 0)), 0);
-    const budgetLimit = event.total_budget || 0;
-    const remaining = budgetLimit - totalExpenses;
-
-    // דאטה לגרף
-    const categoryMap = {};
-    items.forEach(item => {
-      if (!categoryMap[item.category]) categoryMap[item.category] = 0;
-      categoryMap[item.category] += item.amount;
-    });
-    
-    const chartData = Object.keys(categoryMap).map(key => ({
-      name: key,
-      value: categoryMap[key]
-    }));
-
+    const { budgetLimit, summary, chartData } = formatBudgetSummary(event);
     res.json({
       budgetLimit, // התקציב שהוגדר מראש
-      items: items.map(toPublic),
-      summary: { totalExpenses, totalPaid, remaining },
+      ...(items && { items: items.map(toPublic) }),
+      summary,
       chartData
     });
   } catch (err) {
@@ -1098,15 +1147,18 @@ app.post('/api/budget', async (req, res) => {
   }
 
   try {
-    const newItem = await BudgetItem.create({
-      event_id: eventId,
-      title,
-      amount: Number(amount),
-      category: category || 'Other',
-      is_paid: isPaid || false
-    });
+    const { after: newItem } = await withBudgetChange(eventId, async () => ({
+      before: null,
+      after: await BudgetItem.create({
+        event_id: eventId,
+        title,
+        amount: Number(amount),
+        category: category || 'Other',
+        is_paid: isPaid || false
+      })
+    }));
 
-    const event = await Event.findById(eventId);
+    const event = await Event.findById(eventId, { user_id: 1 }).lean();
     if (event) io.to(String(event.user_id)).emit('data_changed');
 
     res.status(201).json(toPublic(newItem));
@@ -1119,9 +1171,13 @@ app.post('/api/budget', async (req, res) => {
 // 4. מחיקת הוצאה
 app.delete('/api/budget/:id', async (req, res) => {
   try {
-    const deleted = await BudgetItem.findByIdAndDelete(req.params.id);
+    // event_id לא משתנה - נדרש לפני המחיקה כדי לסמן את הסיכום של האירוע
+    const item = await BudgetItem.findById(req.params.id, { event_id: 1 }).lean();
+    const { before: deleted } = item
+      ? await withBudgetChange(item.event_id, async () => ({ before: await BudgetItem.findByIdAndDelete(req.params.id), after: null }))
+      : {};
     if(deleted) {
-        const event = await Event.findById(deleted.event_id);
+        const event = await Event.findById(deleted.event_id, { user_id: 1 }).lean();
         if (event) io.to(String(event.user_id)).emit('data_changed');
     }
     res.json({ message: 'Deleted' });
@@ -1130,73 +1186,61 @@ app.delete('/api/budget/:id', async (req, res) => {
   }
 });
 
-// 5. עדכון סטטוס תשלום
+// 5. עדכון הוצאה (סטטוס תשלום, סכום...)
+const BUDGET_ITEM_FIELDS = ['title', 'vendor', 'amount', 'category', 'is_paid', 'notes', 'due_date'];
+
 app.put('/api/budget/:id', async (req, res) => {
+    const update = {};
+    BUDGET_ITEM_FIELDS.forEach((field) => {
+        if (req.body[field] !== undefined) update[field] = req.body[field];
+    });
     try {
-        const updated = await BudgetItem.findByIdAndUpdate(req.params.id, req.body, { new: true });
-        const event = await Event.findById(updated.event_id);
+        const item = await BudgetItem.findById(req.params.id, { event_id: 1 }).lean();
+        if (!item) return res.status(404).json({ message: 'Item not found' });
+
+        // המסמך שלפני העדכון (אטומי) + אותו עדכון עליו = ההפרש המדויק לסיכומים, גם בעריכות מקבילות
+        const { before } = await withBudgetChange(item.event_id, async () => {
+            const old = await BudgetItem.findByIdAndUpdate(req.params.id, update, { new: false, runValidators: true });
+            if (!old) return null;
+            const updated = BudgetItem.hydrate(old.toObject());
+            updated.set(update);
+            return { before: old, after: updated };
+        });
+        if (!before) return res.status(404).json({ message: 'Item not found' });
+
+        const event = await Event.findById(before.event_id, { user_id: 1 }).lean();
         if (event) io.to(String(event.user_id)).emit('data_changed');
-        res.json(toPublic(updated));
+        // נקרא מחדש: updated_at (ושדות שנקבעו בשמירה) כפי שנשמרו
+        res.json(toPublic((await BudgetItem.findById(req.params.id)) || before));
     } catch(err) {
         res.status(500).json({ message: 'Error updating' });
     }
 });
 
-// --- ייבוא ספריות לטיפול בקבצים ---
-const multer = require('multer');
-const csv = require('csv-parser');
-const { Parser } = require('json2csv');
-const upload = multer({ dest: 'uploads/' }); // תיקייה זמנית לקבצים
+// --- ספריות לטיפול בקבצים (xlsx, csv, multer) - נטענות בשימוש הראשון ---
+const guestTransfer = lazy('guestTransfer', () => require('./guestTransfer'));
+const upload = lazy('upload', () => require('multer')({ dest: 'uploads/' })); // תיקייה זמנית לקבצים
+const uploadFile = (field) => (req, res, next) => upload().single(field)(req, res, next);
 
 // --- Guest Import/Export Routes ---
 
-// 1. ייצוא לאקסל אמיתי (XLSX) - תומך בעברית מושלם
+// 1. ייצוא לאקסל אמיתי (XLSX) - תומך בעברית מושלם. ?format=csv מחזיר CSV בסטרימינג
 app.get('/api/events/:eventId/guests/export', async (req, res) => {
   try {
-    const guests = await Guest.find({ event_id: req.params.eventId }).lean();
-    
-    if (guests.length === 0) {
+    const filter = { event_id: req.params.eventId };
+    if (!(await Guest.exists(filter))) {
         return res.status(400).send('אין מוזמנים לייצוא');
     }
 
-    // מילונים להמרה לעברית
-    const sideMap = { 'groom': 'צד חתן', 'bride': 'צד כלה', 'family': 'משפחה', 'friend': 'חברים' };
-    const statusMap = { 'attending': 'מגיע', 'declined': 'לא מגיע', 'pending': 'טרם ענה', 'maybe': 'אולי' };
-    const mealMap = { 'standard': 'רגיל', 'special': 'מיוחדת', 'veggie': 'צמחוני', 'vegan': 'טבעוני', 'kids': 'מנת ילדים' };
-
-    // עיצוב הנתונים לפורמט של אקסל
-    const excelData = guests.map(g => ({
-        'שם מלא': g.full_name,
-        'טלפון': g.phone || '',
-        'אימייל': g.email || '',
-        'צד': sideMap[g.side] || 'חברים',
-        'כמות מוזמנים': g.amount_invited || 1,
-        'סטטוס הגעה': statusMap[g.rsvp_status] || 'טרם ענה',
-        'סוג מנה': mealMap[g.meal_option] || 'רגיל',
-        'הערות': g.dietary_notes || ''
-    }));
+    // קריאה בסמן (cursor) במקום טעינת כל הרשימה לזיכרון
+    const cursor = Guest.find(filter).lean().cursor({ batchSize: 1000 });
 
-    // יצירת חוברת עבודה (Workbook) וגיליון (Worksheet)
-    const workBook = XLSX.utils.book_new();
-    const workSheet = XLSX.utils.json_to_sheet(excelData);
-
-    // התאמת רוחב עמודות אוטומטית (כדי שיראה יפה)
-    const wscols = [
-        { wch: 20 }, // שם מלא
-        { wch: 15 }, // טלפון
-        { wch: 20 }, // אימייל
-        { wch: 10 }, // צד
-        { wch: 12 }, // כמות
-        { wch: 12 }, // סטטוס
-        { wch: 10 }, // מנה
-        { wch: 30 }  // הערות
-    ];
-    workSheet['!cols'] = wscols;
-
-    XLSX.utils.book_append_sheet(workBook, workSheet, "רשימת מוזמנים");
+    if (req.query.format === 'csv') {
+        return await guestTransfer().streamGuestsCsv(res, cursor);
+    }
 
     // יצירת הקובץ בזיכרון (Buffer)
-    const buffer = XLSX.write(workBook, { type: "buffer", bookType: "xlsx" });
+    const buffer = await guestTransfer().buildGuestsWorkbook(cursor);
 
     // שליחת הקובץ לדפדפן
     res.setHeader('Content-Disposition', 'attachment; filename="Guests_List.xlsx"');
@@ -1205,13 +1249,14 @@ app.get('/api/events/:eventId/guests/export', async (req, res) => {
 
   } catch (err) {
     console.error('Export Error:', err);
+    if (res.headersSent) return res.destroy(err);
     res.status(500).send('שגיאה בייצוא הקובץ');
   }
 });
 
 // 2. ייבוא חכם (Smart Import) - תומך ב-Excel ו-CSV
-app.post('/api/events/:eventId/guests/import', upload.single('file'), async (req, res) => {
-    const results = [];
+// שורות עם טלפון שכבר קיים באירוע מעדכנות את המוזמן הקיים במקום ליצור כפילות
+app.post('/api/events/:eventId/guests/import', uploadFile('file'), async (req, res) => {
     const { eventId } = req.params;
 
     if (!req.file) return res.status(400).json({ message: 'לא נבחר קובץ' });
@@ -1219,73 +1264,25 @@ app.post('/api/events/:eventId/guests/import', upload.single('file'), async (req
     console.log(`📂 התקבל קובץ: ${req.file.originalname}`);
 
     try {
-        // קריאת הקובץ באמצעות ספריית XLSX (תומכת בהכל: xlsx, xls, csv)
-        const workbook = XLSX.readFile(req.file.path);
-        const sheetName = workbook.SheetNames[0]; // לוקחים את הגיליון הראשון
-        const sheet = workbook.Sheets[sheetName];
-        
-        // המרה ל-JSON שטוח (מחזיר מערך של אובייקטים)
-        const rawData = XLSX.utils.sheet_to_json(sheet);
-
-        // מילון המרה לסטטוסים
-        const statusMap = {
-            'מגיע': 'attending', 'כן': 'attending', 'yes': 'attending',
-            'לא': 'declined', 'לא מגיע': 'declined', 'no': 'declined',
-            'אולי': 'maybe', 'maybe': 'maybe', '?': 'maybe'
-        };
-
-        // עיבוד הנתונים
-        rawData.forEach(row => {
-            // ניקוי מפתחות (Trim) למקרה שיש רווחים בכותרות
-            const cleanRow = {};
-            Object.keys(row).forEach(key => {
-                cleanRow[key.trim()] = row[key];
-            });
-
-            // חיפוש גמיש של שם
-            const name = cleanRow['שם'] || cleanRow['שם מלא'] || cleanRow['Name'] || cleanRow['Full Name'];
-
-            if (name) {
-                const phone = cleanRow['טלפון'] || cleanRow['נייד'] || cleanRow['Phone'] || '';
-                
-                // טיפול בסטטוס
-                const statusRaw = cleanRow['סטטוס'] || cleanRow['אישור הגעה'] || cleanRow['Status'];
-                // אם הערך הוא בוליאני (TRUE/FALSE מאקסל), נמיר אותו
-                let rsvpStatus = 'pending';
-                if (typeof statusRaw === 'string') {
-                    rsvpStatus = statusMap[statusRaw.trim()] || 'pending';
-                } else if (statusRaw === true) {
-                    rsvpStatus = 'attending';
-                }
-
-                const amountRaw = cleanRow['כמות'] || cleanRow['מספר אורחים'] || cleanRow['Amount'];
-                const amountInvited = Number(amountRaw) || 1;
-
-                results.push({
-                    event_id: eventId,
-                    full_name: name,
-                    phone: String(phone), // ממיר למחרוזת למקרה שאקסל שלח מספר
-                    amount_invited: amountInvited,
-                    rsvp_status: rsvpStatus,
-                    side: 'friend',
-                    meal_option: 'standard'
-                });
-            }
-        });
+        const report = await guestTransfer().importGuests(Guest, eventId, req.file);
+        const count = report.inserted + report.updated;
 
-        if (results.length > 0) {
-            await Guest.insertMany(results);
+        if (count > 0) {
             const event = await Event.findById(eventId);
             if (event) io.to(String(event.user_id)).emit('data_changed');
-            
-            res.json({ message: `נטענו בהצלחה ${results.length} מוזמנים`, count: results.length });
-        } else {
-            res.json({ message: 'לא נמצאו רשומות תקינות בקובץ', count: 0 });
         }
 
+        const message = count > 0
+            ? `נטענו בהצלחה ${count} מוזמנים (${report.inserted} חדשים, ${report.updated} עודכנו)`
+            : 'לא נמצאו רשומות תקינות בקובץ';
+        res.json({ message, count, ...report });
+
     } catch (err) {
         console.error('❌ Import Error:', err);
         res.status(500).json({ message: 'שגיאה בעיבוד הקובץ', error: err.message });
+    } finally {
+        // מחיקת הקובץ הזמני
+        fs.promises.unlink(req.file.path).catch(() => {});
     }
 }); 
 
@@ -1297,6 +1294,8 @@ app.get('/api/vendors', async (req, res) => {
   if (!userId) return res.status(400).json({ message: 'userId query param is required' });
   
   try {
+    if (notModified(req, res, await listVersion(Vendor, { userId }, 'updatedAt'))) return;
+
     const vendors = await Vendor.find({ userId }).sort({ createdAt: -1 });
     res.json(vendors);
   } catch (error) {
@@ -1368,6 +1367,8 @@ app.get('/api/events/:eventId/tables', async (req, res) => {
   const { eventId } = req.params;
   try {
     // שים לב: וידאנו שהשדה הוא eventId (לפי המודל שיצרנו קודם)
+    if (notModified(req, res, await listVersion(Table, { eventId }, 'updatedAt'))) return;
+
     const tables = await Table.find({ eventId }).sort({ createdAt: 1 });
     res.json(tables);
   } catch (err) {
@@ -1391,8 +1392,8 @@ app.post('/api/tables', async (req, res) => {
 
     await newTable.save();
     
-    // שליחת עדכון לחדר
-    io.to(eventId).emit('data_changed', { type: 'TABLE_ADDED' });
+    // שליחת עדכון לחדר (המזהה מאפשר לקשר בין העדכון לשינוי שגרם לו)
+    io.to(eventId).emit('data_changed', { type: 'TABLE_ADDED', tableId: String(newTable._id) });
     
     res.status(201).json(newTable);
   } catch (err) {
@@ -1423,39 +1424,154 @@ app.delete('/api/tables/:id', async (req, res) => {
   }
 });
 
-// עדכון הושבה (גרירה)
+// שגיאות הושבה: אורח/שולחן לא קיים (404), שולחן מלא (400, code: TABLE_FULL)
+// או עדכון הושבה אחר של האירוע שלא הסתיים (503, code: SEATING_BUSY)
+const SEATING_ERROR_STATUS = { [SEATING_ERRORS.TABLE_FULL]: 400, [SEATING_ERRORS.SEATING_BUSY]: 503 };
+
+function sendSeatingError(res, err) {
+  if (!(err instanceof SeatingError)) {
+    return res.status(500).json({ message: 'Error updating seating', error: err.message });
+  }
+  const status = SEATING_ERROR_STATUS[err.code] || 404;
+  res.status(status).json({ message: err.message, code: err.code, ...err.details });
+}
+
+// עדכון הושבה (גרירה) - אורח אחד, אותה בדיקת קיבולת כמו בעדכון המרוכז
 app.put('/api/guests/:guestId/seat', async (req, res) => {
   const { guestId } = req.params;
   const { tableId } = req.body; 
 
   try {
-    const guest = await Guest.findById(guestId);
+    const guest = await Guest.findById(guestId, { event_id: 1 }).lean();
     if (!guest) return res.status(404).json({ message: 'Guest not found' });
 
-    if (tableId) {
-      const table = await Table.findById(tableId);
-      if (!table) return res.status(404).json({ message: 'Table not found' });
+    await applySeating({ Guest, Table, locks }, guest.event_id, [{ guestId, tableId: tableId || null }]);
 
-      // בדיקת קיבולת
-      const currentCount = await Guest.countDocuments({ table_id: tableId });
-      if (currentCount >= table.capacity) {
-        return res.status(400).json({ message: 'Table is full', code: 'TABLE_FULL' });
-      }
+    // 🔥 עדכון לחדר של האירוע
+    io.to(String(guest.event_id)).emit('data_changed', { type: 'SEATING_UPDATED' });
+
+    res.json(toPublic(await Guest.findById(guestId).lean()));
+  } catch (err) {
+    sendSeatingError(res, err);
+  }
+});
+
+// עדכון הושבה מרוכז: { assignments: [{ guestId, tableId | null }] } - הכל או כלום, שידור אחד
+app.put('/api/events/:eventId/seating', async (req, res) => {
+  const { eventId } = req.params;
+  const { assignments } = req.body;
+  if (!Array.isArray(assignments) || assignments.length === 0) {
+    return res.status(400).json({ message: 'assignments must be a non-empty array of { guestId, tableId }' });
+  }
+
+  try {
+    const result = await applySeating({ Guest, Table, locks }, eventId, assignments);
+    if (result.changed > 0) {
+      io.to(eventId).emit('data_changed', { type: 'SEATING_UPDATED', count: result.changed });
     }
+    res.json(result);
+  } catch (err) {
+    sendSeatingError(res, err);
+  }
+});
 
-    // עדכון
-    guest.table_id = tableId || null;
-    await guest.save();
+// הושבה אוטומטית: ממלא את השולחנות לפי צד, מספר מוזמנים וקבוצות (together / apart)
+// dryRun: true מחזיר את התוכנית בלי לשמור
+app.post('/api/events/:eventId/seating/auto', async (req, res) => {
+  const { eventId } = req.params;
+  const { dryRun, keepExisting, includeDeclined, together, apart } = req.body;
 
-    // 🔥 עדכון לחדר של האירוע
-    io.to(guest.eventId.toString()).emit('data_changed', { type: 'SEATING_UPDATED' });
+  try {
+    const [guests, tables] = await Promise.all([
+      Guest.find({ event_id: eventId }, { side: 1, amount_invited: 1, table_id: 1, rsvp_status: 1 }).lean(),
+      Table.find({ eventId }, { capacity: 1 }).sort({ createdAt: 1 }).lean()
+    ]);
+    if (tables.length === 0) return res.status(400).json({ message: 'Create tables first' });
+
+    const plan = autoSeat(guests, tables, {
+      together: Array.isArray(together) ? together : [],
+      apart: Array.isArray(apart) ? apart : [],
+      keepExisting: keepExisting !== false,
+      includeDeclined: !!includeDeclined
+    });
 
-    res.json(guest);
+    let changed = 0;
+    if (!dryRun && plan.assignments.length > 0) {
+      changed = (await applySeating({ Guest, Table, locks }, eventId, plan.assignments)).changed;
+      if (changed > 0) io.to(eventId).emit('data_changed', { type: 'SEATING_UPDATED', count: changed });
+    }
+    res.json({ dryRun: !!dryRun, changed, ...plan });
   } catch (err) {
-    res.status(500).json({ message: 'Error updating seating', error: err.message });
+    sendSeatingError(res, err);
   }
 });
 
+// איפוס הושבה - כל האורחים של האירוע חוזרים ל"לא משובצים"
+app.post('/api/events/:eventId/reset-seating', async (req, res) => {
+  const { eventId } = req.params;
+  try {
+    const result = await Guest.updateMany({ event_id: eventId, table_id: { $ne: null } }, { $set: { table_id: null } });
+    io.to(eventId).emit('data_changed', { type: 'SEATING_UPDATED', count: result.modifiedCount });
+    res.json({ changed: result.modifiedCount });
+  } catch (err) {
+    res.status(500).json({ message: 'Error resetting seating', error: err.message });
+  }
+});
+
+/* ================================
+   TEST DATA MAINTENANCE
+   ================================ */
+// Bulk seed/cleanup for the automated tests, by per-run namespace (see testData.js).
+// Only mounted when TEST_MAINTENANCE_TOKEN is set; every call must send it in X-Test-Maintenance-Token.
+
+if (process.env.TEST_MAINTENANCE_TOKEN) {
+  const { seedTestData, cleanupTestData, hasValidToken, isValidNamespace } = require('./testData');
+
+  const requireMaintenanceToken = (req, res, next) => {
+    if (!hasValidToken(req.get('X-Test-Maintenance-Token'))) {
+      return res.status(403).json({ message: 'Invalid maintenance token' });
+    }
+    next();
+  };
+
+  app.post('/api/test-data/seed', requireMaintenanceToken, async (req, res) => {
+    const { namespace, userId } = req.body;
+    if (!isValidNamespace(namespace) || !userId) {
+      return res.status(400).json({ message: 'a valid namespace (e2e-...) and userId are required' });
+    }
+    try {
+      const seeded = await seedTestData(req.body);
+      io.to(String(userId)).emit('data_changed');
+      res.status(201).json({
+        namespace,
+        events: seeded.events.map(toPublic),
+        guests: seeded.guests.map(toPublic),
+        expenses: seeded.expenses.map(toPublic),
+        tasks: seeded.tasks.map(toPublic),
+        vendors: seeded.vendors.map(toPublic)
+      });
+    } catch (err) {
+      res.status(err.status || 500).json({ message: 'Error seeding test data', error: err.message });
+    }
+  });
+
+  app.post('/api/test-data/cleanup', requireMaintenanceToken, async (req, res) => {
+    const { namespace, olderThanMinutes } = req.body;
+    if (namespace ? !isValidNamespace(namespace) : !(Number(olderThanMinutes) > 0)) {
+      return res.status(400).json({ message: 'namespace (e2e-...) or olderThanMinutes is required' });
+    }
+    try {
+      const result = await cleanupTestData({ namespace, olderThanMinutes });
+      forgetIdentity(null); // test users may have been deleted
+      await locks.remove(result.eventIds);
+      result.userIds.forEach((userId) => io.to(userId).emit('data_changed'));
+      res.json({ namespace: namespace || null, deleted: result.deleted, unseatedGuests: result.unseatedGuests });
+    } catch (err) {
+      res.status(500).json({ message: 'Error cleaning up test data', error: err.message });
+    }
+  });
+}
+
 
 /* ================================
    SERVE FRONTEND BUILD (NEW)
@@ -1477,12 +1593,29 @@ if (fs.existsSync(distPath) && fs.existsSync(distIndex)) {       // (NEW)
 
 // --- Server Start ---
 
+markStage('routes');
+loadEagerly();
+
+// מאזינים עוד לפני החיבור ל-Mongo: /api/health עונה מיד, ושאילתות ממתינות לחיבור
+if (coordination.clustered) {
+  // במצב cluster הפורט שייך ל-cluster.js, שמעביר לכאן חיבורים
+  coordination.acceptConnections(server);
+  markStage('listening');
+  console.log(`Worker ${coordination.workerIndex} (pid ${process.pid}) ready`);
+} else {
+  // שימוש ב-server.listen במקום app.listen
+  server.listen(PORT, '0.0.0.0', () => {
+    markStage('listening');
+    console.log(`Backend (Socket.io/Mongo) listening on http://0.0.0.0:${PORT}`);
+  });
+}
+
 connectMongo()
   .then(() => {
-    // שימוש ב-server.listen במקום app.listen
-    server.listen(PORT, '0.0.0.0', () => {
-      console.log(`Backend (Socket.io/Mongo) listening on http://0.0.0.0:${PORT}`);
-    });
+    markStage('mongo');
+    // התזכורות (במצב cluster רק worker אחד מריץ אותן)
+    if (coordination.runsScheduler) require('./scheduler')(io);
+    markStage('ready');
   })
   .catch((err) => {
     console.error('❌ Failed to connect Mongo:', err.message);
@@ -21,4 +21,7 @@ const BudgetItemSchema = new mongoose.Schema({
   due_date: { type: Date }
 }, { timestamps: { createdAt: 'created_at', updatedAt: 'updated_at' } });
 
+// ETag of the budget screen (conditional.js)
+BudgetItemSchema.index({ event_id: 1, updated_at: -1 });
+
 module.exports = mongoose.model('BudgetItem', BudgetItemSchema);
\ No newline at end of file
@@ -7,9 +7,17 @@ const eventSchema = new mongoose.Schema(
     event_date: { type: Date, required: true, index: true },
     description: { type: String },
     total_budget: { type: Number, default: 0 },
+    // Maintained by budgetSummary.js on every expense write (missing = rebuilt on the next budget read)
+    budget_summary: { type: mongoose.Schema.Types.Mixed },
+    budget_version: { type: Number },
+    // Expense writes in progress (a rebuild must not store while there are any); `at` tells a stale one
+    budget_pending: { type: [{ _id: false, id: String, at: Date }], default: undefined },
     is_main_event: { type: Boolean, default: false } 
   },
   { timestamps: { createdAt: 'created_at', updatedAt: 'updated_at' } }
 );
 
+// ETag of GET /api/events: newest updated_at of the couple's events
+eventSchema.index({ user_id: 1, updated_at: -1 });
+
 module.exports = mongoose.model('Event', eventSchema);
\ No newline at end of file
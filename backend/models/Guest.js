@@ -1,4 +1,5 @@
 const { mongoose } = require('../db');
+const { normalizePhone } = require('../phone');
 
 const guestSchema = new mongoose.Schema(
   {
@@ -6,6 +7,8 @@ const guestSchema = new mongoose.Schema(
     full_name: { type: String, required: true },
     email: { type: String },
     phone: { type: String },
+    // normalizePhone(phone) - RSVP lookups and import upserts match on this ('' when there is no phone)
+    phone_normalized: { type: String },
     side: { type: String, enum: ['bride', 'groom', 'friend', 'family'], default: 'friend' },
     amount_invited: { type: Number, default: 1 },
 
@@ -26,4 +29,19 @@ const guestSchema = new mongoose.Schema(
   { timestamps: { createdAt: 'created_at', updatedAt: 'updated_at' } } // זה מטפל ב-Updated_at timestamp שביקשת
 );
 
+// Paged guest lists (pagination.js) walk these indexes instead of sorting the whole event
+guestSchema.index({ event_id: 1, created_at: -1, _id: -1 });
+guestSchema.index({ event_id: 1, full_name: 1, _id: 1 });
+guestSchema.index({ event_id: 1, phone_normalized: 1 });
+
+// Conditional GET (conditional.js): the newest change and the count of the list come from this index
+guestSchema.index({ event_id: 1, updated_at: -1 });
+
+// create / save / insertMany; updates that change phone set phone_normalized themselves
+guestSchema.pre('validate', function () {
+  if (this.isModified('phone') || this.phone_normalized === undefined) {
+    this.phone_normalized = normalizePhone(this.phone);
+  }
+});
+
 module.exports = mongoose.model('Guest', guestSchema);
@@ -5,9 +5,19 @@ const notificationSchema = new mongoose.Schema(
     user_id: { type: mongoose.Schema.Types.ObjectId, ref: 'User', required: true, index: true },
     message: { type: String, required: true },
     type: { type: String, default: 'info' }, // למשל: 'reminder', 'alert'
-    is_read: { type: Boolean, default: false }
+    is_read: { type: Boolean, default: false },
+    dedupe_key: { type: String } // מזהה ייחודי לתזכורות אוטומטיות (מונע כפילויות)
   },
   { timestamps: { createdAt: 'created_at', updatedAt: 'updated_at' } }
 );
 
+// A reminder is created once per user and key; notifications without a key are not affected
+notificationSchema.index(
+  { user_id: 1, dedupe_key: 1 },
+  { unique: true, partialFilterExpression: { dedupe_key: { $exists: true } } }
+);
+
+// Unread notifications of a user, newest first (also paged - pagination.js)
+notificationSchema.index({ user_id: 1, is_read: 1, created_at: -1, _id: -1 });
+
 module.exports = mongoose.model('Notification', notificationSchema);
\ No newline at end of file
@@ -22,6 +22,9 @@ const tableSchema = new mongoose.Schema({
   }
 }, { timestamps: true });
 
+// ETag of the tables list (conditional.js)
+tableSchema.index({ eventId: 1, updatedAt: -1 });
+
 // המרה של _id ל-id בשביל הפרונט
 tableSchema.set('toJSON', {
   virtuals: true,
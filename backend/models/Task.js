@@ -21,4 +21,10 @@ const taskSchema = new mongoose.Schema(
   { timestamps: { createdAt: 'created_at', updatedAt: 'updated_at' } }
 );
 
+// Paged task lists (pagination.js), default sort by due date
+taskSchema.index({ user_id: 1, due_date: 1, _id: 1 });
+
+// ETag of GET /api/tasks (conditional.js)
+taskSchema.index({ user_id: 1, updated_at: -1 });
+
 module.exports = mongoose.model('Task', taskSchema);
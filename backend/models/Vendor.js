@@ -14,4 +14,7 @@ const vendorSchema = new mongoose.Schema({
   rating: { type: Number, default: 0, min: 0, max: 5 }
 }, { timestamps: true });
 
+// ETag of GET /api/vendors (conditional.js)
+vendorSchema.index({ userId: 1, updatedAt: -1 });
+
 module.exports = mongoose.model('Vendor', vendorSchema);
\ No newline at end of file
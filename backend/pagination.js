@@ -0,0 +1,164 @@
+// backend/pagination.js
+// Opt-in cursor (keyset) pagination and field projection for the list routes.
+//
+// A request without `limit`/`cursor` gets the full array as before. With them the answer is
+// { items, nextCursor, hasMore } and the query walks an index instead of skipping documents:
+// the cursor holds the sort value and _id of the last item of the previous page.
+//
+//   GET /api/events/:eventId/guests?limit=100&sort=-created_at&fields=full_name,phone,rsvp_status
+//   GET /api/events/:eventId/guests?limit=100&cursor=<nextCursor of the previous page>
+
+const mongoose = require('mongoose');
+
+const DEFAULT_PAGE_SIZE = 100;
+const MAX_PAGE_SIZE = 1000;
+
+class PaginationError extends Error {
+  constructor(message) {
+    super(message);
+    this.status = 400;
+  }
+}
+
+/* ================================
+   Cursor encoding
+   ================================ */
+
+function encodeCursor(sort, doc) {
+  const value = doc[sort.field];
+  const payload = {
+    s: `${sort.dir < 0 ? '-' : ''}${sort.field}`,
+    v: value instanceof Date ? value.toISOString() : value ?? null,
+    d: value instanceof Date ? 1 : 0,
+    id: String(doc._id)
+  };
+  return Buffer.from(JSON.stringify(payload)).toString('base64url');
+}
+
+function decodeCursor(cursor, sort) {
+  let payload;
+  try {
+    payload = JSON.parse(Buffer.from(String(cursor), 'base64url').toString('utf8'));
+  } catch (e) {
+    throw new PaginationError('Invalid cursor');
+  }
+  if (payload.s !== `${sort.dir < 0 ? '-' : ''}${sort.field}` || !mongoose.isValidObjectId(payload.id)) {
+    throw new PaginationError('Cursor does not match this query (sort changed?)');
+  }
+  return {
+    value: payload.v === null ? null : payload.d ? new Date(payload.v) : payload.v,
+    id: new mongoose.Types.ObjectId(payload.id)
+  };
+}
+
+// Documents after the cursor in (field, _id) order. Missing/null values sort first ascending
+// (and last descending), like MongoDB sorts them.
+function afterCursor(sort, { value, id }) {
+  const { field, dir } = sort;
+  const idAfter = { _id: dir > 0 ? { $gt: id } : { $lt: id } };
+  if (value === null) {
+    return dir > 0
+      ? { $or: [{ [field]: null, ...idAfter }, { [field]: { $ne: null } }] }
+      : { [field]: null, ...idAfter };
+  }
+  const next = [{ [field]: dir > 0 ? { $gt: value } : { $lt: value } }, { [field]: value, ...idAfter }];
+  if (dir < 0) next.push({ [field]: null });
+  return { $or: next };
+}
+
+/* ================================
+   Query parsing
+   ================================ */
+
+/**
+ * Reads limit / cursor / sort / fields from the query string.
+ *
+ * @param {object} query - req.query
+ * @param {object} options
+ * @param {string[]} options.sortFields - fields a client may sort by
+ * @param {string} options.defaultSort - e.g. '-created_at'
+ * @param {string[]} options.fields - fields a client may select (projection)
+ * @returns {{paged: boolean, limit: number, sort: {field, dir}, cursor, projection}}
+ */
+function parsePageQuery(query, { sortFields, defaultSort, fields }) {
+  const paged = query.limit !== undefined || query.cursor !== undefined;
+
+  const sortParam = String(query.sort || defaultSort);
+  const sort = { field: sortParam.replace(/^-/, ''), dir: sortParam.startsWith('-') ? -1 : 1 };
+  if (!sortFields.includes(sort.field)) {
+    throw new PaginationError(`sort must be one of: ${sortFields.join(', ')}`);
+  }
+
+  let limit = DEFAULT_PAGE_SIZE;
+  if (query.limit !== undefined) {
+    limit = Number.parseInt(query.limit, 10);
+    if (!(limit > 0)) throw new PaginationError('limit must be a positive number');
+    limit = Math.min(limit, MAX_PAGE_SIZE);
+  }
+
+  let projection = null;
+  if (query.fields) {
+    const requested = String(query.fields).split(',').map((f) => f.trim()).filter(Boolean);
+    const unknown = requested.filter((f) => !fields.includes(f));
+    if (unknown.length > 0) throw new PaginationError(`Unknown fields: ${unknown.join(', ')}`);
+    // The sort field is needed for the next cursor
+    projection = Object.fromEntries([...new Set([...requested, sort.field])].map((f) => [f, 1]));
+  }
+
+  return {
+    paged,
+    limit,
+    sort,
+    cursor: query.cursor ? decodeCursor(query.cursor, sort) : null,
+    projection
+  };
+}
+
+/**
+ * Runs the list query: lean documents, optional projection, and - when paged - one page after the cursor.
+ *
+ * @param {mongoose.Model} Model
+ * @param {object} filter
+ * @param {object} page - result of parsePageQuery
+ * @param {object} [legacySort] - sort of the unpaged answer (kept as the routes always returned it)
+ * @returns {Promise<{items: object[], nextCursor: string|null, hasMore: boolean}>}
+ */
+async function findPage(Model, filter, page, legacySort) {
+  const sortSpec = { [page.sort.field]: page.sort.dir, _id: page.sort.dir };
+
+  if (!page.paged) {
+    const items = await Model.find(filter, page.projection).sort(legacySort || sortSpec).lean();
+    return { items, nextCursor: null, hasMore: false };
+  }
+
+  const query = page.cursor ? { $and: [filter, afterCursor(page.sort, page.cursor)] } : filter;
+  // One extra document tells whether another page exists
+  const docs = await Model.find(query, page.projection).sort(sortSpec).limit(page.limit + 1).lean();
+  const hasMore = docs.length > page.limit;
+  const items = hasMore ? docs.slice(0, page.limit) : docs;
+  return {
+    items,
+    nextCursor: hasMore ? encodeCursor(page.sort, items[items.length - 1]) : null,
+    hasMore
+  };
+}
+
+/**
+ * Sends the list: the plain array for unpaged requests, { items, nextCursor, hasMore } otherwise.
+ */
+function sendPage(res, page, result, mapItem) {
+  const items = result.items.map(mapItem);
+  if (!page.paged) return res.json(items);
+  res.json({ items, nextCursor: result.nextCursor, hasMore: result.hasMore });
+}
+
+module.exports = {
+  DEFAULT_PAGE_SIZE,
+  MAX_PAGE_SIZE,
+  PaginationError,
+  parsePageQuery,
+  findPage,
+  sendPage,
+  encodeCursor,
+  decodeCursor
+};
@@ -0,0 +1,45 @@
+// backend/phone.js
+// Phone helpers shared by the RSVP routes, the guest import and the Guest model.
+
+function normalizePhone(raw) {
+  if (!raw) return '';
+  let p = String(raw).trim();
+  p = p.replace(/[^\d+]/g, ''); // keep digits and +
+  // Israel: 05X... -> +9725X...
+  if (p.startsWith('0')) p = '+972' + p.slice(1);
+  if (p.startsWith('972')) p = '+' + p;
+  return p;
+}
+
+function phoneVariants(raw) {
+  const v = new Set();
+  const a = String(raw || '').trim();
+  if (!a) return [];
+  v.add(a);
+  v.add(a.replace(/[^\d+]/g, ''));
+  const n = normalizePhone(a);
+  if (n) v.add(n);
+
+  // also try raw without + for robustness
+  if (n.startsWith('+')) v.add(n.slice(1));
+  return Array.from(v).filter(Boolean);
+}
+
+/**
+ * Query condition matching a guest by phone in any stored format.
+ * Guests carry phone_normalized (indexed with event_id); the second branch only matches guests
+ * written before that field existed and is an empty index range once
+ * scripts/backfill-guest-phones.js has run.
+ */
+function guestPhoneFilter(raw) {
+  const normalized = normalizePhone(raw);
+  if (!normalized) return { phone: { $in: phoneVariants(raw) } };
+  return {
+    $or: [
+      { phone_normalized: normalized },
+      { phone_normalized: { $exists: false }, phone: { $in: phoneVariants(raw) } }
+    ]
+  };
+}
+
+module.exports = { normalizePhone, phoneVariants, guestPhoneFilter };
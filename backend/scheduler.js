@@ -3,63 +3,156 @@ const Event = require('./models/Event');
 const Notification = require('./models/Notification');
 const User = require('./models/User');
 
+// ימים נספרים לפי אזור הזמן של השרת (כמו ה-cron)
+const REMINDER_TZ = process.env.REMINDER_TZ || Intl.DateTimeFormat().resolvedOptions().timeZone;
+const BATCH_SIZE = 1000;
+
+const reminderMessage = (title, daysBefore) => `תזכורת: האירוע "${title}" מתקיים בעוד ${daysBefore} ימים!`;
+
+// One reminder per (user, event, event day, days before) - also if the job runs twice
+const reminderKey = (eventId, eventDay, daysBefore) => `reminder:${eventId}:${eventDay}:${daysBefore}`;
+
+function startOfDay(date, offsetDays = 0) {
+  const d = new Date(date);
+  d.setDate(d.getDate() + offsetDays);
+  d.setHours(0, 0, 0, 0);
+  return d;
+}
+
+// Events whose date is exactly `notification_days` days away for their owner
+function dueRemindersPipeline(now, windowStart, windowEnd) {
+  return [
+    { $match: { event_date: { $gte: windowStart, $lt: windowEnd } } },
+    {
+      $lookup: {
+        from: User.collection.name,
+        localField: 'user_id',
+        foreignField: '_id',
+        as: 'user',
+        pipeline: [{ $project: { daysBefore: { $ifNull: ['$settings.notification_days', 1] } } }]
+      }
+    },
+    { $unwind: '$user' },
+    {
+      $match: {
+        $expr: {
+          $and: [
+            { $gte: ['$user.daysBefore', 0] },
+            { $eq: [{ $dateDiff: { startDate: now, endDate: '$event_date', unit: 'day', timezone: REMINDER_TZ } }, '$user.daysBefore'] }
+          ]
+        }
+      }
+    },
+    {
+      $project: {
+        user_id: 1,
+        title: 1,
+        daysBefore: '$user.daysBefore',
+        eventDay: { $dateToString: { format: '%Y-%m-%d', date: '$event_date', timezone: REMINDER_TZ } }
+      }
+    }
+  ];
+}
+
+// Creates the notifications of one batch; returns the ones that were actually inserted
+async function createReminders(batch) {
+  const docs = batch.map((e) => ({
+    user_id: e.user_id,
+    message: reminderMessage(e.title, e.daysBefore),
+    type: 'reminder',
+    dedupe_key: reminderKey(e._id, e.eventDay, e.daysBefore)
+  }));
+
+  // Skip reminders that were already sent - by key, or by message for notifications created before dedupe_key existed
+  const existing = await Notification.find(
+    {
+      user_id: { $in: [...new Set(docs.map((d) => String(d.user_id)))] },
+      $or: [
+        { dedupe_key: { $in: docs.map((d) => d.dedupe_key) } },
+        { dedupe_key: { $exists: false }, message: { $in: [...new Set(docs.map((d) => d.message))] } }
+      ]
+    },
+    { user_id: 1, dedupe_key: 1, message: 1 }
+  ).lean();
+  const sent = new Set(existing.flatMap((n) => [n.dedupe_key, `${n.user_id}:${n.message}`]));
+  const pending = docs.filter((d) => !sent.has(d.dedupe_key) && !sent.has(`${d.user_id}:${d.message}`));
+  if (pending.length === 0) return { created: [], skipped: docs.length };
+
+  try {
+    const created = await Notification.insertMany(pending, { ordered: false });
+    return { created, skipped: docs.length - created.length };
+  } catch (err) {
+    // A concurrent run already created some of them (unique dedupe key) - keep the rest
+    const writeErrors = err.writeErrors || [];
+    if (writeErrors.length === 0 || writeErrors.some((e) => (e.code ?? e.err?.code) !== 11000)) throw err;
+    const created = err.insertedDocs || [];
+    return { created, skipped: docs.length - created.length };
+  }
+}
+
+function notifyUsers(io, created) {
+  if (!io) return;
+  created.forEach((n) => {
+    io.to(String(n.user_id)).emit('new_notification', {
+      id: n._id,
+      message: n.message,
+      created_at: n.created_at,
+      is_read: false
+    });
+  });
+}
+
+/**
+ * One reminder run: a single aggregation finds all due reminders, notifications are inserted in batches.
+ * @returns {{ due, created, skipped, ms }}
+ */
+async function runReminders(io, now = new Date()) {
+  const started = Date.now();
+  const stats = { due: 0, created: 0, skipped: 0, ms: 0 };
+
+  // The largest notification_days bounds the date range of the event scan (uses the event_date index).
+  // The range has a day of slack on each side in case REMINDER_TZ differs from the process time zone.
+  const [maxSetting] = await User.aggregate([
+    { $group: { _id: null, maxDays: { $max: { $ifNull: ['$settings.notification_days', 1] } } } }
+  ]);
+  const maxDays = maxSetting?.maxDays ?? -1;
+  if (maxDays < 0) return stats;
+
+  const cursor = Event.aggregate(dueRemindersPipeline(now, startOfDay(now, -1), startOfDay(now, maxDays + 2)))
+    .cursor({ batchSize: BATCH_SIZE });
+
+  let batch = [];
+  const flush = async () => {
+    const { created, skipped } = await createReminders(batch);
+    stats.due += batch.length;
+    stats.created += created.length;
+    stats.skipped += skipped;
+    notifyUsers(io, created);
+    batch = [];
+  };
+
+  for await (const due of cursor) {
+    batch.push(due);
+    if (batch.length >= BATCH_SIZE) await flush();
+  }
+  if (batch.length > 0) await flush();
+
+  stats.ms = Date.now() - started;
+  return stats;
+}
+
 module.exports = (io) => {
-  // הרצת המשימה כל יום בחצות 
+  // הרצת המשימה כל יום בחצות
   cron.schedule('0 0 * * *', async () => {
     console.log('⏰ Scheduler running (Socket Mode)...');
-    
+
     try {
-      const users = await User.find({});
-
-      for (const user of users) {
-        const daysBefore = user.settings?.notification_days ?? 1;
-        if (daysBefore < 0) continue;
-
-        const targetDate = new Date();
-        targetDate.setDate(targetDate.getDate() + daysBefore);
-        
-        const startOfDay = new Date(targetDate.setHours(0, 0, 0, 0));
-        const endOfDay = new Date(targetDate.setHours(23, 59, 59, 999));
-
-        const events = await Event.find({
-          user_id: user._id,
-          event_date: { $gte: startOfDay, $lte: endOfDay }
-        });
-
-        for (const event of events) {
-          const message = `תזכורת: האירוע "${event.title}" מתקיים בעוד ${daysBefore} ימים!`;
-          
-          const exists = await Notification.findOne({
-            user_id: user._id,
-            message: message
-          });
-
-          if (!exists) {
-            const newNotification = await Notification.create({
-              user_id: user._id,
-              message: message,
-              type: 'reminder'
-            });
-            
-            console.log(`🔔 Created notification for ${user.email}`);
-            
-            // שליחה ב-Socket
-            if (io) {
-              io.to(user.id).emit('new_notification', {
-                id: newNotification._id,
-                message: newNotification.message,
-                created_at: newNotification.created_at,
-                is_read: false
-              });
-              console.log(`📡 Sent socket to user ${user.id}`);
-            } else {
-                console.log('⚠️ IO object is missing!');
-            }
-          }
-        }
-      }
+      const stats = await runReminders(io);
+      console.log(`🔔 Reminders: ${stats.created} created, ${stats.skipped} already sent (${stats.ms}ms)`);
     } catch (err) {
       console.error('❌ Scheduler error:', err);
     }
   });
-};
\ No newline at end of file
+};
+
+module.exports.runReminders = runReminders;
@@ -0,0 +1,51 @@
+// backend/scripts/backfill-guest-phones.js
+// Fills Guest.phone_normalized for guests written before the field existed and builds the
+// (event_id, phone_normalized) index. Safe to run again: only guests without the field are touched,
+// unless --all re-normalizes everyone (after a change to normalizePhone).
+// Usage: node scripts/backfill-guest-phones.js [--all] [--batch 1000]
+
+const { connectMongo, mongoose } = require('../db');
+const Guest = require('../models/Guest');
+const { normalizePhone } = require('../phone');
+
+async function main() {
+  const all = process.argv.includes('--all');
+  const batchArg = process.argv.indexOf('--batch');
+  const batchSize = batchArg > -1 ? Number(process.argv[batchArg + 1]) : 1000;
+  if (!Number.isInteger(batchSize) || batchSize <= 0) throw new Error('Invalid --batch size');
+
+  await connectMongo();
+  const started = Date.now();
+  const stats = { scanned: 0, updated: 0 };
+
+  const filter = all ? {} : { phone_normalized: { $exists: false } };
+  const cursor = Guest.find(filter, { phone: 1, phone_normalized: 1 }).lean().cursor({ batchSize });
+  let ops = [];
+  const flush = async () => {
+    if (ops.length === 0) return;
+    const result = await Guest.bulkWrite(ops, { ordered: false });
+    stats.updated += result.modifiedCount;
+    ops = [];
+  };
+
+  for await (const guest of cursor) {
+    stats.scanned++;
+    const normalized = normalizePhone(guest.phone);
+    if (guest.phone_normalized === normalized) continue;
+    ops.push({ updateOne: { filter: { _id: guest._id }, update: { $set: { phone_normalized: normalized } } } });
+    if (ops.length >= batchSize) await flush();
+  }
+  await flush();
+
+  // The lookup index (a no-op when it already exists)
+  await Guest.createIndexes();
+
+  console.log(JSON.stringify({ ...stats, ms: Date.now() - started }));
+}
+
+main()
+  .catch((err) => {
+    console.error('❌ Phone backfill failed:', err);
+    process.exitCode = 1;
+  })
+  .finally(() => mongoose.disconnect());
@@ -0,0 +1,26 @@
+// backend/scripts/run-reminders.js
+// Runs the nightly reminder job once and prints its stats as JSON (no Socket.io - nothing is pushed to clients).
+// Usage: node scripts/run-reminders.js [--now 2030-05-31T00:00:00]
+
+const { connectMongo, mongoose } = require('../db');
+const { runReminders } = require('../scheduler');
+
+async function main() {
+  const nowArg = process.argv.indexOf('--now');
+  const now = nowArg > -1 ? new Date(process.argv[nowArg + 1]) : new Date();
+  if (Number.isNaN(now.getTime())) throw new Error('Invalid --now date');
+
+  await connectMongo();
+  // Make sure the dedupe index exists before the first run on a new database
+  await require('../models/Notification').init();
+
+  const stats = await runReminders(null, now);
+  console.log(JSON.stringify(stats));
+}
+
+main()
+  .catch((err) => {
+    console.error('❌ Reminder run failed:', err);
+    process.exitCode = 1;
+  })
+  .finally(() => mongoose.disconnect());
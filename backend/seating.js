@@ -0,0 +1,274 @@
+// backend/seating.js
+// Bulk seating and automatic table assignment.
+//
+// A table's capacity counts seats: a guest takes amount_invited seats (like the seating screen shows).
+// applySeating() validates a whole set of moves against the tables' capacity with a fixed number of
+// queries (moved guests, target tables, current seat usage) and writes them with one bulkWrite -
+// either every move is applied or none. Moves of the same event are serialized in this process, and across
+// the cluster workers by a per-event write lock in the shared lock store (coordination.js).
+// autoSeat() plans assignments for the unseated guests (first-fit decreasing, grouped by side).
+
+const crypto = require('crypto');
+
+const SEATING_ERRORS = {
+  TABLE_FULL: 'TABLE_FULL',
+  UNKNOWN_GUEST: 'UNKNOWN_GUEST',
+  UNKNOWN_TABLE: 'UNKNOWN_TABLE',
+  SEATING_BUSY: 'SEATING_BUSY'
+};
+
+const WRITE_LOCK_WAIT_MS = 10000;
+const WRITE_LOCK_RETRY_MS = 20;
+
+class SeatingError extends Error {
+  constructor(message, code, details = {}) {
+    super(message);
+    this.code = code;
+    this.details = details;
+  }
+}
+
+const seatsOf = (guest) => (guest.amount_invited > 0 ? guest.amount_invited : 1);
+
+/* ================================
+   Per-event serialization
+   ================================ */
+
+const eventQueues = new Map();
+
+// Runs fn after every earlier seating write of the same event finished (validation + write are not interleaved)
+function withEventQueue(eventId, fn) {
+  const key = String(eventId);
+  const previous = eventQueues.get(key) || Promise.resolve();
+  const run = previous.catch(() => {}).then(fn);
+  const tail = run.catch(() => {});
+  eventQueues.set(key, tail);
+  tail.then(() => {
+    if (eventQueues.get(key) === tail) eventQueues.delete(key);
+  });
+  return run;
+}
+
+/**
+ * Runs fn holding the event's seating write lock in `locks` (a coordination.js LockStore), so workers of a
+ * cluster do not validate capacity and write at the same time. The holder is a one-off token: unlike the
+ * seating screen's edit lock, the same user never takes it over.
+ */
+async function withWriteLock(locks, eventId, fn) {
+  if (!locks) return fn();
+  const key = `seating-write:${eventId}`;
+  const token = crypto.randomUUID();
+  const deadline = Date.now() + WRITE_LOCK_WAIT_MS;
+  for (;;) {
+    const result = await locks.acquire(key, { socketId: token, userId: token });
+    if (result.acquired) break;
+    // No answer in time: the acquire may still be applied after it - drop it again (only this token can)
+    if (result.expired) await locks.release(key, token);
+    if (Date.now() > deadline) {
+      throw new SeatingError('Seating is being updated, try again', SEATING_ERRORS.SEATING_BUSY);
+    }
+    await new Promise((resolve) => setTimeout(resolve, WRITE_LOCK_RETRY_MS));
+  }
+  try {
+    return await fn();
+  } finally {
+    await locks.release(key, token);
+  }
+}
+
+/* ================================
+   Bulk apply
+   ================================ */
+
+/**
+ * Seats (or unseats, tableId null) many guests of one event at once.
+ *
+ * @param {{Guest, Table, locks?}} models - locks: the shared LockStore (serializes the event's writes across workers)
+ * @param {string} eventId
+ * @param {{guestId: string, tableId: string|null}[]} assignments - the last one wins for a repeated guest
+ * @returns {Promise<{changed: number, tables: {tableId, seats, capacity}[]}>}
+ * @throws {SeatingError} unknown guest/table (nothing written) or a table over capacity (nothing written)
+ */
+function applySeating({ Guest, Table, locks }, eventId, assignments) {
+  return withEventQueue(eventId, () => withWriteLock(locks, eventId, async () => {
+    const targetOf = new Map(assignments.map((a) => [String(a.guestId), a.tableId ? String(a.tableId) : null]));
+    const guestIds = [...targetOf.keys()];
+    const targetTableIds = [...new Set([...targetOf.values()].filter(Boolean))];
+
+    const [guests, tables] = await Promise.all([
+      Guest.find({ _id: { $in: guestIds }, event_id: eventId }, { table_id: 1, amount_invited: 1 }).lean(),
+      Table.find({ _id: { $in: targetTableIds }, eventId }, { name: 1, capacity: 1 }).lean()
+    ]);
+
+    const unknownGuests = guestIds.filter((id) => !guests.some((g) => String(g._id) === id));
+    if (unknownGuests.length > 0) {
+      throw new SeatingError('Guest not found', SEATING_ERRORS.UNKNOWN_GUEST, { unknownGuests });
+    }
+    const unknownTables = targetTableIds.filter((id) => !tables.some((t) => String(t._id) === id));
+    if (unknownTables.length > 0) {
+      throw new SeatingError('Table not found', SEATING_ERRORS.UNKNOWN_TABLE, { unknownTables });
+    }
+
+    // Seats in use on the target tables right now, then the effect of the moves
+    const usage = await Guest.aggregate([
+      { $match: { table_id: { $in: tables.map((t) => t._id) } } },
+      { $group: { _id: '$table_id', seats: { $sum: { $cond: [{ $gt: ['$amount_invited', 0] }, '$amount_invited', 1] } } } }
+    ]);
+    const seats = new Map(usage.map((u) => [String(u._id), u.seats]));
+    const moves = guests.filter((g) => String(g.table_id || '') !== String(targetOf.get(String(g._id)) || ''));
+    for (const guest of moves) {
+      const from = guest.table_id ? String(guest.table_id) : null;
+      const to = targetOf.get(String(guest._id));
+      if (from && seats.has(from)) seats.set(from, seats.get(from) - seatsOf(guest));
+      if (to) seats.set(to, (seats.get(to) || 0) + seatsOf(guest));
+    }
+
+    const tableStates = tables.map((t) => ({
+      tableId: String(t._id), name: t.name, seats: seats.get(String(t._id)) || 0, capacity: t.capacity
+    }));
+    const overCapacity = tableStates.filter((t) => t.seats > t.capacity);
+    if (overCapacity.length > 0) {
+      throw new SeatingError('Table is full', SEATING_ERRORS.TABLE_FULL, { overCapacity });
+    }
+
+    if (moves.length > 0) {
+      await Guest.bulkWrite(moves.map((g) => ({
+        updateOne: { filter: { _id: g._id }, update: { $set: { table_id: targetOf.get(String(g._id)) } } }
+      })), { ordered: true });
+    }
+    return { changed: moves.length, tables: tableStates };
+  }));
+}
+
+/* ================================
+   Auto-seat solver
+   ================================ */
+
+function unionFind(ids) {
+  const parent = new Map(ids.map((id) => [id, id]));
+  const find = (id) => {
+    while (parent.get(id) !== id) {
+      parent.set(id, parent.get(parent.get(id)));
+      id = parent.get(id);
+    }
+    return id;
+  };
+  const union = (a, b) => parent.set(find(a), find(b));
+  return { find, union };
+}
+
+/**
+ * Plans table assignments for the guests that are not seated yet.
+ *
+ * Guests of a `together` group are placed as one unit (all at the same table); guests of an `apart`
+ * pair never share a table. Units are placed largest first, each on the fitting table that already
+ * hosts its side with the least seats left over (best fit), otherwise on the emptiest table.
+ *
+ * @param {object[]} guests - lean guests: _id, side, amount_invited, table_id, rsvp_status
+ * @param {object[]} tables - lean tables: _id, capacity
+ * @param {object} [options]
+ * @param {string[][]} [options.together] - groups of guest ids that must sit at one table
+ * @param {string[][]} [options.apart] - pairs of guest ids that must not share a table
+ * @param {boolean} [options.keepExisting=true] - keep seated guests where they are (false = re-plan everyone)
+ * @param {boolean} [options.includeDeclined=false] - also seat guests who declined
+ * @returns {{assignments: {guestId, tableId}[], unplaced: {guestIds, seats, reason}[], tables: object[]}}
+ */
+function autoSeat(guests, tables, { together = [], apart = [], keepExisting = true, includeDeclined = false } = {}) {
+  const tableIds = new Set(tables.map((t) => String(t._id)));
+  const state = new Map(tables.map((t) => [String(t._id), {
+    tableId: String(t._id), capacity: t.capacity, seats: 0, sides: {}, guests: new Set()
+  }]));
+  const seat = (table, guest) => {
+    table.seats += seatsOf(guest);
+    table.sides[guest.side] = (table.sides[guest.side] || 0) + seatsOf(guest);
+    table.guests.add(String(guest._id));
+  };
+
+  // Seated guests (on a table that still exists) keep their place and use up capacity
+  const toPlace = [];
+  for (const guest of guests) {
+    const current = guest.table_id ? String(guest.table_id) : null;
+    if (keepExisting && current && tableIds.has(current)) {
+      seat(state.get(current), guest);
+    } else if (includeDeclined || guest.rsvp_status !== 'declined') {
+      toPlace.push(guest);
+    }
+  }
+
+  const byId = new Map(toPlace.map((g) => [String(g._id), g]));
+  const { find, union } = unionFind([...byId.keys()]);
+  together.forEach((group) => {
+    const members = group.map(String).filter((id) => byId.has(id));
+    members.slice(1).forEach((id) => union(members[0], id));
+  });
+
+  const apartOf = new Map();
+  apart.forEach(([a, b]) => {
+    [[String(a), String(b)], [String(b), String(a)]].forEach(([x, y]) => {
+      if (!apartOf.has(x)) apartOf.set(x, new Set());
+      apartOf.get(x).add(y);
+    });
+  });
+
+  const units = new Map();
+  for (const guest of toPlace) {
+    const root = find(String(guest._id));
+    if (!units.has(root)) units.set(root, { guests: [], seats: 0, sides: {} });
+    const unit = units.get(root);
+    unit.guests.push(guest);
+    unit.seats += seatsOf(guest);
+    unit.sides[guest.side] = (unit.sides[guest.side] || 0) + seatsOf(guest);
+  }
+
+  const mainSide = (sides) => Object.entries(sides).sort((a, b) => b[1] - a[1])[0]?.[0];
+  const ordered = [...units.values()].sort((a, b) => b.seats - a.seats);
+
+  const assignments = [];
+  const unplaced = [];
+  for (const unit of ordered) {
+    const side = mainSide(unit.sides);
+    const conflicts = new Set(unit.guests.flatMap((g) => [...(apartOf.get(String(g._id)) || [])]));
+    let best = null;
+    let bestScore = null;
+    for (const table of state.values()) {
+      const free = table.capacity - table.seats;
+      if (free < unit.seats) continue;
+      if ([...conflicts].some((id) => table.guests.has(id))) continue;
+      // Same side first (best fit), then empty tables, then mixing sides
+      const rank = table.sides[side] ? 0 : table.seats === 0 ? 1 : 2;
+      const score = [rank, rank === 1 ? 0 : free - unit.seats];
+      if (!bestScore || score[0] < bestScore[0] || (score[0] === bestScore[0] && score[1] < bestScore[1])) {
+        best = table;
+        bestScore = score;
+      }
+    }
+    if (!best) {
+      unplaced.push({
+        guestIds: unit.guests.map((g) => String(g._id)),
+        seats: unit.seats,
+        reason: unit.seats > Math.max(0, ...tables.map((t) => t.capacity)) ? 'GROUP_LARGER_THAN_ANY_TABLE' : 'NO_TABLE_WITH_ROOM'
+      });
+      continue;
+    }
+    unit.guests.forEach((guest) => {
+      seat(best, guest);
+      assignments.push({ guestId: String(guest._id), tableId: best.tableId });
+    });
+  }
+
+  if (!keepExisting) {
+    // Re-planning everyone: guests left out (declined / no room) give their old seat back
+    const planned = new Set(assignments.map((a) => a.guestId));
+    guests
+      .filter((g) => g.table_id && tableIds.has(String(g.table_id)) && !planned.has(String(g._id)))
+      .forEach((g) => assignments.push({ guestId: String(g._id), tableId: null }));
+  }
+
+  return {
+    assignments,
+    unplaced,
+    tables: [...state.values()].map(({ guests: seated, ...t }) => ({ ...t, guests: seated.size }))
+  };
+}
+
+module.exports = { applySeating, autoSeat, SeatingError, SEATING_ERRORS, seatsOf };
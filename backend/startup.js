@@ -0,0 +1,70 @@
+// backend/startup.js
+// Boot timing and lazily loaded subsystems.
+//
+// Modules only some routes need (guest import/export with xlsx, upload parsing, mail) are required on
+// their first use through lazy(), so a cold start - e.g. Render waking the service up - answers sooner.
+// The server also listens before MongoDB is connected (queries wait for the connection), so
+// /api/health answers right away and reports how far the boot got.
+// Every boot stage and every lazy load is timed; GET /api/health returns them (startupReport()).
+// STARTUP_MODE=eager loads the lazy modules before listening, like the old boot (to compare).
+
+const { performance } = require('perf_hooks');
+
+const STARTUP_MODE = process.env.STARTUP_MODE === 'eager' ? 'eager' : 'lazy';
+
+const stages = {};   // stage -> ms since the process started
+const modules = {};  // lazy module -> { loaded, ms, at }
+const loaders = new Map();
+
+// performance.now() counts from the start of the process
+const sinceStart = () => Math.round(performance.now());
+
+/**
+ * Records that the boot reached `stage` (modules, routes, listening, mongo, ready).
+ */
+function markStage(stage) {
+  if (!(stage in stages)) stages[stage] = sinceStart();
+}
+
+/**
+ * Returns a getter that runs `load` on its first call (and remembers the result).
+ * @param {string} name - reported by /api/health
+ */
+function lazy(name, load) {
+  let value;
+  let loaded = false;
+  modules[name] = { loaded: false, ms: null, at: null };
+  const get = () => {
+    if (!loaded) {
+      const started = performance.now();
+      value = load();
+      loaded = true;
+      modules[name] = { loaded: true, ms: Math.round(performance.now() - started), at: sinceStart() };
+    }
+    return value;
+  };
+  loaders.set(name, get);
+  return get;
+}
+
+// STARTUP_MODE=eager: everything is loaded during the boot
+function loadEagerly() {
+  if (STARTUP_MODE === 'eager') loaders.forEach((get) => get());
+}
+
+function startupReport() {
+  return {
+    mode: STARTUP_MODE,
+    ready: 'ready' in stages,
+    stages: { ...stages },
+    lazy: { ...modules }
+  };
+}
+
+module.exports = {
+  STARTUP_MODE,
+  markStage,
+  lazy,
+  loadEagerly,
+  startupReport
+};
@@ -0,0 +1,187 @@
+// backend/testData.js
+// Seeding and cleanup of automated-test data (tests/ fixtures), by per-run namespace.
+//
+// Every record a test run creates carries its namespace: names/titles end with "[<namespace>]"
+// and test users get "+<namespace>@" in their email. Prerequisites (events, guests...) are inserted
+// in bulk, and at the end of the run everything in the namespace is removed with a few deleteMany calls,
+// so shared test accounts do not grow from run to run.
+//
+// The routes are only mounted when TEST_MAINTENANCE_TOKEN is set (see index.js).
+
+const crypto = require('crypto');
+const User = require('./models/User');
+const Event = require('./models/Event');
+const Task = require('./models/Task');
+const Guest = require('./models/Guest');
+const Notification = require('./models/Notification');
+const BudgetItem = require('./models/BudgetItem');
+const Table = require('./models/Table');
+const Vendor = require('./models/Vendor');
+const { resetBudgetSummaries } = require('./budgetSummary');
+
+// e2e-<yymmddhhmm>-<worker>-<random>; only lowercase letters, digits and dashes (safe inside a regex)
+const NAMESPACE_PATTERN = /^e2e-[a-z0-9-]{1,60}$/;
+const ANY_NAMESPACE = 'e2e-[a-z0-9-]+';
+
+function isValidNamespace(namespace) {
+  return typeof namespace === 'string' && NAMESPACE_PATTERN.test(namespace);
+}
+
+const namespaceTag = (namespace) => `[${namespace}]`;
+
+// Idempotent: a name that already carries the tag is returned as is
+function withTag(name, namespace) {
+  const tag = namespaceTag(namespace);
+  return String(name).endsWith(tag) ? String(name) : `${name} ${tag}`;
+}
+
+function hasValidToken(provided) {
+  const expected = process.env.TEST_MAINTENANCE_TOKEN;
+  if (!expected || typeof provided !== 'string') return false;
+  const a = Buffer.from(provided);
+  const b = Buffer.from(expected);
+  return a.length === b.length && crypto.timingSafeEqual(a, b);
+}
+
+/* ================================
+   Seed
+   ================================ */
+
+/**
+ * Inserts the test prerequisites of one run with one insertMany per collection.
+ * Guests and expenses point at the seeded events by index: { event: 0, ... }.
+ *
+ * @returns {Promise<{events, guests, expenses, tasks, vendors}>} the inserted documents
+ */
+async function seedTestData({ namespace, userId, events = [], guests = [], expenses = [], tasks = [], vendors = [] }) {
+  const createdEvents = await Event.insertMany(events.map((e) => ({
+    user_id: userId,
+    title: withTag(e.title, namespace),
+    event_date: new Date(e.eventDate),
+    description: e.description || null,
+    is_main_event: false // a seeded event never replaces the account's main event
+  })));
+
+  const eventIdAt = (index = 0) => {
+    const event = createdEvents[index];
+    if (!event) throw Object.assign(new Error(`No seeded event at index ${index}`), { status: 400 });
+    return event._id;
+  };
+
+  const [createdGuests, createdExpenses, createdTasks, createdVendors] = await Promise.all([
+    Guest.insertMany(guests.map((g) => ({
+      event_id: eventIdAt(g.event),
+      full_name: withTag(g.fullName, namespace),
+      phone: g.phone,
+      side: g.side || 'friend',
+      amount_invited: g.amountInvited || 1
+    }))),
+    BudgetItem.insertMany(expenses.map((x) => ({
+      event_id: eventIdAt(x.event),
+      title: withTag(x.title, namespace),
+      amount: Number(x.amount),
+      category: x.category || 'אחר',
+      is_paid: !!x.isPaid
+    }))),
+    Task.insertMany(tasks.map((t) => ({
+      user_id: userId,
+      title: withTag(t.title, namespace),
+      due_date: t.dueDate ? new Date(t.dueDate) : null,
+      category: t.category || 'general'
+    }))),
+    Vendor.insertMany(vendors.map((v) => ({
+      userId,
+      name: withTag(v.name, namespace),
+      category: v.category,
+      phone: v.phone,
+      priceEstimate: v.priceEstimate
+    })))
+  ]);
+
+  return { events: createdEvents, guests: createdGuests, expenses: createdExpenses, tasks: createdTasks, vendors: createdVendors };
+}
+
+/* ================================
+   Cleanup
+   ================================ */
+
+/**
+ * Deletes everything tagged with `namespace` - plus everything owned by the namespace's users
+ * and events - with one deleteMany per collection.
+ *
+ * Without a namespace every test namespace is swept, limited to records older than `olderThanMinutes`
+ * (leftovers of runs that crashed before their own cleanup; running sessions are not touched).
+ *
+ * @returns {Promise<{deleted: object, userIds: string[]}>} deleted counts per collection and
+ *          the owners of deleted events (for the data_changed emit)
+ */
+async function cleanupTestData({ namespace, olderThanMinutes } = {}) {
+  const pattern = namespace ? namespace : ANY_NAMESPACE;
+  const tagged = new RegExp(`\\[${pattern}\\]$`);
+  const taggedEmail = new RegExp(`\\+${pattern}@`);
+
+  // Timestamps are created_at in most models, createdAt in Vendor/Table (timestamps: true)
+  const cutoff = olderThanMinutes ? new Date(Date.now() - Number(olderThanMinutes) * 60 * 1000) : null;
+  const olderThan = (field) => (cutoff ? { [field]: { $lt: cutoff } } : {});
+
+  const users = await User.find({ email: taggedEmail, ...olderThan('created_at') }, { _id: 1 }).lean();
+  const userIds = users.map((u) => u._id);
+
+  const events = await Event.find({
+    $or: [{ title: tagged, ...olderThan('created_at') }, { user_id: { $in: userIds } }]
+  }, { _id: 1, user_id: 1 }).lean();
+  const eventIds = events.map((e) => e._id);
+
+  const tables = await Table.find({
+    $or: [{ name: tagged, ...olderThan('createdAt') }, { eventId: { $in: eventIds } }]
+  }, { _id: 1 }).lean();
+  const tableIds = tables.map((t) => t._id);
+
+  // Tagged expenses of events that stay (shared accounts) - their budget summaries are rebuilt
+  const keptEventsWithExpenses = await BudgetItem.distinct('event_id', {
+    title: tagged, ...olderThan('created_at'), event_id: { $nin: eventIds }
+  });
+
+  const [guests, expenses, tasks, vendors, notifications] = await Promise.all([
+    Guest.deleteMany({ $or: [{ full_name: tagged, ...olderThan('created_at') }, { event_id: { $in: eventIds } }] }),
+    BudgetItem.deleteMany({ $or: [{ title: tagged, ...olderThan('created_at') }, { event_id: { $in: eventIds } }] }),
+    Task.deleteMany({ $or: [{ title: tagged, ...olderThan('created_at') }, { user_id: { $in: userIds } }] }),
+    Vendor.deleteMany({ $or: [{ name: tagged, ...olderThan('createdAt') }, { userId: { $in: userIds } }] }),
+    // Reminders about a tagged event quote its title
+    Notification.deleteMany({ $or: [{ message: new RegExp(`\\[${pattern}\\]`), ...olderThan('created_at') }, { user_id: { $in: userIds } }] })
+  ]);
+
+  // Guests of other events seated at a deleted table go back to "not seated"
+  const [unseated, deletedTables, deletedEvents, deletedUsers] = await Promise.all([
+    Guest.updateMany({ table_id: { $in: tableIds } }, { $set: { table_id: null } }),
+    Table.deleteMany({ _id: { $in: tableIds } }),
+    Event.deleteMany({ _id: { $in: eventIds } }),
+    User.deleteMany({ _id: { $in: userIds } }),
+    resetBudgetSummaries(keptEventsWithExpenses)
+  ]);
+
+  return {
+    deleted: {
+      users: deletedUsers.deletedCount,
+      events: deletedEvents.deletedCount,
+      guests: guests.deletedCount,
+      expenses: expenses.deletedCount,
+      tasks: tasks.deletedCount,
+      vendors: vendors.deletedCount,
+      tables: deletedTables.deletedCount,
+      notifications: notifications.deletedCount
+    },
+    unseatedGuests: unseated.modifiedCount,
+    eventIds: eventIds.map(String),
+    userIds: [...new Set(events.map((e) => String(e.user_id)))]
+  };
+}
+
+module.exports = {
+  seedTestData,
+  cleanupTestData,
+  hasValidToken,
+  isValidNamespace,
+  namespaceTag,
+  withTag
+};
@@ -88,9 +88,12 @@ const GuestList = ({ currentUser }) => {
       formData.append('file', file);
       try {
           setLoading(true);
-          await axios.post(`${API_URL}/api/events/${eventId}/guests/import`, formData, { headers: { 'Content-Type': 'multipart/form-data' } });
-          alert('הקובץ נטען בהצלחה!');
-          // הסוקט יעדכן
+          const res = await axios.post(`${API_URL}/api/events/${eventId}/guests/import`, formData, { headers: { 'Content-Type': 'multipart/form-data' } });
+          const { message, failed, errors = [] } = res.data;
+          const failedRows = errors.slice(0, 10).map(e => `שורה ${e.row}: ${e.message}`).join('\n');
+          alert(failed ? `${message}\n${failed} שורות לא נטענו:\n${failedRows}` : message);
+          // הסוקט יעדכן (אם לא נשמר כלום - אין עדכון מהסוקט)
+          if (!res.data.count) setLoading(false);
       } catch (err) { alert('שגיאה בטעינת הקובץ'); setLoading(false); }
       e.target.value = '';
   };
@@ -206,13 +209,21 @@ const GuestList = ({ currentUser }) => {
         }
       );
 
-      setSmsResult(res.data);
+      // השליחה רצה ברקע בשרת - בודקים התקדמות עד שהמשימה מסתיימת
+      let job = res.data;
+      setSmsResult(job);
+      while (job.status !== 'done') {
+        await new Promise((resolve) => setTimeout(resolve, 1000));
+        const progress = await axios.get(`${API_URL}/api/messages/jobs/${job.jobId}`);
+        job = progress.data;
+        setSmsResult(job);
+      }
 
       alert(
         `נשלח בהצלחה ✅
-נשלחו: ${res.data.sent}
-דולגו: ${res.data.skipped}
-נכשלו: ${res.data.failed}`
+נשלחו: ${job.sent}
+דולגו: ${job.skipped}
+נכשלו: ${job.failed}`
       );
 
     } catch (err) {
@@ -287,10 +298,10 @@ const GuestList = ({ currentUser }) => {
         <div className="max-w-[1400px] mx-auto mb-6">
           <div className="p-4 bg-white border rounded-xl shadow-sm border-surface-200 dark:bg-surface-800 dark:border-surface-700">
             <div className="text-sm text-surface-700 dark:text-surface-200">
-              ✅ הודעות נשלחו. Link: <span className="font-mono text-xs">{smsResult.link}</span>
+              {smsResult.status === 'done' ? '✅ הודעות נשלחו.' : '⏳ שולח הודעות...'} Link: <span className="font-mono text-xs">{smsResult.link}</span>
             </div>
             <div className="mt-2 text-xs text-surface-500 dark:text-surface-400">
-              Sent: {smsResult.sent} | Skipped: {smsResult.skipped} | Failed: {smsResult.failed}
+              Sent: {smsResult.sent}/{smsResult.total} | Skipped: {smsResult.skipped} | Failed: {smsResult.failed}
             </div>
             {smsResult.failures && smsResult.failures.length > 0 && (
               <div className="mt-3 text-xs text-rose-600 dark:text-rose-300">
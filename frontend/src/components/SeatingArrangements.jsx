@@ -100,6 +100,17 @@ useEffect(() => {
     } catch (err) { alert('שגיאה באיפוס'); }
   };
 
+  const handleAutoSeat = async () => {
+    try {
+        const { data } = await axios.post(`${API_URL}/api/events/${eventId}/seating/auto`, {});
+        fetchData();
+        if (data.unplaced.length > 0) {
+            const left = data.unplaced.reduce((sum, u) => sum + u.guestIds.length, 0);
+            alert(`${left} אורחים לא שובצו - אין מספיק מקום בשולחנות`);
+        }
+    } catch (err) { alert(err.response?.data?.message || 'שגיאה בסידור האוטומטי'); }
+  };
+
   const handleSeatChange = async (guestId, tableId) => {
       // עדכון אופטימיסטי
       setGuests(prev => prev.map(g => g.id === guestId ? { ...g, table_id: tableId } : g));
@@ -141,6 +152,7 @@ useEffect(() => {
         
         <div className="flex gap-2">
              <button onClick={() => window.print()} className="px-4 py-2 bg-gray-200 dark:bg-gray-700 rounded-lg text-sm font-bold print:hidden">הדפסה</button>
+             <button onClick={handleAutoSeat} className="px-4 py-2 bg-purple-100 text-purple-700 rounded-lg text-sm font-bold border border-purple-200 print:hidden">סידור אוטומטי</button>
              <button onClick={handleResetAndFix} className="px-4 py-2 bg-red-100 text-red-600 rounded-lg text-sm font-bold border border-red-200 print:hidden">איפוס מלא</button>
         </div>
 
@@ -2,9 +2,11 @@
 
 // Vite automatically detects if the app is running in Production (Build) or Development (Dev) mode
 
-export const API_URL = import.meta.env.PROD 
+// VITE_API_URL overrides both (an empty value means "same origin as the page",
+// used when the backend serves the build, e.g. in the hermetic test setup)
+export const API_URL = import.meta.env.VITE_API_URL ?? (import.meta.env.PROD 
   ? "https://wedding-planner-api-s9so.onrender.com" // Production URL (Render)
-  : "http://localhost:4000"; // Development URL (Localhost)
+  : "http://localhost:4000"); // Development URL (Localhost)
 
 /** 
 Notes:
@@ -0,0 +1,26 @@
+import datetime
+import pytest
+from support.api_replay import api_mode
+
+@pytest.fixture(scope="session", autouse=True)
+def _live_api_only():
+    """The API tier tests the real backend - there is nothing to replay it against."""
+    if api_mode() == "replay":
+        pytest.skip("API tier does not run with API_MODE=replay")
+
+@pytest.fixture(scope="session")
+def api_user(authenticated_session):
+    """The logged-in test user (from the session-wide API login)."""
+    return authenticated_session
+
+@pytest.fixture(scope="session")
+def api_event(run_data, api_user):
+    """
+    An event owned by the test user, seeded once per session for the guest/budget flows
+    and deleted with the run's namespace at the end.
+    """
+    event_date = (datetime.date.today() + datetime.timedelta(days=30)).isoformat()
+    seeded = run_data.seed(
+        api_user.id, events=[{"title": "API Test Event", "eventDate": event_date, "description": "Created by the API test tier"}]
+    )
+    return seeded.events[0]
@@ -0,0 +1,20 @@
+import datetime
+import pytest
+
+pytestmark = pytest.mark.api
+
+def test_api_add_event(api_client, api_user, run_data):
+    """
+    API mirror of test_add_event: POST /api/events -> event is returned by GET /api/events.
+    Args:
+        api_client, api_user, run_data: Injected automatically by conftest.py
+    """
+    event_date = (datetime.date.today() + datetime.timedelta(days=10)).isoformat()
+
+    title = run_data.name("API Big Wedding")
+
+    event = api_client.create_event(api_user.id, title, event_date, "Automated event creation test")
+
+    assert event.title == title
+    assert event.user_id == api_user.id
+    assert event.id in {e.id for e in api_client.list_events(api_user.id)}, "Event was not created!"
@@ -0,0 +1,18 @@
+import pytest
+
+pytestmark = pytest.mark.api
+
+def test_api_add_expense(api_client, api_event, run_data):
+    """
+    API mirror of test_add_expense: POST /api/budget -> item and totals show up in the event budget.
+    Args:
+        api_client, api_event, run_data: Injected automatically by conftest.py
+    """
+    before = api_client.get_budget(api_event.id)
+
+    item = api_client.add_expense(api_event.id, run_data.name("API DJ Test"), 2500, category="מוזיקה")
+
+    after = api_client.get_budget(api_event.id)
+    assert item.amount == 2500
+    assert item.id in {i.id for i in after.items}, "Expense was not added to the list!"
+    assert after.summary.totalExpenses == before.summary.totalExpenses + 2500
@@ -0,0 +1,39 @@
+import asyncio
+import pytest
+from support.api_client import AsyncApiClient
+
+pytestmark = pytest.mark.api
+
+def test_api_add_guest(api_client, api_event, run_data):
+    """
+    API mirror of test_add_guest: POST /api/guests -> guest is returned by the event's guest list.
+    Args:
+        api_client, api_event, run_data: Injected automatically by conftest.py
+    """
+    name = run_data.name("API Test Guest")
+
+    guest = api_client.add_guest(api_event.id, name, phone="0501234567", amount_invited=3)
+
+    assert guest.full_name == name
+    assert guest.amount_invited == 3
+    assert guest.rsvp_status == "pending"
+    assert guest.id in {g.id for g in api_client.list_guests(api_event.id)}, "Guest was not added to the list!"
+
+def test_api_add_guests_concurrently(api_url, api_event, run_data):
+    """
+    Same flow through the async client: several guests added at once over one pooled connection set.
+    Args:
+        api_url, api_event, run_data: Injected automatically by conftest.py
+    """
+    names = [run_data.name(f"API Async Guest {i}") for i in range(5)]
+
+    async def add_all():
+        async with AsyncApiClient(api_url) as api:
+            added = await asyncio.gather(*(api.add_guest(api_event.id, name) for name in names))
+            listed = await api.list_guests(api_event.id)
+            return added, listed
+
+    added, listed = asyncio.run(add_all())
+
+    assert sorted(g.full_name for g in added) == names
+    assert {g.id for g in added} <= {g.id for g in listed}, "Not all guests were added to the list!"
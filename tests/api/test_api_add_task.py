@@ -0,0 +1,20 @@
+import datetime
+import pytest
+
+pytestmark = pytest.mark.api
+
+def test_api_add_task(api_client, api_user, run_data):
+    """
+    API mirror of test_add_task: POST /api/tasks -> task is returned by GET /api/tasks.
+    Args:
+        api_client, api_user, run_data: Injected automatically by conftest.py
+    """
+    due_date = (datetime.date.today() + datetime.timedelta(days=10)).isoformat()
+
+    title = run_data.name("API Task")
+
+    task = api_client.create_task(api_user.id, title, due_date)
+
+    assert task.title == title
+    assert task.status == "todo" and task.is_done is False
+    assert task.id in {t.id for t in api_client.list_tasks(api_user.id)}, "Task was not added to the list!"
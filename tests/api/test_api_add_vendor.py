@@ -0,0 +1,17 @@
+import pytest
+
+pytestmark = pytest.mark.api
+
+def test_api_add_vendor(api_client, api_user, run_data):
+    """
+    API mirror of test_add_vendor: POST /api/vendors -> vendor is returned by GET /api/vendors.
+    Args:
+        api_client, api_user, run_data: Injected automatically by conftest.py
+    """
+    name = run_data.name("API Music Service")
+
+    vendor = api_client.add_vendor(api_user.id, name, "Music", phone="0509998877", price_estimate=4500)
+
+    assert vendor.name == name
+    assert vendor.category == "Music"
+    assert vendor.id in {v.id for v in api_client.list_vendors(api_user.id)}, "Vendor was not added to the list!"
@@ -0,0 +1,120 @@
+import asyncio
+import random
+from collections import defaultdict
+from datetime import datetime
+
+import pytest
+from support.api_client import AsyncApiClient
+
+pytestmark = pytest.mark.api
+
+CATEGORIES = ["אולם וקייטרינג", "צילום", "מוזיקה", "עיצוב", "אחר"]
+
+def _timestamp(value):
+    """An ISO timestamp as the API sends it ("...Z")."""
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+def test_api_budget_summary_concurrent_edits(api_client, api_url, api_user, run_data):
+    """
+    The budget totals are kept up to date by every expense write (not recomputed on read),
+    so concurrent adds, edits and deletes must still add up to the items that are left.
+    Test flow:
+    1. Seed an event with 10 expenses (its summary is built on the first read).
+    2. At once: add 20 expenses, toggle is_paid / change the amount of the seeded ones, delete some.
+    3. The summary and the per-category chart equal the sums over the remaining items.
+    Args:
+        api_client, api_url, api_user, run_data: Injected automatically by conftest.py
+    """
+    rng = random.Random(18)
+    seeded = run_data.seed(
+        api_user.id,
+        events=[{"title": "API Budget Summary Event", "eventDate": "2030-01-01"}],
+        expenses=[{"event": 0, "title": f"Seeded Expense {i}", "amount": 100 * (i + 1),
+                   "category": CATEGORIES[i % len(CATEGORIES)]} for i in range(10)],
+    )
+    event_id = seeded.events[0].id
+    items = seeded.expenses
+    assert api_client.get_budget(event_id, items=False).summary.totalExpenses == sum(i.amount for i in items)
+
+    async def edit_all():
+        async with AsyncApiClient(api_url) as api:
+            calls = [api.add_expense(event_id, run_data.name(f"Concurrent Expense {i}"), rng.randint(1, 5000),
+                                     category=rng.choice(CATEGORIES), is_paid=i % 2 == 0) for i in range(20)]
+            calls += [api.update_expense(item.id, is_paid=True) for item in items[:4]]
+            calls += [api.update_expense(item.id, amount=item.amount + 50, category=rng.choice(CATEGORIES))
+                      for item in items[4:7]]
+            # The same item edited twice at once
+            calls += [api.update_expense(items[7].id, amount=777), api.update_expense(items[7].id, is_paid=True)]
+            calls += [api.delete_expense(item.id) for item in items[8:]]
+            await asyncio.gather(*calls)
+
+    asyncio.run(edit_all())
+
+    budget = api_client.get_budget(event_id)
+    expected_chart = defaultdict(float)
+    for item in budget.items:
+        expected_chart[item.category] += item.amount
+
+    assert len(budget.items) == 28
+    assert budget.summary.totalExpenses == pytest.approx(sum(i.amount for i in budget.items))
+    assert budget.summary.totalPaid == pytest.approx(sum(i.amount for i in budget.items if i.is_paid))
+    assert {c["name"]: c["value"] for c in budget.chartData} == pytest.approx(dict(expected_chart))
+    print("✅ Budget summary matches the items after concurrent edits")
+
+def test_api_budget_rebuild_races_writes(api_client, api_url, api_user, run_data):
+    """
+    An event without stored totals gets them built by its first budget read. Reads racing with
+    expense writes must not store totals that miss an expense or count one twice.
+    Test flow:
+    1. Seed 5 events with 10 expenses each, without reading their budgets (no stored totals yet).
+    2. At once on every event: 10 budget reads (rebuilds), 10 new expenses, 3 deletes and 2 edits.
+    3. Every event's stored totals equal the sums over its remaining items.
+    Args:
+        api_client, api_url, api_user, run_data: Injected automatically by conftest.py
+    """
+    rng = random.Random(180)
+    seeded = run_data.seed(
+        api_user.id,
+        events=[{"title": f"API Budget Rebuild Event {e}", "eventDate": "2030-01-01"} for e in range(5)],
+        expenses=[{"event": e, "title": f"Seeded Expense {e}-{i}", "amount": 10 * (i + 1),
+                   "category": CATEGORIES[i % len(CATEGORIES)]} for e in range(5) for i in range(10)],
+    )
+    items_by_event = defaultdict(list)
+    for item in seeded.expenses:
+        items_by_event[item.event_id].append(item)
+
+    async def race():
+        async with AsyncApiClient(api_url) as api:
+            calls = []
+            for event_id, items in items_by_event.items():
+                calls += [api.get_budget(event_id, items=False) for _ in range(10)]
+                calls += [api.add_expense(event_id, run_data.name(f"Racing Expense {i}"), rng.randint(1, 500),
+                                          category=rng.choice(CATEGORIES)) for i in range(10)]
+                calls += [api.delete_expense(item.id) for item in items[:3]]
+                calls += [api.update_expense(item.id, amount=item.amount + 5, is_paid=True) for item in items[3:5]]
+            rng.shuffle(calls)
+            await asyncio.gather(*calls)
+
+    asyncio.run(race())
+
+    for event_id in items_by_event:
+        budget = api_client.get_budget(event_id)
+        assert len(budget.items) == 17
+        assert budget.summary.totalExpenses == pytest.approx(sum(i.amount for i in budget.items)), \
+            f"Stored totals of {event_id} do not match its items"
+        assert budget.summary.totalPaid == pytest.approx(sum(i.amount for i in budget.items if i.is_paid))
+    print("✅ Budget totals rebuilt during concurrent writes match the items")
+
+def test_api_budget_update_returns_saved_item(api_client, api_event, run_data):
+    """
+    PUT /api/budget/:id answers with the item as stored: the edited fields and an updated_at not before the creation.
+    Args:
+        api_client, api_event, run_data: Injected automatically by conftest.py
+    """
+    created = api_client.request("POST", "/api/budget", json={
+        "eventId": api_event.id, "title": run_data.name("Updated Expense"), "amount": 100, "category": "אחר",
+    })
+    new_title = run_data.name("Renamed Expense")
+    updated = api_client.request("PUT", f"/api/budget/{created['id']}", json={"amount": 250, "title": new_title})
+    assert (updated["amount"], updated["title"]) == (250, new_title), f"The answer is not the saved item: {updated}"
+    assert _timestamp(updated["updated_at"]) >= _timestamp(created["updated_at"])
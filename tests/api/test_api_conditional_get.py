@@ -0,0 +1,91 @@
+import asyncio
+import random
+
+import pytest
+from support.api_client import AsyncApiClient
+
+pytestmark = pytest.mark.api
+
+def test_api_conditional_get(api_client, api_user, run_data):
+    """
+    ETag/304 and compression of the dashboard lists (backend/conditional.js).
+    Test flow:
+    1. The guest list comes gzip-compressed with an ETag.
+    2. Asking again with If-None-Match gives 304 without a body.
+    3. After a new guest (or expense) the same ETag gets the full, updated list.
+    4. An expense does not change the events list (the budget totals are not part of it): still 304.
+    Args:
+        api_client, api_user, run_data: Injected automatically by conftest.py
+    """
+    seeded = run_data.seed(
+        api_user.id,
+        events=[{"title": "API Conditional Event", "eventDate": "2030-01-01"}],
+        guests=[{"event": 0, "fullName": f"Conditional Guest {i:02d}", "phone": f"05300000{i:02d}"} for i in range(30)],
+    )
+    event_id = seeded.events[0].id
+    guests_path, budget_path = f"/api/events/{event_id}/guests", f"/api/events/{event_id}/budget"
+
+    first = api_client.http.get(guests_path, headers={"Accept-Encoding": "gzip"})
+    assert first.status_code == 200
+    assert first.headers.get("content-encoding") == "gzip", f"Guest list not compressed: {dict(first.headers)}"
+    etag = first.headers["etag"]
+
+    again = api_client.http.get(guests_path, headers={"If-None-Match": etag})
+    assert again.status_code == 304 and again.content == b"", "An unchanged guest list was sent again"
+
+    api_client.add_guest(event_id, run_data.name("Conditional Guest New"))
+    changed = api_client.http.get(guests_path, headers={"If-None-Match": etag})
+    assert changed.status_code == 200, "A changed guest list answered 304"
+    assert changed.headers["etag"] != etag
+    assert len(changed.json()) == 31
+
+    events_path = f"/api/events?userId={api_user.id}"
+    events_etag = api_client.http.get(events_path).headers["etag"]
+    budget_etag = api_client.http.get(budget_path).headers["etag"]
+    assert api_client.http.get(budget_path, headers={"If-None-Match": budget_etag}).status_code == 304
+    api_client.add_expense(event_id, run_data.name("Conditional Expense"), 500)
+    assert api_client.http.get(budget_path, headers={"If-None-Match": budget_etag}).status_code == 200, \
+        "The budget answered 304 after a new expense"
+    assert api_client.http.get(events_path, headers={"If-None-Match": events_etag}).status_code == 304, \
+        "A new expense invalidated the events list"
+
+def test_api_budget_etag_during_expense_writes(api_client, api_url, api_user, run_data):
+    """
+    An expense write saves the item first and updates the stored budget totals after it, so a budget
+    read can land in between. Its answer (old totals) must not stay valid once the write is done.
+    Test flow:
+    1. Seed an event with 5 expenses and read its budget once (the totals get stored).
+    2. At once: 20 new expenses and 60 budget reads, each read's ETag and totals recorded.
+    3. Revalidating with any recorded ETag answers 304 only if its totals are the final ones.
+    Args:
+        api_client, api_url, api_user, run_data: Injected automatically by conftest.py
+    """
+    seeded = run_data.seed(
+        api_user.id,
+        events=[{"title": "API Budget ETag Event", "eventDate": "2030-01-01"}],
+        expenses=[{"event": 0, "title": f"ETag Expense {i}", "amount": 100, "category": "אחר"} for i in range(5)],
+    )
+    event_id = seeded.events[0].id
+    budget_path, params = f"/api/events/{event_id}/budget", {"items": "false"}
+    assert api_client.http.get(budget_path, params=params).status_code == 200
+    seen = []
+
+    async def race():
+        async with AsyncApiClient(api_url) as api:
+            async def read():
+                response = await api.http.get(budget_path, params=params)
+                seen.append((response.headers["etag"], response.json()["summary"]))
+
+            calls = [api.add_expense(event_id, run_data.name(f"Racing ETag Expense {i}"), 10) for i in range(20)]
+            calls += [read() for _ in range(60)]
+            random.Random(22).shuffle(calls)
+            await asyncio.gather(*calls)
+
+    asyncio.run(race())
+
+    final = api_client.http.get(budget_path, params=params).json()["summary"]
+    assert final["totalExpenses"] == 700
+    for etag, summary in seen:
+        again = api_client.http.get(budget_path, params=params, headers={"If-None-Match": etag})
+        if again.status_code == 304:
+            assert summary == final, f"A stale budget stays valid: {summary} under {etag}, now {final}"
@@ -0,0 +1,32 @@
+import pytest
+
+pytestmark = pytest.mark.api
+
+def test_api_guest_pages(api_client, api_user, run_data):
+    """
+    Cursor pagination of GET /api/events/:eventId/guests: pages of 10 over 25 seeded guests
+    return every guest exactly once, and ?fields= trims every item to the requested fields.
+    Args:
+        api_client, api_user, run_data: Injected automatically by conftest.py
+    """
+    seeded = run_data.seed(
+        api_user.id,
+        events=[{"title": "API Paging Event", "eventDate": "2030-01-01"}],
+        guests=[{"event": 0, "fullName": f"Page Guest {i:02d}", "phone": f"05200000{i:02d}"} for i in range(25)],
+    )
+    event_id = seeded.events[0].id
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        page = api_client.list_guests_page(event_id, limit=10, cursor=cursor, sort="full_name")
+        seen += [g.full_name for g in page.items]
+        pages += 1
+        if not page.hasMore:
+            break
+        cursor = page.nextCursor
+
+    assert pages == 3
+    assert seen == sorted(g.full_name for g in seeded.guests), "Pages skipped, repeated or misordered guests"
+
+    projected = api_client.list_guests_page(event_id, limit=5, fields=["full_name", "phone"])
+    assert all(set(item) == {"id", "full_name", "phone", "created_at"} for item in projected.items), projected.items
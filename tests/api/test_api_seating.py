@@ -0,0 +1,49 @@
+import pytest
+from support.api_client import ApiError
+
+pytestmark = pytest.mark.api
+
+def test_api_seating(api_client, api_user, run_data):
+    """
+    Bulk and automatic seating: capacity counts seats (amount_invited), a bulk move that overfills
+    a table is rejected as a whole, and auto-seat keeps a `together` group at one table.
+    Test flow:
+    1. Seed an event with 4 guests (2 seats each) and create two tables of 4 seats.
+    2. Seating 3 guests at one table -> 400 TABLE_FULL, nobody moved.
+    3. Seating 2 guests at each table -> applied.
+    4. Reset, then auto-seat with a together group -> every guest placed, the group shares a table.
+    Args:
+        api_client, api_user, run_data: Injected automatically by conftest.py
+    """
+    seeded = run_data.seed(
+        api_user.id,
+        events=[{"title": "API Seating Event", "eventDate": "2030-01-01"}],
+        guests=[{"event": 0, "fullName": f"Seat Guest {i}", "amountInvited": 2, "side": "bride"} for i in range(4)],
+    )
+    event_id = seeded.events[0].id
+    guest_ids = [g.id for g in seeded.guests]
+    table_a = api_client.create_table(event_id, run_data.name("Table A"), capacity=4)["_id"]
+    table_b = api_client.create_table(event_id, run_data.name("Table B"), capacity=4)["_id"]
+
+    try:
+        api_client.seat_guests(event_id, [{"guestId": g, "tableId": table_a} for g in guest_ids[:3]])
+        assert False, "❌ Overfilling a table must be rejected"
+    except ApiError as e:
+        assert e.status_code == 400, e
+    assert all(g.table_id is None for g in api_client.list_guests(event_id)), "A rejected bulk move wrote some guests"
+    print("✅ Overfilling bulk move rejected as a whole")
+
+    result = api_client.seat_guests(event_id, [
+        {"guestId": guest_ids[0], "tableId": table_a}, {"guestId": guest_ids[1], "tableId": table_a},
+        {"guestId": guest_ids[2], "tableId": table_b}, {"guestId": guest_ids[3], "tableId": table_b},
+    ])
+    assert result["changed"] == 4
+    assert sorted(t["seats"] for t in result["tables"]) == [4, 4]
+
+    api_client.seat_guests(event_id, [{"guestId": g, "tableId": None} for g in guest_ids])
+    plan = api_client.auto_seat(event_id, together=[[guest_ids[0], guest_ids[3]]])
+    assert plan["unplaced"] == [], plan["unplaced"]
+    seated = {g.id: g.table_id for g in api_client.list_guests(event_id)}
+    assert all(seated.values()), seated
+    assert seated[guest_ids[0]] == seated[guest_ids[3]], "Auto-seat split a together group"
+    print("✅ Auto-seat placed every guest and kept the group together")
@@ -0,0 +1,37 @@
+import datetime
+import pytest
+from support.test_data import RunData, new_namespace
+
+pytestmark = pytest.mark.api
+
+def test_api_seed_and_cleanup_namespace(api_client, api_user, maintenance_token):
+    """
+    Bulk test-data routes: POST /api/test-data/seed -> records are listed -> POST /api/test-data/cleanup
+    removes the whole namespace (event, its guests and expenses, tasks, vendors).
+    Args:
+        api_client, api_user, maintenance_token: Injected automatically by conftest.py
+    """
+    if not maintenance_token:
+        pytest.skip("TEST_MAINTENANCE_TOKEN is not set - the bulk test-data routes are not available")
+
+    run = RunData(new_namespace("cleanup-check"), api_client, maintenance_token)
+    event_date = (datetime.date.today() + datetime.timedelta(days=40)).isoformat()
+
+    seeded = run.seed(
+        api_user.id,
+        events=[{"title": "Seed Check Wedding", "eventDate": event_date}],
+        guests=[{"event": 0, "fullName": f"Seed Guest {i}", "phone": f"05000000{i:02d}"} for i in range(20)],
+        expenses=[{"event": 0, "title": "Seed Expense", "amount": 100}],
+        tasks=[{"title": "Seed Task"}],
+        vendors=[{"name": "Seed Vendor", "category": "Music"}],
+    )
+    event = seeded.events[0]
+    assert event.title == run.name("Seed Check Wedding")
+    assert len(api_client.list_guests(event.id)) == 20
+
+    deleted = run.cleanup()
+
+    assert deleted["events"] == 1 and deleted["guests"] == 20 and deleted["expenses"] == 1
+    assert deleted["tasks"] == 1 and deleted["vendors"] == 1
+    assert event.id not in {e.id for e in api_client.list_events(api_user.id)}, "Seeded event was not deleted!"
+    assert not any(run.tag in t.title for t in api_client.list_tasks(api_user.id)), "Seeded task was not deleted!"
@@ -1,9 +1,22 @@
 import pytest
+import datetime
 import os
+import secrets
+from dataclasses import asdict
 from dotenv import load_dotenv
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+from support.api_client import ApiClient
+from support.api_models import Event, User
+from support.api_replay import (
+    RUN_DATA_FILE, SESSION_FILE, Cassette, ReplayServer, api_mode, collect_recording, fixture_path, load_fixture, save_fixture,
+    start_recording,
+)
+from support.browser_pool import BrowserPool
+from support.durations import DEFAULT_DB, DurationHistory, record_phase
+from support.impact import TESTS_DIR, select_tests
+from support.local_backend import HERMETIC_USER, BackendStartError, LocalBackend
+from support.session import clear_seeded_user, seed_logged_in_user
+from support.step_metrics import StepRecorder
+from support.test_data import RunData, new_namespace
 
 # --- Load Environment Variables ---
 # This ensures .env is loaded for all tests in the session
@@ -11,18 +24,142 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 env_path = os.path.join(current_dir, '.env')
 load_dotenv(env_path)
 
+# Configuration Switch (TEST_MODE in tests/.env)
+# - "render"   (default): run against Render/Production
+# - "local":    run against an already running local stack (LOCAL_RUN_URL)
+# - "hermetic": start a private backend + throwaway MongoDB for this run (see local_backend)
+TEST_MODE = os.getenv("TEST_MODE", "render").lower()
+
+# Backend switch for the UI tests (API_MODE in tests/.env), independent of TEST_MODE:
+# - "live"   (default): the browser talks to the real backend
+# - "record": like live, and every /api/* exchange is saved to tests/fixtures/api/<test>.json
+# - "replay": no backend at all - the frontend build and the recorded responses are served in-process
+API_MODE = api_mode()
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--changed-since", metavar="GIT_REF",
+        help="Only run the tests affected by the changes since GIT_REF (plus the smoke tests); see support/impact.py",
+    )
+    parser.addoption(
+        "--durations-db", metavar="PATH", default=DEFAULT_DB,
+        help="SQLite history of the test durations (default: tests/.cache/durations.sqlite); see support/durations.py",
+    )
+    parser.addoption("--no-duration-history", action="store_true", help="Do not record the durations of this run")
+    parser.addoption(
+        "--fail-on-slowdown", action="store_true",
+        help="Exit with status 1 when a passing test got slower than its recent runs",
+    )
+
+def pytest_configure(config):
+    """Records every test's duration and phases per git commit (support/durations.py)."""
+    if config.getoption("--no-duration-history") or config.option.collectonly:
+        return
+    # Only runs with the same backend, API mode and parallelism are comparable
+    workers = getattr(config.option, "numprocesses", None) or 0
+    history = DurationHistory(
+        config, config.getoption("--durations-db"), f"{TEST_MODE}/{API_MODE}/n{workers}",
+        fail_on_slowdown=config.getoption("--fail-on-slowdown"),
+    )
+    config.pluginmanager.register(history, "duration_history")
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(config, items):
+    """--changed-since: deselects the tests whose frontend files and backend routes did not change."""
+    base = config.getoption("--changed-since")
+    if not base:
+        return
+    test_files = sorted({os.path.relpath(str(item.path), TESTS_DIR).replace(os.sep, '/') for item in items})
+    selection = select_tests(base, test_files)
+
+    reporter = config.pluginmanager.get_plugin("terminalreporter")
+    if selection.run_all:
+        if reporter:
+            reporter.write_line(f"[Impact] Running every test: {'; '.join(selection.run_all_reasons)}")
+        return
+    selected, deselected = [], []
+    for item in items:
+        test_file = os.path.relpath(str(item.path), TESTS_DIR).replace(os.sep, '/')
+        (selected if selection.includes(test_file) else deselected).append(item)
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+    if reporter:
+        reporter.write_line(
+            f"[Impact] {len(selection.changed_files)} changed file(s) since {base}: "
+            f"{len(selected)} test(s) selected, {len(deselected)} deselected"
+        )
+        for test_file, reasons in sorted(selection.tests.items()):
+            reporter.write_line(f"  {test_file}: {'; '.join(reasons)}")
+
 @pytest.fixture(scope="session")
-def base_url():
+def local_backend():
+    """
+    Session fixture that starts backend/index.js on a free local port against a private,
+    RAM-backed MongoDB, waits for /api/health and tears everything down afterward.
+
+    Under pytest-xdist every worker runs its own session, so each worker gets its own
+    isolated backend and database.
+
+    The fresh database is seeded with the hermetic test user and one event, so the
+    login-based and event-based tests have something to work with.
+    """
+    worker = os.getenv("PYTEST_XDIST_WORKER", "master")
+    maintenance_token = secrets.token_hex(16)
+    backend = LocalBackend(name=worker, env={"TEST_MAINTENANCE_TOKEN": maintenance_token})
+    try:
+        backend.start()
+    except BackendStartError as e:
+        pytest.fail(f"Could not start the hermetic backend: {e}", pytrace=False)
+    print(f"\n--- Fixture: Hermetic backend ({worker}) running on {backend.url} ---")
+
+    with ApiClient(backend.url) as client:
+        user = client.register(HERMETIC_USER["email"], HERMETIC_USER["password"], HERMETIC_USER["fullName"])
+        client.create_event(user.id, "Hermetic Wedding", "2030-06-01", "Seeded by the local_backend fixture")
+    backend.credentials = {
+        "email": HERMETIC_USER["email"],
+        "password": HERMETIC_USER["password"],
+        "main_test_user_wedding_code": user.wedding_code,
+    }
+    backend.maintenance_token = maintenance_token
+
+    yield backend
+
+    backend.stop()
+
+@pytest.fixture(scope="session")
+def replay_server():
+    """
+    Session fixture for API_MODE=replay: serves frontend/dist and the recorded API responses
+    from a stub server inside the test process (no MongoDB, no backend).
+    """
+    try:
+        server = ReplayServer().start()
+    except RuntimeError as e:
+        pytest.fail(f"Could not start the replay server: {e}", pytrace=False)
+    print(f"\n--- Fixture: Replaying recorded API responses on {server.url} ---")
+    yield server
+    server.stop()
+
+def _recorded_session():
+    session = load_fixture(SESSION_FILE)
+    if session is None:
+        pytest.skip(f"No recorded session ({os.path.relpath(SESSION_FILE)}) - run once with API_MODE=record")
+    return session
+
+@pytest.fixture(scope="session")
+def base_url(request):
     """
     Fixture to determine the Base URL for the application.
-    It checks the configuration (Local vs Production) and returns the appropriate URL.
+    It checks the configuration (API_MODE, TEST_MODE) and returns the appropriate URL.
     Scope is 'session' so it runs only once per test suite execution.
     """
-    # Configuration Switch
-    # Set to True to run against localhost, False for Render/Production
-    is_local_mode = False 
-
-    if is_local_mode:
+    if API_MODE == "replay":
+        return request.getfixturevalue("replay_server").url
+    if TEST_MODE == "hermetic":
+        # The backend serves frontend/dist when it exists (build it with VITE_API_URL= for same-origin API calls)
+        return request.getfixturevalue("local_backend").url
+    elif TEST_MODE == "local":
         url = os.getenv("LOCAL_RUN_URL")
         print(f"\n--- Fixture: Running in LOCAL mode: {url} ---")
         return url
@@ -31,46 +168,250 @@ def base_url():
         print(f"\n--- Fixture: Running in PRODUCTION mode: {url} ---")
         return url
 
+@pytest.fixture(scope="session")
+def api_url(base_url):
+    """
+    Fixture for the backend API URL used by the HTTP client.
+    The frontend and the API may be deployed separately, so API_RUN_URL (or LOCAL_API_URL
+    in local mode) can point at the backend. Falls back to base_url when the backend
+    also serves the frontend build.
+    """
+    if TEST_MODE == "hermetic" or API_MODE == "replay":
+        return base_url
+    if TEST_MODE == "local":
+        return os.getenv("LOCAL_API_URL") or base_url
+    return os.getenv("API_RUN_URL") or base_url
+
+@pytest.fixture(scope="session")
+def api_client(api_url):
+    """
+    Session-scoped HTTP client with a pooled keep-alive connection set.
+    Shared by every test of the worker; closed at the end of the session.
+    """
+    with ApiClient(api_url) as client:
+        yield client
+
+@pytest.fixture(scope="session")
+def browser_pool():
+    """
+    Session-scoped pool holding one long-lived Chrome per worker.
+
+    When running in parallel (pytest -n 4), pytest-xdist starts each worker in its own
+    process, so every worker gets its own pool and its own browser.
+    The worker name is taken from PYTEST_XDIST_WORKER ('master' when running serially).
+    """
+    pool = BrowserPool(worker_id=os.getenv("PYTEST_XDIST_WORKER", "master"))
+    yield pool
+    pool.close()
+
 @pytest.fixture
-def driver():
+def driver(browser_pool):
     """
-    Fixture to handle Selenium WebDriver setup and teardown.
+    Fixture that hands the worker's pooled Selenium WebDriver to a test.
     
     Yields:
         driver: A configured Chrome WebDriver instance.
     
     Behavior:
-    - Setup: Installs Chrome driver, initializes it, and sets the window size.
+    - Setup: Reuses the worker's browser (Chrome starts only for the first test of the worker).
     - Yield: Passes the driver to the test function.
-    - Teardown: Automatically calls driver.quit() after the test finishes (even if it fails).
+    - Teardown: Resets the browser (tabs, cookies, localStorage) even if the test failed,
+      so the next test starts logged out on a blank page.
     """
     
     # --- Setup ---
-    print("\n[Fixture] Setting up Chrome Driver...")
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service)
-    
-    # Critical: Set window size to ensure all UI elements (like Sidebar/Forms) are visible
-    driver.set_window_size(1920, 1080)
+    driver = browser_pool.acquire()
     
     # Pass the driver instance to the test function
     yield driver
     
     # --- Teardown ---
-    print("\n[Fixture] Closing Browser...")
-    driver.quit()
+    browser_pool.reset()
 
 @pytest.fixture
-def credentials():
+def steps(driver, request):
+    """
+    Per-step browser metrics for a UI test.
+
+    Usage:
+        steps.step("1. Navigating to Dashboard...")  # prints the banner and starts the step
+
+    Behavior:
+    - Each step records its duration, navigation timing, FCP/LCP, long tasks, JS heap
+      and every /api/* request made during the step (from the Chrome performance log).
+    - Teardown: Writes tests/reports/steps/<test>.json, also when the test failed,
+      and adds the step durations to the duration history (step:<name>).
+    """
+    recorder = StepRecorder(driver, request.node.nodeid)
+    yield recorder
+    recorder.end()
+    for step in recorder.steps:
+        record_phase(request.node, f"step:{step['name'].rstrip('. ')}", step["duration_ms"])
+    path = recorder.write()
+    print(f"\n[Steps] {request.node.name} -> {path}")
+
+@pytest.fixture(scope="session")
+def credentials(request):
     """
     Fixture that provides the test user's login credentials.
-    Fetched securely from the .env file.
+    Fetched securely from the .env file (in hermetic mode: the user seeded by local_backend).
     
     Returns:
         dict: {'email': '...', 'password': '...', 'main_test_user_wedding_code': '...'}
     """
+    if API_MODE == "replay":
+        # Recorded together with the fixtures (the password is never stored)
+        return {**_recorded_session()["credentials"], "password": "replayed-password"}
+    if TEST_MODE == "hermetic":
+        return request.getfixturevalue("local_backend").credentials
     return {
         "email": os.getenv("TEST_EMAIL"),
         "password": os.getenv("TEST_PASSWORD"),
         "main_test_user_wedding_code": os.getenv("MAIN_TEST_USER_WEDDING_CODE")
-    }
\ No newline at end of file
+    }
+
+@pytest.fixture(scope="session")
+def authenticated_session(api_client, credentials):
+    """
+    Logs the test user in once per session through POST /api/users/login.
+
+    Returns:
+        User: The logged-in user; .public is the object exactly as the UI stores it after a login.
+    """
+    if API_MODE == "replay":
+        return User.from_api(_recorded_session()["user"])
+
+    print("\n[Fixture] Logging in through the API...")
+    user = api_client.login(credentials['email'], credentials['password'])
+    if API_MODE == "record":
+        recorded_credentials = {k: v for k, v in credentials.items() if k != "password"}
+        save_fixture(SESSION_FILE, {"credentials": recorded_credentials, "user": user.public}, api_client.api_url)
+    return user
+
+@pytest.fixture(scope="session")
+def maintenance_token(request):
+    """
+    Token for the backend's bulk test-data routes (TEST_MAINTENANCE_TOKEN in tests/.env - the same value
+    the backend runs with). In hermetic mode local_backend generates one. None = routes not available.
+    """
+    if TEST_MODE == "hermetic":
+        return request.getfixturevalue("local_backend").maintenance_token
+    return os.getenv("TEST_MAINTENANCE_TOKEN")
+
+@pytest.fixture(scope="session")
+def run_data(request):
+    """
+    The namespace of this run (one per xdist worker) for everything the tests create.
+
+    Behavior:
+    - Setup: Sweeps test data that crashed runs left behind (older than a few hours).
+    - Tests name their records through run_data.name(...) / run_data.email(...).
+    - Teardown: Deletes everything in the namespace with one bulk backend call, so the
+      shared test account does not grow from run to run.
+    Without a maintenance token nothing is deleted (a warning is printed).
+    """
+    if API_MODE == "replay":
+        # Names must match the recorded responses
+        yield RunData(_recorded_run_data()["namespace"])
+        return
+
+    run = RunData(
+        new_namespace(os.getenv("PYTEST_XDIST_WORKER", "master")),
+        request.getfixturevalue("api_client"),
+        request.getfixturevalue("maintenance_token"),
+    )
+    if API_MODE == "record":
+        save_fixture(RUN_DATA_FILE, {"namespace": run.namespace}, run.api_client.api_url)
+    swept = run.sweep_stale()
+    if swept and any(swept.values()):
+        print(f"\n[Test Data] Swept leftovers of earlier runs: {swept}")
+
+    yield run
+
+    if not run.can_clean_up:
+        print(f"\n[Test Data] ⚠️ TEST_MAINTENANCE_TOKEN not set - records tagged {run.tag} were not deleted")
+        return
+    print(f"\n[Test Data] Cleaned up {run.tag}: {run.cleanup()}")
+
+def _recorded_run_data():
+    recorded = load_fixture(RUN_DATA_FILE)
+    if recorded is None:
+        pytest.skip(f"No recorded run data ({os.path.relpath(RUN_DATA_FILE)}) - run once with API_MODE=record")
+    return recorded
+
+@pytest.fixture(scope="session")
+def seeded_event(run_data, authenticated_session):
+    """
+    An event of the test user, seeded in bulk for this run and deleted with its namespace
+    (guests, expenses and tables included) at the end of the session.
+    """
+    if API_MODE == "replay":
+        return Event(**_recorded_run_data()["event"])
+
+    tomorrow = (datetime.date.today() + datetime.timedelta(days=1)).isoformat()
+    seeded = run_data.seed(
+        authenticated_session.id,
+        events=[{"title": "Selenium Seeded Wedding", "eventDate": tomorrow, "description": "Seeded by the test fixtures"}],
+    )
+    event = seeded.events[0]
+    if API_MODE == "record":
+        save_fixture(RUN_DATA_FILE, {"namespace": run_data.namespace, "event": asdict(event)}, run_data.api_client.api_url)
+    return event
+
+@pytest.fixture(autouse=True)
+def api_fixture(request):
+    """
+    Record/replay of the /api/* traffic of UI tests (API_MODE=record / replay; does nothing when live).
+
+    Behavior:
+    - record: captures every exchange in the browser and writes tests/fixtures/api/<test>.json
+      when the test passed (a failed run never overwrites good fixtures).
+    - replay: loads that file into the replay server; tests without a recording are skipped.
+    The perf tier always runs live.
+    """
+    if API_MODE not in ("record", "replay") or "driver" not in request.fixturenames \
+            or request.node.get_closest_marker("perf"):
+        yield
+        return
+
+    path = fixture_path(request.node.nodeid)
+    if API_MODE == "replay":
+        recorded = load_fixture(path)
+        if recorded is None:
+            pytest.skip(f"No recorded API fixture ({os.path.relpath(path)}) - run once with API_MODE=record")
+        server = request.getfixturevalue("replay_server")
+        server.use(Cassette(recorded["exchanges"]))
+        yield
+        if server.cassette.unmatched:
+            print(f"\n[Replay] Requests without a recorded response: {server.cassette.unmatched}")
+        return
+
+    driver = request.getfixturevalue("driver")
+    identifier = start_recording(driver)
+    yield
+    exchanges = collect_recording(driver, identifier)
+    report = getattr(request.node, "rep_call", None)
+    if report is not None and report.passed:
+        save_fixture(path, {"test": request.node.nodeid, "exchanges": exchanges}, request.getfixturevalue("base_url"))
+        print(f"\n[Record] {len(exchanges)} API exchanges -> {os.path.relpath(path)}")
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Keeps each phase's report on the test item (rep_setup / rep_call / rep_teardown) for fixtures to inspect."""
+    outcome = yield
+    report = outcome.get_result()
+    setattr(item, f"rep_{report.when}", report)
+
+@pytest.fixture
+def signed_in_driver(driver, base_url, authenticated_session):
+    """
+    The pooled driver, already logged in as the test user.
+
+    Behavior:
+    - Setup: Registers a script that puts the cached user into localStorage before the app loads,
+      so the first driver.get() lands directly on the requested page (no login form).
+    - Teardown: Removes the script; the pool reset then clears localStorage.
+    """
+    identifier = seed_logged_in_user(driver, base_url, authenticated_session)
+    yield driver
+    clear_seeded_user(driver, identifier)
@@ -0,0 +1,7 @@
+"""
+Performance tooling: load generators, harnesses and benchmarks.
+
+The modules are runnable from the tests folder, e.g.:
+    python -m perf.rsvp_load --base-url http://localhost:4000 --event-id <id>
+The test_*.py files next to them are opt-in (pytest -m perf) and run against the hermetic backend.
+"""
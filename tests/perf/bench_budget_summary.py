@@ -0,0 +1,144 @@
+"""
+Budget summary benchmark (backend/budgetSummary.js).
+
+Adds thousands of expenses to one event concurrently over the API, edits and deletes part of them
+concurrently, then checks that the stored totals still equal the sums over the remaining items and
+times the budget read: summary only (?items=false, one event lookup) and with the full item list.
+
+Usage (from the tests folder):
+    python -m perf.bench_budget_summary --base-url http://localhost:4000 --user-id <userId> --items 5000 --reads 200
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import defaultdict
+
+import httpx
+
+from perf.stats import latency_summary
+from support.api_client import ApiClient, AsyncApiClient
+
+CATEGORIES = ["אולם וקייטרינג", "צילום", "מוזיקה", "ביגוד וטיפוח", "עיצוב", "מתנות", "טקסים", "כללי", "אחר"]
+
+
+async def _add_and_edit(base_url, event_id, items, edits, concurrency, seed):
+    rng = random.Random(seed)
+    semaphore = asyncio.Semaphore(concurrency)
+    async with AsyncApiClient(base_url) as api:
+        async def limited(call):
+            async with semaphore:
+                return await call
+
+        started = time.perf_counter()
+        added = await asyncio.gather(*(
+            limited(api.add_expense(event_id, f"Bench Expense {i}", rng.randint(100, 20000),
+                                    category=rng.choice(CATEGORIES), is_paid=rng.random() < 0.3))
+            for i in range(items)
+        ))
+        add_s = time.perf_counter() - started
+
+        # Edits race each other on purpose: several writes may hit the same item at once
+        targets = [rng.choice(added) for _ in range(edits)]
+        calls = []
+        for i, item in enumerate(targets):
+            kind = i % 3
+            if kind == 0:
+                calls.append(api.update_expense(item.id, is_paid=rng.random() < 0.5))
+            elif kind == 1:
+                calls.append(api.update_expense(item.id, amount=rng.randint(100, 20000), category=rng.choice(CATEGORIES)))
+            else:
+                calls.append(api.delete_expense(item.id))
+        started = time.perf_counter()
+        await asyncio.gather(*(limited(call) for call in calls), return_exceptions=True)
+        edit_s = time.perf_counter() - started
+    return round(add_s, 2), round(edit_s, 2)
+
+
+def check_consistency(api, event_id):
+    """Compares the stored summary with the sums over the item list; returns the differences (empty = consistent)."""
+    budget = api.get_budget(event_id)
+    chart = defaultdict(float)
+    for item in budget.items:
+        chart[item.category] += item.amount
+    expected = {
+        "totalExpenses": sum(i.amount for i in budget.items),
+        "totalPaid": sum(i.amount for i in budget.items if i.is_paid),
+        "chart": dict(chart),
+    }
+    actual = {
+        "totalExpenses": budget.summary.totalExpenses,
+        "totalPaid": budget.summary.totalPaid,
+        "chart": {c["name"]: c["value"] for c in budget.chartData},
+    }
+    differences = {}
+    for key in ("totalExpenses", "totalPaid"):
+        if abs(expected[key] - actual[key]) > 0.01:
+            differences[key] = {"expected": expected[key], "stored": actual[key]}
+    for category in set(expected["chart"]) | set(actual["chart"]):
+        if abs(expected["chart"].get(category, 0) - actual["chart"].get(category, 0)) > 0.01:
+            differences[category] = {"expected": expected["chart"].get(category), "stored": actual["chart"].get(category)}
+    return len(budget.items), differences
+
+
+def _time_reads(client, event_id, reads, params=None):
+    latencies, size = [], 0
+    for _ in range(reads):
+        started = time.perf_counter()
+        response = client.get(f"/api/events/{event_id}/budget", params=params)
+        latencies.append((time.perf_counter() - started) * 1000)
+        response.raise_for_status()
+        size = len(response.content)
+    return {**latency_summary(latencies), "bytes": size}
+
+
+def run_benchmark(base_url, user_id, items=5000, edits=1000, reads=200, concurrency=50, seed=1):
+    base_url = base_url.rstrip('/')
+    with ApiClient(base_url) as api:
+        event_id = api.create_event(user_id, f"Budget Bench {items}", "2030-06-01").id
+
+    add_s, edit_s = asyncio.run(_add_and_edit(base_url, event_id, items, edits, concurrency, seed))
+
+    with ApiClient(base_url) as api:
+        remaining, differences = check_consistency(api, event_id)
+
+    with httpx.Client(base_url=base_url, timeout=60) as client:
+        summary_only = _time_reads(client, event_id, reads, {"items": "false"})
+        with_items = _time_reads(client, event_id, max(1, reads // 10))
+
+    return {
+        "items": items,
+        "edits": edits,
+        "remaining_items": remaining,
+        "add_s": add_s,
+        "edit_s": edit_s,
+        "differences": differences,
+        "summary_read": summary_only,
+        "full_read": with_items,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Budget summary consistency and read benchmark")
+    parser.add_argument("--base-url", required=True)
+    parser.add_argument("--user-id", required=True, help="Owner of the benchmark event")
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--edits", type=int, default=1000, help="Concurrent edits/deletes after seeding")
+    parser.add_argument("--reads", type=int, default=200)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = run_benchmark(args.base_url, args.user_id, args.items, args.edits, args.reads)
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    print(text)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
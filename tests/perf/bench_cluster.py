@@ -0,0 +1,143 @@
+"""
+Cluster mode harness (backend/cluster.js): throughput against a single process, plus edit-lock
+exclusivity and broadcast delivery across workers.
+
+1. Throughput: the same read load (a large guest list and the dashboard lists, gzip like a browser)
+   for a fixed time against a single-process backend and against the cluster - requests per second.
+2. Sockets: the fan-out/lock harness (perf.socket_fanout) against the cluster, starting with long-polling
+   like the browser (so the sticky routing of the session is exercised). Clients land on different
+   workers; every broadcast must reach every client exactly once and every lock round must have
+   exactly one holder, whichever worker each contender is on.
+3. Seating race: many guests are seated on one small table at once, through every worker. The capacity
+   check and the write hold a lock shared by the workers, so the table must never go over capacity.
+
+Usage (from the tests folder, both backends on the same database):
+    python -m perf.bench_cluster --single-url http://localhost:4000 --cluster-url http://localhost:4100 \\
+        --user-id <userId> --event-id <eventId> --concurrency 64 --duration 10
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+
+from perf.socket_fanout import FanoutConfig, run_fanout
+from perf.stats import latency_summary
+from support.api_client import AsyncApiClient
+
+
+def read_paths(user_id, event_id):
+    return [
+        f"/api/events/{event_id}/guests",
+        f"/api/events/{event_id}/budget",
+        f"/api/events?userId={user_id}",
+        f"/api/tasks?userId={user_id}",
+    ]
+
+
+async def _load(base_url, paths, concurrency, duration):
+    latencies, errors = [], 0
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30,
+                                 headers={"Accept-Encoding": "gzip"}) as client:
+        deadline = time.perf_counter() + duration
+
+        async def worker(i):
+            nonlocal errors
+            n = i
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                response = await client.get(paths[n % len(paths)])
+                latencies.append((time.perf_counter() - started) * 1000)
+                errors += response.status_code != 200
+                n += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        wall_s = time.perf_counter() - started
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / wall_s, 1),
+        "latency": latency_summary(latencies),
+    }
+
+
+def measure_throughput(base_url, paths, concurrency=64, duration=10.0, warmup=2.0):
+    base_url = base_url.rstrip('/')
+    asyncio.run(_load(base_url, paths, concurrency, warmup))
+    return asyncio.run(_load(base_url, paths, concurrency, duration))
+
+
+def seating_race(base_url, event_id, capacity=10, contenders=40):
+    """Seats `contenders` unseated guests on a new table of `capacity` seats at once; returns the outcome."""
+    async def race():
+        async with AsyncApiClient(base_url) as api:
+            guests = [g for g in await api.list_guests(event_id) if not g.table_id][:contenders]
+            table = await api.create_table(event_id, f"Race Table {time.time_ns()}", capacity)
+            responses = await asyncio.gather(*(
+                api.http.put(f"/api/guests/{g.id}/seat", json={"tableId": table["_id"]}) for g in guests
+            ))
+            seated = [g for g in await api.list_guests(event_id) if g.table_id == table["_id"]]
+            return {
+                "contenders": len(guests),
+                "capacity": capacity,
+                "accepted": sum(r.status_code == 200 for r in responses),
+                "rejected_full": sum(r.status_code == 400 for r in responses),
+                "errors": sum(r.status_code not in (200, 400) for r in responses),
+                "seats_taken": sum(g.amount_invited or 1 for g in seated),
+            }
+    return asyncio.run(race())
+
+
+def run_benchmark(single_url, cluster_url, user_id, event_id, concurrency=64, duration=10.0,
+                  clients=80, mutations=20, lock_contenders=16, lock_rounds=20):
+    paths = read_paths(user_id, event_id)
+    single = measure_throughput(single_url, paths, concurrency, duration)
+    clustered = measure_throughput(cluster_url, paths, concurrency, duration)
+
+    config = FanoutConfig(
+        base_url=cluster_url, event_id=event_id, user_id=user_id, clients=clients, mutations=mutations,
+        lock_contenders=lock_contenders, lock_rounds=lock_rounds, transports=("polling", "websocket"),
+    )
+    sockets = asyncio.run(run_fanout(config))
+    seating = seating_race(cluster_url, event_id)
+
+    return {
+        "throughput": {
+            "single": single,
+            "cluster": clustered,
+            "speedup": round(clustered["rps"] / max(single["rps"], 0.1), 2),
+        },
+        "sockets": sockets,
+        "seating": seating,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Cluster mode throughput, lock and broadcast harness")
+    parser.add_argument("--single-url", required=True, help="A backend started with node index.js")
+    parser.add_argument("--cluster-url", required=True, help="A backend started with node cluster.js")
+    parser.add_argument("--user-id", required=True)
+    parser.add_argument("--event-id", required=True, help="An event of the user, ideally with many guests")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of load per backend")
+    parser.add_argument("--clients", type=int, default=80, help="Socket.io clients across the workers")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = run_benchmark(args.single_url, args.cluster_url, args.user_id, args.event_id,
+                           args.concurrency, args.duration, args.clients)
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    print(text)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Cold start harness: how soon a freshly started backend (node index.js) answers, lazy boot against eager boot.
+
+1. Boots: `node index.js` is started `--runs` times per STARTUP_MODE (lazy, eager) and /api/health is
+   polled every few milliseconds. Per boot: time to the first answer, time until the boot is ready
+   (MongoDB connected, scheduler started), and the stages/lazy modules reported by /api/health.
+   With --event-id, a guest export is requested after the boot, to time the first use of a lazy module.
+2. Modules: the require() cost of every heavy dependency, each in a fresh Node process.
+
+Usage (from the tests folder, against any MongoDB):
+    python -m perf.bench_cold_start --mongo-uri mongodb://127.0.0.1:27017 --db-name wedding_db --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import time
+
+import httpx
+
+from support.local_backend import BACKEND_DIR, LOG_DIR, free_port
+
+MODES = ("lazy", "eager")
+MODULES = [
+    "express", "mongoose", "socket.io", "bcryptjs", "node-cron", "twilio",
+    "nodemailer", "multer", "xlsx", "csv-parser", "./guestTransfer",
+]
+POLL_S = 0.005
+
+REQUIRE_COST_JS = """
+const started = process.hrtime.bigint();
+require(process.argv[1]);
+console.log(Number(process.hrtime.bigint() - started) / 1e6);
+"""
+
+
+def measure_boot(mongo_uri, db_name, mode, event_id=None, timeout=60):
+    """One cold start of node index.js in STARTUP_MODE=`mode`; times are ms since the process was spawned."""
+    os.makedirs(LOG_DIR, exist_ok=True)
+    port = free_port()
+    env = {
+        **os.environ,
+        "PORT": str(port),
+        "MONGO_URI": mongo_uri,
+        "DB_NAME": db_name,
+        "STARTUP_MODE": mode,
+    }
+    base_url = f"http://127.0.0.1:{port}"
+    result = {"mode": mode, "first_response_ms": None, "ready_ms": None}
+
+    with open(os.path.join(LOG_DIR, f'backend-cold-start-{mode}.log'), 'w', encoding='utf-8') as log:
+        spawned = time.perf_counter()
+        process = subprocess.Popen(['node', 'index.js'], cwd=BACKEND_DIR, env=env, stdout=log, stderr=subprocess.STDOUT)
+        try:
+            with httpx.Client(base_url=base_url, timeout=5) as http:
+                deadline = spawned + timeout
+                health = None
+                while time.perf_counter() < deadline:
+                    if process.poll() is not None:
+                        raise RuntimeError(f"backend exited early (code {process.returncode}), see {log.name}")
+                    try:
+                        response = http.get('/api/health')
+                    except httpx.TransportError:
+                        time.sleep(POLL_S)
+                        continue
+                    elapsed = round((time.perf_counter() - spawned) * 1000, 1)
+                    if result["first_response_ms"] is None:
+                        result["first_response_ms"] = elapsed
+                    health = response.json()
+                    if health.get("startup", {}).get("ready"):
+                        result["ready_ms"] = elapsed
+                        break
+                    time.sleep(POLL_S)
+                else:
+                    raise RuntimeError(f"backend not ready within {timeout}s, see {log.name}")
+
+                result["startup"] = health["startup"]
+                result["rss_at_ready"] = health["memory"]["rss"]
+
+                if event_id:
+                    started = time.perf_counter()
+                    response = http.get(f'/api/events/{event_id}/guests/export', params={"format": "csv"})
+                    result["first_export"] = {
+                        "status": response.status_code,
+                        "ms": round((time.perf_counter() - started) * 1000, 1),
+                        "lazy": http.get('/api/health').json()["startup"]["lazy"],
+                    }
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+    return result
+
+
+def require_costs(modules=MODULES):
+    """ms to require() each module in a fresh Node process (cold module cache)."""
+    costs = {}
+    for module in modules:
+        completed = subprocess.run(['node', '-e', REQUIRE_COST_JS, module], cwd=BACKEND_DIR,
+                                   capture_output=True, text=True, timeout=60)
+        costs[module] = round(float(completed.stdout.strip()), 1) if completed.returncode == 0 else None
+    return costs
+
+
+def _summary(boots, field):
+    values = [boot[field] for boot in boots]
+    return {"median": round(statistics.median(values), 1), "min": min(values), "max": max(values)}
+
+
+def run_benchmark(mongo_uri, db_name, runs=5, event_id=None):
+    modes = {}
+    for mode in MODES:
+        boots = [measure_boot(mongo_uri, db_name, mode, event_id) for _ in range(runs)]
+        modes[mode] = {
+            "first_response_ms": _summary(boots, "first_response_ms"),
+            "ready_ms": _summary(boots, "ready_ms"),
+            "boots": boots,
+        }
+    return {
+        "runs": runs,
+        "modes": modes,
+        "first_response_saved_ms": round(
+            modes["eager"]["first_response_ms"]["median"] - modes["lazy"]["first_response_ms"]["median"], 1),
+        "require_ms": require_costs(),
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Backend cold start: lazy against eager boot")
+    parser.add_argument("--mongo-uri", required=True)
+    parser.add_argument("--db-name", default="wedding_db")
+    parser.add_argument("--runs", type=int, default=5, help="Boots per startup mode")
+    parser.add_argument("--event-id", help="An event with guests, exported once after every boot")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = run_benchmark(args.mongo_uri, args.db_name, args.runs, args.event_id)
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    print(text)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Concurrent dashboard loads, for the identity cache (backend/identityCache.js).
+
+Every simulated dashboard loads what Dashboard.jsx loads after each `data_changed` -
+GET /api/events, /api/tasks and /api/notifications at once - for a mix of couples and partners.
+Run it against a backend with the cache (default) and one with IDENTITY_CACHE_TTL_MS=0 to see
+the latency saved by skipping the per-request user lookup; the cache counters come from /api/health.
+
+Usage (from the tests folder):
+    python -m perf.bench_dashboard_loads --base-url http://localhost:4000 --couples 10 --partners 2 --dashboards 50 --rounds 20
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+
+from perf.stats import latency_summary
+from support.api_client import ApiClient
+
+DASHBOARD_ROUTES = ["/api/events", "/api/tasks", "/api/notifications"]
+
+
+def seed_dashboard_users(api_url, couples, partners_per_couple, tag="bench"):
+    """Registers couples (one event and a few tasks each) and their partners; returns every user id."""
+    user_ids = []
+    stamp = time.time_ns()
+    with ApiClient(api_url) as api:
+        for c in range(couples):
+            couple = api.register(f"dash.{tag}.{stamp}.{c}@example.com", "BenchPassword1!", f"Couple {c}")
+            api.create_event(couple.id, f"Dashboard Bench {c}", "2030-06-01")
+            for t in range(3):
+                api.create_task(couple.id, f"Bench Task {t}", "2030-05-01")
+            user_ids.append(couple.id)
+            for p in range(partners_per_couple):
+                partner = api.register(
+                    f"dash.{tag}.{stamp}.{c}.p{p}@example.com", "BenchPassword1!", f"Partner {c}.{p}",
+                    wedding_code=couple.wedding_code,
+                )
+                user_ids.append(partner.id)
+    return user_ids
+
+
+async def _load_dashboards(base_url, user_ids, dashboards, rounds):
+    latencies = {route: [] for route in DASHBOARD_ROUTES}
+    errors = 0
+    limits = httpx.Limits(max_connections=dashboards, max_keepalive_connections=dashboards)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        async def get(route, user_id):
+            nonlocal errors
+            started = time.perf_counter()
+            response = await client.get(route, params={"userId": user_id})
+            if response.status_code != 200:
+                errors += 1
+            latencies[route].append((time.perf_counter() - started) * 1000)
+
+        async def dashboard(i):
+            user_id = user_ids[i % len(user_ids)]
+            for _ in range(rounds):
+                await asyncio.gather(*(get(route, user_id) for route in DASHBOARD_ROUTES))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(dashboard(i) for i in range(dashboards)))
+        wall_s = time.perf_counter() - started
+
+        health = (await client.get("/api/health")).json()
+
+    return {
+        "wall_s": round(wall_s, 2),
+        "requests": sum(len(v) for v in latencies.values()),
+        "errors": errors,
+        "routes": {route: latency_summary(values) for route, values in latencies.items()},
+        "identity_cache": health.get("identityCache"),
+    }
+
+
+def run_benchmark(base_url, user_ids, dashboards=50, rounds=20, warmup_rounds=2):
+    """Loads the dashboards (after a short warm-up) and returns latency per route plus the cache counters."""
+    base_url = base_url.rstrip('/')
+    asyncio.run(_load_dashboards(base_url, user_ids, min(dashboards, len(user_ids)), warmup_rounds))
+    return asyncio.run(_load_dashboards(base_url, user_ids, dashboards, rounds))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent dashboard load benchmark")
+    parser.add_argument("--base-url", required=True)
+    parser.add_argument("--couples", type=int, default=10)
+    parser.add_argument("--partners", type=int, default=2, help="Partners per couple")
+    parser.add_argument("--dashboards", type=int, default=50, help="Concurrent dashboards")
+    parser.add_argument("--rounds", type=int, default=20, help="Refreshes per dashboard")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    user_ids = seed_dashboard_users(args.base_url, args.couples, args.partners)
+    report = run_benchmark(args.base_url, user_ids, args.dashboards, args.rounds)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
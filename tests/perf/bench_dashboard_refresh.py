@@ -0,0 +1,137 @@
+"""
+Dashboard refresh replay for conditional GET and compression (backend/conditional.js).
+
+Replays what the frontend does after every `data_changed`: one change (a guest, an expense, a task,
+a vendor or a table) followed by a refetch of all six data routes. The refetch is done twice -
+like a browser (If-None-Match with the last ETag, Accept-Encoding: gzip) and like the old
+frontend without either - and the bytes on the wire and the 304 hit ratio are compared.
+A 304 for the route a change touched is counted as stale.
+
+Usage (from the tests folder, against a user and their event - e.g. loaded with perf.dataset):
+    python -m perf.bench_dashboard_refresh --base-url http://localhost:4000 --user-id <userId> --event-id <eventId> --rounds 30
+"""
+import argparse
+import json
+import time
+
+import httpx
+
+from perf.stats import latency_summary
+from support.api_client import ApiClient
+
+
+def dashboard_routes(user_id, event_id):
+    """The six lists the frontend refetches: {name: (path, params)}."""
+    return {
+        "events": ("/api/events", {"userId": user_id}),
+        "tasks": ("/api/tasks", {"userId": user_id}),
+        "guests": (f"/api/events/{event_id}/guests", None),
+        "budget": (f"/api/events/{event_id}/budget", None),
+        "vendors": ("/api/vendors", {"userId": user_id}),
+        "tables": (f"/api/events/{event_id}/tables", None),
+    }
+
+
+def changes(api, user_id, event_id):
+    """The writes replayed between refreshes, in turn: (name, routes whose answer it changes, write)."""
+    return [
+        ("guest", {"guests"}, lambda i: api.add_guest(event_id, f"Refresh Guest {i}", phone=f"0549{i:06d}")),
+        # An expense also updates the budget summary stored on the event
+        ("expense", {"budget", "events"}, lambda i: api.add_expense(event_id, f"Refresh Expense {i}", 100 + i)),
+        ("task", {"tasks"}, lambda i: api.create_task(user_id, f"Refresh Task {i}", "2030-01-01")),
+        ("vendor", {"vendors"}, lambda i: api.add_vendor(user_id, f"Refresh Vendor {i}", "Music")),
+        ("table", {"tables"}, lambda i: api.create_table(event_id, f"Refresh Table {i}", 10)),
+    ]
+
+
+class _Fetcher:
+    """Fetches the routes and keeps count of bytes and statuses; conditional=True behaves like a browser cache."""
+
+    def __init__(self, client, routes, conditional):
+        self.client = client
+        self.routes = routes
+        self.conditional = conditional
+        self.etags = {}
+        self.stats = {"requests": 0, "not_modified": 0, "wire_bytes": 0, "json_bytes": 0, "latencies": []}
+
+    def refresh(self):
+        statuses = {}
+        for name, (path, params) in self.routes.items():
+            headers = {"Accept-Encoding": "gzip" if self.conditional else "identity"}
+            if self.conditional and name in self.etags:
+                headers["If-None-Match"] = self.etags[name]
+            started = time.perf_counter()
+            response = self.client.get(path, params=params, headers=headers)
+            self.stats["latencies"].append((time.perf_counter() - started) * 1000)
+            if response.status_code not in (200, 304):
+                response.raise_for_status()
+            self.stats["requests"] += 1
+            self.stats["wire_bytes"] += response.num_bytes_downloaded
+            self.stats["json_bytes"] += len(response.content)
+            if response.status_code == 304:
+                self.stats["not_modified"] += 1
+            elif "etag" in response.headers:
+                self.etags[name] = response.headers["etag"]
+            statuses[name] = response.status_code
+        return statuses
+
+    def report(self):
+        stats = dict(self.stats)
+        latencies = stats.pop("latencies")
+        stats["hit_ratio"] = round(stats["not_modified"] / max(stats["requests"], 1), 3)
+        return {**stats, "latency": latency_summary(latencies)}
+
+
+def run_benchmark(base_url, user_id, event_id, rounds=30):
+    """Initial load, then `rounds` change + refresh cycles; returns the conditional and the plain numbers."""
+    base_url = base_url.rstrip('/')
+    routes = dashboard_routes(user_id, event_id)
+    stale = []
+    with ApiClient(base_url) as api, httpx.Client(base_url=base_url, timeout=60) as client:
+        browser, plain = _Fetcher(client, routes, conditional=True), _Fetcher(client, routes, conditional=False)
+        browser.refresh()
+        plain.refresh()
+        # Only the refreshes after a change are compared (the first load is a full load either way)
+        browser.stats.update(requests=0, not_modified=0, wire_bytes=0, json_bytes=0, latencies=[])
+        plain.stats.update(requests=0, not_modified=0, wire_bytes=0, json_bytes=0, latencies=[])
+
+        writes = changes(api, user_id, event_id)
+        for i in range(rounds):
+            name, touched, write = writes[i % len(writes)]
+            write(i)
+            statuses = browser.refresh()
+            stale += [f"{name} -> {route}" for route in touched if statuses[route] == 304]
+            plain.refresh()
+
+    conditional, baseline = browser.report(), plain.report()
+    return {
+        "rounds": rounds,
+        "conditional": conditional,
+        "plain": baseline,
+        "stale": stale,
+        "wire_bytes_saved": round(1 - conditional["wire_bytes"] / max(baseline["wire_bytes"], 1), 3),
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Dashboard refresh replay (ETag/304 and compression)")
+    parser.add_argument("--base-url", required=True)
+    parser.add_argument("--user-id", required=True, help="Owner of the event (a couple)")
+    parser.add_argument("--event-id", required=True)
+    parser.add_argument("--rounds", type=int, default=30, help="Change + refresh cycles")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = run_benchmark(args.base_url, args.user_id, args.event_id, args.rounds)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Scale benchmark for the paged guest list (GET /api/events/:eventId/guests?limit=&cursor=).
+
+Seeds one event with many guests straight into the backend's database (pymongo bulk inserts),
+then walks the whole list page by page and records latency and payload size of every page:
+with keyset pagination the last page must cost about the same as the first one.
+For comparison the unpaged list (the old full array) is fetched once.
+
+Usage (from the tests folder, against a backend and its database):
+    python -m perf.bench_guest_pages --base-url http://localhost:4000 --mongo-uri mongodb://127.0.0.1:27017 \\
+        --db-name wedding_planner --user-id <userId> --guests 50000
+"""
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+import httpx
+from bson import ObjectId
+from pymongo import MongoClient
+
+from perf.dataset import generate_guests, insert_batched
+from perf.stats import percentile
+
+
+def seed_event_with_guests(db, user_id, guests, seed=1):
+    """Inserts one event and `guests` generated guests (perf/dataset.py) for it; returns the event id (str)."""
+    rng = random.Random(seed)
+    event_id = ObjectId()
+    now = datetime.now(timezone.utc)
+    db.events.insert_one({
+        "_id": event_id, "user_id": ObjectId(user_id), "title": f"Paging Bench {guests}",
+        "event_date": now + timedelta(days=90), "is_main_event": False, "created_at": now, "updated_at": now,
+    })
+
+    # Imports create many guests within the same millisecond - ties are broken by _id
+    insert_batched(db.guests, generate_guests(
+        rng, event_id, guests, now, phone_digits=lambda i: f"{i:08d}", no_phone_share=0, name_prefix="Bench",
+    ))
+    return str(event_id)
+
+
+def _timed_get(client, url, params=None):
+    started = time.perf_counter()
+    response = client.get(url, params=params)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    response.raise_for_status()
+    return response, elapsed_ms
+
+
+def walk_pages(client, event_id, limit, fields=None, sort=None):
+    """Fetches every page; returns per-page latency/bytes and the ids seen."""
+    pages, ids, cursor = [], [], None
+    while True:
+        params = {"limit": limit}
+        if fields:
+            params["fields"] = ",".join(fields)
+        if sort:
+            params["sort"] = sort
+        if cursor:
+            params["cursor"] = cursor
+        response, elapsed_ms = _timed_get(client, f"/api/events/{event_id}/guests", params)
+        body = response.json()
+        pages.append({"ms": round(elapsed_ms, 2), "bytes": len(response.content), "items": len(body["items"])})
+        ids += [item["id"] for item in body["items"]]
+        if not body["hasMore"]:
+            return pages, ids
+        cursor = body["nextCursor"]
+
+
+def summarize(pages):
+    latencies = [p["ms"] for p in pages]
+    head = latencies[: max(1, len(latencies) // 10)]
+    tail = latencies[-max(1, len(latencies) // 10):]
+    return {
+        "pages": len(pages),
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "max_ms": round(max(latencies), 2),
+        "max_bytes": max(p["bytes"] for p in pages),
+        "first_10pct_mean_ms": round(sum(head) / len(head), 2),
+        "last_10pct_mean_ms": round(sum(tail) / len(tail), 2),
+    }
+
+
+def run_benchmark(base_url, mongo_uri, db_name, user_id, guests, limit=100):
+    mongo = MongoClient(mongo_uri)
+    try:
+        started = time.perf_counter()
+        event_id = seed_event_with_guests(mongo[db_name], user_id, guests)
+        seed_s = time.perf_counter() - started
+    finally:
+        mongo.close()
+
+    with httpx.Client(base_url=base_url.rstrip('/'), timeout=120) as client:
+        full, full_ms = _timed_get(client, f"/api/events/{event_id}/guests")
+        paged, paged_ids = walk_pages(client, event_id, limit)
+        projected, _ = walk_pages(client, event_id, limit, fields=["full_name", "phone", "rsvp_status"])
+        by_name, by_name_ids = walk_pages(client, event_id, limit, sort="full_name")
+
+    return {
+        "guests": guests,
+        "limit": limit,
+        "event_id": event_id,
+        "seed_s": round(seed_s, 2),
+        "unpaged": {"ms": round(full_ms, 2), "bytes": len(full.content), "items": len(full.json())},
+        "paged": {**summarize(paged), "items": len(paged_ids), "unique": len(set(paged_ids))},
+        "projected": summarize(projected),
+        "by_name": {**summarize(by_name), "items": len(by_name_ids), "unique": len(set(by_name_ids))},
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Paged guest list benchmark")
+    parser.add_argument("--base-url", required=True)
+    parser.add_argument("--mongo-uri", required=True)
+    parser.add_argument("--db-name", required=True, help="The backend's database (DB_NAME)")
+    parser.add_argument("--user-id", required=True, help="Owner of the seeded event")
+    parser.add_argument("--guests", type=int, default=50000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = run_benchmark(args.base_url, args.mongo_uri, args.db_name, args.user_id, args.guests, args.limit)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Benchmark for the guest import/export routes (backend/guestTransfer.js).
+
+For every size it generates a guest file (Excel and/or CSV), then measures against a fresh event:
+  - import of the file (all rows new),
+  - re-import of the same file (all rows update the existing guests by phone - no duplicates),
+  - export as Excel and as CSV,
+and the backend's peak RSS during each step.
+
+Peak RSS is sampled from /proc/<pid>/status when the backend runs on this machine (--backend-pid,
+or the LocalBackend process in the perf tests); otherwise from the "memory" block of /api/health.
+
+Usage (from the tests folder):
+    python -m perf.bench_guest_transfer --base-url http://localhost:4000 --user-id <id> --sizes 1000 10000 100000
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+
+import httpx
+from openpyxl import Workbook
+
+from support.api_client import ApiClient
+
+FORMATS = ("xlsx", "csv")
+HEADERS = ["שם מלא", "טלפון", "כמות", "סטטוס"]
+STATUSES = ["מגיע", "לא מגיע", "אולי", ""]
+
+
+def _guest_rows(count, seed):
+    rng = random.Random(seed)
+    for i in range(count):
+        yield [f"Bench Guest {i}", f"052{i:07d}", rng.randint(1, 5), rng.choice(STATUSES)]
+
+
+def write_guest_xlsx(path, count, seed=1):
+    """Writes `count` guest rows with openpyxl's write-only mode (constant memory for any size)."""
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("מוזמנים")
+    sheet.append(HEADERS)
+    for row in _guest_rows(count, seed):
+        sheet.append(row)
+    workbook.save(path)
+    return path
+
+
+def write_guest_csv(path, count, seed=1):
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        f.write(",".join(HEADERS) + "\r\n")
+        for row in _guest_rows(count, seed):
+            f.write(",".join(str(v) for v in row) + "\r\n")
+    return path
+
+
+def _proc_rss(pid):
+    try:
+        with open(f"/proc/{pid}/status", encoding='utf-8') as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+
+class PeakRssSampler:
+    """Samples the backend's RSS in a background thread while a request runs (use as a context manager)."""
+
+    def __init__(self, base_url, pid=None, interval=0.05):
+        self.base_url = base_url
+        self.pid = pid
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self, http):
+        if self.pid:
+            return _proc_rss(self.pid)
+        try:
+            return http.get('/api/health').json().get("memory", {}).get("rss")
+        except (httpx.HTTPError, ValueError):
+            return None
+
+    def _run(self):
+        with httpx.Client(base_url=self.base_url, timeout=2) as http:
+            while not self._stop.is_set():
+                rss = self._sample(http)
+                if rss:
+                    self.peak = max(self.peak, rss)
+                self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    @property
+    def peak_mb(self):
+        return round(self.peak / (1024 * 1024), 1) if self.peak else None
+
+
+def _timed(base_url, pid, call):
+    with PeakRssSampler(base_url, pid) as sampler:
+        started = time.perf_counter()
+        result = call()
+        elapsed = time.perf_counter() - started
+    return result, {"seconds": round(elapsed, 3), "peak_rss_mb": sampler.peak_mb}
+
+
+def bench_size(base_url, user_id, count, fmt, workdir, pid=None, timeout=600):
+    """Runs import, re-import and both exports for one size/format and returns the measurements."""
+    path = os.path.join(workdir, f"guests_{count}.{fmt}")
+    if not os.path.exists(path):
+        (write_guest_xlsx if fmt == "xlsx" else write_guest_csv)(path, count)
+
+    with ApiClient(base_url, timeout=timeout) as api:
+        event = api.create_event(user_id, f"Transfer Bench {count} {fmt}", "2030-06-01")
+        http = api.http
+
+        def upload():
+            with open(path, 'rb') as f:
+                response = http.post(f"/api/events/{event.id}/guests/import", files={"file": (os.path.basename(path), f)})
+            response.raise_for_status()
+            return response.json()
+
+        def export(export_format):
+            size = 0
+            with http.stream("GET", f"/api/events/{event.id}/guests/export", params={"format": export_format}) as response:
+                response.raise_for_status()
+                for chunk in response.iter_bytes():
+                    size += len(chunk)
+            return size
+
+        imported, import_stats = _timed(base_url, pid, upload)
+        reimported, reimport_stats = _timed(base_url, pid, upload)
+        xlsx_bytes, export_xlsx_stats = _timed(base_url, pid, lambda: export("xlsx"))
+        csv_bytes, export_csv_stats = _timed(base_url, pid, lambda: export("csv"))
+        stored = len(api.request("GET", f"/api/events/{event.id}/guests"))
+
+    return {
+        "rows": count,
+        "format": fmt,
+        "file_bytes": os.path.getsize(path),
+        "import": {**import_stats, "rows_per_s": round(count / import_stats["seconds"]),
+                   **{k: imported[k] for k in ("inserted", "updated", "failed")}},
+        "reimport": {**reimport_stats, **{k: reimported[k] for k in ("inserted", "updated", "failed")}},
+        "export_xlsx": {**export_xlsx_stats, "bytes": xlsx_bytes},
+        "export_csv": {**export_csv_stats, "bytes": csv_bytes},
+        "guests_stored": stored,
+    }
+
+
+def run_benchmark(base_url, user_id, sizes, formats=FORMATS, pid=None, workdir=None):
+    with tempfile.TemporaryDirectory(prefix="guest-transfer-") as tmp:
+        results = [bench_size(base_url, user_id, count, fmt, workdir or tmp, pid)
+                   for count in sizes for fmt in formats]
+    return {"base_url": base_url, "results": results}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Guest import/export benchmark")
+    parser.add_argument("--base-url", required=True, help="Backend URL, e.g. http://localhost:4000")
+    parser.add_argument("--user-id", required=True, help="Owner of the benchmark events")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=list(FORMATS))
+    parser.add_argument("--backend-pid", type=int, help="Sample RSS from /proc instead of /api/health")
+    parser.add_argument("--workdir", help="Keep the generated files in this folder")
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = run_benchmark(args.base_url, args.user_id, args.sizes, args.formats, args.backend_pid, args.workdir)
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    print(text)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
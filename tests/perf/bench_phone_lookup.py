@@ -0,0 +1,143 @@
+"""
+RSVP phone lookup benchmark for the indexed phone_normalized field (backend/phone.js, models/Guest.js).
+
+Seeds events of growing size straight into the backend's database (pymongo) the way older data looks:
+phones in mixed formats ("050-1234567", "+972501234567", "0501234567") and no phone_normalized.
+Then runs the backfill (`node scripts/backfill-guest-phones.js`) and times POST /api/rsvp/lookup for
+known guests, typing each phone in a different format than the stored one. With the
+(event_id, phone_normalized) index the latency and the documents examined per lookup stay flat
+as the event grows.
+
+Usage (from the tests folder, against a backend and its database):
+    python -m perf.bench_phone_lookup --base-url http://localhost:4000 --mongo-uri mongodb://127.0.0.1:27017 \\
+        --db-name wedding_planner --user-id <userId> --sizes 1000 10000 50000
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import time
+from datetime import datetime, timedelta, timezone
+
+import httpx
+from bson import ObjectId
+from pymongo import MongoClient
+
+from perf.dataset import generate_guests, insert_batched
+from perf.stats import latency_summary
+from support.local_backend import BACKEND_DIR
+
+TYPED_FORMATS = [
+    lambda n: f"+972 5{n[:1]} {n[1:4]} {n[4:]}",
+    lambda n: f"05{n}",
+    lambda n: f"9725{n}",
+]
+
+
+def seed_legacy_event(db, user_id, guests, size_index, seed=1):
+    """Inserts an event with `guests` generated guests without phone_normalized; returns (event_id, local numbers)."""
+    rng = random.Random(seed + size_index)
+    event_id = ObjectId()
+    now = datetime.now(timezone.utc)
+    db.events.insert_one({
+        "_id": event_id, "user_id": ObjectId(user_id), "title": f"Phone Lookup Bench {guests}",
+        "event_date": now + timedelta(days=90), "is_main_event": False, "created_at": now, "updated_at": now,
+    })
+
+    # 8 digits after "05": the size index keeps numbers distinct across events
+    numbers = [f"{size_index}{i:07d}" for i in range(guests)]
+    insert_batched(db.guests, generate_guests(
+        rng, event_id, guests, now, phone_digits=numbers.__getitem__, no_phone_share=0, legacy_phones=True,
+        name_prefix="Lookup",
+    ))
+    return str(event_id), numbers
+
+
+def run_backfill(mongo_uri, db_name):
+    """Runs the phone backfill once in a fresh Node process; returns (wall seconds, its stats)."""
+    env = {**os.environ, "MONGO_URI": mongo_uri, "DB_NAME": db_name}
+    started = time.perf_counter()
+    result = subprocess.run(
+        ['node', 'scripts/backfill-guest-phones.js'],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    return time.perf_counter() - started, json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def docs_examined(db, event_id, number):
+    """Documents MongoDB reads for one lookup (the query the RSVP routes send)."""
+    plan = db.guests.find({
+        "event_id": ObjectId(event_id),
+        "$or": [{"phone_normalized": f"+9725{number}"}, {"phone_normalized": {"$exists": False}}],
+    }).limit(1).explain()
+    return plan["executionStats"]["totalDocsExamined"]
+
+
+def time_lookups(client, event_id, numbers, lookups, seed=1):
+    rng = random.Random(seed)
+    latencies, found = [], 0
+    for number in rng.sample(numbers, min(lookups, len(numbers))):
+        phone = rng.choice(TYPED_FORMATS)(number)
+        started = time.perf_counter()
+        response = client.post("/api/rsvp/lookup", json={"eventId": event_id, "phone": phone})
+        latencies.append((time.perf_counter() - started) * 1000)
+        response.raise_for_status()
+        found += response.json().get("found") is True
+    return {**latency_summary(latencies), "found": found}
+
+
+def run_benchmark(base_url, mongo_uri, db_name, user_id, sizes, lookups=200):
+    with MongoClient(mongo_uri) as mongo:
+        db = mongo[db_name]
+        started = time.perf_counter()
+        events = [(size, *seed_legacy_event(db, user_id, size, i + 1)) for i, size in enumerate(sizes)]
+        seed_s = time.perf_counter() - started
+
+        backfill_s, backfill = run_backfill(mongo_uri, db_name)
+
+        results = []
+        with httpx.Client(base_url=base_url.rstrip('/'), timeout=60) as client:
+            for size, event_id, numbers in events:
+                time_lookups(client, event_id, numbers, 20, seed=size)  # warm-up
+                results.append({
+                    "guests": size,
+                    "event_id": event_id,
+                    "docs_examined": docs_examined(db, event_id, numbers[-1]),
+                    **time_lookups(client, event_id, numbers, lookups),
+                })
+
+    smallest, largest = results[0], results[-1]
+    return {
+        "seed_s": round(seed_s, 2),
+        "backfill": {"wall_s": round(backfill_s, 2), **backfill},
+        "lookups": lookups,
+        "results": results,
+        "p50_growth": round(largest["p50_ms"] / max(smallest["p50_ms"], 0.01), 2),
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="RSVP phone lookup benchmark")
+    parser.add_argument("--base-url", required=True)
+    parser.add_argument("--mongo-uri", required=True)
+    parser.add_argument("--db-name", required=True, help="The backend's database (DB_NAME)")
+    parser.add_argument("--user-id", required=True, help="Owner of the seeded events")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--lookups", type=int, default=200, help="Lookups per event")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = run_benchmark(args.base_url, args.mongo_uri, args.db_name, args.user_id, args.sizes, args.lookups)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
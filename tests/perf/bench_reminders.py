@@ -0,0 +1,117 @@
+"""
+Benchmark for the nightly reminder job (backend/scheduler.js).
+
+Seeds users and their events straight into MongoDB (pymongo bulk inserts), then times
+`node scripts/run-reminders.js` twice against that database:
+  - the first run creates every due reminder,
+  - the second run must create nothing (dedupe key) and shows the cost of an idempotent re-run.
+
+Each user gets one event 0-30 days away and a random notification_days, so a predictable
+share of them is due; the expected count is computed here and compared with the job's stats.
+
+Usage (from the tests folder, against a throwaway database - seeded users are not removed):
+    python -m perf.bench_reminders --mongo-uri mongodb://127.0.0.1:27017 --db-name reminders_bench --users 10000 100000
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import time
+from datetime import datetime, timedelta
+from datetime import time as day_time
+
+from bson import ObjectId
+from pymongo import MongoClient
+
+from support.local_backend import BACKEND_DIR
+
+NOTIFICATION_DAYS = [0, 1, 1, 1, 2, 3, 7, 14, 30]
+INSERT_BATCH = 10000
+
+
+def seed_users(db, count, today, seed=1):
+    """Inserts `count` users with one event each; returns how many reminders are due on `today`."""
+    rng = random.Random(seed)
+    due = 0
+    users, events = [], []
+
+    def flush():
+        if users:
+            db.users.insert_many(users, ordered=False)
+            db.events.insert_many(events, ordered=False)
+            users.clear()
+            events.clear()
+
+    for i in range(count):
+        user_id = ObjectId()
+        days = rng.choice(NOTIFICATION_DAYS)
+        offset = rng.randint(0, 30)
+        due += offset == days
+        event_date = datetime.combine(today + timedelta(days=offset), day_time(12)).astimezone()
+        users.append({
+            "_id": user_id,
+            "email": f"reminder.bench.{seed}.{i}.{user_id}@example.com",
+            "password_hash": "x",
+            "settings": {"notification_days": days},
+        })
+        events.append({"user_id": user_id, "title": f"Bench Wedding {i}", "event_date": event_date})
+        if len(users) >= INSERT_BATCH:
+            flush()
+    flush()
+    return due
+
+
+def run_job(mongo_uri, db_name, now):
+    """Runs the reminder job once in a fresh Node process; returns (wall seconds, job stats)."""
+    env = {**os.environ, "MONGO_URI": mongo_uri, "DB_NAME": db_name}
+    started = time.perf_counter()
+    result = subprocess.run(
+        ['node', 'scripts/run-reminders.js', '--now', now.isoformat()],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    elapsed = time.perf_counter() - started
+    return elapsed, json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def bench_users(mongo_uri, db_name, users, now=None):
+    """Seeds `users` users into a clean database and times two reminder runs."""
+    now = now or datetime.now().replace(microsecond=0)
+    with MongoClient(mongo_uri) as client:
+        client.drop_database(db_name)
+        started = time.perf_counter()
+        expected = seed_users(client[db_name], users, now.date())
+        seed_seconds = time.perf_counter() - started
+
+    first_s, first = run_job(mongo_uri, db_name, now)
+    second_s, second = run_job(mongo_uri, db_name, now)
+    return {
+        "users": users,
+        "expected_due": expected,
+        "seed_s": round(seed_seconds, 2),
+        "first_run": {"wall_s": round(first_s, 2), **first},
+        "second_run": {"wall_s": round(second_s, 2), **second},
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Reminder job benchmark")
+    parser.add_argument("--mongo-uri", required=True)
+    parser.add_argument("--db-name", default="reminders_bench", help="Dropped and re-seeded for every size")
+    parser.add_argument("--users", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = {"results": [bench_users(args.mongo_uri, args.db_name, n) for n in args.users]}
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    print(text)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Seating benchmark for the bulk and automatic seating routes (backend/seating.js).
+
+Creates one event with many tables and guests (mixed sides, 1-4 seats each) over the API, then times:
+- POST /api/events/:eventId/seating/auto (plan + one bulk write),
+- PUT /api/events/:eventId/seating re-seating every guest in one request,
+- the one-guest-at-a-time route (PUT /api/guests/:guestId/seat) on a sample, for comparison
+  (projected_all_ms: what moving every guest that way would take).
+After every step the tables are checked: no table may hold more seats than its capacity.
+
+Usage (from the tests folder):
+    python -m perf.bench_seating --base-url http://localhost:4000 --user-id <userId> --guests 1000 --tables 100
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import Counter
+
+import httpx
+
+from perf.stats import latency_summary
+from support.api_client import ApiClient, AsyncApiClient
+
+SIDES = ["bride", "groom", "friend", "family"]
+TABLE_CAPACITY = 24
+
+
+def seed_seating_event(base_url, user_id, guests, tables, seed=1, concurrency=50):
+    """Creates an event with `tables` tables and `guests` guests; returns (event_id, guest_ids, table_ids)."""
+    rng = random.Random(seed)
+    with ApiClient(base_url) as api:
+        event_id = api.create_event(user_id, f"Seating Bench {guests}", "2030-06-01").id
+
+    async def seed():
+        semaphore = asyncio.Semaphore(concurrency)
+        async with AsyncApiClient(base_url) as api:
+            async def limited(call):
+                async with semaphore:
+                    return await call
+
+            created_tables = await asyncio.gather(*(
+                limited(api.create_table(event_id, f"Table {t + 1}", TABLE_CAPACITY)) for t in range(tables)
+            ))
+            created_guests = await asyncio.gather(*(
+                limited(api.add_guest(event_id, f"Seat Guest {i}", amount_invited=rng.choice([1, 1, 2, 2, 3, 4]),
+                                      side=rng.choice(SIDES)))
+                for i in range(guests)
+            ))
+            return [g.id for g in created_guests], [t["_id"] for t in created_tables]
+
+    guest_ids, table_ids = asyncio.run(seed())
+    return event_id, guest_ids, table_ids
+
+
+def seating_state(client, event_id):
+    """Seats used per table, capacity per table, and how many guests are seated."""
+    guests = client.get(f"/api/events/{event_id}/guests").json()
+    tables = client.get(f"/api/events/{event_id}/tables").json()
+    seats = Counter()
+    for guest in guests:
+        if guest.get("table_id"):
+            seats[guest["table_id"]] += max(guest.get("amount_invited") or 1, 1)
+    capacity = {t["_id"]: t["capacity"] for t in tables}
+    return {
+        "seated": sum(1 for g in guests if g.get("table_id")),
+        "tables_used": len(seats),
+        "over_capacity": [t for t, used in seats.items() if used > capacity.get(t, 0)],
+        "max_seats": max(seats.values(), default=0),
+    }
+
+
+def _timed(client, method, url, **kwargs):
+    started = time.perf_counter()
+    response = client.request(method, url, **kwargs)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    response.raise_for_status()
+    return response.json(), round(elapsed_ms, 2)
+
+
+def run_benchmark(base_url, event_id, guest_ids, table_ids, single_sample=100):
+    base_url = base_url.rstrip('/')
+    with httpx.Client(base_url=base_url, timeout=120) as client:
+        client.post(f"/api/events/{event_id}/reset-seating").raise_for_status()
+
+        dry_run, dry_run_ms = _timed(client, "POST", f"/api/events/{event_id}/seating/auto", json={"dryRun": True})
+        auto, auto_ms = _timed(client, "POST", f"/api/events/{event_id}/seating/auto", json={})
+        after_auto = seating_state(client, event_id)
+
+        # Re-seat everyone in one request: rotate each table's guests to the next table
+        plan = [{"guestId": a["guestId"], "tableId": a["tableId"]} for a in auto["assignments"]]
+        position = {t: i for i, t in enumerate(table_ids)}
+        rotated = [{"guestId": a["guestId"], "tableId": table_ids[(position[a["tableId"]] + 1) % len(table_ids)]}
+                   for a in plan]
+        bulk, bulk_ms = _timed(client, "PUT", f"/api/events/{event_id}/seating", json={"assignments": rotated})
+        after_bulk = seating_state(client, event_id)
+
+        # One guest per request (what dragging does): unseat a sample, which always fits
+        single_ms = []
+        for a in rotated[:single_sample]:
+            _, ms = _timed(client, "PUT", f"/api/guests/{a['guestId']}/seat", json={"tableId": None})
+            single_ms.append(ms)
+        after_single = seating_state(client, event_id)
+
+    return {
+        "guests": len(guest_ids),
+        "tables": len(table_ids),
+        "auto_seat": {
+            "dry_run_ms": dry_run_ms, "ms": auto_ms, "changed": auto["changed"],
+            "unplaced_guests": sum(len(u["guestIds"]) for u in auto["unplaced"]), **after_auto,
+        },
+        "bulk_reseat": {"ms": bulk_ms, "changed": bulk["changed"], **after_bulk},
+        "single_seat": {
+            **latency_summary(single_ms),
+            "projected_all_ms": round(sum(single_ms) / max(len(single_ms), 1) * len(plan), 2), **after_single,
+        },
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk / automatic seating benchmark")
+    parser.add_argument("--base-url", required=True)
+    parser.add_argument("--user-id", required=True, help="Owner of the seeded event")
+    parser.add_argument("--guests", type=int, default=1000)
+    parser.add_argument("--tables", type=int, default=100)
+    parser.add_argument("--single-sample", type=int, default=100, help="One-guest moves to time")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    event_id, guest_ids, table_ids = seed_seating_event(args.base_url, args.user_id, args.guests, args.tables)
+    report = run_benchmark(args.base_url, event_id, guest_ids, table_ids, args.single_sample)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
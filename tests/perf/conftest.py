@@ -0,0 +1,78 @@
+import asyncio
+import hashlib
+import json
+import os
+import pytest
+from dataclasses import replace
+from pymongo import MongoClient
+from perf.dataset import PRESETS, copy_password_hash, load_dataset, remove_dataset
+from support.api_client import ApiClient, AsyncApiClient
+
+REPORTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'reports')
+
+@pytest.fixture(scope="session")
+def perf_backend(local_backend):
+    """
+    Performance tests always run against the hermetic backend (whatever TEST_MODE is),
+    so the numbers are not skewed by the shared Render deployment or its data.
+    """
+    return local_backend
+
+@pytest.fixture(scope="session")
+def perf_user(perf_backend):
+    """The hermetic test user, typed (owner of the events the perf tests create)."""
+    with ApiClient(perf_backend.url) as client:
+        return client.login(perf_backend.credentials["email"], perf_backend.credentials["password"])
+
+@pytest.fixture(scope="session")
+def dataset(perf_backend, perf_user):
+    """
+    Loads a synthetic wedding dataset (perf/dataset.py) into the hermetic backend's database:
+    dataset("small", seed=1, guests_per_wedding=500) -> Dataset. Loaded once per session for each
+    preset, seed and overrides; every generated user logs in with the hermetic user's password.
+    Removed again at the end of the session.
+    """
+    password_hash = copy_password_hash(perf_backend.mongo_uri, perf_backend.db_name, perf_backend.credentials["email"])
+    loaded = {}
+
+    def load(preset="small", seed=1, **overrides):
+        key = (preset, seed, tuple(sorted(overrides.items())))
+        if key not in loaded:
+            spec = replace(PRESETS[preset], **overrides)
+            if overrides:
+                # Own namespace, so it does not replace the preset's copy loaded by another test
+                spec = replace(spec, name=f"{preset}-{hashlib.sha1(repr(key).encode()).hexdigest()[:8]}")
+            loaded[key] = load_dataset(perf_backend.mongo_uri, perf_backend.db_name, spec, seed,
+                                       password_hash=password_hash, password=perf_backend.credentials["password"])
+        return loaded[key]
+
+    yield load
+    with MongoClient(perf_backend.mongo_uri) as mongo:
+        for data in loaded.values():
+            remove_dataset(mongo[perf_backend.db_name], data.namespace)
+
+def seed_guests(api_url, event_id, count, concurrency=50):
+    """Adds `count` guests with distinct Israeli mobile numbers to the event (concurrently, over the async client)."""
+    async def seed():
+        semaphore = asyncio.Semaphore(concurrency)
+        async with AsyncApiClient(api_url) as api:
+            async def add(i):
+                async with semaphore:
+                    return await api.add_guest(event_id, f"Perf Guest {i}", phone=f"050{i:07d}")
+            return await asyncio.gather(*(add(i) for i in range(count)))
+    return asyncio.run(seed())
+
+@pytest.fixture
+def write_report(request):
+    """
+    Writes a JSON report to tests/reports/<name>.json and returns its path.
+    Reports are kept out of git; CI can archive the folder to track numbers over time.
+    """
+    def write(name, report):
+        os.makedirs(REPORTS_DIR, exist_ok=True)
+        path = os.path.join(REPORTS_DIR, f"{name}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n[Report] {request.node.name} -> {path}")
+        return path
+    return write
@@ -0,0 +1,401 @@
+"""
+Synthetic wedding datasets for scale tests, loaded straight into MongoDB (pymongo bulk inserts).
+
+A dataset is a number of weddings: the couple's account, partner accounts linked with the
+wedding code, events, guests (mixed phone formats, sides, meals, RSVP answers, party sizes;
+part of them seated), tables, tasks, budget items, vendors and notifications. Everything is
+derived from the seed and the anchor day the dates count from (DEFAULT_ANCHOR unless given) - the
+same preset, seed and anchor always produce the same documents and ids -
+and tagged with the dataset's namespace the way support/test_data.py tags test data (emails get
+"+<namespace>@", event titles end with "[<namespace>]"), so POST /api/test-data/cleanup or
+remove_dataset() removes it again.
+
+Usage (from the tests folder):
+    python -m perf.dataset --mongo-uri mongodb://127.0.0.1:27017 --db-name wedding_planner --preset small --seed 1
+    python -m perf.dataset ... --preset 100k-guests --login-as hermetic.tester@example.com   # users log in with that account's password
+    python -m perf.dataset ... --anchor today        # weddings in the coming year (reminders, countdowns)
+    python -m perf.dataset ... --remove e2e-ds-small-1
+"""
+import argparse
+import hashlib
+import json
+import random
+import re
+import struct
+import time
+from dataclasses import asdict, dataclass, field, replace
+from datetime import datetime, time as day_time, timedelta, timezone
+
+from bson import ObjectId
+from pymongo import MongoClient
+
+INSERT_BATCH = 10000
+# Dates (and the ObjectId timestamps) count from this day: fixed, so a seed gives the same data on any day.
+# Every generated wedding is after it, i.e. still ahead for years to come.
+DEFAULT_ANCHOR = datetime(2030, 1, 1, tzinfo=timezone.utc)
+
+SIDES = ["bride", "groom", "friend", "family"]
+MEALS = ["standard", "standard", "standard", "special", "veggie", "vegan", "kids"]
+RSVP_STATUSES = ["pending", "attending", "attending", "declined"]
+PARTY_SIZES = [1, 1, 2, 2, 2, 3, 4]
+TASK_CATEGORIES = ['general', 'vendors', 'budget', 'design', 'guests', 'logistics']
+TASK_STATUSES = ['todo', 'todo', 'in_progress', 'done']
+BUDGET_CATEGORIES = ['אולם וקייטרינג', 'צילום', 'מוזיקה', 'ביגוד וטיפוח', 'עיצוב', 'מתנות', 'טקסים', 'כללי', 'אחר']
+VENDOR_CATEGORIES = ['Venue', 'Photography', 'Music', 'Catering', 'Flowers', 'Dress', 'Makeup']
+FIRST_NAMES = ["Noa", "Yosef", "Maya", "David", "Tamar", "Ariel", "Shira", "Eitan", "Yael", "Omer", "Lior", "Dana"]
+LAST_NAMES = ["Cohen", "Levi", "Mizrahi", "Peretz", "Biton", "Friedman", "Azoulay", "Katz", "Shapiro", "Golan"]
+WEDDING_CODE_CHARS = 'ABCDEFGHJKLMNPQRSTUVWXYZ23456789'
+
+# How guests typed their phone - the RSVP routes must find them whatever the format
+PHONE_FORMATS = [
+    lambda d: f"05{d}",
+    lambda d: f"05{d[:1]}-{d[1:]}",
+    lambda d: f"+9725{d}",
+    lambda d: f"+972 5{d[:1]} {d[1:4]} {d[4:]}",
+    lambda d: f"9725{d}",
+]
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    """Sizes per wedding; the preset name is only a label."""
+    name: str
+    weddings: int
+    guests_per_wedding: int
+    partners_per_wedding: float = 0.5   # average; 0-2 per couple
+    extra_events_per_wedding: float = 0.2
+    tables_per_wedding: int = 0          # 0 = enough tables for the seated guests
+    seated_share: float = 0.6
+    tasks_per_wedding: int = 15
+    budget_items_per_wedding: int = 12
+    vendors_per_wedding: int = 6
+    notifications_per_wedding: int = 5
+    table_capacity: int = 12
+    no_phone_share: float = 0.05
+
+
+PRESETS = {
+    "small": DatasetSpec("small", weddings=10, guests_per_wedding=50),
+    "1k-weddings": DatasetSpec("1k-weddings", weddings=1000, guests_per_wedding=150),
+    "100k-guests": DatasetSpec("100k-guests", weddings=20, guests_per_wedding=5000, tasks_per_wedding=30,
+                               budget_items_per_wedding=40),
+}
+
+
+@dataclass
+class Wedding:
+    couple_id: str
+    email: str
+    wedding_code: str
+    partner_ids: list
+    event_ids: list
+    guests: int
+
+
+@dataclass
+class Dataset:
+    """What was loaded: counts per collection and the ids the benchmarks need."""
+    namespace: str
+    preset: str
+    seed: int
+    password: str
+    counts: dict = field(default_factory=dict)
+    weddings: list = field(default_factory=list)
+    load_s: float = 0.0
+
+    @property
+    def largest_event(self):
+        """(event_id, guests) of the main event with the most guests."""
+        wedding = max(self.weddings, key=lambda w: w.guests)
+        return wedding.event_ids[0], wedding.guests
+
+    @property
+    def user_ids(self):
+        return [w.couple_id for w in self.weddings] + [p for w in self.weddings for p in w.partner_ids]
+
+
+def dataset_namespace(preset, seed):
+    # Same shape as support/test_data.py namespaces (accepted by /api/test-data/cleanup)
+    return f"e2e-ds-{re.sub(r'[^a-z0-9]+', '-', preset.lower())}-{seed}"
+
+
+def normalize_phone(raw):
+    """Same rules as backend/phone.js normalizePhone (stored as Guest.phone_normalized)."""
+    phone = re.sub(r"[^\d+]", "", str(raw or "").strip())
+    if phone.startswith("0"):
+        phone = "+972" + phone[1:]
+    if phone.startswith("972"):
+        phone = "+" + phone
+    return phone
+
+
+class _Ids:
+    """Deterministic ObjectIds: creation second + 5 bytes of the namespace + a counter."""
+
+    def __init__(self, namespace):
+        self.salt = hashlib.sha1(namespace.encode()).digest()[:5]
+        self.counter = 0
+
+    def new(self, created_at):
+        self.counter += 1
+        return ObjectId(struct.pack(">I", int(created_at.timestamp())) + self.salt + self.counter.to_bytes(3, "big"))
+
+
+# --- Documents ---
+
+def generate_guests(rng, event_id, count, created_at, phone_digits, tables=(), seated_share=0.0,
+                    no_phone_share=0.05, legacy_phones=False, ids=None, name_prefix="Guest"):
+    """
+    Guest documents for one event. `phone_digits(i)` returns the 8 digits after "05" (unique per event).
+    Tables are filled up to their capacity (in seats, like the seating screen) for `seated_share` of the guests.
+    legacy_phones=True leaves phone_normalized out, like guests stored before that field existed.
+    """
+    free = [[table["_id"], table["capacity"]] for table in tables]
+    for i in range(count):
+        created = created_at - timedelta(milliseconds=i // 10)
+        seats = rng.choice(PARTY_SIZES)
+        phone = None if rng.random() < no_phone_share else rng.choice(PHONE_FORMATS)(phone_digits(i))
+        status = rng.choice(RSVP_STATUSES)
+        table_id = None
+        if free and status != "declined" and rng.random() < seated_share:
+            fitting = next((t for t in free if t[1] >= seats), None)
+            if fitting:
+                fitting[1] -= seats
+                table_id = fitting[0]
+        guest = {
+            "event_id": event_id,
+            "full_name": f"{name_prefix} {rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {i}",
+            "phone": phone,
+            "side": rng.choice(SIDES),
+            "amount_invited": seats,
+            "meal_option": rng.choice(MEALS),
+            "rsvp_status": status,
+            "table_id": table_id,
+            "is_unknown": rng.random() < 0.01,
+            "created_at": created,
+            "updated_at": created,
+        }
+        if ids is not None:
+            guest["_id"] = ids.new(created)
+        if not legacy_phones:
+            guest["phone_normalized"] = normalize_phone(phone)
+        yield guest
+
+
+def _wedding_documents(rng, ids, spec, index, namespace, anchor, password_hash, guest_counter):
+    """Every document of one wedding, per collection."""
+    docs = {name: [] for name in ("users", "events", "guests", "tables", "tasks", "budgetitems", "vendors", "notifications")}
+    created = anchor - timedelta(days=rng.randint(30, 400))
+    couple_id = ids.new(created)
+    code = "WED-" + "".join(rng.choice(WEDDING_CODE_CHARS) for _ in range(4)) + f"{index:X}"
+    email = f"ds.couple.{index}+{namespace}@example.com"
+    docs["users"].append({
+        "_id": couple_id, "email": email, "password_hash": password_hash,
+        "full_name": f"{rng.choice(FIRST_NAMES)} & {rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+        "wedding_code": code, "is_partner": False, "settings": {"notification_days": rng.choice([1, 1, 2, 3, 7])},
+        "created_at": created, "updated_at": created,
+    })
+
+    partners = min(2, int(spec.partners_per_wedding + rng.random()))
+    partner_ids = []
+    for p in range(partners):
+        partner_id = ids.new(created + timedelta(days=1))
+        partner_ids.append(partner_id)
+        docs["users"].append({
+            "_id": partner_id, "email": f"ds.partner.{index}.{p}+{namespace}@example.com", "password_hash": password_hash,
+            "full_name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}", "is_partner": True,
+            "linked_wedding_id": couple_id, "settings": {"notification_days": 1},
+            "created_at": created, "updated_at": created,
+        })
+
+    event_ids = []
+    wedding_day = datetime.combine(anchor.date() + timedelta(days=rng.randint(1, 365)), day_time(19), tzinfo=timezone.utc)
+    events = 1 + int(spec.extra_events_per_wedding + rng.random())
+    for e in range(events):
+        event_id = ids.new(created)
+        event_ids.append(event_id)
+        title = "Wedding" if e == 0 else rng.choice(["Henna", "Engagement Party", "Shabbat Chatan"])
+        docs["events"].append({
+            "_id": event_id, "user_id": couple_id, "title": f"{title} {index} [{namespace}]",
+            "event_date": wedding_day - timedelta(days=7 * e), "description": None,
+            "total_budget": rng.randrange(80000, 400000, 5000), "is_main_event": e == 0,
+            "created_at": created, "updated_at": created,
+        })
+
+    main_event = event_ids[0]
+    guests = spec.guests_per_wedding
+    seated_seats = int(guests * spec.seated_share * 2.2)
+    table_count = spec.tables_per_wedding or max(1, -(-seated_seats // spec.table_capacity))
+    for t in range(table_count):
+        docs["tables"].append({
+            "_id": ids.new(created), "eventId": main_event, "userId": couple_id, "name": f"Table {t + 1}",
+            "capacity": spec.table_capacity, "createdAt": created, "updatedAt": created,
+        })
+    docs["guests"].extend(generate_guests(
+        rng, main_event, guests, created + timedelta(days=10),
+        phone_digits=lambda i: f"{guest_counter + i:08d}"[-8:], tables=docs["tables"],
+        seated_share=spec.seated_share, no_phone_share=spec.no_phone_share, ids=ids,
+    ))
+
+    for t in range(spec.tasks_per_wedding):
+        status = rng.choice(TASK_STATUSES)
+        docs["tasks"].append({
+            "_id": ids.new(created), "user_id": couple_id, "title": f"Task {t + 1}",
+            "due_date": wedding_day - timedelta(days=rng.randint(0, 180)), "is_done": status == "done", "status": status,
+            "category": rng.choice(TASK_CATEGORIES), "collaborators_emails": [], "created_at": created, "updated_at": created,
+        })
+    for b in range(spec.budget_items_per_wedding):
+        docs["budgetitems"].append({
+            "_id": ids.new(created), "event_id": main_event, "title": f"Expense {b + 1}", "vendor": "",
+            "amount": rng.randrange(500, 60000, 50), "category": rng.choice(BUDGET_CATEGORIES),
+            "is_paid": rng.random() < 0.4, "notes": "", "created_at": created, "updated_at": created,
+        })
+    for v in range(spec.vendors_per_wedding):
+        docs["vendors"].append({
+            "_id": ids.new(created), "userId": couple_id, "name": f"Vendor {index}.{v + 1}",
+            "category": rng.choice(VENDOR_CATEGORIES), "phone": rng.choice(PHONE_FORMATS)(f"{rng.randrange(10 ** 8):08d}"),
+            "priceEstimate": rng.randrange(2000, 50000, 500), "rating": rng.randint(0, 5),
+            "createdAt": created, "updatedAt": created,
+        })
+    for n in range(spec.notifications_per_wedding):
+        at = anchor - timedelta(days=rng.randint(0, 60))
+        docs["notifications"].append({
+            "_id": ids.new(at), "user_id": couple_id, "message": f"Reminder {n + 1}: Wedding {index} [{namespace}]",
+            "type": rng.choice(["info", "reminder"]), "is_read": rng.random() < 0.5, "created_at": at, "updated_at": at,
+        })
+
+    wedding = Wedding(str(couple_id), email, code, [str(p) for p in partner_ids], [str(e) for e in event_ids], guests)
+    return docs, wedding
+
+
+# --- Loading ---
+
+def load_dataset(mongo_uri, db_name, spec, seed=1, password_hash="!", password=None, anchor=None):
+    """
+    Inserts the dataset (any previous copy of the same namespace is removed first).
+
+    Args:
+        spec: A DatasetSpec or a preset name.
+        password_hash: Stored for every generated user; copy a real account's hash (copy_password_hash)
+            so they can log in with that account's password - the default cannot log in.
+        anchor: Dates are relative to this day (default: DEFAULT_ANCHOR); pass today's date for weddings
+            close enough for reminders and countdowns. A different anchor gives different ids.
+    """
+    spec = PRESETS[spec] if isinstance(spec, str) else spec
+    namespace = dataset_namespace(spec.name, seed)
+    anchor = anchor or DEFAULT_ANCHOR
+    rng = random.Random(f"{spec.name}:{seed}")
+    ids = _Ids(namespace)
+    dataset = Dataset(namespace=namespace, preset=spec.name, seed=seed, password=password)
+
+    started = time.perf_counter()
+    with MongoClient(mongo_uri) as mongo:
+        db = mongo[db_name]
+        remove_dataset(db, namespace)
+        pending = {}
+        guest_counter = 0
+
+        def flush(force=False):
+            for collection, documents in pending.items():
+                if documents and (force or len(documents) >= INSERT_BATCH):
+                    db[collection].insert_many(documents, ordered=False)
+                    dataset.counts[collection] = dataset.counts.get(collection, 0) + len(documents)
+                    documents.clear()
+
+        for index in range(spec.weddings):
+            docs, wedding = _wedding_documents(rng, ids, spec, index, namespace, anchor, password_hash, guest_counter)
+            guest_counter += spec.guests_per_wedding
+            dataset.weddings.append(wedding)
+            for collection, documents in docs.items():
+                pending.setdefault(collection, []).extend(documents)
+            flush()
+        flush(force=True)
+    dataset.load_s = round(time.perf_counter() - started, 2)
+    return dataset
+
+
+def insert_batched(collection, documents):
+    """Inserts an iterable of documents INSERT_BATCH at a time; returns how many were inserted."""
+    batch, inserted = [], 0
+    for document in documents:
+        batch.append(document)
+        if len(batch) >= INSERT_BATCH:
+            collection.insert_many(batch, ordered=False)
+            inserted += len(batch)
+            batch.clear()
+    if batch:
+        collection.insert_many(batch, ordered=False)
+        inserted += len(batch)
+    return inserted
+
+
+def remove_dataset(db, namespace):
+    """Deletes everything of one namespace (what POST /api/test-data/cleanup does, without the backend)."""
+    users = [u["_id"] for u in db.users.find({"email": {"$regex": rf"\+{re.escape(namespace)}@"}}, {"_id": 1})]
+    events = [e["_id"] for e in db.events.find({"user_id": {"$in": users}}, {"_id": 1})]
+    deleted = {
+        "guests": db.guests.delete_many({"event_id": {"$in": events}}).deleted_count,
+        "tables": db.tables.delete_many({"eventId": {"$in": events}}).deleted_count,
+        "budgetitems": db.budgetitems.delete_many({"event_id": {"$in": events}}).deleted_count,
+        "tasks": db.tasks.delete_many({"user_id": {"$in": users}}).deleted_count,
+        "vendors": db.vendors.delete_many({"userId": {"$in": users}}).deleted_count,
+        "notifications": db.notifications.delete_many({"user_id": {"$in": users}}).deleted_count,
+        "events": db.events.delete_many({"_id": {"$in": events}}).deleted_count,
+        "users": db.users.delete_many({"_id": {"$in": users}}).deleted_count,
+    }
+    return deleted
+
+
+def copy_password_hash(mongo_uri, db_name, email):
+    """The stored password hash of an existing account (generated users then share its password)."""
+    with MongoClient(mongo_uri) as mongo:
+        user = mongo[db_name].users.find_one({"email": email}, {"password_hash": 1})
+    if not user:
+        raise ValueError(f"No user {email} in {db_name}")
+    return user["password_hash"]
+
+
+def parse_anchor(value):
+    day = datetime.now(timezone.utc).date() if value == "today" else datetime.strptime(value, "%Y-%m-%d").date()
+    return datetime.combine(day, day_time(0), tzinfo=timezone.utc)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load a synthetic wedding dataset into MongoDB")
+    parser.add_argument("--mongo-uri", required=True)
+    parser.add_argument("--db-name", required=True, help="The backend's database (DB_NAME)")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="small")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--weddings", type=int, help="Override the preset's number of weddings")
+    parser.add_argument("--guests-per-wedding", type=int, help="Override the preset's guests per wedding")
+    parser.add_argument("--anchor", type=parse_anchor, default=DEFAULT_ANCHOR,
+                        help="YYYY-MM-DD or 'today': the day the dates count from (default: 2030-01-01)")
+    parser.add_argument("--login-as", metavar="EMAIL", help="Give every generated user this existing account's password")
+    parser.add_argument("--remove", metavar="NAMESPACE", help="Only delete a previously loaded dataset")
+    parser.add_argument("--output", help="Write the dataset summary (ids, counts) to this JSON file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.remove:
+        with MongoClient(args.mongo_uri) as mongo:
+            print(json.dumps(remove_dataset(mongo[args.db_name], args.remove), indent=2))
+        return
+
+    spec = PRESETS[args.preset]
+    overrides = {"weddings": args.weddings, "guests_per_wedding": args.guests_per_wedding}
+    spec = replace(spec, **{k: v for k, v in overrides.items() if v is not None})
+    password_hash = copy_password_hash(args.mongo_uri, args.db_name, args.login_as) if args.login_as else "!"
+    dataset = load_dataset(args.mongo_uri, args.db_name, spec, args.seed, password_hash=password_hash, anchor=args.anchor)
+
+    summary = asdict(dataset)
+    text = json.dumps({k: v for k, v in summary.items() if k != "weddings"}, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Cold-load measurements of the built frontend under a throttled Chrome profile.
+
+Budgets and the throttling profile live in frontend_budgets.json next to this module; every route
+there names its path and an XPath for its first meaningful content (data the user came for,
+not the loading placeholder). Used by test_frontend_budgets.py.
+"""
+import json
+import os
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+BUDGETS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'frontend_budgets.json')
+
+MOBILE_VIEWPORT = {"width": 390, "height": 844, "deviceScaleFactor": 3, "mobile": True}
+
+# Records when the route's meaningful content first appears - registered before the app loads,
+# so the time is taken by the page itself and not by a WebDriver poll
+FIRST_CONTENT_JS = r"""
+(() => {
+  const xpath = %(xpath)s;
+  const matches = () => document.evaluate(
+    'count(' + xpath + ')', document, null, XPathResult.NUMBER_TYPE, null
+  ).numberValue > 0;
+  const observer = new MutationObserver(() => {
+    if (window.__firstContent == null && matches()) {
+      window.__firstContent = performance.now();
+      observer.disconnect();
+    }
+  });
+  observer.observe(document, { childList: true, subtree: true, characterData: true });
+})();
+"""
+
+# Resolves once the content appeared and no new resource finished loading for `quietMs`
+WAIT_FOR_SETTLED_JS = r"""
+const [quietMs, timeoutMs, done] = arguments;
+const started = performance.now();
+let count = -1, quietSince = performance.now();
+const check = () => {
+  const resources = performance.getEntriesByType('resource').length;
+  if (resources !== count) { count = resources; quietSince = performance.now(); }
+  const settled = window.__firstContent != null && performance.now() - quietSince >= quietMs;
+  if (settled || performance.now() - started > timeoutMs) { done(settled); return; }
+  setTimeout(check, 50);
+};
+check();
+"""
+
+LOAD_METRICS_JS = r"""
+const nav = performance.getEntriesByType('navigation')[0];
+const perf = window.__testPerf || { lcp: null, longTasks: [] };
+return {
+  firstContent: window.__firstContent,
+  lcp: perf.lcp,
+  longTasks: perf.longTasks.map(t => t.duration),
+  document: nav ? { transferSize: nav.transferSize, domContentLoaded: nav.domContentLoadedEventEnd, load: nav.loadEventEnd } : null,
+  resources: performance.getEntriesByType('resource').map(r => ({
+    name: r.name, type: r.initiatorType, transferSize: r.transferSize
+  }))
+};
+"""
+
+
+def load_budgets(path=BUDGETS_FILE):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+@contextmanager
+def throttled(driver, profile, mobile=False):
+    """Applies the CPU/network throttling profile (and a phone viewport) and restores the pooled browser afterward."""
+    kbps_to_bytes = 1024 / 8
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": True})
+    driver.execute_cdp_cmd("Network.emulateNetworkConditions", {
+        "offline": False,
+        "latency": profile["latency_ms"],
+        "downloadThroughput": profile["download_kbps"] * kbps_to_bytes,
+        "uploadThroughput": profile["upload_kbps"] * kbps_to_bytes,
+    })
+    driver.execute_cdp_cmd("Emulation.setCPUThrottlingRate", {"rate": profile["cpu_slowdown"]})
+    if mobile:
+        driver.execute_cdp_cmd("Emulation.setDeviceMetricsOverride", MOBILE_VIEWPORT)
+    try:
+        yield driver
+    finally:
+        if mobile:
+            driver.execute_cdp_cmd("Emulation.clearDeviceMetricsOverride", {})
+        driver.execute_cdp_cmd("Emulation.setCPUThrottlingRate", {"rate": 1})
+        driver.execute_cdp_cmd("Network.emulateNetworkConditions", {
+            "offline": False, "latency": 0, "downloadThroughput": -1, "uploadThroughput": -1,
+        })
+        driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": False})
+
+
+def measure_route(driver, url, content_xpath, timeout=60, quiet_ms=500):
+    """
+    Cold-loads `url` and returns its load metrics.
+
+    Returns:
+        dict: bundle_kb (JS + CSS), requests (document + resources), api_requests, first_content_ms,
+              lcp_ms, long_tasks, total_blocking_ms, document_kb, load_ms.
+    """
+    identifier = driver.execute_cdp_cmd(
+        "Page.addScriptToEvaluateOnNewDocument", {"source": FIRST_CONTENT_JS % {"xpath": json.dumps(content_xpath)}}
+    )["identifier"]
+    try:
+        driver.set_page_load_timeout(timeout)
+        driver.get(url)
+        driver.set_script_timeout(timeout + 5)
+        settled = driver.execute_async_script(WAIT_FOR_SETTLED_JS, quiet_ms, timeout * 1000)
+        raw = driver.execute_script(LOAD_METRICS_JS)
+    finally:
+        driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": identifier})
+
+    origin = "{0.scheme}://{0.netloc}".format(urlsplit(url))
+    bundle = [
+        r for r in raw["resources"]
+        if r["name"].startswith(origin) and urlsplit(r["name"]).path.endswith((".js", ".css"))
+    ]
+    api = [r for r in raw["resources"] if urlsplit(r["name"]).path.startswith("/api/")]
+    long_tasks = raw["longTasks"]
+    document = raw["document"] or {}
+    return {
+        "settled": bool(settled),
+        "bundle_kb": round(sum(r["transferSize"] for r in bundle) / 1024, 1),
+        "bundle_files": len(bundle),
+        "requests": len(raw["resources"]) + 1,
+        "api_requests": len(api),
+        "first_content_ms": round(raw["firstContent"]) if raw["firstContent"] is not None else None,
+        "lcp_ms": round(raw["lcp"]) if raw["lcp"] is not None else None,
+        "long_tasks": len(long_tasks),
+        "total_blocking_ms": round(sum(max(0, d - 50) for d in long_tasks)),
+        "document_kb": round(document.get("transferSize", 0) / 1024, 1),
+        "load_ms": round(document["load"]) if document.get("load") else None,
+    }
+
+
+def exceeded_budgets(metrics, budgets):
+    """Returns a readable line for every budget the metrics exceeded (missing content counts as exceeded)."""
+    problems = []
+    for name, limit in budgets.items():
+        value = metrics.get(name)
+        if value is None:
+            problems.append(f"{name}: not measured (content never appeared?) - budget {limit}")
+        elif value > limit:
+            problems.append(f"{name}: {value} > budget {limit}")
+    return problems
@@ -0,0 +1,256 @@
+"""
+Asyncio load generator for the guest-facing RSVP endpoints.
+
+Replays the traffic of an invitation SMS blast: guests arrive at a target rate (Poisson arrivals,
+open loop - a slow server does not slow the arrivals down), each one looks up their phone with
+POST /api/rsvp/lookup and most of them then answer with POST /api/rsvp/submit.
+Phones are taken from the event's real guest list, typed the way guests type them.
+
+Usage (from the tests folder):
+    python -m perf.rsvp_load --base-url http://localhost:4000 --event-id <id> --rate 50 --duration 60
+
+Prints (and optionally writes) a JSON report with throughput, p50/p95/p99 latency and error rates.
+Point it at a local/staging backend - submits change the RSVP status of the event's guests.
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+from dataclasses import dataclass, field
+
+import httpx
+
+from perf.stats import latency_summary
+
+ENDPOINTS = ("lookup", "submit")
+STATUSES = ("attending", "declined")
+SIDES = ("groom", "bride", "family", "friend")
+
+
+@dataclass
+class LoadConfig:
+    base_url: str
+    event_id: str
+    rate: float = 20.0                # new guests per second
+    duration: float = 30.0            # seconds of arrivals
+    submit_ratio: float = 0.8         # share of guests that submit after the lookup
+    unknown_ratio: float = 0.05       # share of guests whose phone is not on the list
+    think_time: float = 0.0           # seconds between lookup and submit
+    max_in_flight: int = 500          # cap on concurrent guests (protects the load generator)
+    timeout: float = 30.0
+    seed: int = 1
+
+
+@dataclass
+class EndpointStats:
+    latencies_ms: list = field(default_factory=list)
+    statuses: dict = field(default_factory=dict)
+    errors: int = 0
+    transport_errors: int = 0
+
+    def record(self, started, status=None):
+        self.latencies_ms.append((time.perf_counter() - started) * 1000)
+        if status is None:
+            self.transport_errors += 1
+            self.errors += 1
+            return
+        self.statuses[str(status)] = self.statuses.get(str(status), 0) + 1
+        if status >= 400:
+            self.errors += 1
+
+    def report(self, elapsed):
+        count = len(self.latencies_ms)
+        return {
+            **latency_summary(self.latencies_ms),
+            "throughput_rps": round(count / elapsed, 2) if elapsed else None,
+            "errors": self.errors,
+            "transport_errors": self.transport_errors,
+            "error_rate": round(self.errors / count, 4) if count else 0.0,
+            "statuses": self.statuses,
+        }
+
+
+def typed_like_a_guest(phone, rng):
+    """Returns the phone in one of the formats guests actually type (05X..., +972..., with dashes)."""
+    digits = re.sub(r"\D", "", phone or "")
+    if digits.startswith("972"):
+        digits = "0" + digits[3:]
+    if len(digits) < 9:
+        return phone
+    local = digits
+    variants = [
+        local,
+        f"{local[:3]}-{local[3:]}",
+        f"{local[:3]}-{local[3:6]}-{local[6:]}",
+        "+972" + local[1:],
+        "972" + local[1:],
+    ]
+    return rng.choice(variants)
+
+
+def random_unknown_phone(rng):
+    return "058" + "".join(str(rng.randint(0, 9)) for _ in range(7))
+
+
+async def fetch_known_phones(client, event_id, page_size=1000):
+    """Walks the guest list page by page, fetching only the phone field."""
+    phones, cursor = [], None
+    while True:
+        params = {"limit": page_size, "fields": "phone", **({"cursor": cursor} if cursor else {})}
+        response = await client.get(f"/api/events/{event_id}/guests", params=params)
+        response.raise_for_status()
+        page = response.json()
+        phones += [g["phone"] for g in page["items"] if g.get("phone")]
+        if not page["hasMore"]:
+            return phones
+        cursor = page["nextCursor"]
+
+
+async def _guest_session(client, config, stats, rng, phone):
+    started = time.perf_counter()
+    try:
+        response = await client.post("/api/rsvp/lookup", json={"eventId": config.event_id, "phone": phone})
+        stats["lookup"].record(started, response.status_code)
+        found = response.status_code == 200 and response.json().get("found")
+    except httpx.HTTPError:
+        stats["lookup"].record(started)
+        return
+
+    if rng.random() >= config.submit_ratio:
+        return
+    if config.think_time:
+        await asyncio.sleep(rng.expovariate(1 / config.think_time))
+
+    payload = {
+        "eventId": config.event_id,
+        "phone": phone,
+        "status": rng.choice(STATUSES),
+        "count": rng.randint(1, 4),
+        "side": rng.choice(SIDES),
+        "mealOption": "standard",
+    }
+    if not found:
+        payload["fullName"] = "Load Test Guest"
+
+    started = time.perf_counter()
+    try:
+        response = await client.post("/api/rsvp/submit", json=payload)
+        stats["submit"].record(started, response.status_code)
+    except httpx.HTTPError:
+        stats["submit"].record(started)
+
+
+async def run_load(config, known_phones=None):
+    """
+    Runs one load test and returns the report dict.
+
+    Args:
+        config: LoadConfig.
+        known_phones: Phones to replay. Fetched from the event's guest list when omitted.
+    """
+    rng = random.Random(config.seed)
+    stats = {name: EndpointStats() for name in ENDPOINTS}
+    limits = httpx.Limits(max_connections=config.max_in_flight, max_keepalive_connections=config.max_in_flight)
+
+    async with httpx.AsyncClient(base_url=config.base_url.rstrip('/'), limits=limits, timeout=config.timeout) as client:
+        if known_phones is None:
+            known_phones = await fetch_known_phones(client, config.event_id)
+
+        in_flight = asyncio.Semaphore(config.max_in_flight)
+        tasks = []
+        dropped = 0
+
+        async def guarded(phone):
+            try:
+                await _guest_session(client, config, stats, rng, phone)
+            finally:
+                in_flight.release()
+
+        started = time.perf_counter()
+        next_arrival = started
+        while next_arrival - started < config.duration:
+            delay = next_arrival - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            if not known_phones or rng.random() < config.unknown_ratio:
+                phone = random_unknown_phone(rng)
+            else:
+                phone = typed_like_a_guest(rng.choice(known_phones), rng)
+
+            if in_flight.locked():
+                # The generator is saturated - count it instead of silently slowing the arrival rate
+                dropped += 1
+            else:
+                await in_flight.acquire()
+                tasks.append(asyncio.create_task(guarded(phone)))
+            next_arrival += rng.expovariate(config.rate)
+
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+
+    all_latencies = stats["lookup"].latencies_ms + stats["submit"].latencies_ms
+    total_errors = stats["lookup"].errors + stats["submit"].errors
+    return {
+        "config": {
+            "base_url": config.base_url,
+            "event_id": config.event_id,
+            "target_rate": config.rate,
+            "duration_s": config.duration,
+            "submit_ratio": config.submit_ratio,
+            "unknown_ratio": config.unknown_ratio,
+            "known_phones": len(known_phones),
+        },
+        "elapsed_s": round(elapsed, 2),
+        "guests_started": len(tasks),
+        "guests_dropped": dropped,
+        "overall": {
+            **latency_summary(all_latencies),
+            "throughput_rps": round(len(all_latencies) / elapsed, 2) if elapsed else None,
+            "errors": total_errors,
+            "error_rate": round(total_errors / len(all_latencies), 4) if all_latencies else 0.0,
+        },
+        "endpoints": {name: stats[name].report(elapsed) for name in ENDPOINTS},
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="RSVP endpoints load generator")
+    parser.add_argument("--base-url", required=True, help="Backend URL, e.g. http://localhost:4000")
+    parser.add_argument("--event-id", required=True)
+    parser.add_argument("--rate", type=float, default=LoadConfig.rate, help="Guests per second")
+    parser.add_argument("--duration", type=float, default=LoadConfig.duration, help="Seconds of arrivals")
+    parser.add_argument("--submit-ratio", type=float, default=LoadConfig.submit_ratio)
+    parser.add_argument("--unknown-ratio", type=float, default=LoadConfig.unknown_ratio)
+    parser.add_argument("--think-time", type=float, default=LoadConfig.think_time)
+    parser.add_argument("--max-in-flight", type=int, default=LoadConfig.max_in_flight)
+    parser.add_argument("--seed", type=int, default=LoadConfig.seed)
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    config = LoadConfig(
+        base_url=args.base_url,
+        event_id=args.event_id,
+        rate=args.rate,
+        duration=args.duration,
+        submit_ratio=args.submit_ratio,
+        unknown_ratio=args.unknown_ratio,
+        think_time=args.think_time,
+        max_in_flight=args.max_in_flight,
+        seed=args.seed,
+    )
+    report = asyncio.run(run_load(config))
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    print(text)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
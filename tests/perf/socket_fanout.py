@@ -0,0 +1,279 @@
+"""
+Socket.io fan-out harness for event rooms and the seating edit lock.
+
+Opens N Socket.io clients that join one event room (`join_event`, like the seating page), then creates
+tables through the REST API (POST /api/tables broadcasts `data_changed` with the new tableId to the room).
+For every mutation it records when each client received the broadcast:
+  - latency: request sent -> broadcast received, per client,
+  - spread: first client -> last client receiving the same broadcast,
+  - dropped (a client never received it) and duplicate (received more than once) deliveries.
+
+It then measures the in-memory edit lock (`request_edit_lock` / `lock_status` / `release_edit_lock`):
+in every round all contenders ask for the lock at once - exactly one must be granted - and the
+holder hands it over to the next contender (release -> next grant latency).
+
+Usage (from the tests folder):
+    python -m perf.socket_fanout --base-url http://localhost:4000 --event-id <id> --user-id <id> --clients 200
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter, defaultdict
+from dataclasses import asdict, dataclass
+
+import httpx
+import socketio
+
+from perf.stats import latency_summary
+
+
+@dataclass
+class FanoutConfig:
+    base_url: str
+    event_id: str
+    user_id: str
+    clients: int = 50               # clients in the event room
+    mutations: int = 20             # tables created while the clients listen
+    interval: float = 0.1           # seconds between mutations
+    settle_timeout: float = 5.0     # how long to wait for late deliveries after the last mutation
+    lock_contenders: int = 10       # clients competing for the seating lock
+    lock_rounds: int = 10
+    connect_concurrency: int = 50
+    timeout: float = 10.0
+    transports: tuple = ("websocket",)  # ("polling", "websocket") starts with long-polling, like the browser
+
+
+def _ms(seconds):
+    return seconds * 1000
+
+
+class RoomClient:
+    """One simulated browser tab: a Socket.io connection in the event room."""
+
+    def __init__(self, index):
+        self.index = index
+        self.user_id = f"fanout-user-{index}"
+        self.email = f"fanout{index}@example.com"
+        self.received = defaultdict(list)   # tableId -> receive times
+        self.lock_replies = asyncio.Queue()
+        self.sio = socketio.AsyncClient(reconnection=False)
+        self.sio.on('data_changed', self._on_data_changed)
+        self.sio.on('lock_status', self._on_lock_status)
+
+    async def _on_data_changed(self, data=None):
+        self.received[(data or {}).get('tableId')].append(time.perf_counter())
+
+    async def _on_lock_status(self, data):
+        await self.lock_replies.put((time.perf_counter(), data))
+
+    async def connect(self, base_url, event_id, timeout, transports=("websocket",)):
+        await self.sio.connect(base_url, transports=list(transports), wait_timeout=timeout)
+        await self.sio.emit('join_event', event_id)
+
+    async def request_lock(self, event_id, timeout):
+        """Asks for the edit lock; returns (granted, milliseconds until the lock_status reply)."""
+        started = time.perf_counter()
+        await self.sio.emit('request_edit_lock', {"eventId": event_id, "userId": self.user_id, "email": self.email})
+        received_at, status = await asyncio.wait_for(self.lock_replies.get(), timeout)
+        return not status.get("isLocked"), _ms(received_at - started)
+
+    async def release_lock(self, event_id):
+        await self.sio.emit('release_edit_lock', event_id)
+
+    @property
+    def worker(self):
+        """The backend worker serving this client in cluster mode (session ids start with "w<index>_")."""
+        sid = self.sio.eio.sid or ""
+        return sid.split("_", 1)[0] if sid.startswith("w") and "_" in sid else None
+
+    async def close(self):
+        await self.sio.disconnect()
+
+
+async def _connect_all(config):
+    clients = [RoomClient(i) for i in range(config.clients)]
+    semaphore = asyncio.Semaphore(config.connect_concurrency)
+
+    async def connect(client):
+        async with semaphore:
+            try:
+                await client.connect(config.base_url, config.event_id, config.timeout, config.transports)
+                return client
+            except (socketio.exceptions.ConnectionError, asyncio.TimeoutError):
+                return None
+
+    started = time.perf_counter()
+    connected = [c for c in await asyncio.gather(*(connect(c) for c in clients)) if c is not None]
+    return connected, {
+        "requested": config.clients,
+        "connected": len(connected),
+        "failed": config.clients - len(connected),
+        "seconds": round(time.perf_counter() - started, 3),
+        "workers": dict(Counter(c.worker for c in connected if c.worker)),
+    }
+
+
+async def _create_table(http, config, name):
+    payload = {"eventId": config.event_id, "userId": config.user_id, "name": name, "capacity": 10}
+    sent = time.perf_counter()
+    response = await http.post("/api/tables", json=payload)
+    response.raise_for_status()
+    return response.json()["_id"], sent, _ms(time.perf_counter() - sent)
+
+
+async def _wait_for_delivery(clients, table_ids, timeout):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if all(table_id in c.received for c in clients for table_id in table_ids):
+            return
+        await asyncio.sleep(0.02)
+
+
+async def _measure_fanout(http, clients, config):
+    # Warm-up broadcast: join_event has no ack, so wait until every client is really in the room
+    warmup_id, _, _ = await _create_table(http, config, "Fan-out warm-up")
+    await _wait_for_delivery(clients, [warmup_id], config.timeout)
+    in_room = [c for c in clients if warmup_id in c.received]
+
+    mutations = []
+
+    async def mutate(i):
+        mutations.append(await _create_table(http, config, f"Fan-out table {i}"))
+
+    tasks = []
+    for i in range(config.mutations):
+        tasks.append(asyncio.create_task(mutate(i)))
+        await asyncio.sleep(config.interval)
+    await asyncio.gather(*tasks)
+    await _wait_for_delivery(in_room, [m[0] for m in mutations], config.settle_timeout)
+
+    latencies, spreads, rest = [], [], []
+    delivered = dropped = duplicates = 0
+    for table_id, sent, rest_ms in mutations:
+        rest.append(rest_ms)
+        first_receipts = []
+        for client in in_room:
+            receipts = client.received.get(table_id, [])
+            if not receipts:
+                dropped += 1
+                continue
+            delivered += 1
+            duplicates += len(receipts) - 1
+            first_receipts.append(receipts[0])
+            latencies.append(_ms(receipts[0] - sent))
+        if first_receipts:
+            spreads.append(_ms(max(first_receipts) - min(first_receipts)))
+
+    return {
+        "clients_in_room": len(in_room),
+        "clients_missing_warmup": len(clients) - len(in_room),
+        "mutations": len(mutations),
+        "expected_deliveries": len(mutations) * len(in_room),
+        "delivered": delivered,
+        "dropped": dropped,
+        "duplicates": duplicates,
+        "latency": latency_summary(latencies),
+        "spread": latency_summary(spreads),
+        "rest": latency_summary(rest),
+    }, [warmup_id] + [m[0] for m in mutations]
+
+
+async def _measure_locks(contenders, config):
+    acquire, handoff = [], []
+    violations = denials = 0
+
+    for _ in range(config.lock_rounds):
+        results = await asyncio.gather(*(c.request_lock(config.event_id, config.timeout) for c in contenders))
+        acquire.extend(ms for _, ms in results)
+        holders = [c for c, (granted, _) in zip(contenders, results) if granted]
+        denials += len(results) - len(holders)
+        if len(holders) != 1:
+            # 0 holders: a stale lock; more than 1: two editors on the same seating plan
+            violations += 1
+            for holder in holders:
+                await holder.release_lock(config.event_id)
+            continue
+
+        # Hand-over: the holder leaves the page, another contender retries until it gets the lock
+        holder = holders[0]
+        successor = next(c for c in contenders if c is not holder)
+        released = time.perf_counter()
+        await holder.release_lock(config.event_id)
+        deadline = released + config.timeout
+        while time.perf_counter() < deadline:
+            granted, _ = await successor.request_lock(config.event_id, config.timeout)
+            if granted:
+                handoff.append(_ms(time.perf_counter() - released))
+                break
+        await successor.release_lock(config.event_id)
+
+    return {
+        "contenders": len(contenders),
+        "rounds": config.lock_rounds,
+        "violations": violations,
+        "denials": denials,
+        "acquire": latency_summary(acquire),
+        "handoff": latency_summary(handoff),
+    }
+
+
+async def run_fanout(config):
+    """Runs the fan-out and the lock measurements and returns the report dict."""
+    clients, connect_report = await _connect_all(config)
+    created = []
+    try:
+        async with httpx.AsyncClient(base_url=config.base_url.rstrip('/'), timeout=config.timeout) as http:
+            fanout_report, created = await _measure_fanout(http, clients, config)
+            locks_report = await _measure_locks(clients[:config.lock_contenders], config) if len(clients) > 1 else None
+    finally:
+        await asyncio.gather(*(c.close() for c in clients), return_exceptions=True)
+
+    # Remove the tables the harness created (after disconnecting, so the deletes are not measured)
+    async with httpx.AsyncClient(base_url=config.base_url.rstrip('/'), timeout=config.timeout) as http:
+        await asyncio.gather(*(http.delete(f"/api/tables/{table_id}") for table_id in created))
+
+    return {
+        "config": asdict(config),
+        "connect": connect_report,
+        "fanout": fanout_report,
+        "locks": locks_report,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Socket.io fan-out and edit-lock harness")
+    parser.add_argument("--base-url", required=True, help="Backend URL, e.g. http://localhost:4000")
+    parser.add_argument("--event-id", required=True)
+    parser.add_argument("--user-id", required=True, help="Owner of the tables the harness creates")
+    parser.add_argument("--clients", type=int, default=FanoutConfig.clients)
+    parser.add_argument("--mutations", type=int, default=FanoutConfig.mutations)
+    parser.add_argument("--interval", type=float, default=FanoutConfig.interval)
+    parser.add_argument("--lock-contenders", type=int, default=FanoutConfig.lock_contenders)
+    parser.add_argument("--lock-rounds", type=int, default=FanoutConfig.lock_rounds)
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    config = FanoutConfig(
+        base_url=args.base_url,
+        event_id=args.event_id,
+        user_id=args.user_id,
+        clients=args.clients,
+        mutations=args.mutations,
+        interval=args.interval,
+        lock_contenders=args.lock_contenders,
+        lock_rounds=args.lock_rounds,
+    )
+    report = asyncio.run(run_fanout(config))
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    print(text)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
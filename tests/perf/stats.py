@@ -0,0 +1,25 @@
+import math
+import statistics
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile (pct in 0-100) of an unsorted list. Returns None for an empty list."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def latency_summary(latencies_ms):
+    """count / mean / p50 / p95 / p99 / max of a list of latencies in milliseconds."""
+    if not latencies_ms:
+        return {"count": 0, "mean_ms": None, "p50_ms": None, "p95_ms": None, "p99_ms": None, "max_ms": None}
+    return {
+        "count": len(latencies_ms),
+        "mean_ms": round(statistics.fmean(latencies_ms), 2),
+        "p50_ms": round(percentile(latencies_ms, 50), 2),
+        "p95_ms": round(percentile(latencies_ms, 95), 2),
+        "p99_ms": round(percentile(latencies_ms, 99), 2),
+        "max_ms": round(max(latencies_ms), 2),
+    }
@@ -0,0 +1,27 @@
+import pytest
+from perf.bench_budget_summary import run_benchmark
+
+pytestmark = pytest.mark.perf
+
+ITEMS = 5000
+EDITS = 1000
+SUMMARY_READ_P95_MS = 50
+
+def test_budget_summary_at_scale(perf_backend, perf_user, write_report):
+    """
+    5000 expenses added concurrently, then 1000 racing edits and deletes on random items.
+    Test flow:
+    1. The stored totals and per-category chart equal the sums over the items that are left.
+    2. The summary read (?items=false) stays within budget and does not grow with the item count.
+    3. The summary read is cheaper than the read with the full item list.
+    Args:
+        perf_backend, perf_user, write_report: Injected automatically
+    """
+    report = run_benchmark(perf_backend.url, perf_user.id, ITEMS, EDITS)
+    write_report("budget_summary", report)
+
+    assert report["differences"] == {}, f"Budget summary drifted from the items: {report['differences']}"
+    summary_read, full_read = report["summary_read"], report["full_read"]
+    assert summary_read["p95_ms"] <= SUMMARY_READ_P95_MS, \
+        f"Summary read p95 {summary_read['p95_ms']} ms (budget {SUMMARY_READ_P95_MS} ms)"
+    assert summary_read["p50_ms"] < full_read["p50_ms"], f"Summary read is not cheaper: {summary_read} vs {full_read}"
@@ -0,0 +1,53 @@
+import os
+import pytest
+from perf.bench_cluster import run_benchmark
+from support.local_backend import LocalBackend
+
+pytestmark = pytest.mark.perf
+
+WORKERS = 4
+MIN_SPEEDUP = 1.5
+
+@pytest.fixture(scope="module")
+def cluster_backend(perf_backend):
+    """backend/cluster.js with 4 workers, on the same MongoDB and database as perf_backend."""
+    backend = LocalBackend(
+        name="cluster", mongo_uri=perf_backend.mongo_uri, script="cluster.js",
+        env={"CLUSTER_WORKERS": str(WORKERS), "DB_NAME": perf_backend.db_name},
+    ).start()
+    yield backend
+    backend.stop()
+
+def test_cluster_locks_broadcasts_and_throughput(perf_backend, cluster_backend, dataset, write_report):
+    """
+    4 workers behind one port, compared with the single-process backend on the same data.
+    Test flow:
+    1. Socket.io clients (long-polling first, then upgraded) are spread over all workers.
+    2. Every data_changed broadcast reaches every client exactly once, whichever worker made the change.
+    3. Lock contenders on different workers never hold the seating lock together.
+    4. Guests seated on one small table at once through every worker never overfill it.
+    5. With at least 4 CPUs the cluster serves the read load faster than one process.
+    Args:
+        perf_backend, dataset, write_report: Injected automatically by conftest.py
+        cluster_backend: The cluster (module fixture above)
+    """
+    data = dataset("small", seed=1, weddings=1, guests_per_wedding=1000)
+    event_id, _ = data.largest_event
+    report = run_benchmark(perf_backend.url, cluster_backend.url, data.weddings[0].couple_id, event_id)
+    write_report("cluster", report)
+
+    sockets, throughput = report["sockets"], report["throughput"]
+    print(f"\n[Cluster] clients per worker {sockets['connect']['workers']}, speedup x{throughput['speedup']}")
+    assert sockets["connect"]["failed"] == 0, f"Socket connections failed: {sockets['connect']}"
+    assert len(sockets["connect"]["workers"]) == WORKERS, f"Clients did not reach every worker: {sockets['connect']}"
+    assert sockets["fanout"]["clients_missing_warmup"] == 0, "Some clients never joined the event room"
+    assert sockets["fanout"]["dropped"] == 0, f"{sockets['fanout']['dropped']} broadcasts were not delivered"
+    assert sockets["fanout"]["duplicates"] == 0, f"{sockets['fanout']['duplicates']} broadcasts were delivered twice"
+    assert sockets["locks"]["violations"] == 0, f"The lock did not have exactly one holder in {sockets['locks']['violations']} rounds"
+    seating = report["seating"]
+    assert seating["errors"] == 0, f"Seating requests failed: {seating}"
+    assert seating["seats_taken"] <= seating["capacity"], f"The table was overfilled across workers: {seating}"
+    assert throughput["single"]["errors"] == 0 and throughput["cluster"]["errors"] == 0, "Read requests failed"
+
+    if (os.cpu_count() or 1) >= WORKERS:
+        assert throughput["speedup"] >= MIN_SPEEDUP, f"Cluster throughput only x{throughput['speedup']}: {throughput}"
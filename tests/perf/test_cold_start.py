@@ -0,0 +1,41 @@
+import pytest
+from perf.bench_cold_start import run_benchmark
+
+pytestmark = pytest.mark.perf
+
+RUNS = 3
+FIRST_RESPONSE_BUDGET_MS = 1500
+# Noise between boots of the same mode on a busy CI machine
+TOLERANCE_MS = 25
+LAZY_MODULES = ("guestTransfer", "upload", "mail")
+
+def test_cold_start_answers_before_the_lazy_modules_load(perf_backend, dataset, write_report):
+    """
+    Fresh `node index.js` processes against the hermetic MongoDB, lazy boot (default) and STARTUP_MODE=eager.
+    Test flow:
+    1. Every boot answers /api/health within the budget.
+    2. The lazy boot answers no later than the eager one.
+    3. After a lazy boot the import/export and mail modules are not loaded yet; the first guest export loads guestTransfer.
+    Args:
+        perf_backend, dataset, write_report: Injected automatically by conftest.py
+    """
+    data = dataset("small", seed=1)
+    event_id, _ = data.largest_event
+    report = run_benchmark(perf_backend.mongo_uri, perf_backend.db_name, runs=RUNS, event_id=event_id)
+    write_report("cold_start", report)
+
+    lazy, eager = report["modes"]["lazy"], report["modes"]["eager"]
+    print(f"\n[Cold start] first response lazy {lazy['first_response_ms']['median']}ms, "
+          f"eager {eager['first_response_ms']['median']}ms, require costs {report['require_ms']}")
+    assert lazy["first_response_ms"]["max"] <= FIRST_RESPONSE_BUDGET_MS, f"Slow cold start: {lazy['first_response_ms']}"
+    assert lazy["first_response_ms"]["median"] <= eager["first_response_ms"]["median"] + TOLERANCE_MS, \
+        f"The lazy boot answered later than the eager one: {lazy['first_response_ms']} vs {eager['first_response_ms']}"
+
+    for boot in lazy["boots"]:
+        assert boot["startup"]["mode"] == "lazy"
+        loaded = [name for name in LAZY_MODULES if boot["startup"]["lazy"][name]["loaded"]]
+        assert not loaded, f"Loaded during the boot: {loaded}"
+        assert boot["first_export"]["status"] == 200, f"Export failed: {boot['first_export']}"
+        assert boot["first_export"]["lazy"]["guestTransfer"]["loaded"], "The export did not load guestTransfer"
+    for boot in eager["boots"]:
+        assert all(boot["startup"]["lazy"][name]["loaded"] for name in LAZY_MODULES), boot["startup"]["lazy"]
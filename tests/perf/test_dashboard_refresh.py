@@ -0,0 +1,31 @@
+import pytest
+from perf.bench_dashboard_refresh import run_benchmark
+
+pytestmark = pytest.mark.perf
+
+ROUNDS = 30
+MIN_HIT_RATIO = 0.6
+MIN_BYTES_SAVED = 0.7
+
+def test_dashboard_refresh_transfers_only_changes(perf_backend, dataset, write_report):
+    """
+    Replays 30 dashboard refreshes, each after one change, for a generated couple with 1000 guests.
+    Test flow:
+    1. Like a browser (If-None-Match + gzip) most lists answer 304 - only the changed ones are sent.
+    2. No route a change touched answers 304 (no stale data).
+    3. Far fewer bytes go over the wire than with full uncompressed refetches.
+    Args:
+        perf_backend, dataset, write_report: Injected automatically by conftest.py
+    """
+    data = dataset("small", seed=1, weddings=1, guests_per_wedding=1000)
+    event_id, _ = data.largest_event
+    couple = data.weddings[0]
+
+    report = run_benchmark(perf_backend.url, couple.couple_id, event_id, ROUNDS)
+    write_report("dashboard_refresh", report)
+    print(f"\n[Refresh] 304 ratio {report['conditional']['hit_ratio']}, "
+          f"{report['conditional']['wire_bytes']} vs {report['plain']['wire_bytes']} bytes")
+
+    assert not report["stale"], f"Changed lists answered 304: {report['stale']}"
+    assert report["conditional"]["hit_ratio"] >= MIN_HIT_RATIO, f"Too few 304s: {report['conditional']}"
+    assert report["wire_bytes_saved"] >= MIN_BYTES_SAVED, f"Refreshes saved only {report['wire_bytes_saved']:.0%} of the bytes"
@@ -0,0 +1,51 @@
+import pytest
+from pymongo import MongoClient
+from perf.dataset import copy_password_hash, load_dataset
+from support.api_client import ApiClient
+
+pytestmark = pytest.mark.perf
+
+def test_dataset_is_deterministic_and_usable(perf_backend, dataset, write_report):
+    """
+    Loads the "small" synthetic dataset and checks it can stand in for real data in scale tests.
+
+    Test flow:
+    1. Loading the same preset and seed again gives the same ids and counts.
+    2. Every collection got documents and generated guests have phone_normalized.
+    3. A generated couple logs in and reads their event, guest list and budget through the API.
+
+    Args:
+        perf_backend: The hermetic backend. Injected automatically by conftest.py
+        dataset: Dataset loader. Injected automatically by conftest.py
+        write_report: Writes tests/reports/<name>.json. Injected automatically by conftest.py
+    """
+    data = dataset("small", seed=7)
+    print(f"\n[Step 1] Loaded {data.counts} in {data.load_s}s")
+
+    password_hash = copy_password_hash(perf_backend.mongo_uri, perf_backend.db_name, perf_backend.credentials["email"])
+    again = load_dataset(perf_backend.mongo_uri, perf_backend.db_name, "small", seed=7, password_hash=password_hash)
+    assert again.counts == data.counts, "The same seed produced different amounts of data"
+    assert [w.event_ids for w in again.weddings] == [w.event_ids for w in data.weddings], "The same seed produced different ids"
+    print("✅ Reloading with the same seed gave identical ids and counts")
+
+    for collection in ("users", "events", "guests", "tables", "tasks", "budgetitems", "vendors", "notifications"):
+        assert data.counts.get(collection), f"No {collection} generated"
+    event_id, guests = data.largest_event
+    with MongoClient(perf_backend.mongo_uri) as mongo:
+        db = mongo[perf_backend.db_name]
+        missing = db.guests.count_documents({"phone": {"$ne": None}, "phone_normalized": {"$exists": False}})
+    assert missing == 0, f"{missing} generated guests have no phone_normalized"
+
+    wedding = next(w for w in data.weddings if w.event_ids[0] == event_id)
+    with ApiClient(perf_backend.url) as client:
+        user = client.login(wedding.email, data.password)
+        events = client.list_events(user.id)
+        assert event_id in [e.id for e in events], "The couple does not see their generated event"
+        listed = client.list_guests(event_id)
+        assert len(listed) == guests, f"Expected {guests} guests, the API returned {len(listed)}"
+        budget = client.get_budget(event_id, items=False)
+    assert budget.summary.totalExpenses > 0, "The generated expenses are missing from the budget summary"
+    print(f"✅ {wedding.email} sees their event with {len(listed)} guests")
+
+    write_report("dataset_small", {"counts": data.counts, "load_s": data.load_s, "largest_event_guests": guests,
+                                   "total_expenses": budget.summary.totalExpenses})
@@ -0,0 +1,65 @@
+import os
+import pytest
+from perf.frontend_budgets import exceeded_budgets, load_budgets, measure_route, throttled
+from support.api_client import ApiClient
+from support.local_backend import BACKEND_DIR
+from support.session import clear_seeded_user, seed_logged_in_user
+from support.waits import xpath_literal
+
+pytestmark = pytest.mark.perf
+
+BUDGETS = load_budgets()
+DIST_INDEX = os.path.join(os.path.dirname(BACKEND_DIR), 'frontend', 'dist', 'index.html')
+
+@pytest.fixture(scope="module")
+def budget_data(perf_backend):
+    """An event with guests, a table, an expense and a vendor, so every route has real content to render."""
+    if not os.path.exists(DIST_INDEX):
+        pytest.skip("frontend/dist is missing - build it with: cd frontend && VITE_API_URL= npm run build")
+
+    with ApiClient(perf_backend.url) as api:
+        user = api.login(perf_backend.credentials["email"], perf_backend.credentials["password"])
+        event = api.create_event(user.id, "Budget Wedding", "2030-06-01")
+        for i in range(20):
+            api.add_guest(event.id, f"Budget Guest {i}", phone=f"054{i:07d}")
+        api.add_expense(event.id, "Budget Expense", 1000)
+        api.add_vendor(user.id, "Budget Vendor", "Music")
+        api.request("POST", "/api/tables", json={"eventId": event.id, "userId": user.id, "name": "Table 1"})
+    return {
+        "user": user,
+        "event_id": event.id,
+        "event_title": xpath_literal("Budget Wedding"),
+        "guest_name": xpath_literal("Budget Guest 0"),
+        "vendor_name": xpath_literal("Budget Vendor"),
+    }
+
+@pytest.mark.parametrize("route", list(BUDGETS["routes"]))
+def test_frontend_budget(route, driver, perf_backend, budget_data, write_report):
+    """
+    Cold-loads one main route in a throttled Chrome (CPU slowdown + slow network, see frontend_budgets.json)
+    and fails when bundle bytes, request count, time to first meaningful content or long tasks exceed the budget.
+    Args:
+        route: Route name from frontend_budgets.json
+        driver, perf_backend, write_report: Injected automatically by conftest.py
+    """
+    config = BUDGETS["routes"][route]
+    url = perf_backend.url + config["path"].format(**budget_data)
+    content_xpath = config["content"].format(**budget_data)
+
+    print(f"1. Loading '{route}' ({config['path']}) with the throttled profile...")
+    identifier = None if config.get("logged_out") else seed_logged_in_user(driver, perf_backend.url, budget_data["user"])
+    try:
+        with throttled(driver, BUDGETS["profile"], mobile=config.get("mobile", False)):
+            metrics = measure_route(driver, url, content_xpath)
+    finally:
+        if identifier:
+            clear_seeded_user(driver, identifier)
+
+    print("2. Comparing with the budgets...")
+    report = {"route": route, "url": url, "profile": BUDGETS["profile"], "metrics": metrics, "budgets": config["budgets"]}
+    write_report(f"frontend_budget_{route}", report)
+
+    problems = exceeded_budgets(metrics, config["budgets"])
+    if problems:
+        assert False, f"❌ '{route}' is over budget:\n" + "\n".join(problems)
+    print(f"✅ '{route}' within budget: {metrics}")
@@ -0,0 +1,40 @@
+import os
+import pytest
+from perf.bench_guest_pages import run_benchmark
+
+pytestmark = pytest.mark.perf
+
+GUESTS = int(os.getenv("GUEST_PAGE_BENCH_GUESTS", "50000"))
+PAGE_SIZE = 100
+
+# Per-page budgets (hermetic backend on the test machine)
+MAX_PAGE_KB = 50
+MAX_PROJECTED_PAGE_KB = 20
+MAX_PAGE_P95_MS = 250
+
+def test_guest_list_pagination_at_scale(perf_backend, perf_user, write_report):
+    """
+    Seeds one event with 50k guests (GUEST_PAGE_BENCH_GUESTS) into the hermetic database and
+    walks GET /api/events/:eventId/guests in pages of 100.
+    Test flow:
+    1. Every guest is returned exactly once (by created_at and by full_name).
+    2. Every page stays under the size budget - also with ?fields= projection.
+    3. Page latency stays bounded and deep pages are not slower than the first ones (keyset, no skip).
+    Args:
+        perf_backend, perf_user, write_report: Injected automatically by conftest.py
+    """
+    report = run_benchmark(
+        perf_backend.url, perf_backend.mongo_uri, perf_backend.db_name, perf_user.id, GUESTS, PAGE_SIZE
+    )
+    write_report("guest_pagination", report)
+    paged, by_name, projected = report["paged"], report["by_name"], report["projected"]
+
+    assert paged["items"] == paged["unique"] == GUESTS, f"Pages skipped or repeated guests: {paged}"
+    assert by_name["items"] == by_name["unique"] == GUESTS, f"Pages by name skipped or repeated guests: {by_name}"
+
+    assert paged["max_bytes"] <= MAX_PAGE_KB * 1024, f"Page too large: {paged['max_bytes']} bytes"
+    assert projected["max_bytes"] <= MAX_PROJECTED_PAGE_KB * 1024, f"Projected page too large: {projected['max_bytes']} bytes"
+
+    assert paged["p95_ms"] <= MAX_PAGE_P95_MS, f"Page p95 {paged['p95_ms']}ms > {MAX_PAGE_P95_MS}ms"
+    # Deep pages must not degrade like skip/offset paging would (small absolute slack for noise)
+    assert paged["last_10pct_mean_ms"] <= paged["first_10pct_mean_ms"] * 2 + 20, f"Deep pages are slower: {paged}"
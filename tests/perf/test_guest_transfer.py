@@ -0,0 +1,30 @@
+import os
+import pytest
+from perf.bench_guest_transfer import run_benchmark
+
+pytestmark = pytest.mark.perf
+
+# Larger sizes are for manual runs: GUEST_TRANSFER_SIZES="1000 10000 100000" pytest -m perf
+SIZES = [int(n) for n in os.getenv("GUEST_TRANSFER_SIZES", "1000").split()]
+
+def test_guest_transfer_benchmark(perf_backend, perf_user, write_report):
+    """
+    Imports, re-imports and exports generated guest files (Excel and CSV) against the hermetic backend.
+    Test flow:
+    1. Import a fresh file - every row is inserted.
+    2. Import the same file again - every row updates the existing guest (no duplicates).
+    3. Export as Excel and as CSV.
+    Args:
+        perf_backend, perf_user, write_report: Injected automatically by conftest.py
+    """
+    report = run_benchmark(perf_backend.url, perf_user.id, SIZES, pid=perf_backend.process.pid)
+    write_report("guest_transfer", report)
+
+    for result in report["results"]:
+        label = f"{result['rows']} rows ({result['format']})"
+        assert result["import"]["inserted"] == result["rows"], f"{label}: import did not insert every row"
+        assert result["import"]["failed"] == 0, f"{label}: rows failed on import"
+        assert result["reimport"]["inserted"] == 0, f"{label}: re-import created duplicate guests"
+        assert result["reimport"]["updated"] == result["rows"], f"{label}: re-import did not match every guest"
+        assert result["guests_stored"] == result["rows"]
+        assert result["export_csv"]["bytes"] > 0 and result["export_xlsx"]["bytes"] > 0
@@ -0,0 +1,47 @@
+import pytest
+from perf.bench_dashboard_loads import DASHBOARD_ROUTES, run_benchmark, seed_dashboard_users
+from support.local_backend import LocalBackend
+
+pytestmark = pytest.mark.perf
+
+COUPLES = 10
+PARTNERS_PER_COUPLE = 2
+DASHBOARDS = 50
+ROUNDS = 20
+
+@pytest.fixture(scope="module")
+def uncached_backend(perf_backend):
+    """A second backend (same MongoDB, own database) with the identity cache turned off."""
+    backend = LocalBackend(name="nocache", mongo_uri=perf_backend.mongo_uri, env={"IDENTITY_CACHE_TTL_MS": "0"}).start()
+    yield backend
+    backend.stop()
+
+def test_identity_cache_under_dashboard_load(perf_backend, uncached_backend, write_report):
+    """
+    50 concurrent dashboards (couples and partners) refresh events, tasks and notifications 20 times,
+    against the regular backend and against one with IDENTITY_CACHE_TTL_MS=0.
+    Test flow:
+    1. Same users and data on both backends.
+    2. With the cache, the user lookups are served from memory (high hit rate).
+    3. The cached backend is not slower on the two routes that resolve the partner.
+    Args:
+        perf_backend, uncached_backend, write_report: Injected automatically
+    """
+    results = {}
+    for label, backend in (("cached", perf_backend), ("uncached", uncached_backend)):
+        user_ids = seed_dashboard_users(backend.url, COUPLES, PARTNERS_PER_COUPLE, tag=label)
+        results[label] = run_benchmark(backend.url, user_ids, DASHBOARDS, ROUNDS)
+
+    cached, uncached = results["cached"], results["uncached"]
+    results["saved_p50_ms"] = {
+        route: round(uncached["routes"][route]["p50_ms"] - cached["routes"][route]["p50_ms"], 2)
+        for route in DASHBOARD_ROUTES
+    }
+    write_report("identity_cache", results)
+
+    assert cached["errors"] == 0 and uncached["errors"] == 0, "Dashboard requests failed"
+    assert cached["identity_cache"]["hitRate"] >= 0.9, f"Identity cache hit rate too low: {cached['identity_cache']}"
+    assert uncached["identity_cache"]["hits"] == 0, "IDENTITY_CACHE_TTL_MS=0 must disable the cache"
+    for route in ("/api/events", "/api/tasks"):
+        assert cached["routes"][route]["p50_ms"] <= uncached["routes"][route]["p50_ms"] * 1.1 + 1, \
+            f"{route} is slower with the identity cache: {cached['routes'][route]} vs {uncached['routes'][route]}"
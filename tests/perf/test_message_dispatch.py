@@ -0,0 +1,79 @@
+import time
+import pytest
+from perf.conftest import seed_guests
+from support.api_client import ApiClient
+from support.fake_sms import FakeSmsProvider
+from support.local_backend import HERMETIC_USER, LocalBackend
+
+pytestmark = pytest.mark.perf
+
+GUESTS = 600
+RATE_PER_SEC = 100
+
+@pytest.fixture(scope="module")
+def sms_setup(perf_backend):
+    """
+    A second backend (same MongoDB, own database) whose SMS go to a local FakeSmsProvider
+    that answers slowly and fails 5% of the requests with 503.
+    """
+    with FakeSmsProvider(latency=0.05, failure_rate=0.05) as sms:
+        backend = LocalBackend(
+            name="sms",
+            mongo_uri=perf_backend.mongo_uri,
+            env={
+                "SMS_PROVIDER_URL": sms.url,
+                "SMS_RATE_PER_SEC": str(RATE_PER_SEC),
+                "SMS_CONCURRENCY": "20",
+                "SMS_RETRY_BASE_MS": "100",
+            },
+        ).start()
+        try:
+            yield backend, sms
+        finally:
+            backend.stop()
+
+def test_invitation_dispatch_throughput(sms_setup, write_report):
+    """
+    Sends the RSVP invitation to a 600-guest list and polls the job until it finishes.
+    Test flow:
+    1. POST /api/messages/send answers right away with a job ID (202).
+    2. Poll GET /api/messages/jobs/:jobId until the job is done.
+    3. Every guest got exactly one SMS, transient provider errors were retried, the rate limit was kept.
+    Args:
+        sms_setup, write_report: Injected automatically
+    """
+    backend, sms = sms_setup
+    with ApiClient(backend.url) as api:
+        user = api.register(HERMETIC_USER["email"], HERMETIC_USER["password"], HERMETIC_USER["fullName"])
+        event = api.create_event(user.id, "Dispatch Event", "2030-06-01")
+        seed_guests(backend.url, event.id, GUESTS)
+
+        started = time.perf_counter()
+        response = api.http.post("/api/messages/send", json={"eventId": event.id, "eventName": "Dispatch Event"})
+        accepted_ms = (time.perf_counter() - started) * 1000
+        assert response.status_code == 202, f"❌ Expected 202, got {response.status_code}: {response.text}"
+        job = response.json()
+
+        while job["status"] != "done":
+            assert time.perf_counter() - started < 120, f"❌ Job did not finish in 120s: {job}"
+            time.sleep(0.2)
+            job = api.request("GET", f"/api/messages/jobs/{job['jobId']}")
+        completion_s = time.perf_counter() - started
+
+    delivered = sms.delivered_to()
+    report = {
+        "guests": GUESTS,
+        "configured_rate_per_s": RATE_PER_SEC,
+        "accepted_ms": round(accepted_ms, 1),
+        "completion_s": round(completion_s, 2),
+        "messages_per_s": round(job["sent"] / completion_s, 2),
+        "provider_delivery_rate_per_s": sms.delivery_rate(),
+        "provider_rejected": sms.rejected,
+        "job": {k: job[k] for k in ("total", "sent", "skipped", "failed", "retries")},
+    }
+    write_report("message_dispatch", report)
+
+    assert accepted_ms < 2000, "The send request still waits for the messages"
+    assert job["sent"] == GUESTS and job["failed"] == 0, f"❌ Not every invitation was sent: {report['job']}"
+    assert len(delivered) == len(set(delivered)) == GUESTS, "❌ Some guests got the SMS twice or not at all"
+    assert report["provider_delivery_rate_per_s"] <= RATE_PER_SEC * 1.2, "❌ The dispatcher exceeded its rate limit"
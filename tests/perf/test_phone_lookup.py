@@ -0,0 +1,32 @@
+import os
+import pytest
+from perf.bench_phone_lookup import run_benchmark
+
+pytestmark = pytest.mark.perf
+
+SIZES = [int(n) for n in os.getenv("PHONE_LOOKUP_BENCH_SIZES", "1000 10000 50000").split()]
+LOOKUPS = 200
+MAX_DOCS_EXAMINED = 2
+MAX_LOOKUP_P95_MS = 50
+
+def test_phone_lookup_stays_flat(perf_backend, perf_user, write_report):
+    """
+    Seeds events of 1k, 10k and 50k guests (PHONE_LOOKUP_BENCH_SIZES) with phones in mixed formats
+    and no phone_normalized, backfills them and looks guests up by a differently formatted phone.
+    Test flow:
+    1. The backfill normalizes every seeded guest.
+    2. Every lookup finds its guest, whatever format was typed.
+    3. A lookup reads at most a couple of documents and its latency does not grow with the event.
+    Args:
+        perf_backend, perf_user, write_report: Injected automatically by conftest.py
+    """
+    report = run_benchmark(perf_backend.url, perf_backend.mongo_uri, perf_backend.db_name, perf_user.id, SIZES, LOOKUPS)
+    write_report("phone_lookup", report)
+
+    assert report["backfill"]["updated"] >= sum(SIZES), f"Backfill missed guests: {report['backfill']}"
+    for result in report["results"]:
+        assert result["found"] == min(LOOKUPS, result["guests"]), f"Lookups missed known guests: {result}"
+        assert result["docs_examined"] <= MAX_DOCS_EXAMINED, f"Lookup is not using the phone index: {result}"
+        assert result["p95_ms"] <= MAX_LOOKUP_P95_MS, f"Lookup p95 over {MAX_LOOKUP_P95_MS} ms: {result}"
+    smallest, largest = report["results"][0], report["results"][-1]
+    assert largest["p50_ms"] <= smallest["p50_ms"] * 2 + 2, f"Lookup latency grows with the event size: {report}"
@@ -0,0 +1,24 @@
+import os
+import pytest
+from perf.bench_reminders import bench_users
+
+pytestmark = pytest.mark.perf
+
+USERS = int(os.getenv("REMINDER_BENCH_USERS", "10000"))
+
+def test_reminder_job_benchmark(perf_backend, write_report):
+    """
+    Seeds 10k users (REMINDER_BENCH_USERS) with one event each into a separate database on the hermetic MongoDB
+    and runs the reminder job twice.
+    Test flow:
+    1. First run - creates exactly the due reminders.
+    2. Second run - creates nothing (every reminder was already sent).
+    Args:
+        perf_backend, write_report: Injected automatically by conftest.py
+    """
+    report = bench_users(perf_backend.mongo_uri, f"{perf_backend.db_name}_reminders", USERS)
+    write_report("reminders", report)
+
+    assert report["first_run"]["created"] == report["expected_due"], f"Wrong number of reminders: {report}"
+    assert report["second_run"]["created"] == 0, "The second run sent reminders again"
+    assert report["first_run"]["ms"] < 10000, "Reminder run took more than 10 seconds"
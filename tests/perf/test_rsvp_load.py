@@ -0,0 +1,26 @@
+import asyncio
+import pytest
+from perf.conftest import seed_guests
+from perf.rsvp_load import LoadConfig, run_load
+from support.api_client import ApiClient
+
+pytestmark = pytest.mark.perf
+
+def test_rsvp_load_smoke(perf_backend, perf_user, write_report):
+    """
+    Short RSVP burst against the hermetic backend: 200 known guests, 20 guests/second for 5 seconds.
+    Catches errors and gross latency regressions in /api/rsvp/lookup and /api/rsvp/submit.
+    Args:
+        perf_backend, perf_user, write_report: Injected automatically by conftest.py
+    """
+    with ApiClient(perf_backend.url) as api:
+        event = api.create_event(perf_user.id, "RSVP Load Event", "2030-06-01")
+    seeded = seed_guests(perf_backend.url, event.id, 200)
+
+    config = LoadConfig(base_url=perf_backend.url, event_id=event.id, rate=20, duration=5)
+    report = asyncio.run(run_load(config, known_phones=[g.phone for g in seeded]))
+    write_report("rsvp_load_smoke", report)
+
+    assert report["overall"]["error_rate"] == 0, f"RSVP errors: {report['endpoints']}"
+    assert report["endpoints"]["lookup"]["count"] > 0
+    assert report["endpoints"]["lookup"]["p95_ms"] < 1000, "RSVP lookup p95 above 1s"
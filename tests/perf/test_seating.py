@@ -0,0 +1,32 @@
+import pytest
+from perf.bench_seating import run_benchmark, seed_seating_event
+
+pytestmark = pytest.mark.perf
+
+GUESTS = 1000
+TABLES = 100
+AUTO_SEAT_BUDGET_MS = 2000
+BULK_RESEAT_BUDGET_MS = 1000
+
+def test_seating_at_scale(perf_backend, perf_user, write_report):
+    """
+    Auto-seat and bulk re-seat of 1000 guests (1-4 seats each, mixed sides) over 100 tables of 24.
+    Test flow:
+    1. Auto-seat places every guest within budget and no table goes over capacity.
+    2. Re-seating everyone in one bulk request stays within budget and within capacity.
+    3. The bulk request beats moving the same guests one request at a time.
+    Args:
+        perf_backend, perf_user, write_report: Injected automatically
+    """
+    event_id, guest_ids, table_ids = seed_seating_event(perf_backend.url, perf_user.id, GUESTS, TABLES)
+    report = run_benchmark(perf_backend.url, event_id, guest_ids, table_ids)
+    write_report("seating", report)
+
+    auto, bulk, single = report["auto_seat"], report["bulk_reseat"], report["single_seat"]
+    assert auto["unplaced_guests"] == 0, f"Auto-seat left guests without a table: {auto}"
+    assert auto["seated"] == GUESTS, auto
+    for step in (auto, bulk, single):
+        assert step["over_capacity"] == [], f"Tables over capacity: {step}"
+    assert auto["ms"] <= AUTO_SEAT_BUDGET_MS, f"Auto-seat took {auto['ms']} ms (budget {AUTO_SEAT_BUDGET_MS} ms)"
+    assert bulk["ms"] <= BULK_RESEAT_BUDGET_MS, f"Bulk re-seat took {bulk['ms']} ms (budget {BULK_RESEAT_BUDGET_MS} ms)"
+    assert bulk["ms"] < single["projected_all_ms"], f"Bulk re-seat is not faster than one-by-one: {bulk} vs {single}"
@@ -0,0 +1,28 @@
+import asyncio
+import pytest
+from perf.socket_fanout import FanoutConfig, run_fanout
+from support.api_client import ApiClient
+
+pytestmark = pytest.mark.perf
+
+def test_socket_fanout_smoke(perf_backend, perf_user, write_report):
+    """
+    50 clients in one event room while 20 tables are created, then 10 clients competing for the seating lock.
+    Every client must receive every broadcast exactly once and the lock must have exactly one holder per round.
+    Args:
+        perf_backend, perf_user, write_report: Injected automatically by conftest.py
+    """
+    with ApiClient(perf_backend.url) as api:
+        event = api.create_event(perf_user.id, "Fan-out Event", "2030-06-01")
+
+    config = FanoutConfig(base_url=perf_backend.url, event_id=event.id, user_id=perf_user.id, clients=50, mutations=20)
+    report = asyncio.run(run_fanout(config))
+    write_report("socket_fanout_smoke", report)
+
+    fanout, locks = report["fanout"], report["locks"]
+    assert report["connect"]["failed"] == 0, f"Socket connections failed: {report['connect']}"
+    assert fanout["clients_missing_warmup"] == 0, "Some clients never joined the event room"
+    assert fanout["dropped"] == 0, f"{fanout['dropped']} broadcasts were not delivered"
+    assert fanout["duplicates"] == 0, f"{fanout['duplicates']} broadcasts were delivered twice"
+    assert fanout["latency"]["p95_ms"] < 1000, "Broadcast p95 above 1s"
+    assert locks["violations"] == 0, f"Edit lock did not have exactly one holder in {locks['violations']} rounds"
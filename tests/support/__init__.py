@@ -0,0 +1,4 @@
+"""
+Shared helpers for the test suite (browser pool, page objects, API clients).
+Test modules import from here; fixtures that wire them together live in conftest.py.
+"""
@@ -0,0 +1,215 @@
+import httpx
+
+from support.api_models import BudgetItem, BudgetOverview, Event, Guest, Page, SeededData, Task, User, Vendor
+
+# One pooled connection set per client: keep-alive connections are reused across calls,
+# so only the first request pays for the TCP/TLS handshake.
+POOL_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10)
+DEFAULT_TIMEOUT = httpx.Timeout(30.0, connect=10.0)
+
+
+class ApiError(AssertionError):
+    """Raised when the backend answers with an error status (fails the calling test)."""
+
+    def __init__(self, response):
+        self.status_code = response.status_code
+        try:
+            message = response.json().get("message", response.text)
+        except ValueError:
+            message = response.text
+        super().__init__(f"{response.request.method} {response.request.url.path} -> {response.status_code}: {message}")
+
+
+def _parse(response, parse):
+    if response.status_code >= 400:
+        raise ApiError(response)
+    data = response.json()
+    return parse(data) if parse else data
+
+
+class _Endpoints:
+    """
+    The backend routes used by the tests, shared by the sync and the async client.
+
+    Every method returns self._call(...): a typed result for ApiClient,
+    an awaitable of the same typed result for AsyncApiClient.
+    """
+
+    # --- Auth ---
+
+    def login(self, email, password):
+        """POST /api/users/login - the typed user; User.public is the object the UI stores."""
+        return self._call("POST", "/api/users/login", User.from_api, json={"email": email, "password": password})
+
+    def register(self, email, password, full_name=None, wedding_code=None):
+        """POST /api/users/register - a partner account when wedding_code is given, a new couple otherwise."""
+        payload = {"email": email, "password": password, "fullName": full_name}
+        if wedding_code:
+            payload.update({"isPartner": True, "weddingCode": wedding_code})
+        return self._call("POST", "/api/users/register", User.from_api, json=payload)
+
+    # --- Events ---
+
+    def create_event(self, user_id, title, event_date, description=None):
+        payload = {"userId": user_id, "title": title, "eventDate": event_date, "description": description}
+        return self._call("POST", "/api/events", Event.from_api, json=payload)
+
+    def list_events(self, user_id):
+        return self._call("GET", "/api/events", Event.list_from_api, params={"userId": user_id})
+
+    # --- Tasks ---
+
+    def create_task(self, user_id, title, due_date=None, category="general"):
+        payload = {"userId": user_id, "title": title, "dueDate": due_date, "category": category}
+        return self._call("POST", "/api/tasks", Task.from_api, json=payload)
+
+    def list_tasks(self, user_id):
+        return self._call("GET", "/api/tasks", Task.list_from_api, params={"userId": user_id})
+
+    # --- Guests ---
+
+    def add_guest(self, event_id, full_name, phone=None, amount_invited=1, side="friend"):
+        payload = {
+            "eventId": event_id,
+            "fullName": full_name,
+            "phone": phone,
+            "amountInvited": amount_invited,
+            "side": side,
+        }
+        return self._call("POST", "/api/guests", Guest.from_api, json=payload)
+
+    def list_guests(self, event_id):
+        return self._call("GET", f"/api/events/{event_id}/guests", Guest.list_from_api)
+
+    def list_guests_page(self, event_id, limit=100, cursor=None, sort=None, fields=None, **filters):
+        """
+        One page of the event's guests (cursor pagination). Filters: rsvpStatus, side, tableId, search.
+        With `fields` the items are raw dicts holding only those fields (+ id).
+        """
+        params = {"limit": limit, "cursor": cursor, "sort": sort, "fields": ",".join(fields) if fields else None}
+        params = {k: v for k, v in {**params, **filters}.items() if v is not None}
+        parse = Page.parser(None if fields else Guest)
+        return self._call("GET", f"/api/events/{event_id}/guests", parse, params=params)
+
+    # --- Seating ---
+
+    def create_table(self, event_id, name, capacity=10):
+        payload = {"eventId": event_id, "name": name, "capacity": capacity}
+        return self._call("POST", "/api/tables", None, json=payload)
+
+    def seat_guest(self, guest_id, table_id):
+        return self._call("PUT", f"/api/guests/{guest_id}/seat", Guest.from_api, json={"tableId": table_id})
+
+    def seat_guests(self, event_id, assignments):
+        """PUT /api/events/:eventId/seating - [{"guestId", "tableId" | None}], applied all-or-nothing."""
+        return self._call("PUT", f"/api/events/{event_id}/seating", None, json={"assignments": list(assignments)})
+
+    def auto_seat(self, event_id, dry_run=False, keep_existing=True, together=(), apart=()):
+        """POST /api/events/:eventId/seating/auto - returns {assignments, unplaced, tables, changed}."""
+        payload = {"dryRun": dry_run, "keepExisting": keep_existing, "together": list(together), "apart": list(apart)}
+        return self._call("POST", f"/api/events/{event_id}/seating/auto", None, json=payload)
+
+    # --- Budget ---
+
+    def add_expense(self, event_id, title, amount, category="אחר", is_paid=False):
+        payload = {"eventId": event_id, "title": title, "amount": amount, "category": category, "isPaid": is_paid}
+        return self._call("POST", "/api/budget", BudgetItem.from_api, json=payload)
+
+    def update_expense(self, item_id, **fields):
+        """PUT /api/budget/:id - e.g. amount=..., is_paid=True."""
+        return self._call("PUT", f"/api/budget/{item_id}", BudgetItem.from_api, json=fields)
+
+    def delete_expense(self, item_id):
+        return self._call("DELETE", f"/api/budget/{item_id}", None)
+
+    def get_budget(self, event_id, items=True):
+        """The event budget; items=False fetches only the summary and chart data."""
+        params = None if items else {"items": "false"}
+        return self._call("GET", f"/api/events/{event_id}/budget", BudgetOverview.from_api, params=params)
+
+    # --- Vendors ---
+
+    def add_vendor(self, user_id, name, category, phone=None, price_estimate=None):
+        payload = {"userId": user_id, "name": name, "category": category, "phone": phone, "priceEstimate": price_estimate}
+        return self._call("POST", "/api/vendors", Vendor.from_api, json=payload)
+
+    def list_vendors(self, user_id):
+        return self._call("GET", "/api/vendors", Vendor.list_from_api, params={"userId": user_id})
+
+    # --- Test data maintenance (only when the backend runs with TEST_MAINTENANCE_TOKEN) ---
+
+    def seed_test_data(self, token, namespace, user_id, events=(), guests=(), expenses=(), tasks=(), vendors=()):
+        """
+        POST /api/test-data/seed - bulk-inserts tagged prerequisites for one run.
+        Guests and expenses reference the seeded events by index: {"event": 0, "fullName": ...}.
+        """
+        payload = {
+            "namespace": namespace, "userId": user_id, "events": list(events), "guests": list(guests),
+            "expenses": list(expenses), "tasks": list(tasks), "vendors": list(vendors),
+        }
+        return self._call("POST", "/api/test-data/seed", SeededData.from_api,
+                          json=payload, headers={"X-Test-Maintenance-Token": token})
+
+    def cleanup_test_data(self, token, namespace=None, older_than_minutes=None):
+        """POST /api/test-data/cleanup - deletes one namespace, or every test namespace older than N minutes."""
+        payload = {"namespace": namespace, "olderThanMinutes": older_than_minutes}
+        return self._call("POST", "/api/test-data/cleanup", None,
+                          json=payload, headers={"X-Test-Maintenance-Token": token})
+
+
+class ApiClient(_Endpoints):
+    """
+    Synchronous client for the backend REST API (backend/index.js).
+
+    Usage:
+        with ApiClient(api_url) as api:
+            user = api.login(email, password)
+    """
+
+    def __init__(self, api_url, timeout=DEFAULT_TIMEOUT):
+        self.api_url = api_url.rstrip('/')
+        self.http = httpx.Client(base_url=self.api_url, limits=POOL_LIMITS, timeout=timeout)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.http.close()
+
+    def request(self, method, path, **kwargs):
+        return self._call(method, path, None, **kwargs)
+
+    def _call(self, method, path, parse, **kwargs):
+        return _parse(self.http.request(method, path, **kwargs), parse)
+
+
+class AsyncApiClient(_Endpoints):
+    """
+    asyncio client with the same methods as ApiClient (each one must be awaited).
+
+    Usage:
+        async with AsyncApiClient(api_url) as api:
+            guests = await asyncio.gather(*(api.add_guest(event_id, name) for name in names))
+    """
+
+    def __init__(self, api_url, timeout=DEFAULT_TIMEOUT):
+        self.api_url = api_url.rstrip('/')
+        self.http = httpx.AsyncClient(base_url=self.api_url, limits=POOL_LIMITS, timeout=timeout)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        await self.http.aclose()
+
+    async def request(self, method, path, **kwargs):
+        return await self._call(method, path, None, **kwargs)
+
+    async def _call(self, method, path, parse, **kwargs):
+        return _parse(await self.http.request(method, path, **kwargs), parse)
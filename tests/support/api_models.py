@@ -0,0 +1,173 @@
+from dataclasses import dataclass, field, fields
+from typing import Optional
+
+
+class ApiModel:
+    """
+    Base for the typed API results.
+    from_api() keeps only the declared fields, so extra keys added by the backend don't break tests.
+    """
+
+    # Maps backend keys that differ from the field name (e.g. Mongo's raw '_id')
+    ALIASES = {}
+
+    @classmethod
+    def from_api(cls, data):
+        known = {f.name for f in fields(cls)}
+        values = {}
+        for key, value in data.items():
+            name = cls.ALIASES.get(key, key)
+            if name in known:
+                values[name] = value
+        return cls(**values)
+
+    @classmethod
+    def list_from_api(cls, items):
+        return [cls.from_api(item) for item in items]
+
+
+@dataclass
+class User(ApiModel):
+    id: str
+    email: str
+    full_name: Optional[str] = None
+    wedding_code: Optional[str] = None
+    is_partner: bool = False
+    linked_wedding_id: Optional[str] = None
+    settings: dict = field(default_factory=dict)
+    # The whole public user object as the backend sent it - what the UI keeps in localStorage['user']
+    public: dict = field(default_factory=dict, repr=False, compare=False)
+
+    @classmethod
+    def from_api(cls, data):
+        user = super().from_api(data)
+        user.public = dict(data)
+        return user
+
+
+@dataclass
+class Event(ApiModel):
+    id: str
+    user_id: str
+    title: str
+    event_date: str
+    description: Optional[str] = None
+    total_budget: float = 0
+    is_main_event: bool = False
+
+
+@dataclass
+class Task(ApiModel):
+    id: str
+    user_id: str
+    title: str
+    due_date: Optional[str] = None
+    is_done: bool = False
+    status: str = "todo"
+    category: str = "general"
+    assignee_name: Optional[str] = None
+    assignee_email: Optional[str] = None
+
+
+@dataclass
+class Guest(ApiModel):
+    id: str
+    event_id: str
+    full_name: str
+    phone: Optional[str] = None
+    email: Optional[str] = None
+    side: str = "friend"
+    amount_invited: int = 1
+    meal_option: str = "standard"
+    rsvp_status: str = "pending"
+    table_id: Optional[str] = None
+    is_unknown: bool = False
+
+
+@dataclass
+class BudgetItem(ApiModel):
+    id: str
+    event_id: str
+    title: str
+    amount: float
+    category: str
+    is_paid: bool = False
+    vendor: str = ""
+    notes: str = ""
+
+
+@dataclass
+class BudgetSummary(ApiModel):
+    totalExpenses: float
+    totalPaid: float
+    remaining: float
+
+
+@dataclass
+class BudgetOverview(ApiModel):
+    """GET /api/events/:eventId/budget (items is empty when fetched with ?items=false)"""
+    budgetLimit: float
+    items: list
+    summary: BudgetSummary
+    chartData: list
+
+    @classmethod
+    def from_api(cls, data):
+        overview = super().from_api({"items": [], **data})
+        overview.items = BudgetItem.list_from_api(overview.items)
+        overview.summary = BudgetSummary.from_api(overview.summary)
+        return overview
+
+
+@dataclass
+class Vendor(ApiModel):
+    # Vendors are returned as raw Mongoose documents (not through toPublic)
+    ALIASES = {"_id": "id"}
+
+    id: str
+    userId: str
+    name: str
+    category: str
+    phone: Optional[str] = None
+    email: Optional[str] = None
+    priceEstimate: Optional[float] = None
+    notes: Optional[str] = None
+    rating: float = 0
+
+
+@dataclass
+class Page(ApiModel):
+    """One page of a list route called with ?limit= / ?cursor= (backend/pagination.js)."""
+    items: list
+    nextCursor: Optional[str] = None
+    hasMore: bool = False
+
+    @classmethod
+    def parser(cls, item_model):
+        """Returns a parse function for pages of `item_model` items (raw dicts when fields were projected)."""
+        def parse(data):
+            page = cls.from_api(data)
+            page.items = item_model.list_from_api(page.items) if item_model else page.items
+            return page
+        return parse
+
+
+@dataclass
+class SeededData(ApiModel):
+    """POST /api/test-data/seed - the inserted prerequisites of one test run."""
+    namespace: str
+    events: list = field(default_factory=list)
+    guests: list = field(default_factory=list)
+    expenses: list = field(default_factory=list)
+    tasks: list = field(default_factory=list)
+    vendors: list = field(default_factory=list)
+
+    @classmethod
+    def from_api(cls, data):
+        seeded = super().from_api(data)
+        seeded.events = Event.list_from_api(seeded.events)
+        seeded.guests = Guest.list_from_api(seeded.guests)
+        seeded.expenses = BudgetItem.list_from_api(seeded.expenses)
+        seeded.tasks = Task.list_from_api(seeded.tasks)
+        seeded.vendors = Vendor.list_from_api(seeded.vendors)
+        return seeded
@@ -0,0 +1,275 @@
+import asyncio
+import datetime
+import json
+import mimetypes
+import os
+import re
+import subprocess
+import threading
+
+import socketio
+from aiohttp import web
+from selenium.common.exceptions import WebDriverException
+
+from support.local_backend import free_port
+
+TESTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(TESTS_DIR, 'fixtures', 'api')
+SESSION_FILE = os.path.join(FIXTURES_DIR, '_session.json')
+RUN_DATA_FILE = os.path.join(FIXTURES_DIR, '_run_data.json')
+DIST_DIR = os.path.join(os.path.dirname(TESTS_DIR), 'frontend', 'dist')
+
+# Bump when the fixture layout changes; older files must be re-recorded
+FORMAT_VERSION = 1
+
+MUTATING_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+
+def api_mode():
+    """API_MODE in tests/.env: 'live' (default), 'record' or 'replay'."""
+    return os.getenv("API_MODE", "live").lower()
+
+
+def fixture_path(nodeid):
+    """tests/fixtures/api/<test file>__<test name>.json"""
+    return os.path.join(FIXTURES_DIR, re.sub(r"[^\w.-]+", "_", nodeid.replace("::", "__")) + ".json")
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=TESTS_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# --- Recording (in the browser) ---
+# Wraps XHR (axios) and fetch (Auth.jsx) and appends every /api/* exchange - request body,
+# status and response text - to sessionStorage, which survives page loads within the tab.
+RECORDER_JS = r"""
+(() => {
+  if (window.__apiRecorder) return;
+  window.__apiRecorder = true;
+  const KEY = '__apiRecording';
+  const isApi = (url) => { try { return new URL(url, location.href).pathname.startsWith('/api/'); } catch (e) { return false; } };
+  const pathOf = (url) => { const u = new URL(url, location.href); return u.pathname + u.search; };
+  const save = (entry) => {
+    const entries = JSON.parse(sessionStorage.getItem(KEY) || '[]');
+    entries.push(entry);
+    sessionStorage.setItem(KEY, JSON.stringify(entries));
+  };
+
+  const open = XMLHttpRequest.prototype.open;
+  const send = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.open = function (method, url) {
+    this.__recMethod = String(method).toUpperCase();
+    this.__recUrl = String(url);
+    return open.apply(this, arguments);
+  };
+  XMLHttpRequest.prototype.send = function (body) {
+    if (isApi(this.__recUrl)) {
+      this.addEventListener('loadend', () => {
+        const textual = this.responseType === '' || this.responseType === 'text';
+        save({
+          method: this.__recMethod, path: pathOf(this.__recUrl),
+          request_body: typeof body === 'string' ? body : null,
+          status: this.status, content_type: this.getResponseHeader('Content-Type'),
+          body: textual ? this.responseText : null
+        });
+      });
+    }
+    return send.apply(this, arguments);
+  };
+
+  const originalFetch = window.fetch;
+  window.fetch = function (input, init) {
+    const url = typeof input === 'string' ? input : String(input.url);
+    const promise = originalFetch.apply(this, arguments);
+    if (!isApi(url)) return promise;
+    const method = String((init && init.method) || (input && input.method) || 'GET').toUpperCase();
+    const body = init && typeof init.body === 'string' ? init.body : null;
+    return promise.then((res) => {
+      res.clone().text().then((text) => save({
+        method, path: pathOf(url), request_body: body,
+        status: res.status, content_type: res.headers.get('Content-Type'), body: text
+      }));
+      return res;
+    });
+  };
+})();
+"""
+
+
+def start_recording(driver):
+    """Registers the recorder for every page of this test; returns the CDP identifier."""
+    return driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": RECORDER_JS})["identifier"]
+
+
+def collect_recording(driver, identifier):
+    """Stops recording and returns the exchanges captured in the current tab (oldest first)."""
+    driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": identifier})
+    try:
+        raw = driver.execute_script(
+            "const r = sessionStorage.getItem('__apiRecording'); sessionStorage.removeItem('__apiRecording'); return r;"
+        )
+    except WebDriverException:
+        # The test ended outside the app (e.g. about:blank) - nothing to collect
+        return []
+    return json.loads(raw) if raw else []
+
+
+def save_fixture(path, data, source_url):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            "format": FORMAT_VERSION,
+            "recorded_at": datetime.datetime.now().isoformat(timespec='seconds'),
+            "git_commit": _git_commit(),
+            "source": source_url,
+            **data,
+        }, f, indent=2, ensure_ascii=False)
+    return path
+
+
+def load_fixture(path):
+    """Returns the fixture file content, or None when it is missing or was recorded in an older format."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    except OSError:
+        return None
+    return data if data.get("format") == FORMAT_VERSION else None
+
+
+# --- Replay (in-process stub server) ---
+
+def _normalized_body(body):
+    if body is None or body == "":
+        return None
+    try:
+        return json.loads(body)
+    except ValueError:
+        return body
+
+
+class Cassette:
+    """
+    The recorded exchanges of one test, answered in recorded order.
+
+    A request is matched by method + path (+ query) and, when possible, the same JSON body;
+    requests with generated values (e.g. a random signup email) fall back to the next
+    exchange with the same method and path. Once every match was used, the last one repeats.
+    """
+
+    def __init__(self, exchanges):
+        self.exchanges = exchanges
+        self._used = [False] * len(exchanges)
+        self._last = {}
+        self.unmatched = []
+
+    def match(self, method, path, body):
+        key = (method, path)
+        candidates = [
+            i for i, e in enumerate(self.exchanges)
+            if not self._used[i] and e["method"] == method and e["path"] == path
+        ]
+        body = _normalized_body(body)
+        exact = [i for i in candidates if _normalized_body(self.exchanges[i]["request_body"]) == body]
+        chosen = (exact or candidates or [None])[0]
+        if chosen is not None:
+            self._used[chosen] = True
+            self._last[key] = chosen
+        else:
+            chosen = self._last.get(key)
+        if chosen is None:
+            self.unmatched.append(f"{method} {path}")
+            return None
+        return self.exchanges[chosen]
+
+
+class ReplayServer:
+    """
+    Serves frontend/dist and the recorded /api/* responses from a background thread (no MongoDB, no backend).
+
+    Socket.io is served too: every replayed mutation is followed by a `data_changed` broadcast,
+    like the real backend does, so pages refresh the same way; the seating edit lock is always granted.
+    The frontend must be built with same-origin API calls (VITE_API_URL= npm run build).
+    """
+
+    def __init__(self, dist_dir=DIST_DIR):
+        self.dist_dir = dist_dir
+        self.port = None
+        self.cassette = Cassette([])
+        self._loop = None
+        self._runner = None
+        self._thread = None
+        self._sio = socketio.AsyncServer(async_mode='aiohttp', cors_allowed_origins='*')
+        self._sio.on('request_edit_lock', self._grant_lock)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.port}"
+
+    def use(self, cassette):
+        self.cassette = cassette
+
+    async def _grant_lock(self, sid, data):
+        await self._sio.emit('lock_status', {"isLocked": False}, to=sid)
+
+    async def _api(self, request):
+        body = await request.text() if request.can_read_body else None
+        exchange = self.cassette.match(request.method, request.path_qs, body)
+        if exchange is None:
+            return web.json_response({"message": f"No recorded response for {request.method} {request.path_qs}"}, status=404)
+
+        if request.method in MUTATING_METHODS:
+            asyncio.get_running_loop().call_later(0.01, lambda: asyncio.ensure_future(self._sio.emit('data_changed')))
+        content_type = (exchange.get("content_type") or "application/json").split(";")[0]
+        return web.Response(status=exchange["status"], text=exchange.get("body") or "", content_type=content_type)
+
+    async def _static(self, request):
+        # SPA: real files from dist, every other path gets index.html (like the backend's catch-all)
+        relative = os.path.normpath(request.path.lstrip('/')) if request.path != '/' else 'index.html'
+        path = os.path.join(self.dist_dir, relative)
+        if relative.startswith('..') or not os.path.isfile(path):
+            path = os.path.join(self.dist_dir, 'index.html')
+        content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        with open(path, 'rb') as f:
+            return web.Response(body=f.read(), content_type=content_type)
+
+    def _build_app(self):
+        app = web.Application()
+        self._sio.attach(app)
+        app.router.add_route('*', '/api/{tail:.*}', self._api)
+        app.router.add_get('/{tail:.*}', self._static)
+        return app
+
+    def start(self):
+        if not os.path.exists(os.path.join(self.dist_dir, 'index.html')):
+            raise RuntimeError("frontend/dist is missing - build it with: cd frontend && VITE_API_URL= npm run build")
+
+        self.port = free_port()
+        ready = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            self._runner = web.AppRunner(self._build_app())
+            self._loop.run_until_complete(self._runner.setup())
+            self._loop.run_until_complete(web.TCPSite(self._runner, '127.0.0.1', self.port).start())
+            ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+        ready.wait(10)
+        return self
+
+    def stop(self):
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result(10)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(10)
+        self._loop = None
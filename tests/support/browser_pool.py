@@ -0,0 +1,153 @@
+import json
+import os
+import time
+
+from filelock import FileLock
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+
+from support.step_metrics import enable_performance_logging, install_paint_observer
+from support.waits import install_activity_recorder
+
+# --- Driver Binary Cache ---
+# Resolving the driver through ChromeDriverManager costs a network round trip on every call.
+# We resolve it once, store the path on disk and share it between all workers.
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache')
+DRIVER_CACHE_FILE = os.path.join(CACHE_DIR, 'chromedriver.json')
+DRIVER_CACHE_MAX_AGE = int(os.getenv("CHROMEDRIVER_CACHE_DAYS", "7")) * 24 * 60 * 60
+
+WINDOW_SIZE = (1920, 1080)
+
+
+def _read_cached_driver_path():
+    try:
+        with open(DRIVER_CACHE_FILE, encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    path = cached.get("path")
+    is_fresh = time.time() - cached.get("resolved_at", 0) < DRIVER_CACHE_MAX_AGE
+    if path and is_fresh and os.path.exists(path):
+        return path
+    return None
+
+
+def resolve_driver_path():
+    """
+    Returns a local chromedriver path without touching the network when possible.
+
+    Order:
+    1. CHROMEDRIVER_PATH from the environment (CI images with a pre-installed driver).
+    2. The on-disk cache written by a previous run (valid for CHROMEDRIVER_CACHE_DAYS).
+    3. ChromeDriverManager().install() - done by a single worker while the others wait on the lock.
+    """
+    env_path = os.getenv("CHROMEDRIVER_PATH")
+    if env_path:
+        return env_path
+
+    path = _read_cached_driver_path()
+    if path:
+        return path
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with FileLock(DRIVER_CACHE_FILE + '.lock'):
+        # Another worker may have resolved it while we were waiting for the lock
+        path = _read_cached_driver_path()
+        if path:
+            return path
+
+        path = ChromeDriverManager().install()
+        with open(DRIVER_CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump({"path": path, "resolved_at": time.time()}, f)
+        return path
+
+
+def build_chrome_options():
+    """
+    Chrome options shared by every pooled browser.
+    Set HEADLESS=1 in tests/.env when running many workers in parallel.
+    """
+    options = webdriver.ChromeOptions()
+    options.add_argument(f"--window-size={WINDOW_SIZE[0]},{WINDOW_SIZE[1]}")
+    if os.getenv("HEADLESS", "").lower() in ("1", "true", "yes"):
+        options.add_argument("--headless=new")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+    # DevTools Network events for the per-step metrics (see step_metrics)
+    return enable_performance_logging(options)
+
+
+class BrowserPool:
+    """
+    Holds one long-lived Chrome per pytest worker.
+
+    pytest-xdist runs every worker in its own process, so a session-scoped pool
+    naturally gives each worker its own browser. Between tests the browser is
+    reset (extra tabs closed, cookies and storage cleared) instead of restarted.
+    """
+
+    def __init__(self, worker_id="master"):
+        self.worker_id = worker_id
+        self._driver = None
+
+    def _start(self):
+        print(f"\n[BrowserPool:{self.worker_id}] Starting Chrome...")
+        service = Service(resolve_driver_path())
+        driver = webdriver.Chrome(service=service, options=build_chrome_options())
+
+        # Critical: Set window size to ensure all UI elements (like Sidebar/Forms) are visible
+        driver.set_window_size(*WINDOW_SIZE)
+
+        # Records API responses and socket events on every page, so tests can wait on them
+        install_activity_recorder(driver)
+        # Collects paint metrics (LCP, long tasks) for the per-step reports
+        install_paint_observer(driver)
+        return driver
+
+    def acquire(self):
+        """Returns the worker's browser, starting it on first use."""
+        if self._driver is None:
+            self._driver = self._start()
+        return self._driver
+
+    def reset(self):
+        """
+        Brings the browser back to a clean state for the next test.
+        If the browser is no longer responsive it is discarded and restarted lazily.
+        """
+        driver = self._driver
+        if driver is None:
+            return
+
+        try:
+            # 1. Close every tab except the first one
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+
+            # 2. Clear storage of the current origin (localStorage holds the logged-in user)
+            if driver.current_url.startswith("http"):
+                driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+
+            # 3. Clear cookies and leave the app so nothing keeps running in the background
+            driver.delete_all_cookies()
+            driver.get("about:blank")
+        except WebDriverException as e:
+            print(f"\n[BrowserPool:{self.worker_id}] Reset failed ({e.msg}), restarting browser...")
+            self.close()
+
+    def close(self):
+        if self._driver is None:
+            return
+        print(f"\n[BrowserPool:{self.worker_id}] Closing Browser...")
+        try:
+            self._driver.quit()
+        except WebDriverException:
+            pass
+        self._driver = None
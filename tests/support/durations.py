@@ -0,0 +1,410 @@
+"""
+Per-test duration history: the timings of every run go to a local SQLite file keyed by git commit,
+so a test that got slower shows up against its recent runs instead of hiding behind a green result.
+
+Recorded for each test:
+- setup / call / teardown (pytest's phases),
+- fixture:<name> - the setup of the test's own fixtures (fixture:driver includes the Chrome start in the
+  first test of a worker, fixture:signed_in_driver the seeded login),
+- shared:<name> - the setup of session/module fixtures, paid by the first test that needs them
+  (shared:local_backend = the hermetic backend boot, shared:authenticated_session = the API login),
+- step:<name> - the named steps of the UI tests (steps.step(...): navigation, action, verification).
+A test's duration is setup + call + teardown without the shared fixtures, so running a subset (-k, --changed-since)
+does not make the first test look slower. Runs are grouped by environment (TEST_MODE/API_MODE/xdist workers),
+and only runs of the same environment are compared. A passing test is flagged as slower when its duration is
+more than SLOWDOWN_Z robust z-scores (median / MAD) above its last BASELINE_RUNS passing runs and at least
+MIN_SLOWDOWN_MS slower; the phase that grew most is reported with it.
+
+    pytest                                                       # records into tests/.cache/durations.sqlite
+    pytest --fail-on-slowdown                                    # exit status 1 when a test slowed down
+    python -m support.durations trend --test test_add_guest      # median duration per commit
+    python -m support.durations trend --test test_add_guest --phases
+    python -m support.durations regressions                      # the last run against the runs before it
+"""
+import argparse
+import datetime
+import json
+import os
+import sqlite3
+import statistics
+import subprocess
+import time
+from contextlib import closing
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+import pytest
+
+TESTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DB = os.path.join(TESTS_DIR, '.cache', 'durations.sqlite')
+
+BASELINE_RUNS = 10
+MIN_SAMPLES = 3
+SLOWDOWN_Z = 3.0
+MIN_SLOWDOWN_MS = 500.0
+# Spread floor (share of the median): ten identical runs must not turn 1% of noise into a slowdown
+MIN_SPREAD = 0.05
+# Fixtures faster than this are not worth a row (most fixtures only return a value)
+FIXTURE_MIN_MS = 1.0
+
+PHASES_KEY = pytest.StashKey[dict]()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at TEXT NOT NULL,
+    commit_sha TEXT NOT NULL,
+    dirty INTEGER NOT NULL,
+    branch TEXT,
+    environment TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    test TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    duration_ms REAL NOT NULL,
+    PRIMARY KEY (run_id, test)
+);
+CREATE TABLE IF NOT EXISTS phases (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    test TEXT NOT NULL,
+    phase TEXT NOT NULL,
+    duration_ms REAL NOT NULL,
+    PRIMARY KEY (run_id, test, phase)
+);
+CREATE INDEX IF NOT EXISTS results_by_test ON results (test, run_id);
+"""
+
+
+def record_phase(item, phase, duration_ms):
+    """Adds `duration_ms` to a named phase of the test `item` (e.g. record_phase(request.node, "step:login", 812))."""
+    phases = item.stash.setdefault(PHASES_KEY, {})
+    phases[phase] = phases.get(phase, 0.0) + duration_ms
+
+
+def git_commit():
+    """(commit sha, uncommitted changes?, branch) of the checkout, or ("unknown", False, None) outside git."""
+    def git(*args):
+        return subprocess.run(['git', *args], cwd=TESTS_DIR, capture_output=True, text=True, check=True).stdout.strip()
+    try:
+        sha = git('rev-parse', 'HEAD')
+        dirty = bool(git('status', '--porcelain', '--untracked-files=no'))
+        branch = git('rev-parse', '--abbrev-ref', 'HEAD')
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown", False, None
+    return sha, dirty, None if branch == "HEAD" else branch
+
+
+def connect(path=DEFAULT_DB):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def save_run(conn, environment, results, commit=None, started_at=None):
+    """
+    Stores one run. `results`: {test: {"outcome": ..., "duration_ms": ..., "phases": {phase: ms}}}.
+    Returns the run id.
+    """
+    sha, dirty, branch = commit or git_commit()
+    started_at = started_at or datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds')
+    with conn:
+        run_id = conn.execute(
+            "INSERT INTO runs (started_at, commit_sha, dirty, branch, environment) VALUES (?, ?, ?, ?, ?)",
+            (started_at, sha, int(dirty), branch, environment),
+        ).lastrowid
+        conn.executemany(
+            "INSERT INTO results (run_id, test, outcome, duration_ms) VALUES (?, ?, ?, ?)",
+            [(run_id, test, r["outcome"], round(r["duration_ms"], 1)) for test, r in results.items()],
+        )
+        conn.executemany(
+            "INSERT INTO phases (run_id, test, phase, duration_ms) VALUES (?, ?, ?, ?)",
+            [(run_id, test, phase, round(ms, 1)) for test, r in results.items() for phase, ms in r["phases"].items()],
+        )
+    return run_id
+
+
+@dataclass
+class Slowdown:
+    test: str
+    duration_ms: float
+    baseline_ms: float
+    samples: int
+    z: float
+    phase: Optional[str] = None
+    phase_delta_ms: Optional[float] = None
+
+
+def robust_z(value, samples):
+    """How many (MAD-based) standard deviations `value` lies above the median of `samples`."""
+    median = statistics.median(samples)
+    mad = statistics.median(abs(x - median) for x in samples)
+    spread = max(1.4826 * mad, MIN_SPREAD * median, 1.0)
+    return (value - median) / spread
+
+
+def _baseline(conn, test, environment, before_run_id, runs=BASELINE_RUNS):
+    """The test's last `runs` passing results of the same environment, before `before_run_id`."""
+    return conn.execute(
+        "SELECT results.run_id, results.duration_ms FROM results JOIN runs ON runs.id = results.run_id"
+        " WHERE results.test = ? AND results.outcome = 'passed' AND runs.environment = ? AND runs.id < ?"
+        " ORDER BY runs.id DESC LIMIT ?",
+        (test, environment, before_run_id, runs),
+    ).fetchall()
+
+
+def _phases(conn, test, run_ids):
+    """{phase: [ms per run]} over `run_ids` (a run without the phase counts as 0)."""
+    values = {}
+    placeholders = ','.join('?' * len(run_ids))
+    for row in conn.execute(
+        f"SELECT run_id, phase, duration_ms FROM phases WHERE test = ? AND run_id IN ({placeholders})",
+        (test, *run_ids),
+    ):
+        values.setdefault(row["phase"], {})[row["run_id"]] = row["duration_ms"]
+    return {phase: [by_run.get(run_id, 0.0) for run_id in run_ids] for phase, by_run in values.items()}
+
+
+def find_slowdowns(conn, run_id, runs=BASELINE_RUNS, threshold=SLOWDOWN_Z, min_delta_ms=MIN_SLOWDOWN_MS):
+    """The passing tests of run `run_id` that are slower than their recent runs, slowest first."""
+    run = conn.execute("SELECT environment FROM runs WHERE id = ?", (run_id,)).fetchone()
+    if run is None:
+        return []
+    slowdowns = []
+    for row in conn.execute("SELECT test, duration_ms FROM results WHERE run_id = ? AND outcome = 'passed'", (run_id,)):
+        baseline = _baseline(conn, row["test"], run["environment"], run_id, runs)
+        if len(baseline) < MIN_SAMPLES:
+            continue
+        samples = [b["duration_ms"] for b in baseline]
+        median = statistics.median(samples)
+        z = robust_z(row["duration_ms"], samples)
+        if z < threshold or row["duration_ms"] - median < min_delta_ms:
+            continue
+
+        # The phase that grew most against its own median
+        current = {phase: values[0] for phase, values in _phases(conn, row["test"], [run_id]).items()}
+        history = _phases(conn, row["test"], [b["run_id"] for b in baseline])
+        deltas = {
+            phase: ms - statistics.median(history.get(phase, [0.0]))
+            for phase, ms in current.items() if not phase.startswith("shared:")
+        }
+        # A fixture or step explaining half of the slowdown says more than "call" or "setup"
+        specific = {p: d for p, d in deltas.items() if ':' in p}
+        if specific and max(specific.values()) >= (row["duration_ms"] - median) / 2:
+            deltas = specific
+        phase = max(deltas, key=deltas.get) if deltas else None
+        slowdowns.append(Slowdown(
+            test=row["test"], duration_ms=row["duration_ms"], baseline_ms=round(median, 1), samples=len(samples),
+            z=round(z, 1), phase=phase, phase_delta_ms=round(deltas[phase], 1) if phase else None,
+        ))
+    return sorted(slowdowns, key=lambda s: s.duration_ms - s.baseline_ms, reverse=True)
+
+
+def trend(conn, test_filter="", commits=10, environment=None, phases=False):
+    """
+    Median duration per test (or per test phase) for each of the last `commits` commits of the environment
+    (default: the environment of the latest run). Returns {"environment", "commits", "rows": [{name, values}]}.
+    """
+    if environment is None:
+        latest = conn.execute("SELECT environment FROM runs ORDER BY id DESC LIMIT 1").fetchone()
+        if latest is None:
+            return {"environment": None, "commits": [], "rows": []}
+        environment = latest["environment"]
+
+    commit_rows = conn.execute(
+        "SELECT commit_sha, MAX(id) AS last FROM runs WHERE environment = ? GROUP BY commit_sha ORDER BY last DESC LIMIT ?",
+        (environment, commits),
+    ).fetchall()
+    shas = [row["commit_sha"] for row in reversed(commit_rows)]
+    if phases:
+        query = ("SELECT phases.test || '  ' || phases.phase AS name, runs.commit_sha, phases.duration_ms"
+                 " FROM phases JOIN results USING (run_id, test) JOIN runs ON runs.id = phases.run_id"
+                 " WHERE results.outcome = 'passed' AND runs.environment = ? AND phases.test LIKE ?")
+    else:
+        query = ("SELECT results.test AS name, runs.commit_sha, results.duration_ms FROM results"
+                 " JOIN runs ON runs.id = results.run_id"
+                 " WHERE results.outcome = 'passed' AND runs.environment = ? AND results.test LIKE ?")
+    values = {}
+    for row in conn.execute(query, (environment, f"%{test_filter}%")):
+        if row["commit_sha"] in shas:
+            values.setdefault(row["name"], {}).setdefault(row["commit_sha"], []).append(row["duration_ms"])
+    return {
+        "environment": environment,
+        "commits": shas,
+        "rows": [
+            {"name": name, "values": [round(statistics.median(by_commit[sha]), 1) if sha in by_commit else None for sha in shas]}
+            for name, by_commit in sorted(values.items())
+        ],
+    }
+
+
+def _seconds(ms):
+    return f"{ms / 1000:.2f}s"
+
+
+def describe(slowdown):
+    text = (f"{slowdown.test}: {_seconds(slowdown.duration_ms)} vs median {_seconds(slowdown.baseline_ms)} "
+            f"of the last {slowdown.samples} runs (z {slowdown.z})")
+    if slowdown.phase:
+        text += f", mostly {slowdown.phase} (+{_seconds(slowdown.phase_delta_ms)})"
+    return text
+
+
+class DurationHistory:
+    """
+    pytest plugin recording the durations of the run (registered by conftest.py).
+
+    Under pytest-xdist every worker times its own fixtures and steps and sends them with the teardown
+    report; only the controller writes the database and looks for slowdowns.
+    """
+
+    def __init__(self, config, path, environment, fail_on_slowdown=False):
+        self.path = path
+        self.environment = environment
+        self.fail_on_slowdown = fail_on_slowdown
+        self.is_worker = hasattr(config, "workerinput")
+        self.commit = None
+        self.run_id = None
+        self.error = None
+        self.slowdowns = []
+        self.results = {}
+        self._tests = {}
+        self._item = None
+
+    # --- Timing (where the test runs) ---
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        self._item = item
+        yield
+        self._item = None
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_fixture_setup(self, fixturedef, request):
+        started = time.perf_counter()
+        yield
+        duration_ms = (time.perf_counter() - started) * 1000
+        if self._item is not None and duration_ms >= FIXTURE_MIN_MS:
+            prefix = "fixture" if fixturedef.scope == "function" else "shared"
+            record_phase(self._item, f"{prefix}:{fixturedef.argname}", duration_ms)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        report = outcome.get_result()
+        if report.when == "teardown":
+            # Extra report attributes travel from the xdist workers to the controller with the report
+            report.phase_ms = dict(item.stash.get(PHASES_KEY, {}))
+
+    # --- Collecting (controller) ---
+
+    def pytest_runtest_logreport(self, report):
+        test = self._tests.setdefault(report.nodeid, {"outcome": "passed", "phases": {}})
+        test["phases"][report.when] = report.duration * 1000
+        if report.failed:
+            test["outcome"] = "failed" if report.when == "call" else "error"
+        elif report.skipped and test["outcome"] == "passed":
+            test["outcome"] = "skipped"
+        if report.when != "teardown":
+            return
+
+        test["phases"].update(getattr(report, "phase_ms", {}))
+        del self._tests[report.nodeid]
+        shared_ms = sum(ms for phase, ms in test["phases"].items() if phase.startswith("shared:"))
+        own_ms = sum(test["phases"].get(when, 0.0) for when in ("setup", "call", "teardown")) - shared_ms
+        self.results[report.nodeid] = {"outcome": test["outcome"], "duration_ms": max(own_ms, 0.0), "phases": test["phases"]}
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self, session, exitstatus):
+        if self.is_worker or not self.results or exitstatus == pytest.ExitCode.INTERRUPTED:
+            return
+        self.commit = git_commit()
+        try:
+            with closing(connect(self.path)) as conn:
+                self.run_id = save_run(conn, self.environment, self.results, commit=self.commit)
+                self.slowdowns = find_slowdowns(conn, self.run_id)
+        except sqlite3.Error as e:
+            self.error = str(e)
+            return
+        if self.fail_on_slowdown and self.slowdowns and session.exitstatus == pytest.ExitCode.OK:
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.error:
+            terminalreporter.write_line(f"[Durations] ⚠️ Could not record the durations in {self.path}: {self.error}")
+        if self.run_id is None:
+            return
+        sha, dirty, _ = self.commit
+        terminalreporter.write_line(
+            f"[Durations] {len(self.results)} test(s) recorded as run {self.run_id} of {sha[:8]}{' (dirty)' if dirty else ''}"
+            f" ({self.environment}) -> {os.path.relpath(self.path)}"
+        )
+        if self.slowdowns:
+            terminalreporter.write_line(f"[Durations] ⚠️ {len(self.slowdowns)} test(s) slower than their recent runs:", yellow=True)
+            for slowdown in self.slowdowns:
+                terminalreporter.write_line(f"  {describe(slowdown)}", yellow=True)
+
+
+# --- Command line: trend and regressions reports ---
+
+def _format_trend(report):
+    if not report["rows"]:
+        return "No passing runs recorded" + (f" for {report['environment']}" if report["environment"] else "")
+    width = max(len(row["name"]) for row in report["rows"])
+    lines = [f"Environment {report['environment']}, median duration per commit (oldest first):",
+             f"{'':{width}}  " + "  ".join(f"{sha[:8]:>8}" for sha in report["commits"]) + "    change"]
+    for row in report["rows"]:
+        known = [v for v in row["values"] if v is not None]
+        change = f"{(known[-1] / known[0] - 1) * 100:+.0f}%" if len(known) > 1 and known[0] else ""
+        cells = "  ".join(f"{v / 1000:>7.2f}s" if v is not None else f"{'-':>8}" for v in row["values"])
+        lines.append(f"{row['name']:{width}}  {cells}  {change:>8}")
+    return "\n".join(lines)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Per-test duration history: trends and slowdowns")
+    parser.add_argument("--db", default=DEFAULT_DB, help="History file (default: tests/.cache/durations.sqlite)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    trend_parser = commands.add_parser("trend", help="Median duration of every test per commit")
+    trend_parser.add_argument("--test", default="", help="Only tests whose node id contains this text")
+    trend_parser.add_argument("--commits", type=int, default=10, help="Number of recent commits (default: 10)")
+    trend_parser.add_argument("--environment", help="e.g. hermetic/live/n4 (default: the environment of the latest run)")
+    trend_parser.add_argument("--phases", action="store_true", help="One row per test phase (fixtures, steps)")
+    trend_parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+
+    regressions_parser = commands.add_parser("regressions", help="Tests of a run that are slower than their recent runs")
+    regressions_parser.add_argument("--run", type=int, help="Run id (default: the latest run)")
+    regressions_parser.add_argument("--runs", type=int, default=BASELINE_RUNS, help="Recent runs to compare with")
+    regressions_parser.add_argument("--threshold", type=float, default=SLOWDOWN_Z, help="Robust z-score to flag")
+    regressions_parser.add_argument("--json", action="store_true", help="Print the slowdowns as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    with closing(connect(args.db)) as conn:
+        if args.command == "trend":
+            report = trend(conn, args.test, args.commits, args.environment, args.phases)
+            print(json.dumps(report, indent=2) if args.json else _format_trend(report))
+            return
+
+        run = conn.execute("SELECT * FROM runs WHERE id = ?", (args.run,)).fetchone() if args.run \
+            else conn.execute("SELECT * FROM runs ORDER BY id DESC LIMIT 1").fetchone()
+        if run is None:
+            raise SystemExit("No recorded runs")
+        slowdowns = find_slowdowns(conn, run["id"], args.runs, args.threshold)
+    if args.json:
+        print(json.dumps([asdict(s) for s in slowdowns], indent=2))
+        return
+    print(f"Run {run['id']} of {run['commit_sha'][:8]} ({run['environment']}, {run['started_at']}): "
+          f"{len(slowdowns)} test(s) slower than their recent runs")
+    for slowdown in slowdowns:
+        print(f"  {describe(slowdown)}")
+
+
+if __name__ == "__main__":
+    main()
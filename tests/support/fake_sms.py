@@ -0,0 +1,106 @@
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeSmsProvider:
+    """
+    Local stand-in for the SMS provider (the backend's SMS_PROVIDER_URL).
+
+    Accepts POST {from, to, body}, records every delivered message and can misbehave like a real provider:
+    slow answers, transient 503s and 429s when the sender goes faster than the allowed rate.
+
+    Usage:
+        with FakeSmsProvider(failure_rate=0.05, rate_limit=100) as sms:
+            backend = LocalBackend(env={"SMS_PROVIDER_URL": sms.url}).start()
+            ...
+            assert len(sms.messages) == expected
+
+    Args:
+        latency: Seconds each request takes before answering.
+        failure_rate: Share of requests answered with 503 (not delivered).
+        rate_limit: Messages per second accepted; requests above it get 429. None = unlimited.
+    """
+
+    def __init__(self, latency=0.0, failure_rate=0.0, rate_limit=None, seed=1):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.rate_limit = rate_limit
+        self.messages = []          # (received time, payload) of delivered messages
+        self.rejected = {"503": 0, "429": 0}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._window = []           # delivery times within the last second (rate limit)
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/messages"
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def start(self):
+        provider = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                payload = json.loads(self.rfile.read(length) or b'{}')
+                status = provider._handle(payload)
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.end_headers()
+                self.wfile.write(json.dumps({"status": status}).encode())
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def _handle(self, payload):
+        if self.latency:
+            time.sleep(self.latency)
+        now = time.monotonic()
+        with self._lock:
+            if self.rate_limit:
+                self._window = [t for t in self._window if now - t < 1.0]
+                if len(self._window) >= self.rate_limit:
+                    self.rejected["429"] += 1
+                    return 429
+            if self._rng.random() < self.failure_rate:
+                self.rejected["503"] += 1
+                return 503
+            self._window.append(now)
+            self.messages.append((now, payload))
+        return 201
+
+    def delivered_to(self):
+        """Recipients in delivery order (a phone appearing twice means a duplicate SMS)."""
+        with self._lock:
+            return [payload.get("to") for _, payload in self.messages]
+
+    def delivery_rate(self):
+        """Messages per second between the first and the last delivery."""
+        with self._lock:
+            if len(self.messages) < 2:
+                return None
+            span = self.messages[-1][0] - self.messages[0][0]
+            return round((len(self.messages) - 1) / span, 2) if span else None
@@ -0,0 +1,433 @@
+"""
+Change-impact test selection: given a git base, picks the tests whose code paths changed.
+
+Every test is mapped (tests/impact_map.json, plus the endpoints recorded in tests/fixtures/api)
+to the frontend files and backend routes it exercises. A diff is turned into the same terms:
+- frontend/src files -> the file and every file importing it (transitively),
+- backend/index.js hunks -> the routes whose handler changed; a changed helper or constant
+  -> every route referencing it,
+- other backend modules -> the names index.js imports from them (directly or through other
+  modules) -> every route referencing those names.
+Changes nothing can be attributed to (middleware, startup, packages, shared test code) select
+everything. The smoke tests always run, and tests missing from the map always run.
+
+    pytest --changed-since origin/main
+    python -m support.impact --base origin/main      # prints the selection and the reasons
+"""
+import argparse
+import fnmatch
+import glob
+import json
+import os
+import re
+import subprocess
+from dataclasses import dataclass, field
+
+from support.api_replay import FIXTURES_DIR
+
+TESTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_DIR = os.path.dirname(TESTS_DIR)
+MAP_FILE = os.path.join(TESTS_DIR, 'impact_map.json')
+
+INDEX_FILE = 'backend/index.js'
+ROUTE_RE = re.compile(r"^\s*app\.(get|post|put|delete|patch)\(\s*['\"]([^'\"]+)['\"]")
+# A top-level statement starts at column 0 (closing brackets and comments continue the previous one)
+STATEMENT_START_RE = re.compile(r"^[A-Za-z_$]")
+DEFINES_RE = re.compile(r"^\s*(?:(?:async\s+)?function\s*\*?\s*(\w+)|class\s+(\w+)|(?:const|let|var)\s+(\w+))")
+DESTRUCTURE_RE = re.compile(r"^\s*(?:const|let|var)\s*\{([^}]*)\}\s*=")
+REQUIRE_RE = re.compile(r"require\(\s*['\"](\.{1,2}/[^'\"]+)['\"]\s*\)")
+IMPORT_RE = re.compile(r"""(?:import|export)\s[^'"]*?from\s*['"](\.{1,2}/[^'"]+)['"]|import\s*['"](\.{1,2}/[^'"]+)['"]""")
+COMMENT_LINE_RE = re.compile(r"^\s*(//.*|/\*.*|\*.*|\*/\s*)?$")
+HUNK_RE = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+@dataclass
+class Selection:
+    """The tests to run (test file -> reasons), or run_all with the reasons for it."""
+    base: str
+    changed_files: list
+    run_all: bool = False
+    run_all_reasons: list = field(default_factory=list)
+    tests: dict = field(default_factory=dict)
+
+    def select(self, test_file, reason):
+        self.tests.setdefault(test_file, [])
+        if reason not in self.tests[test_file]:
+            self.tests[test_file].append(reason)
+
+    def everything(self, reason):
+        self.run_all = True
+        self.run_all_reasons.append(reason)
+
+    def includes(self, test_file):
+        return self.run_all or test_file in self.tests
+
+
+# --- Git ---
+
+def _git(*args):
+    return subprocess.run(['git', *args], cwd=REPO_DIR, capture_output=True, text=True, check=True).stdout
+
+
+def changed_files(base):
+    """Files that differ between `base` and the working tree (committed, staged, unstaged and untracked)."""
+    tracked = _git('diff', '--name-only', base).splitlines()
+    untracked = _git('ls-files', '--others', '--exclude-standard').splitlines()
+    return sorted(set(tracked + untracked))
+
+
+def changed_lines(base, path):
+    """(old line numbers, new line numbers, changed text) of a file's diff against `base`."""
+    old, new, text = set(), set(), []
+    for line in _git('diff', '-U0', base, '--', path).splitlines():
+        hunk = HUNK_RE.match(line)
+        if hunk:
+            old_start, old_count = int(hunk[1]), int(hunk[2] or 1)
+            new_start, new_count = int(hunk[3]), int(hunk[4] or 1)
+            # Deleted lines are found in the base version, added ones in the working tree
+            old.update(range(old_start, old_start + old_count))
+            new.update(range(new_start, new_start + new_count))
+        elif line[:1] in '+-' and not line.startswith(('+++', '---')):
+            text.append(line[1:])
+    return old, new, text
+
+
+def file_at(base, path):
+    try:
+        return _git('show', f'{base}:{path}')
+    except subprocess.CalledProcessError:
+        return ''  # added after base
+
+
+def _read(path):
+    try:
+        with open(os.path.join(REPO_DIR, path), encoding='utf-8') as f:
+            return f.read()
+    except FileNotFoundError:
+        return ''  # deleted
+
+
+# --- Backend ---
+
+@dataclass
+class Block:
+    """One top-level statement of index.js: a route, or a helper/constant/middleware."""
+    start: int
+    end: int
+    text: str
+    route: str = None  # "METHOD /path"
+    names: set = field(default_factory=set)
+
+
+def parse_blocks(source):
+    lines = source.splitlines()
+    starts, in_template = [], False
+    for i, line in enumerate(lines):
+        # Lines of a multi-line template literal may start at column 0 too
+        if not in_template and (STATEMENT_START_RE.match(line) or ROUTE_RE.match(line)):
+            starts.append(i)
+        if line.count('`') % 2:
+            in_template = not in_template
+    blocks = []
+    for n, start in enumerate(starts):
+        end = starts[n + 1] if n + 1 < len(starts) else len(lines)
+        # Comments right above a statement belong to it
+        while end > start + 1 and COMMENT_LINE_RE.match(lines[end - 1]):
+            end -= 1
+        text = "\n".join(lines[start:end])
+        route = ROUTE_RE.match(lines[start])
+        block = Block(start + 1, end, text, route=f"{route[1].upper()} {route[2]}" if route else None)
+        if not route:
+            defined = DEFINES_RE.match(lines[start])
+            if defined:
+                block.names.add(next(g for g in defined.groups() if g))
+            destructured = DESTRUCTURE_RE.match(lines[start])
+            if destructured:
+                block.names.update(_names(destructured[1]))
+        blocks.append(block)
+    return blocks
+
+
+def _names(destructured):
+    # "{ a, b: c }" binds a and c
+    return {part.split(':')[-1].strip() for part in destructured.split(',') if part.strip()}
+
+
+def _references(text, names):
+    return any(re.search(rf"\b{re.escape(name)}\b", text) for name in names)
+
+
+def _blocks_at(blocks, line_numbers):
+    return [b for b in blocks if any(b.start <= n <= max(b.end, b.start) for n in line_numbers)]
+
+
+def _backend_modules():
+    modules = {}
+    for path in glob.glob(os.path.join(REPO_DIR, 'backend', '**', '*.js'), recursive=True):
+        rel = os.path.relpath(path, REPO_DIR).replace(os.sep, '/')
+        if '/node_modules/' not in rel:
+            modules[rel] = _read(rel)
+    return modules
+
+
+def _resolve(from_file, spec, known, extensions):
+    base = os.path.normpath(os.path.join(os.path.dirname(from_file), spec)).replace(os.sep, '/')
+    for candidate in [base] + [base + ext for ext in extensions] + [f"{base}/index{ext}" for ext in extensions]:
+        if candidate in known:
+            return candidate
+    return None
+
+
+def _dependents(changed, sources, pattern, extensions):
+    """`changed` plus every file that imports it, transitively."""
+    importers = {}
+    for path, source in sources.items():
+        for match in pattern.finditer(source):
+            spec = next(g for g in match.groups() if g)
+            target = _resolve(path, spec, sources, extensions)
+            if target:
+                importers.setdefault(target, set()).add(path)
+    result, queue = {changed}, [changed]
+    while queue:
+        for importer in importers.get(queue.pop(), ()):
+            if importer not in result:
+                result.add(importer)
+                queue.append(importer)
+    return result
+
+
+def _imported_names(index_source, module_paths):
+    """Names index.js binds from any of `module_paths` (bare requires are background jobs, not routes)."""
+    names = set()
+    for line in index_source.splitlines():
+        for match in REQUIRE_RE.finditer(line):
+            if _resolve(INDEX_FILE, match[1], module_paths, ['.js']) is None:
+                continue
+            destructured = DESTRUCTURE_RE.match(line)
+            # also `const x = lazy('x', () => require('./x'))` (loaded on first use, see backend/startup.js)
+            single = re.match(r"^\s*(?:const|let|var)\s+(\w+)\s*=\s*(?:lazy\(.*=>\s*)?require", line)
+            if destructured:
+                names.update(_names(destructured[1]))
+            elif single:
+                names.add(single[1])
+    return names
+
+
+def affected_routes(blocks, names):
+    """Routes referencing `names`, following the helpers/constants built from them."""
+    names = set(names)
+    helpers = [b for b in blocks if not b.route]
+    while True:
+        grown = {n for b in helpers if b.names and _references(b.text, names) for n in b.names} - names
+        if not grown:
+            break
+        names |= grown
+    return {b.route for b in blocks if b.route and _references(b.text, names)}
+
+
+def backend_routes(base, path):
+    """Routes affected by a change of a backend file; None when the change is global."""
+    index_source = _read(INDEX_FILE)
+    blocks = parse_blocks(index_source)
+    old_lines, new_lines, text = changed_lines(base, path)
+    if all(COMMENT_LINE_RE.match(line) for line in text):
+        return set()
+
+    if path == INDEX_FILE:
+        routes, names = set(), set()
+        touched = _blocks_at(blocks, new_lines) + _blocks_at(parse_blocks(file_at(base, path)), old_lines)
+        for block in touched:
+            if block.route:
+                routes.add(block.route)
+            elif block.names:
+                names |= block.names
+            else:
+                return None  # middleware, socket handlers, startup...
+        return routes | affected_routes(blocks, names)
+
+    modules = _backend_modules()
+    if path not in modules:
+        modules[path] = ''  # deleted module: whoever still requires it
+    dependents = _dependents(path, modules, REQUIRE_RE, ['.js'])
+    if INDEX_FILE not in dependents:
+        return set()  # scripts and tools the tests do not exercise
+    return affected_routes(blocks, _imported_names(index_source, dependents - {INDEX_FILE}))
+
+
+def _route_regex(route):
+    method, path = route.split(' ', 1)
+    pattern = re.sub(r":\w+", "[^/]+", re.escape(path).replace(r"\:", ":"))
+    return method, re.compile(f"^{pattern}$")
+
+
+def endpoint_matches(endpoint, routes):
+    """`endpoint` is declared ("GET /api/events/:eventId/budget") or recorded ("GET /api/events/65f.../budget?x=1")."""
+    if endpoint in routes:
+        return True
+    method, path = endpoint.split(' ', 1)
+    path = path.split('?', 1)[0]
+    for route in routes:
+        route_method, regex = _route_regex(route)
+        if route_method == method and regex.match(path):
+            return True
+    return False
+
+
+# --- Map ---
+
+def load_map(path=MAP_FILE):
+    """Per test file: {"frontend": set, "endpoints": set}, plus the map's own settings."""
+    with open(path, encoding='utf-8') as f:
+        raw = json.load(f)
+    areas = raw.get("areas", {})
+    tests = {}
+    for test_file, entry in raw.get("tests", {}).items():
+        frontend = {f"frontend/src/{p}" for p in entry.get("frontend", [])}
+        endpoints = set(entry.get("endpoints", []))
+        for area in ["fixtures", *entry.get("uses", [])]:
+            frontend |= {f"frontend/src/{p}" for p in areas.get(area, {}).get("frontend", [])}
+            endpoints |= set(areas.get(area, {}).get("endpoints", []))
+        tests[test_file] = {"frontend": frontend, "endpoints": endpoints}
+
+    # What UI tests actually called when they were recorded (API_MODE=record)
+    for fixture in glob.glob(os.path.join(FIXTURES_DIR, '*.json')):
+        with open(fixture, encoding='utf-8') as f:
+            recorded = json.load(f)
+        if "test" not in recorded:
+            continue
+        test_file = recorded["test"].split("::")[0]
+        entry = tests.setdefault(test_file, {"frontend": set(), "endpoints": set()})
+        entry["endpoints"] |= {f"{e['method']} {e['path']}" for e in recorded.get("exchanges", [])}
+    return raw, tests
+
+
+def _matches_any(path, patterns):
+    return any(path == p or (p.endswith('/') and path.startswith(p)) or fnmatch.fnmatch(os.path.basename(path), p)
+               for p in patterns)
+
+
+def _is_ui_test(test_file):
+    return '/' not in test_file
+
+
+# --- Selection ---
+
+def select_tests(base, test_files, map_path=MAP_FILE):
+    """Decides which of `test_files` (paths relative to tests/, e.g. "api/test_api_add_guest.py") to run."""
+    raw, tests = load_map(map_path)
+    selection = Selection(base=base, changed_files=changed_files(base))
+    frontend_sources = {
+        os.path.relpath(p, REPO_DIR).replace(os.sep, '/'): _read(os.path.relpath(p, REPO_DIR))
+        for p in glob.glob(os.path.join(REPO_DIR, 'frontend', 'src', '**', '*.*'), recursive=True)
+    }
+
+    for path in selection.changed_files:
+        if _matches_any(path, raw.get("run_all", [])):
+            selection.everything(f"{path} is shared by every test")
+        elif _matches_any(path, raw.get("ignore", [])):
+            continue
+        elif path.startswith('tests/'):
+            _select_test_change(selection, path[len('tests/'):], test_files)
+        elif _matches_any(path, raw.get("ui_entry_points", [])):
+            for test_file in filter(_is_ui_test, test_files):
+                selection.select(test_file, f"{path} (app entry point)")
+        elif path.startswith('frontend/src/'):
+            frontend_sources.setdefault(path, '')
+            dependents = _dependents(path, frontend_sources, IMPORT_RE, ['.jsx', '.js', '.css'])
+            if not path.startswith('frontend/src/components/') and dependents & set(raw.get("ui_entry_points", [])):
+                # Global styles, contexts and config reach every page
+                for test_file in filter(_is_ui_test, test_files):
+                    selection.select(test_file, f"{path} (used app-wide)")
+                continue
+            for test_file in test_files:
+                used = tests.get(test_file, {}).get("frontend", set()) & dependents
+                if used:
+                    via = sorted(used - {path})
+                    selection.select(test_file, f"{path} (via {', '.join(via)})" if via else path)
+        elif path.startswith('backend/') and path.endswith('.js'):
+            routes = backend_routes(base, path)
+            if routes is None:
+                selection.everything(f"{path} changes code every route runs through")
+                continue
+            for test_file in test_files:
+                hit = sorted(e for e in tests.get(test_file, {}).get("endpoints", ()) if endpoint_matches(e, routes))
+                if hit:
+                    selection.select(test_file, f"{path} ({', '.join(hit[:3])}{'...' if len(hit) > 3 else ''})")
+        elif path.startswith('frontend/'):
+            for test_file in filter(_is_ui_test, test_files):
+                selection.select(test_file, f"{path} (frontend build)")
+        elif path.startswith('backend/'):
+            selection.everything(f"{path} is not mapped to tests")
+        # Anything outside backend/, frontend/ and tests/ does not reach the test runs
+
+    if not selection.run_all:
+        for test_file in test_files:
+            if test_file not in tests:
+                selection.select(test_file, "not in impact_map.json")
+        for test_file in raw.get("smoke", []):
+            if test_file in test_files:
+                selection.select(test_file, "smoke")
+    return selection
+
+
+def _select_test_change(selection, rel, test_files):
+    folder, name = os.path.split(rel)
+    if rel in test_files:
+        selection.select(rel, "test changed")
+    elif name == 'conftest.py':
+        for test_file in test_files:
+            if test_file.startswith(f"{folder}/"):
+                selection.select(test_file, f"tests/{rel} changed")
+    elif rel.startswith('fixtures/api/_'):
+        # The recorded login session / run data shared by every replayed UI test
+        for test_file in filter(_is_ui_test, test_files):
+            selection.select(test_file, f"tests/{rel} changed")
+    elif rel.startswith('fixtures/api/'):
+        recorded = next((t for t in test_files if name.startswith(re.sub(r"[^\w.-]+", "_", t) + "__")), None)
+        if recorded:
+            selection.select(recorded, "recorded API fixture changed")
+    elif folder in ('api', 'perf'):
+        # Helpers of one tier (e.g. perf/bench_*.py)
+        for test_file in test_files:
+            if test_file.startswith(f"{folder}/"):
+                selection.select(test_file, f"tests/{rel} changed")
+
+
+def discover_test_files(perf=False):
+    files = []
+    for pattern in ('test_*.py', 'api/test_*.py') + (('perf/test_*.py',) if perf else ()):
+        files += [os.path.relpath(p, TESTS_DIR).replace(os.sep, '/') for p in glob.glob(os.path.join(TESTS_DIR, pattern))]
+    return sorted(files)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Select the tests affected by the changes since a git ref")
+    parser.add_argument("--base", default="origin/main", help="Git ref to diff against (default: origin/main)")
+    parser.add_argument("--perf", action="store_true", help="Also consider the perf tests (opt-in, like pytest -m perf)")
+    parser.add_argument("--json", action="store_true", help="Print the selection as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    test_files = discover_test_files(args.perf)
+    selection = select_tests(args.base, test_files)
+    if args.json:
+        print(json.dumps({
+            "base": selection.base, "changed_files": selection.changed_files, "run_all": selection.run_all,
+            "run_all_reasons": selection.run_all_reasons, "tests": selection.tests,
+        }, indent=2, ensure_ascii=False))
+        return
+    print(f"{len(selection.changed_files)} changed file(s) since {args.base}")
+    if selection.run_all:
+        print("Running every test:")
+        for reason in selection.run_all_reasons:
+            print(f"  - {reason}")
+        return
+    print(f"{len(selection.tests)}/{len(test_files)} test files selected:")
+    for test_file, reasons in sorted(selection.tests.items()):
+        print(f"  {test_file}: {'; '.join(reasons)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+import os
+import shutil
+import socket
+import subprocess
+import tempfile
+import time
+
+import httpx
+
+TESTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKEND_DIR = os.path.join(os.path.dirname(TESTS_DIR), 'backend')
+LOG_DIR = os.path.join(TESTS_DIR, '.cache', 'logs')
+
+# RAM-backed when available, so the throwaway database never touches the disk
+EPHEMERAL_ROOT = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+# User registered in every fresh backend, so login-based tests have an account to use
+HERMETIC_USER = {
+    "email": "hermetic.tester@example.com",
+    "password": "HermeticPassword123!",
+    "fullName": "Hermetic Tester",
+}
+
+
+class BackendStartError(RuntimeError):
+    pass
+
+
+def free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _tail(path, lines=30):
+    try:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            return ''.join(f.readlines()[-lines:])
+    except OSError:
+        return ''
+
+
+class EphemeralMongo:
+    """
+    A private mongod on a free port with its data directory in a temporary (RAM-backed) folder.
+    Everything is deleted on stop(). Uses MONGOD_PATH or the mongod found on PATH.
+    """
+
+    def __init__(self, name="master"):
+        self.name = name
+        self.port = None
+        self.dbpath = None
+        self.process = None
+        self.log_path = os.path.join(LOG_DIR, f'mongod-{name}.log')
+
+    @property
+    def uri(self):
+        return f"mongodb://127.0.0.1:{self.port}"
+
+    def start(self, timeout=30):
+        binary = os.getenv("MONGOD_PATH") or shutil.which("mongod")
+        if not binary:
+            raise BackendStartError("mongod was not found. Install MongoDB or set MONGOD_PATH.")
+
+        os.makedirs(LOG_DIR, exist_ok=True)
+        self.port = free_port()
+        self.dbpath = tempfile.mkdtemp(prefix=f'wedding-mongo-{self.name}-', dir=EPHEMERAL_ROOT)
+        self.process = subprocess.Popen(
+            [binary, '--dbpath', self.dbpath, '--port', str(self.port), '--bind_ip', '127.0.0.1',
+             '--quiet', '--logpath', self.log_path],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.STDOUT,
+        )
+
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise BackendStartError(f"mongod exited early:\n{_tail(self.log_path)}")
+            try:
+                with socket.create_connection(('127.0.0.1', self.port), timeout=0.5):
+                    return self
+            except OSError:
+                time.sleep(0.1)
+        self.stop()
+        raise BackendStartError(f"mongod did not start within {timeout}s:\n{_tail(self.log_path)}")
+
+    def stop(self):
+        if self.process is not None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+            self.process = None
+        if self.dbpath:
+            shutil.rmtree(self.dbpath, ignore_errors=True)
+            self.dbpath = None
+
+
+class LocalBackend:
+    """
+    Runs backend/index.js (or another entry script, e.g. cluster.js) on a free local port against a private EphemeralMongo.
+
+    Usage:
+        backend = LocalBackend(name="gw0").start()
+        ... backend.url ...
+        backend.stop()
+
+    Args:
+        name: Used for log file names and the database name (one backend per xdist worker).
+        env: Extra environment variables for the Node process (e.g. feature switches).
+        mongo_uri: Reuse an existing MongoDB instead of starting a private one.
+        script: The backend entry point ("cluster.js" runs several workers behind the port).
+    """
+
+    def __init__(self, name="master", env=None, mongo_uri=None, script="index.js"):
+        self.name = name
+        self.script = script
+        self.extra_env = env or {}
+        self.mongo = None if mongo_uri else EphemeralMongo(name)
+        self.mongo_uri = mongo_uri
+        self.port = None
+        self.process = None
+        self.log_path = os.path.join(LOG_DIR, f'backend-{name}.log')
+        self._log_file = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.port}"
+
+    @property
+    def db_name(self):
+        return f"wedding_test_{self.name}"
+
+    def start(self, timeout=60):
+        if self.mongo is not None:
+            self.mongo_uri = self.mongo.start().uri
+
+        os.makedirs(LOG_DIR, exist_ok=True)
+        self.port = free_port()
+        env = {
+            **os.environ,
+            "PORT": str(self.port),
+            "MONGO_URI": self.mongo_uri,
+            "DB_NAME": self.db_name,
+            "PUBLIC_BASE_URL": f"http://127.0.0.1:{self.port}",
+            **self.extra_env,
+        }
+        self._log_file = open(self.log_path, 'w', encoding='utf-8')
+        self.process = subprocess.Popen(
+            ['node', self.script], cwd=BACKEND_DIR, env=env, stdout=self._log_file, stderr=subprocess.STDOUT,
+        )
+
+        try:
+            self.wait_until_healthy(timeout)
+        except BackendStartError:
+            self.stop()
+            raise
+        return self
+
+    def wait_until_healthy(self, timeout=60):
+        """Polls /api/health until the server answers and Mongo is connected (readyState 1)."""
+        deadline = time.monotonic() + timeout
+        with httpx.Client(base_url=self.url, timeout=2) as http:
+            while time.monotonic() < deadline:
+                if self.process.poll() is not None:
+                    raise BackendStartError(f"backend exited early:\n{_tail(self.log_path)}")
+                try:
+                    health = http.get('/api/health')
+                    if health.status_code == 200 and health.json().get("state") == 1:
+                        return health.json()
+                except httpx.TransportError:
+                    pass
+                time.sleep(0.1)
+        raise BackendStartError(f"backend did not become healthy within {timeout}s:\n{_tail(self.log_path)}")
+
+    def stop(self):
+        if self.process is not None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+            self.process = None
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+        if self.mongo is not None:
+            self.mongo.stop()
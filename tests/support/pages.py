@@ -0,0 +1,268 @@
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import Select
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+from support.waits import DEFAULT_TIMEOUT, PageActivity, count_matches, wait_for_matches, xpath_literal
+
+# --- Shared Locators ---
+DASHBOARD_HEADER = (By.XPATH, "//h1[contains(., 'Wedding Planner')]")
+SIGN_IN_BUTTON = (By.XPATH, "//button[contains(., 'Sign In')]")
+
+
+class BasePage:
+    """
+    Common plumbing for all page objects.
+
+    Every action waits on a real completion signal (API response, Socket.io emit or a
+    DOM mutation) instead of a fixed sleep, and every check is a targeted element query.
+    """
+
+    def __init__(self, driver, base_url, timeout=DEFAULT_TIMEOUT):
+        self.driver = driver
+        self.base_url = base_url.rstrip('/')
+        self.wait = WebDriverWait(driver, timeout)
+        self.activity = PageActivity(driver, timeout)
+        self.timeout = timeout
+
+    def open(self, path=""):
+        self.driver.get(f"{self.base_url}{path}")
+        return self
+
+    def scroll_to(self, element):
+        # Instant scroll ('auto'), so the element is in place as soon as the call returns
+        self.driver.execute_script("arguments[0].scrollIntoView({block: 'center', behavior: 'auto'});", element)
+        return element
+
+    def js_click(self, element):
+        self.driver.execute_script("arguments[0].click();", element)
+
+    def count(self, xpath):
+        return count_matches(self.driver, xpath)
+
+    def wait_for_count_above(self, xpath, previous_count):
+        """Waits until the list matched by `xpath` grew past `previous_count`."""
+        return wait_for_matches(self.driver, xpath, previous_count + 1, self.timeout)
+
+    def is_visible(self, locator):
+        return len(self.driver.find_elements(*locator)) > 0
+
+
+class AuthPage(BasePage):
+    """Login / Sign Up screen (Auth.jsx)."""
+
+    def login(self, email, password):
+        mark = self.activity.mark()
+        email_input = self.wait.until(EC.visibility_of_element_located((By.CSS_SELECTOR, "input[type='email']")))
+        email_input.clear()
+        email_input.send_keys(email)
+
+        password_input = self.driver.find_element(By.CSS_SELECTOR, "input[type='password']")
+        password_input.clear()
+        password_input.send_keys(password)
+
+        self.driver.find_element(By.CSS_SELECTOR, "button[type='submit']").click()
+        self.activity.wait_for_response("POST", "/api/users/login", since=mark)
+        return DashboardPage(self.driver, self.base_url, self.timeout).wait_until_loaded()
+
+    def switch_to_signup(self):
+        """Toggles to Sign Up mode. Returns False if the toggle was not found (already in Sign Up)."""
+        try:
+            toggle = self.wait.until(EC.element_to_be_clickable(
+                (By.XPATH, "//button[contains(., \"Don't have an account? Sign up\")]")
+            ))
+        except TimeoutException:
+            return False
+        toggle.click()
+        return True
+
+    def fill_signup(self, full_name, email, password):
+        name_input = self.wait.until(EC.visibility_of_element_located((By.CSS_SELECTOR, "input[placeholder='John Doe']")))
+        name_input.clear()
+        name_input.send_keys(full_name)
+
+        email_input = self.driver.find_element(By.CSS_SELECTOR, "input[type='email']")
+        email_input.clear()
+        email_input.send_keys(email)
+
+        pass_input = self.driver.find_element(By.CSS_SELECTOR, "input[type='password']")
+        pass_input.clear()
+        pass_input.send_keys(password)
+
+    def join_as_partner(self, wedding_code):
+        self.driver.find_element(By.XPATH, "//span[contains(., 'Join as a Partner')]").click()
+
+        # The Wedding Code input renders conditionally after the checkbox is ticked
+        code_input = self.wait.until(EC.visibility_of_element_located((By.CSS_SELECTOR, "input[placeholder*='WED-']")))
+        code_input.clear()
+        code_input.send_keys(wedding_code)
+
+    def submit_signup(self):
+        mark = self.activity.mark()
+        self.driver.find_element(By.XPATH, "//button[contains(., 'Create Account')]").click()
+        self.activity.wait_for_response("POST", "/api/users/register", since=mark)
+        return DashboardPage(self.driver, self.base_url, self.timeout).wait_until_loaded()
+
+    def wait_until_shown(self):
+        self.wait.until(EC.visibility_of_element_located(SIGN_IN_BUTTON))
+        return self
+
+
+class DashboardPage(BasePage):
+    """Main dashboard (Dashboard.jsx): events, tasks and the 'New Event' / 'New Task' forms."""
+
+    def wait_until_loaded(self):
+        """Waits for the header and for the initial events request, so the lists are rendered."""
+        self.wait.until(EC.presence_of_element_located(DASHBOARD_HEADER))
+        self.activity.wait_for_response("GET", "/api/events", since=0)
+        return self
+
+    @staticmethod
+    def title_xpath(title):
+        return f"//h3[normalize-space(.)={xpath_literal(title)}]"
+
+    def first_event_link(self, section):
+        """Returns the first event card link to '/events/<id>/<section>' (guests / budget)."""
+        return self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, f"a[href*='/{section}']")))
+
+    def event_link(self, event_id, section):
+        """Returns the link to '/events/<event_id>/<section>' on that event's card."""
+        return self.wait.until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, f"a[href$='/events/{event_id}/{section}']"))
+        )
+
+    def add_event(self, title, date_text, description=""):
+        # Find the Header "New Event" (Hebrew: 'אירוע חדש') to ensure we are in the right section
+        header = self.wait.until(EC.presence_of_element_located((By.XPATH, "//h3[contains(., 'אירוע חדש')]")))
+        self.scroll_to(header)
+
+        title_input = self.wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "input[placeholder*='חינה']")))
+        title_input.clear()
+        title_input.send_keys(title)
+
+        date_input = self.driver.find_element(By.XPATH, "//h3[contains(., 'אירוע חדש')]/following-sibling::form//input[@type='date']")
+        date_input.send_keys(date_text)
+
+        if description:
+            self.driver.find_element(By.CSS_SELECTOR, "input[placeholder='פרטים...']").send_keys(description)
+
+        before = self.count(self.title_xpath(title))
+        mark = self.activity.mark()
+        self.js_click(self.driver.find_element(By.XPATH, "//button[contains(., 'צור אירוע חדש')]"))
+        self.activity.wait_for_response("POST", "/api/events", since=mark)
+        return self.wait_for_count_above(self.title_xpath(title), before)
+
+    def add_task(self, title, date_text):
+        title_input = self.wait.until(EC.visibility_of_element_located((By.CSS_SELECTOR, "input[placeholder*='לקבוע פגישה']")))
+        title_input.clear()
+        title_input.send_keys(title)
+
+        # The input following the label "Due Date" (Hebrew: "תאריך יעד") is a required field
+        date_input = self.driver.find_element(By.XPATH, "//label[contains(., 'תאריך יעד')]/following-sibling::input")
+        date_input.send_keys(date_text)
+
+        add_task_btn = self.driver.find_element(By.XPATH, "//button[contains(., 'הוסף משימה לרשימה')]")
+        self.scroll_to(add_task_btn)
+
+        before = self.count(self.title_xpath(title))
+        mark = self.activity.mark()
+        add_task_btn.click()
+        self.activity.wait_for_response("POST", "/api/tasks", since=mark)
+        return self.wait_for_count_above(self.title_xpath(title), before)
+
+    def logout(self):
+        # "Disconnect" (Hebrew: 'התנתק') in the Sidebar
+        self.wait.until(EC.element_to_be_clickable((By.XPATH, "//button[contains(., 'התנתק')]"))).click()
+        return AuthPage(self.driver, self.base_url, self.timeout).wait_until_shown()
+
+
+class GuestListPage(BasePage):
+    """Guest list of a single event (GuestList.jsx)."""
+
+    @staticmethod
+    def guest_row_xpath(full_name):
+        return f"//tbody//td[normalize-space(.)={xpath_literal(full_name)}]"
+
+    def wait_until_loaded(self):
+        self.wait.until(EC.presence_of_element_located((By.NAME, "fullName")))
+        return self
+
+    def add_guest(self, full_name, phone, amount_invited):
+        """Submits the 'add guest' form and waits for the new row to render."""
+        name_input = self.wait.until(EC.presence_of_element_located((By.NAME, "fullName")))
+        name_input.send_keys(full_name)
+        self.driver.find_element(By.NAME, "phone").send_keys(phone)
+
+        amount_input = self.driver.find_element(By.NAME, "amountInvited")
+        amount_input.clear()
+        amount_input.send_keys(str(amount_invited))
+
+        before = self.count(self.guest_row_xpath(full_name))
+        mark = self.activity.mark()
+        self.driver.find_element(By.CSS_SELECTOR, "form button[type='submit']").click()
+        self.activity.wait_for_response("POST", "/api/guests", since=mark)
+        # The list is refetched when the backend emits data_changed
+        self.activity.wait_for_socket_event("data_changed", since=mark)
+        return self.wait_for_count_above(self.guest_row_xpath(full_name), before)
+
+
+class BudgetPage(BasePage):
+    """Budget dashboard of a single event (BudgetDashboard.jsx)."""
+
+    @staticmethod
+    def expense_row_xpath(title):
+        return f"//tbody//td[normalize-space(.)={xpath_literal(title)}]"
+
+    def add_expense(self, title, amount):
+        add_btn = self.wait.until(EC.element_to_be_clickable((By.XPATH, "//button[contains(., 'הוצאה חדשה')]")))
+        add_btn.click()
+
+        name_input = self.wait.until(EC.visibility_of_element_located((By.CSS_SELECTOR, "input[placeholder*='צלם מגנטים']")))
+        amount_input = self.driver.find_element(By.CSS_SELECTOR, "input[type='number']")
+        name_input.clear()
+        name_input.send_keys(title)
+        amount_input.clear()
+        amount_input.send_keys(str(amount))
+
+        before = self.count(self.expense_row_xpath(title))
+        mark = self.activity.mark()
+        self.driver.find_element(By.CSS_SELECTOR, "button[type='submit']").click()
+        self.activity.wait_for_response("POST", "/api/budget", since=mark)
+        return self.wait_for_count_above(self.expense_row_xpath(title), before)
+
+
+class VendorsPage(BasePage):
+    """Global vendors page (VendorList.jsx, route /vendors)."""
+
+    @staticmethod
+    def vendor_card_xpath(name):
+        return f"//h3[normalize-space(.)={xpath_literal(name)}]"
+
+    def open(self, path="/vendors"):
+        super().open(path)
+        # driver.get returns on the new document, whose recorder log starts at 0: any
+        # GET /api/vendors in it is this page's load (a mark from the old page would be stale)
+        self.activity.wait_for_response("GET", "/api/vendors", since=0)
+        return self
+
+    def add_vendor(self, name, category, phone="", price_estimate=""):
+        # Button text "New Vendor" (Hebrew: 'ספק חדש')
+        self.wait.until(EC.element_to_be_clickable((By.XPATH, "//button[contains(., 'ספק חדש')]"))).click()
+
+        name_input = self.wait.until(EC.visibility_of_element_located((By.CSS_SELECTOR, "input[placeholder*='שם העסק']")))
+        name_input.clear()
+        name_input.send_keys(name)
+
+        Select(self.driver.find_element(By.TAG_NAME, "select")).select_by_value(category)
+        if phone:
+            self.driver.find_element(By.CSS_SELECTOR, "input[placeholder*='טלפון']").send_keys(phone)
+        if price_estimate:
+            self.driver.find_element(By.CSS_SELECTOR, "input[type='number']").send_keys(str(price_estimate))
+
+        before = self.count(self.vendor_card_xpath(name))
+        mark = self.activity.mark()
+        # Button text "Save Vendor" (Hebrew: 'שמור ספק')
+        self.driver.find_element(By.XPATH, "//button[contains(., 'שמור ספק')]").click()
+        self.activity.wait_for_response("POST", "/api/vendors", since=mark)
+        return self.wait_for_count_above(self.vendor_card_xpath(name), before)
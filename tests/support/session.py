@@ -0,0 +1,38 @@
+import json
+from urllib.parse import urlsplit
+
+# Runs before the app's own scripts on every page of the target origin,
+# so App.jsx finds the user in localStorage on its very first render.
+SEED_USER_JS = """
+(() => {
+  if (window.location.origin !== %(origin)s) return;
+  window.localStorage.setItem('user', %(user)s);
+})();
+"""
+
+
+def origin_of(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def seed_logged_in_user(driver, base_url, user):
+    """
+    Makes the browser start already logged in as `user` (a User from ApiClient.login).
+
+    The app keeps its session in localStorage['user'] (see App.jsx handleLogin), so no UI login,
+    extra page load or bcrypt check is needed.
+
+    Returns:
+        str: CDP script identifier - pass it to clear_seeded_user() when the test is done.
+    """
+    source = SEED_USER_JS % {
+        "origin": json.dumps(origin_of(base_url)),
+        "user": json.dumps(json.dumps(user.public)),
+    }
+    result = driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": source})
+    return result["identifier"]
+
+
+def clear_seeded_user(driver, identifier):
+    driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": identifier})
@@ -0,0 +1,236 @@
+import json
+import os
+import re
+import time
+from urllib.parse import urlparse
+
+from selenium.common.exceptions import WebDriverException
+
+STEPS_REPORT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'reports', 'steps')
+
+# --- In-Page Paint Observer ---
+# LCP and long tasks are only exposed through PerformanceObserver, so they are collected
+# from the first moment of every page load (registered like the activity recorder).
+PAINT_OBSERVER_JS = r"""
+(() => {
+  if (window.__testPerf) return;
+  const perf = window.__testPerf = { lcp: null, longTasks: [] };
+  try {
+    new PerformanceObserver((list) => {
+      const entries = list.getEntries();
+      perf.lcp = entries[entries.length - 1].startTime;
+    }).observe({ type: 'largest-contentful-paint', buffered: true });
+    new PerformanceObserver((list) => {
+      list.getEntries().forEach((e) => perf.longTasks.push({ start: e.startTime, duration: e.duration }));
+    }).observe({ type: 'longtask', buffered: true });
+  } catch (err) { /* entry type not supported by this browser */ }
+})();
+"""
+
+# Current document state: time origin (changes on a full page load), navigation timing and paints
+PAGE_SNAPSHOT_JS = r"""
+const nav = performance.getEntriesByType('navigation')[0];
+const fcp = performance.getEntriesByName('first-contentful-paint')[0];
+const perf = window.__testPerf || { lcp: null, longTasks: [] };
+return {
+  url: location.href,
+  timeOrigin: performance.timeOrigin,
+  now: performance.now(),
+  navigation: nav ? {
+    dns_ms: nav.domainLookupEnd - nav.domainLookupStart,
+    connect_ms: nav.connectEnd - nav.connectStart,
+    ttfb_ms: nav.responseStart - nav.requestStart,
+    dom_content_loaded_ms: nav.domContentLoadedEventEnd,
+    load_ms: nav.loadEventEnd,
+    transfer_bytes: nav.transferSize
+  } : null,
+  fcp_ms: fcp ? fcp.startTime : null,
+  lcp_ms: perf.lcp,
+  longTasks: perf.longTasks
+};
+"""
+
+HEAP_METRICS = {
+    "JSHeapUsedSize": "js_heap_used_bytes",
+    "JSHeapTotalSize": "js_heap_total_bytes",
+    "Nodes": "dom_nodes",
+}
+
+
+def enable_performance_logging(options):
+    """Adds the Chrome performance log (DevTools Network events) to the driver options."""
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    return options
+
+
+def install_paint_observer(driver):
+    """Registers the paint observer on every page load of this browser. Called once when the browser starts."""
+    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": PAINT_OBSERVER_JS})
+    driver.execute_cdp_cmd("Performance.enable", {})
+
+
+def _round(value):
+    return round(value, 1) if isinstance(value, (int, float)) else value
+
+
+class ApiCallCollector:
+    """Turns DevTools Network events from the performance log into one record per /api/* request."""
+
+    def __init__(self):
+        self._requests = {}
+
+    def feed(self, log_entries):
+        for entry in log_entries:
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+            method, params = message.get("method"), message.get("params", {})
+            request_id = params.get("requestId")
+
+            if method == "Network.requestWillBeSent":
+                request = params["request"]
+                if not urlparse(request["url"]).path.startswith("/api/"):
+                    continue
+                self._requests[request_id] = {
+                    "method": request["method"],
+                    "url": request["url"],
+                    "started": params["timestamp"],
+                    "request_bytes": len(request.get("postData") or ""),
+                    "response_bytes": 0,
+                }
+            elif request_id in self._requests:
+                record = self._requests[request_id]
+                if method == "Network.responseReceived":
+                    record["status"] = params["response"]["status"]
+                elif method == "Network.dataReceived":
+                    record["response_bytes"] += params.get("dataLength", 0)
+                elif method == "Network.loadingFinished":
+                    record["transfer_bytes"] = params.get("encodedDataLength")
+                    record["duration_ms"] = (params["timestamp"] - record["started"]) * 1000
+                elif method == "Network.loadingFailed":
+                    record["failed"] = params.get("errorText")
+                    record["duration_ms"] = (params["timestamp"] - record["started"]) * 1000
+
+    def drain(self):
+        """Returns the finished requests (in start order) and forgets them; unfinished ones stay for the next step."""
+        finished = sorted(
+            (r for r in self._requests.values() if "duration_ms" in r), key=lambda r: r["started"]
+        )
+        self._requests = {k: v for k, v in self._requests.items() if "duration_ms" not in v}
+        return [
+            {
+                "method": r["method"],
+                "path": urlparse(r["url"]).path,
+                "status": r.get("status"),
+                "duration_ms": _round(r["duration_ms"]),
+                "request_bytes": r["request_bytes"],
+                "response_bytes": r["response_bytes"],
+                "transfer_bytes": r.get("transfer_bytes"),
+                **({"failed": r["failed"]} if "failed" in r else {}),
+            }
+            for r in finished
+        ]
+
+
+class StepRecorder:
+    """
+    Records browser metrics for the named steps of one UI test.
+
+    Usage (through the `steps` fixture):
+        steps.step("1. Navigating to Dashboard...")   # prints the banner and starts measuring
+        ...
+        steps.step("2. Adding a new guest...")        # ends step 1, starts step 2
+
+    Every step gets its wall time, navigation timing and FCP/LCP when the step loaded a new document,
+    long tasks, the JS heap after the step and every /api/* request with its duration and size.
+    """
+
+    def __init__(self, driver, test_id):
+        self.driver = driver
+        self.test_id = test_id
+        self.steps = []
+        self._current = None
+        self._api_calls = ApiCallCollector()
+        self._read_log()  # drop what previous tests left in the log
+
+    def step(self, name):
+        self.end()
+        print(name)
+        self._read_log()
+        self._current = {"name": name, "started": time.perf_counter(), "page": self._snapshot()}
+
+    def end(self):
+        current, self._current = self._current, None
+        if current is None:
+            return
+        duration_ms = (time.perf_counter() - current["started"]) * 1000
+        self._read_log()
+        self.steps.append({
+            "name": current["name"],
+            "duration_ms": _round(duration_ms),
+            **self._page_metrics(current["page"], self._snapshot()),
+            **self._heap(),
+            "api_calls": self._api_calls.drain(),
+        })
+
+    def report(self):
+        return {
+            "test": self.test_id,
+            "total_ms": _round(sum(s["duration_ms"] for s in self.steps)),
+            "steps": self.steps,
+        }
+
+    def write(self, directory=STEPS_REPORT_DIR):
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, re.sub(r"[^\w.-]+", "_", self.test_id) + ".json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2, ensure_ascii=False)
+        return path
+
+    # --- Collection helpers (a broken browser must not fail the test - metrics are best effort) ---
+
+    def _read_log(self):
+        try:
+            self._api_calls.feed(self.driver.get_log("performance"))
+        except WebDriverException:
+            pass
+
+    def _snapshot(self):
+        try:
+            return self.driver.execute_script(PAGE_SNAPSHOT_JS)
+        except WebDriverException:
+            return None
+
+    def _heap(self):
+        try:
+            metrics = self.driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+        except WebDriverException:
+            return {}
+        values = {m["name"]: m["value"] for m in metrics}
+        return {key: int(values[name]) for name, key in HEAP_METRICS.items() if name in values}
+
+    @staticmethod
+    def _page_metrics(before, after):
+        if not after:
+            return {}
+        loaded_new_page = not before or before["timeOrigin"] != after["timeOrigin"]
+        since = 0 if loaded_new_page else before["now"]
+        long_tasks = [t for t in after["longTasks"] if t["start"] >= since]
+        metrics = {
+            "url": after["url"],
+            "loaded_new_page": loaded_new_page,
+            "long_tasks": len(long_tasks),
+            "long_task_ms": _round(sum(t["duration"] for t in long_tasks)),
+        }
+        if loaded_new_page:
+            fcp = after["fcp_ms"]
+            # TTI-style estimate: first paint, pushed back by every long task that ran after it
+            tti = max([fcp or 0] + [t["start"] + t["duration"] for t in long_tasks]) if fcp is not None else None
+            metrics.update({
+                "navigation": {k: _round(v) for k, v in (after["navigation"] or {}).items()},
+                "fcp_ms": _round(fcp),
+                "lcp_ms": _round(after["lcp_ms"]),
+                "tti_estimate_ms": _round(tti),
+            })
+        return metrics
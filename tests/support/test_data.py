@@ -0,0 +1,102 @@
+import datetime
+import secrets
+import time
+
+from support.api_models import SeededData
+
+# Records of runs that crashed before their cleanup are swept by the next session once they are this old
+STALE_AFTER_MINUTES = 6 * 60
+
+
+def new_namespace(worker="master"):
+    """A unique, lowercase namespace per run and worker, e.g. 'e2e-2610181205-gw0-3fa2'."""
+    stamp = datetime.datetime.now().strftime("%y%m%d%H%M")
+    return f"e2e-{stamp}-{worker.lower()}-{secrets.token_hex(2)}"
+
+
+class RunData:
+    """
+    The test data of one run, all tagged with the run's namespace so it can be deleted in bulk.
+
+    Names and titles end with "[<namespace>]", test users get "+<namespace>@" in their email
+    (the same tags the backend's /api/test-data/cleanup looks for).
+
+    Usage (through the `run_data` fixture):
+        guest_name = run_data.name("Selenium Test Guest")   # 'Selenium Test Guest [e2e-...]'
+        email = run_data.email("signup.test")                 # 'signup.test.<ms>+e2e-...@fictive.com'
+
+    Args:
+        namespace: The run's namespace (see new_namespace).
+        api_client: Client used for seeding and cleanup (None = names only, e.g. in replay mode).
+        token: TEST_MAINTENANCE_TOKEN of the backend. Without it prerequisites are created one by one
+               through the regular routes and nothing is cleaned up.
+    """
+
+    def __init__(self, namespace, api_client=None, token=None):
+        self.namespace = namespace
+        self.api_client = api_client
+        self.token = token
+
+    @property
+    def tag(self):
+        return f"[{self.namespace}]"
+
+    @property
+    def can_clean_up(self):
+        return self.api_client is not None and bool(self.token)
+
+    def name(self, base):
+        return f"{base} {self.tag}"
+
+    def email(self, prefix):
+        return f"{prefix}.{time.time_ns() // 1_000_000}+{self.namespace}@fictive.com"
+
+    def seed(self, user_id, events=(), guests=(), expenses=(), tasks=(), vendors=()):
+        """
+        Creates tagged prerequisites for the run; guests and expenses reference events by index.
+
+        Returns:
+            SeededData: The created events, guests, expenses, tasks and vendors.
+        """
+        tag = lambda items, key: [{**item, key: self.name(item[key])} for item in items]
+        spec = {
+            "events": tag(events, "title"), "guests": tag(guests, "fullName"), "expenses": tag(expenses, "title"),
+            "tasks": tag(tasks, "title"), "vendors": tag(vendors, "name"),
+        }
+        if self.can_clean_up:
+            return self.api_client.seed_test_data(self.token, self.namespace, user_id, **spec)
+        return self._seed_one_by_one(user_id, spec)
+
+    def cleanup(self):
+        """Deletes everything in this namespace. Returns the deleted counts (None when cleanup is not available)."""
+        if not self.can_clean_up:
+            return None
+        return self.api_client.cleanup_test_data(self.token, namespace=self.namespace)["deleted"]
+
+    def sweep_stale(self, older_than_minutes=STALE_AFTER_MINUTES):
+        """Deletes what earlier runs left behind (every test namespace older than the given age)."""
+        if not self.can_clean_up:
+            return None
+        return self.api_client.cleanup_test_data(self.token, older_than_minutes=older_than_minutes)["deleted"]
+
+    def _seed_one_by_one(self, user_id, spec):
+        # Fallback for backends without the maintenance routes (TEST_MAINTENANCE_TOKEN not configured)
+        api = self.api_client
+        events = [api.create_event(user_id, e["title"], e["eventDate"], e.get("description")) for e in spec["events"]]
+        return SeededData(
+            namespace=self.namespace,
+            events=events,
+            guests=[
+                api.add_guest(events[g.get("event", 0)].id, g["fullName"], g.get("phone"), g.get("amountInvited", 1))
+                for g in spec["guests"]
+            ],
+            expenses=[
+                api.add_expense(events[x.get("event", 0)].id, x["title"], x["amount"], x.get("category", "אחר"))
+                for x in spec["expenses"]
+            ],
+            tasks=[api.create_task(user_id, t["title"], t.get("dueDate")) for t in spec["tasks"]],
+            vendors=[
+                api.add_vendor(user_id, v["name"], v["category"], v.get("phone"), v.get("priceEstimate"))
+                for v in spec["vendors"]
+            ],
+        )
@@ -0,0 +1,168 @@
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+
+DEFAULT_TIMEOUT = 10
+
+# --- In-Page Activity Recorder ---
+# Injected before any app script runs (CDP Page.addScriptToEvaluateOnNewDocument).
+# It records every finished XHR/fetch (axios uses XHR, Auth.jsx uses fetch) and every
+# Socket.io event frame received over the websocket, each with an increasing sequence number.
+# Tests take a mark() before an action and then wait for entries newer than the mark.
+ACTIVITY_RECORDER_JS = r"""
+(() => {
+  if (window.__testActivity) return;
+  const log = window.__testActivity = { seq: 0, requests: [], socketEvents: [] };
+  const push = (list, entry) => { entry.seq = ++log.seq; list.push(entry); };
+
+  const open = XMLHttpRequest.prototype.open;
+  const send = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.open = function (method, url) {
+    this.__testMethod = String(method).toUpperCase();
+    this.__testUrl = String(url);
+    return open.apply(this, arguments);
+  };
+  XMLHttpRequest.prototype.send = function () {
+    this.addEventListener('loadend', () => {
+      push(log.requests, { method: this.__testMethod, url: this.__testUrl, status: this.status });
+    });
+    return send.apply(this, arguments);
+  };
+
+  const originalFetch = window.fetch;
+  window.fetch = function (input, init) {
+    const method = String((init && init.method) || (input && input.method) || 'GET').toUpperCase();
+    const url = typeof input === 'string' ? input : String(input.url);
+    return originalFetch.apply(this, arguments).then(
+      (res) => { push(log.requests, { method, url, status: res.status }); return res; },
+      (err) => { push(log.requests, { method, url, status: 0 }); throw err; }
+    );
+  };
+
+  // Socket.io (engine.io v4) event frames look like: 42["data_changed", {...}]
+  const OriginalWebSocket = window.WebSocket;
+  window.WebSocket = class extends OriginalWebSocket {
+    constructor(...args) {
+      super(...args);
+      this.addEventListener('message', (e) => {
+        if (typeof e.data !== 'string') return;
+        const match = /^42(?:\/[^,]*,)?\d*(\[[\s\S]*\])$/.exec(e.data);
+        if (!match) return;
+        try {
+          const packet = JSON.parse(match[1]);
+          push(log.socketEvents, { name: packet[0] });
+        } catch (err) { /* not a JSON event frame */ }
+      });
+    }
+  };
+})();
+"""
+
+# Resolves as soon as the XPath matches at least `minimum` nodes.
+# Uses a MutationObserver, so the browser only re-checks when the DOM actually changes.
+WAIT_FOR_MATCHES_JS = r"""
+const [xpath, minimum, timeoutMs, done] = arguments;
+const count = () => document.evaluate(
+  'count(' + xpath + ')', document, null, XPathResult.NUMBER_TYPE, null
+).numberValue;
+if (count() >= minimum) { done(true); return; }
+const observer = new MutationObserver(() => {
+  if (count() >= minimum) { observer.disconnect(); clearTimeout(timer); done(true); }
+});
+const timer = setTimeout(() => { observer.disconnect(); done(false); }, timeoutMs);
+observer.observe(document.documentElement, { childList: true, subtree: true, characterData: true });
+"""
+
+
+def install_activity_recorder(driver):
+    """
+    Registers the activity recorder so it runs on every page load of this browser.
+    Called once when the pooled browser starts.
+    """
+    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": ACTIVITY_RECORDER_JS})
+
+
+def xpath_literal(text):
+    """Quotes a Python string for use inside an XPath expression (handles both quote kinds)."""
+    if "'" not in text:
+        return f"'{text}'"
+    if '"' not in text:
+        return f'"{text}"'
+    parts = text.split("'")
+    return "concat(" + ", \"'\", ".join(f"'{part}'" for part in parts) + ")"
+
+
+class PageActivity:
+    """
+    Reads what the in-page recorder captured.
+
+    Usage:
+        mark = activity.mark()
+        ... click submit ...
+        activity.wait_for_response("POST", "/api/guests", since=mark)
+        activity.wait_for_socket_event("data_changed", since=mark)
+    """
+
+    def __init__(self, driver, timeout=DEFAULT_TIMEOUT):
+        self.driver = driver
+        self.timeout = timeout
+
+    def mark(self):
+        """Returns the current sequence number (0 if the recorder did not load yet)."""
+        return self.driver.execute_script("return window.__testActivity ? window.__testActivity.seq : 0;")
+
+    def _wait_for_entry(self, script, args, description, timeout):
+        def find_entry(driver):
+            try:
+                return driver.execute_script(script, *args)
+            except WebDriverException:
+                # Page is in the middle of a navigation - try again on the next poll
+                return None
+
+        try:
+            return WebDriverWait(self.driver, timeout or self.timeout, poll_frequency=0.1).until(find_entry)
+        except TimeoutException:
+            raise AssertionError(f"Timed out waiting for {description}")
+
+    def wait_for_response(self, method, path, since=0, timeout=None):
+        """
+        Waits for a finished request whose URL contains `path`.
+        Fails the test right away if the server answered with an error status.
+        """
+        script = """
+            const [method, path, since] = arguments;
+            const log = window.__testActivity;
+            if (!log) return null;
+            return log.requests.find(r => r.seq > since && r.method === method && r.url.includes(path)) || null;
+        """
+        entry = self._wait_for_entry(script, (method.upper(), path, since), f"{method} {path} response", timeout)
+        assert 200 <= entry["status"] < 400, f"{method} {path} failed with status {entry['status']}"
+        return entry
+
+    def wait_for_socket_event(self, name, since=0, timeout=None):
+        """Waits for a Socket.io event (e.g. 'data_changed') received after the mark."""
+        script = """
+            const [name, since] = arguments;
+            const log = window.__testActivity;
+            if (!log) return null;
+            return log.socketEvents.find(e => e.seq > since && e.name === name) || null;
+        """
+        return self._wait_for_entry(script, (name, since), f"socket event '{name}'", timeout)
+
+
+def count_matches(driver, xpath):
+    """Counts XPath matches inside the browser (no page_source serialization)."""
+    return int(driver.execute_script(
+        "return document.evaluate('count(' + arguments[0] + ')', document, null, XPathResult.NUMBER_TYPE, null).numberValue;",
+        xpath,
+    ))
+
+
+def wait_for_matches(driver, xpath, minimum=1, timeout=DEFAULT_TIMEOUT):
+    """
+    Waits (via DOM mutations) until `xpath` matches at least `minimum` elements.
+
+    Returns:
+        bool: True if the condition was met before the timeout.
+    """
+    driver.set_script_timeout(timeout + 5)
+    return bool(driver.execute_async_script(WAIT_FOR_MATCHES_JS, xpath, minimum, int(timeout * 1000)))
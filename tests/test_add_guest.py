@@ -1,58 +1,37 @@
-import time
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from support.pages import DashboardPage, GuestListPage
 
-def test_add_guest(driver, base_url, credentials):
+def test_add_guest(signed_in_driver, base_url, steps, run_data, seeded_event):
     """
-    Test flow: Login -> Dashboard -> Navigate to an Event -> Add Guest -> Verify.
+    Test flow: Dashboard (already logged in) -> Navigate to the run's seeded Event -> Add Guest -> Verify.
     Args:
-        driver, base_url, credentials: Injected automatically by conftest.py
+        signed_in_driver, base_url, steps, run_data, seeded_event: Injected automatically by conftest.py
     """
     
-    print("1. Navigating to Login Page...")
-    driver.get(base_url)
+    steps.step("1. Navigating to Dashboard (session seeded through the API)...")
+    dashboard = DashboardPage(signed_in_driver, base_url).open().wait_until_loaded()
     
-    # --- Login ---
-    wait = WebDriverWait(driver, 10)
-    wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='email']"))).send_keys(credentials['email'])
-    driver.find_element(By.CSS_SELECTOR, "input[type='password']").send_keys(credentials['password'])
-    driver.find_element(By.CSS_SELECTOR, "button[type='submit']").click()
-    
-    print("2. Looking for an event in Dashboard...")
-    time.sleep(3) 
+    steps.step("2. Looking for the seeded event in Dashboard...")
     
     # --- Find Event and Click Guest List ---
     try:
-        guest_list_btn = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "a[href*='/guests']")))
+        guest_list_btn = dashboard.event_link(seeded_event.id, "guests")
         print(f"   -> Found an event! Navigating to: {guest_list_btn.get_attribute('href')}")
+        dashboard.scroll_to(guest_list_btn)
         guest_list_btn.click()
-    except:
-        assert False, "❌ No events found in Dashboard! Create an event first."
+    except Exception:
+        assert False, f"❌ Seeded event '{seeded_event.title}' not found in Dashboard!"
 
     # --- Add Guest ---
-    print("3. Adding a new guest...")
-    
-    name_input = wait.until(EC.presence_of_element_located((By.NAME, "fullName")))
-    phone_input = driver.find_element(By.NAME, "phone")
-    amount_input = driver.find_element(By.NAME, "amountInvited")
-    
-    guest_name = "Selenium Test Guest"
+    steps.step("3. Adding a new guest...")
+    guest_name = run_data.name("Selenium Test Guest")
     
-    name_input.send_keys(guest_name)
-    phone_input.send_keys("0501234567")
-    amount_input.clear()
-    amount_input.send_keys("3")
-    
-    # Submit
-    driver.find_element(By.CSS_SELECTOR, "form button[type='submit']").click()
+    # add_guest waits for the POST response, the data_changed emit and the new table row
+    guest_listed = GuestListPage(signed_in_driver, base_url).add_guest(guest_name, "0501234567", 3)
     
     # --- Verification ---
-    print("4. Verifying guest was added...")
-    time.sleep(2)
-    
-    if guest_name in driver.page_source:
+    steps.step("4. Verifying guest was added...")
+    if guest_listed:
         print("✅ TEST PASSED: Guest added successfully!")
     else:
         print("❌ TEST FAILED: Guest not found.")
-        assert False, "Guest was not added to the list!"
\ No newline at end of file
+        assert False, "Guest was not added to the list!"
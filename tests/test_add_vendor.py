@@ -1,86 +1,28 @@
-import time
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import Select
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from support.pages import VendorsPage
 
-def test_add_vendor(driver, base_url, credentials):
+def test_add_vendor(signed_in_driver, base_url, steps, run_data):
     """
-    Test flow: Login -> Navigate to Global Vendors Page -> Add Vendor -> Verify.
+    Test flow: Open Global Vendors Page directly (already logged in) -> Add Vendor -> Verify.
     Args:
-        driver, base_url, credentials: Injected automatically by conftest.py
+        signed_in_driver, base_url, steps, run_data: Injected automatically by conftest.py
     """
     
-    print("1. Navigating to Login Page...")
-    driver.get(base_url)
-    
-    # --- Login Step ---
-    wait = WebDriverWait(driver, 10)
-    
-    email_input = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='email']")))
-    password_input = driver.find_element(By.CSS_SELECTOR, "input[type='password']")
-    submit_btn = driver.find_element(By.CSS_SELECTOR, "button[type='submit']")
-    
-    email_input.send_keys(credentials['email'])
-    password_input.send_keys(credentials['password'])
-    submit_btn.click()
-    
     # --- Navigate to Vendors Page ---
-    print("2. Navigating to Vendors Page...")
-    time.sleep(3) # Wait for login to complete
-    
-    # CORRECT ROUTE based on your App.jsx:
-    vendors_url = f"{base_url}/vendors"
-    driver.get(vendors_url)
-    
-    # --- OPEN FORM ---
-    print("3. Opening 'New Vendor' Form...")
-    
-    # Now that window is large, we can safely search for the text "New Vendor" (Hebrew: 'ספק חדש')
-    add_btn = wait.until(EC.element_to_be_clickable((By.XPATH, "//button[contains(., 'ספק חדש')]")))
-    add_btn.click()
-    
-    # --- Fill Form ---
-    print("4. Filling the form...")
+    # The session is seeded through the API, so we land on /vendors without the login form
+    steps.step("1. Navigating to Vendors Page...")
+    vendors_page = VendorsPage(signed_in_driver, base_url).open()
     
-    vendor_name = "Selenium Music Service"
-    vendor_phone = "0509998877"
-    vendor_price = "4500"
+    # --- Fill & Submit Form ---
+    steps.step("2. Adding a new vendor...")
+    vendor_name = run_data.name("Selenium Music Service")
     
-    # 1. Vendor Name Input (placeholder="Business Name / Vendor *")
-    name_input = wait.until(EC.visibility_of_element_located((By.CSS_SELECTOR, "input[placeholder*='שם העסק']")))
-    name_input.clear()
-    name_input.send_keys(vendor_name)
-    
-    # 2. Category Select (Value='Music')
-    select_element = driver.find_element(By.TAG_NAME, "select")
-    select = Select(select_element)
-    select.select_by_value("Music")
-    
-    # 3. Phone Input (placeholder="Phone (Optional)")
-    phone_input = driver.find_element(By.CSS_SELECTOR, "input[placeholder*='טלפון']")
-    phone_input.send_keys(vendor_phone)
-    
-    # 4. Price Estimate Input (type="number")
-    price_input = driver.find_element(By.CSS_SELECTOR, "input[type='number']")
-    price_input.send_keys(vendor_price)
-
-    # --- Submit ---
-    print("5. Submitting form...")
-    
-    # Find button by text "Save Vendor" (Hebrew: 'שמור ספק')
-    save_btn = driver.find_element(By.XPATH, "//button[contains(., 'שמור ספק')]")
-    save_btn.click()
+    # add_vendor waits for the POST response and for the new vendor card to render
+    vendor_listed = vendors_page.add_vendor(vendor_name, "Music", phone="0509998877", price_estimate="4500")
     
     # --- Assertion / Verification ---
-    print("6. Verifying vendor was added...")
-    
-    time.sleep(3) # Wait for backend save and list refresh
-    
-    page_source = driver.page_source
-    
-    if vendor_name in page_source:
+    steps.step("3. Verifying vendor was added...")
+    if vendor_listed:
         print(f"✅ TEST PASSED: Vendor '{vendor_name}' added successfully!")
     else:
         print(f"❌ TEST FAILED: Vendor '{vendor_name}' not found in the list.")
-        assert False, "Vendor was not added to the list!"
\ No newline at end of file
+        assert False, "Vendor was not added to the list!"
@@ -1,9 +1,6 @@
-import time
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from support.pages import AuthPage, SIGN_IN_BUTTON
 
-def test_signup_as_collaborator(driver, base_url, credentials):
+def test_signup_as_collaborator(driver, base_url, credentials, steps, run_data):
     """
     Test flow for Collaborator (Partner): 
     1. Navigate to Auth Page.
@@ -14,87 +11,44 @@ def test_signup_as_collaborator(driver, base_url, credentials):
     6. Submit and verify success.
     
     Args:
-        driver, base_url, credentials: Injected automatically by conftest.py
+        driver, base_url, credentials, steps, run_data: Injected automatically by conftest.py
     """
     
-    print("1. Navigating to Base URL...")
-    driver.get(base_url)
-    
-    wait = WebDriverWait(driver, 10)
+    steps.step("1. Navigating to Base URL...")
+    auth_page = AuthPage(driver, base_url).open()
     
     # --- Switch to Sign Up Mode ---
-    print("2. Switching to Sign Up mode...")
-    
-    try:
-        # Check if we are already in Signup mode or need to toggle
-        toggle_btn = wait.until(EC.element_to_be_clickable(
-            (By.XPATH, "//button[contains(., \"Don't have an account? Sign up\")]")
-        ))
-        toggle_btn.click()
-    except Exception as e:
+    steps.step("2. Switching to Sign Up mode...")
+    if not auth_page.switch_to_signup():
         print("   (Note: Toggle button not found or already in Signup mode. Proceeding...)")
 
-    # --- Generate Fictive User Data ---
-    unique_id = int(time.time())
-    fictive_email = f"collab.test.{unique_id}@fictive.com"
-    fictive_name = f"Collaborator {unique_id}"
+    # --- Generate Fictive User Data (tagged with the run's namespace - deleted after the session) ---
+    fictive_email = run_data.email("collab.test")
+    fictive_name = f"Collaborator {run_data.namespace}"
     fictive_password = "SecretPassword123!"
     
     # Fetch the wedding code securely from the credentials fixture
     target_wedding_code = credentials["main_test_user_wedding_code"]
     
-    print(f"3. Registering Partner: {fictive_email} with code {target_wedding_code}")
-    
-    # --- Fill Basic Form ---
-    
-    # 1. Full Name 
-    name_input = wait.until(EC.visibility_of_element_located((By.CSS_SELECTOR, "input[placeholder='John Doe']")))
-    name_input.clear()
-    name_input.send_keys(fictive_name)
-    
-    # 2. Email
-    email_input = driver.find_element(By.CSS_SELECTOR, "input[type='email']")
-    email_input.clear()
-    email_input.send_keys(fictive_email)
-    
-    # 3. Password
-    pass_input = driver.find_element(By.CSS_SELECTOR, "input[type='password']")
-    pass_input.clear()
-    pass_input.send_keys(fictive_password)
+    steps.step(f"3. Registering Partner: {fictive_email} with code {target_wedding_code}")
+    auth_page.fill_signup(fictive_name, fictive_email, fictive_password)
     
     # --- PARTNER SPECIFIC STEPS ---
-    print("4. Selecting 'Join as a Partner'...")
-    
-    # Locate the checkbox or its label text
-    partner_checkbox_label = driver.find_element(By.XPATH, "//span[contains(., 'Join as a Partner')]")
-    partner_checkbox_label.click()
-    
-    # Wait for Wedding Code input to appear (it renders conditionally)
-    print("   -> Waiting for code input...")
-    code_input = wait.until(EC.visibility_of_element_located((By.CSS_SELECTOR, "input[placeholder*='WED-']")))
-    
-    code_input.clear()
-    code_input.send_keys(target_wedding_code)
+    steps.step("4. Selecting 'Join as a Partner'...")
+    auth_page.join_as_partner(target_wedding_code)
     
     # --- Submit ---
-    print("5. Submitting registration...")
-    
-    submit_btn = driver.find_element(By.XPATH, "//button[contains(., 'Create Account')]")
-    submit_btn.click()
+    # submit_signup waits for the register response and for the Dashboard to load
+    steps.step("5. Submitting registration...")
+    dashboard = auth_page.submit_signup()
     
     # --- Verify Success ---
-    print("6. Verifying redirection to Dashboard...")
-    
-    # Wait for the "Wedding Planner" header
-    wait.until(EC.presence_of_element_located((By.XPATH, "//h1[contains(., 'Wedding Planner')]")))
-    
-    time.sleep(2) # Short sleep to ensure URL update
-    current_url = driver.current_url
-    print(f"   -> Current URL: {current_url}")
+    steps.step("6. Verifying redirection to Dashboard...")
+    print(f"   -> Current URL: {driver.current_url}")
     
     # Check if the "Sign In" button is GONE (indicating user is logged in)
-    if len(driver.find_elements(By.XPATH, "//button[contains(., 'Sign In')]")) == 0:
+    if not dashboard.is_visible(SIGN_IN_BUTTON):
          print(f"✅ TEST PASSED: Collaborator registered successfully to the wedding with code: {target_wedding_code}")
     else:
          print("❌ TEST FAILED: Still seeing Sign In button.")
-         assert False, "Signup Failed: 'Sign In' button is still visible."
\ No newline at end of file
+         assert False, "Signup Failed: 'Sign In' button is still visible."
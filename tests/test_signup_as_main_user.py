@@ -1,9 +1,6 @@
-import time
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from support.pages import AuthPage, SIGN_IN_BUTTON
 
-def test_signup_as_main_user(driver, base_url):
+def test_signup_as_main_user(driver, base_url, steps, run_data):
     """
     Test flow: 
     1. Navigate to Auth Page.
@@ -11,72 +8,37 @@ def test_signup_as_main_user(driver, base_url):
     3. Fill registration form (Name, Email, Password).
     4. Submit and verify redirection to Dashboard.
     Args:
-        driver, base_url: Injected automatically by conftest.py
+        driver, base_url, steps, run_data: Injected automatically by conftest.py
     """
     
-    print("1. Navigating to Base URL...")
-    driver.get(base_url)
-    
-    wait = WebDriverWait(driver, 10)
+    steps.step("1. Navigating to Base URL...")
+    auth_page = AuthPage(driver, base_url).open()
     
     # --- Switch to Sign Up Mode ---
-    print("2. Switching to Sign Up mode...")
-    
-    try:
-        # In your Auth.jsx, the button text is: "Don't have an account? Sign up"
-        toggle_btn = wait.until(EC.element_to_be_clickable(
-            (By.XPATH, "//button[contains(., \"Don't have an account? Sign up\")]")
-        ))
-        toggle_btn.click()
-    except Exception as e:
+    steps.step("2. Switching to Sign Up mode...")
+    if not auth_page.switch_to_signup():
         print("   (Warning: Could not find toggle button. Page might already be in Signup mode or text changed).")
 
-    # --- Generate Fictive User Data ---
-    unique_id = int(time.time())
-    fictive_email = f"signup.test.{unique_id}@fictive.com"
-    fictive_name = f"Auto Tester {unique_id}"
+    # --- Generate Fictive User Data (tagged with the run's namespace - deleted after the session) ---
+    fictive_email = run_data.email("signup.test")
+    fictive_name = f"Auto Tester {run_data.namespace}"
     fictive_password = "SecretPassword123!"
     
-    print(f"3. Registering with: {fictive_email}")
-    
-    # --- Fill Form ---
-    
-    # 1. Full Name 
-    name_input = wait.until(EC.visibility_of_element_located((By.CSS_SELECTOR, "input[placeholder='John Doe']")))
-    name_input.clear()
-    name_input.send_keys(fictive_name)
-    
-    # 2. Email
-    email_input = driver.find_element(By.CSS_SELECTOR, "input[type='email']")
-    email_input.clear()
-    email_input.send_keys(fictive_email)
-    
-    # 3. Password
-    pass_input = driver.find_element(By.CSS_SELECTOR, "input[type='password']")
-    pass_input.clear()
-    pass_input.send_keys(fictive_password)
+    steps.step(f"3. Registering with: {fictive_email}")
+    auth_page.fill_signup(fictive_name, fictive_email, fictive_password)
     
     # --- Submit ---
-    print("4. Submitting registration...")
-    
-    submit_btn = driver.find_element(By.XPATH, "//button[contains(., 'Create Account')]")
-    submit_btn.click()
+    # submit_signup waits for the register response and for the Dashboard to load
+    steps.step("4. Submitting registration...")
+    dashboard = auth_page.submit_signup()
     
     # --- Verify Success ---
-    print("5. Verifying redirection to Dashboard...")
-    
-    # Wait for the "Wedding Planner" header which appears on the Dashboard
-    wait.until(EC.presence_of_element_located((By.XPATH, "//h1[contains(., 'Wedding Planner')]")))
-    
-    # Also verify URL does not contain 'login' or 'auth' logic
-    time.sleep(2) # Brief wait for URL update
-    current_url = driver.current_url
-    
-    print(f"   -> Current URL: {current_url}")
+    steps.step("5. Verifying redirection to Dashboard...")
+    print(f"   -> Current URL: {driver.current_url}")
     
     # Check if the "Sign In" button is GONE (meaning we are logged in)
-    if len(driver.find_elements(By.XPATH, "//button[contains(., 'Sign In')]")) == 0:
+    if not dashboard.is_visible(SIGN_IN_BUTTON):
          print("✅ TEST PASSED: New user registered and logged in successfully!")
     else:
          print("❌ TEST FAILED: Still seeing Sign In button.")
-         assert False, "Signup Failed: 'Sign In' button is still visible after registration."
\ No newline at end of file
+         assert False, "Signup Failed: 'Sign In' button is still visible after registration."